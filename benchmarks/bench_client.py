@@ -0,0 +1,145 @@
+"""
+Measures prediction throughput of tiktorch.client against a local server:
+serial Predict calls, pipelined predict_many and tiled prediction of a large array
+
+With --model, a real server is started in this process and model archive is loaded into it.
+Otherwise server runs stand-in model that negates its input after sleeping for --latency,
+which isolates client and transport overhead.
+"""
+
+import argparse
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+
+from tiktorch import converters
+from tiktorch.client import Client
+from tiktorch.proto import data_store_pb2, data_store_pb2_grpc, inference_pb2, inference_pb2_grpc
+
+
+class _StandInInference(inference_pb2_grpc.InferenceServicer):
+    def __init__(self, latency, tile_shape, halo):
+        self.__latency = latency
+        self.__tile_shape = tile_shape
+        self.__halo = halo
+
+    def CreateModelSession(self, request, context):
+        dims = [inference_pb2.TensorDim(name=a, size=s) for a, s in zip("cyx", self.__tile_shape)]
+        return inference_pb2.ModelSession(
+            id="bench",
+            inputAxes="cyx",
+            outputAxes="cyx",
+            validShapes=[inference_pb2.Shape(dims=dims)],
+            halo=[inference_pb2.TensorDim(name=a, size=self.__halo) for a in "yx"],
+        )
+
+    def CloseModelSession(self, request, context):
+        return inference_pb2.Empty()
+
+    def Predict(self, request, context):
+        arr = converters.pb_tensor_to_numpy(request.tensor)
+        time.sleep(self.__latency)
+        return inference_pb2.PredictResponse(tensor=converters.numpy_to_pb_tensor(-arr))
+
+
+class _NoUploads(data_store_pb2_grpc.DataStoreServicer):
+    def Upload(self, request_iterator, context):
+        size = sum(len(rq.content) for rq in request_iterator)
+        return data_store_pb2.UploadResponse(id="model", size=size)
+
+    def Remove(self, request, context):
+        return data_store_pb2.RemoveResponse()
+
+
+def _start_stand_in_server(port, args):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+    tile_shape = (1, args.tile, args.tile)
+    inference_pb2_grpc.add_InferenceServicer_to_server(_StandInInference(args.latency, tile_shape, args.halo), server)
+    data_store_pb2_grpc.add_DataStoreServicer_to_server(_NoUploads(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    return lambda: server.stop(0).wait()
+
+
+def _start_real_server(port):
+    from tiktorch.server.grpc import serve
+
+    thread = threading.Thread(target=serve, args=("127.0.0.1", port), daemon=True)
+    thread.start()
+
+    def _stop():
+        with grpc.insecure_channel(f"127.0.0.1:{port}") as chan:
+            inference_pb2_grpc.FlightControlStub(chan).Shutdown(inference_pb2.Empty())
+        thread.join()
+
+    return _stop
+
+
+def _rate(fn, count):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=5599)
+    parser.add_argument("--model", help="model zip to load into real server")
+    parser.add_argument("--latency", type=float, default=0.005, help="stand-in model latency in seconds")
+    parser.add_argument("--tile", type=int, default=256, help="stand-in model tile size")
+    parser.add_argument("--halo", type=int, default=16, help="stand-in model halo")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--volume", type=int, default=2048, help="side of array predicted with tiling")
+    args = parser.parse_args()
+
+    stop = _start_real_server(args.port) if args.model else _start_stand_in_server(args.port, args)
+    client = Client(f"127.0.0.1:{args.port}", pool_size=args.pool_size)
+    try:
+        client.wait_for_ready(timeout=10)
+        if args.model:
+            with open(args.model, "rb") as model:
+                session = client.create_model_session(model)
+        else:
+            session = client.create_model_session(b"stand-in")
+
+        tile_shape = [dim.size for dim in session.validShapes[0].dims]
+        tile = np.random.rand(*tile_shape).astype(np.float32)
+        tile_mib = tile.nbytes / 2**20
+        client.predict(session, tile)  # warm up
+
+        def _serial():
+            for _ in range(args.requests):
+                client.predict(session, tile)
+
+        def _pipelined():
+            for _ in client.predict_many(session, (tile for _ in range(args.requests)), max_in_flight=args.in_flight):
+                pass
+
+        serial = _rate(_serial, args.requests)
+        print(f"serial predict:    {serial:8.1f} req/s {serial * tile_mib:8.1f} MiB/s")
+        pipelined = _rate(_pipelined, args.requests)
+        print(
+            f"predict_many ({args.in_flight:2d}): {pipelined:8.1f} req/s {pipelined * tile_mib:8.1f} MiB/s "
+            f"({pipelined / serial:.2f}x)"
+        )
+
+        volume_shape = list(tile_shape[:-2]) + [args.volume, args.volume]
+        volume = np.random.rand(*volume_shape).astype(np.float32)
+        start = time.perf_counter()
+        client.predict_tiled(session, volume, max_in_flight=args.in_flight)
+        elapsed = time.perf_counter() - start
+        print(f"predict_tiled:     {volume.nbytes / 2 ** 20 / elapsed:8.1f} MiB/s of {tuple(volume_shape)} volume")
+
+        client.close_model_session(session)
+    finally:
+        client.close()
+        stop()
+
+
+if __name__ == "__main__":
+    main()
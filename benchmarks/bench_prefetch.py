@@ -0,0 +1,76 @@
+"""
+Compares training iterations per second with and without PrefetchingLoader
+
+Optimizer step is simulated by sleeping, data preparation uses a transform of configurable cost.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from tiktorch import tiktypes
+from tiktorch.server.datasets import DynamicDataset, PrefetchingLoader
+
+
+def _make_dataset(num_samples, shape, transform_repeats):
+    def _transform(data, label):
+        for _ in range(transform_repeats):
+            data = np.flip(np.rot90(data, axes=(-2, -1)), axis=-1)
+            label = np.flip(np.rot90(label, axes=(-2, -1)), axis=-1)
+
+        return np.ascontiguousarray(data), np.ascontiguousarray(label)
+
+    dataset = DynamicDataset(transform=_transform)
+    tensors = tiktypes.TikTensorBatch(
+        [tiktypes.TikTensor(np.random.rand(*shape).astype(np.float32), id_=(i,)) for i in range(num_samples)]
+    )
+    dataset.update(tensors, tensors)
+    return dataset
+
+
+def _synchronous_batches(dataset, batch_size):
+    while True:
+        samples = [dataset[idx] for idx in dataset.sample_indices(batch_size).tolist()]
+        yield [torch.stack(field) for field in zip(*samples)]
+
+
+def _measure(batches, iterations, step_time):
+    next(batches)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        next(batches)
+        time.sleep(step_time)
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--shape", type=int, nargs="+", default=[1, 256, 256])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--step-time", type=float, default=0.01, help="simulated optimizer step in seconds")
+    parser.add_argument("--transform-repeats", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--prefetch", type=int, default=4)
+    args = parser.parse_args()
+
+    dataset = _make_dataset(args.samples, args.shape, args.transform_repeats)
+
+    sync_its = _measure(_synchronous_batches(dataset, args.batch_size), args.iterations, args.step_time)
+    print(f"without prefetching: {sync_its:8.1f} it/s")
+
+    loader = PrefetchingLoader(dataset, args.batch_size, num_workers=args.workers, prefetch=args.prefetch)
+    try:
+        prefetch_its = _measure(iter(loader), args.iterations, args.step_time)
+    finally:
+        loader.close()
+
+    print(f"with prefetching:    {prefetch_its:8.1f} it/s ({prefetch_its / sync_its:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
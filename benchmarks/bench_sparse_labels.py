@@ -0,0 +1,74 @@
+"""
+Reports transfer and storage size of brush stroke labels in dense and sparse (coordinate) format
+
+Strokes are random walks of a round brush drawn into a few slices of a label block,
+similar to interactive annotation.
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from tiktorch.tiktypes import SparseTikTensor, TikTensor, TikTensorBatch
+from tiktorch.types import SparseNDArray
+
+
+def _draw_strokes(shape, num_strokes, stroke_length, radius, num_classes, rng):
+    labels = np.zeros(shape, dtype=np.uint8)
+    height, width = shape[-2:]
+    yy, xx = np.mgrid[-radius : radius + 1, -radius : radius + 1]
+    brush = yy**2 + xx**2 <= radius**2
+
+    for _ in range(num_strokes):
+        plane = labels[tuple(rng.randint(0, s) for s in shape[:-2])]
+        label = rng.randint(1, num_classes + 1)
+        y, x = rng.randint(radius, height - radius), rng.randint(radius, width - radius)
+        for _ in range(stroke_length):
+            y = int(np.clip(y + rng.randint(-2, 3), radius, height - radius - 1))
+            x = int(np.clip(x + rng.randint(-2, 3), radius, width - radius - 1))
+            window = plane[y - radius : y + radius + 1, x - radius : x + radius + 1]
+            window[brush] = label
+
+    return labels
+
+
+def _report(name, labels):
+    sparse = SparseNDArray.from_dense(labels)
+    dense_batch = TikTensorBatch([TikTensor(labels, id_=(0,))])
+    sparse_batch = TikTensorBatch([SparseTikTensor(sparse)])
+
+    dense_wire = len(pickle.dumps(dense_batch, protocol=pickle.HIGHEST_PROTOCOL))
+    sparse_wire = len(pickle.dumps(sparse_batch, protocol=pickle.HIGHEST_PROTOCOL))
+
+    start = time.perf_counter()
+    densified = sparse.as_numpy()
+    densify_time = time.perf_counter() - start
+    assert np.array_equal(labels, densified)
+
+    print(
+        f"{name:<28} shape {str(labels.shape):<16} labeled {sparse.nnz / labels.size:6.2%}: "
+        f"transfer {dense_wire / 2 ** 20:7.2f} -> {sparse_wire / 2 ** 20:6.3f} MiB ({dense_wire / sparse_wire:5.1f}x), "
+        f"stored {labels.nbytes / 2 ** 20:7.2f} -> {sparse.nbytes / 2 ** 20:6.3f} MiB, "
+        f"densify {densify_time * 1e3:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(args.seed)
+    patterns = [
+        ("2d, few strokes", (1024, 1024), 5, 200, 3),
+        ("2d, many strokes", (1024, 1024), 40, 300, 5),
+        ("3d block, strokes in slices", (64, 512, 512), 20, 200, 3),
+    ]
+    for name, shape, num_strokes, stroke_length, radius in patterns:
+        _report(name, _draw_strokes(shape, num_strokes, stroke_length, radius, num_classes=2, rng=rng))
+
+
+if __name__ == "__main__":
+    main()
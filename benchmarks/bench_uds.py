@@ -0,0 +1,86 @@
+"""
+Compares Predict throughput over loopback TCP and unix domain socket for several payload sizes
+
+Server runs in separate process and echoes tensors back, so only transport cost is measured.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+
+from tiktorch.client import Client
+from tiktorch.client.channel import CHANNEL_OPTIONS
+from tiktorch.proto import inference_pb2, inference_pb2_grpc
+
+
+class _EchoInference(inference_pb2_grpc.InferenceServicer):
+    def Predict(self, request, context):
+        return inference_pb2.PredictResponse(tensor=request.tensor)
+
+
+def _run_server(port, socket_path, ready, stop):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8), options=CHANNEL_OPTIONS)
+    inference_pb2_grpc.add_InferenceServicer_to_server(_EchoInference(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.add_insecure_port(f"unix:{socket_path}")
+    server.start()
+    ready.set()
+    stop.wait()
+    server.stop(0).wait()
+
+
+def _throughput(target, array, seconds):
+    session = inference_pb2.ModelSession(id="echo")
+    with Client(target, pool_size=1) as client:
+        client.wait_for_ready(timeout=10)
+        client.predict(session, array)  # warm up
+
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            client.predict(session, array)
+            count += 1
+
+        elapsed = time.perf_counter() - start
+
+    # payload travels to server and back
+    return 2 * count * array.nbytes / 2**20 / elapsed, elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=5598)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.0625, 1, 16, 64], help="payload sizes in MiB")
+    parser.add_argument("--seconds", type=float, default=2.0, help="measurement time per size and transport")
+    args = parser.parse_args()
+
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="tiktorch_bench_"), "server.sock")
+    ctx = mp.get_context("spawn")
+    ready, stop = ctx.Event(), ctx.Event()
+    server = ctx.Process(target=_run_server, args=(args.port, socket_path, ready, stop))
+    server.start()
+    try:
+        ready.wait()
+        for size in args.sizes:
+            array = np.random.rand(int(size * 2**20) // 4).astype(np.float32)
+            tcp, tcp_latency = _throughput(f"127.0.0.1:{args.port}", array, args.seconds)
+            uds, uds_latency = _throughput(f"unix:{socket_path}", array, args.seconds)
+            print(
+                f"{size:8.4f} MiB: tcp {tcp:8.1f} MiB/s ({tcp_latency * 1e3:7.2f} ms), "
+                f"uds {uds:8.1f} MiB/s ({uds_latency * 1e3:7.2f} ms), {uds / tcp:.2f}x"
+            )
+    finally:
+        stop.set()
+        server.join()
+        shutil.rmtree(os.path.dirname(socket_path), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
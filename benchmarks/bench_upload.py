@@ -0,0 +1,111 @@
+"""
+Measures upload throughput and peak server RSS against upload size
+
+Every upload goes to a fresh server process, reported is growth of its peak RSS over RSS before upload (Linux only).
+Single stream and parallel (resumable) uploads are compared with the previous implementation
+concatenating chunks into bytes.
+"""
+
+import argparse
+import hashlib
+import multiprocessing as mp
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+
+from tiktorch.client import Client
+from tiktorch.proto import data_store_pb2, data_store_pb2_grpc
+from tiktorch.server.data_store import DataStore
+from tiktorch.server.grpc.data_store_servicer import DataStoreServicer
+
+
+class _ConcatenatingServicer(data_store_pb2_grpc.DataStoreServicer):
+    def __init__(self):
+        self.blobs = {}
+
+    def Upload(self, request_iterator, context):
+        rq = next(request_iterator)
+        data = b""
+        sha256 = hashlib.sha256()
+        for rq in request_iterator:
+            data += rq.content
+            sha256.update(rq.content)
+
+        self.blobs[str(len(self.blobs))] = data
+        return data_store_pb2.UploadResponse(id=str(len(self.blobs) - 1), size=len(data), sha256=sha256.hexdigest())
+
+
+def _memory_status_mib(field):
+    # unlike ru_maxrss, VmHWM isn't inherited from parent process holding the payload
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+
+    raise KeyError(field)
+
+
+def _run_server(port, legacy, conn):
+    servicer = _ConcatenatingServicer() if legacy else DataStoreServicer(DataStore())
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    data_store_pb2_grpc.add_DataStoreServicer_to_server(servicer, server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    conn.send(_memory_status_mib("VmRSS"))
+    conn.recv()  # upload finished
+    conn.send(_memory_status_mib("VmHWM"))
+    server.stop(0).wait()
+
+
+def _measure(port, data, legacy, streams=0):
+    ctx = mp.get_context("spawn")
+    conn, child_conn = ctx.Pipe()
+    server = ctx.Process(target=_run_server, args=(port, legacy, child_conn))
+    server.start()
+    try:
+        rss_before = conn.recv()
+        try:
+            with Client(f"127.0.0.1:{port}", pool_size=max(streams, 1)) as client:
+                client.wait_for_ready(timeout=10)
+                start = time.perf_counter()
+                if streams:
+                    client.upload_parallel(data, streams=streams)
+                else:
+                    client.upload(data, skip_existing=False)
+                elapsed = time.perf_counter() - start
+        finally:
+            conn.send(None)
+
+        rss_after = conn.recv()
+    finally:
+        server.join()
+
+    return len(data) / 2**20 / elapsed, rss_after - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=5597)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256, 1024], help="upload sizes in MiB")
+    parser.add_argument(
+        "--legacy-max", type=int, default=256, help="largest size for previous implementation, it's quadratic"
+    )
+    parser.add_argument("--streams", type=int, default=4, help="streams of parallel upload")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        data = np.random.bytes(size * 2**20)
+        throughput, rss = _measure(args.port, data, legacy=False)
+        line = f"{size:5d} MiB: streaming {throughput:7.1f} MiB/s, peak RSS +{rss:7.1f} MiB"
+        throughput, rss = _measure(args.port, data, legacy=False, streams=args.streams)
+        line += f" | parallel {throughput:7.1f} MiB/s, peak RSS +{rss:7.1f} MiB"
+        if size <= args.legacy_max:
+            legacy_throughput, legacy_rss = _measure(args.port, data, legacy=True)
+            line += f" | concatenating {legacy_throughput:7.1f} MiB/s, peak RSS +{legacy_rss:7.1f} MiB"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
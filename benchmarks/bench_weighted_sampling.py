@@ -0,0 +1,68 @@
+"""
+Compares weighted sampling from DynamicDataset using sum tree with rebuilding weight tensor on every draw
+
+Each iteration draws one index and decays its weight, as a training loop accessing the dataset does.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from tiktorch import tiktypes
+from tiktorch.server.datasets import DynamicDataset
+
+
+def _make_dataset(num_entries):
+    dataset = DynamicDataset()
+    tensors = tiktypes.TikTensorBatch([tiktypes.TikTensor(np.zeros(1), id_=(i,)) for i in range(num_entries)])
+    dataset.update(tensors, tensors)
+    return dataset
+
+
+def _rebuild_weights_draw(dataset):
+    # previous implementation: weight tensor built from python list, then multinomial
+    weights = torch.DoubleTensor(dataset.get_weights().tolist())
+    return int(torch.multinomial(weights, num_samples=1))
+
+
+def _sum_tree_draw(dataset):
+    return int(dataset.sample_indices(1)[0])
+
+
+def _measure(dataset, draw, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dataset[draw(dataset)]
+
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    for num_entries in args.entries:
+        dataset = _make_dataset(num_entries)
+
+        rebuild = _measure(dataset, _rebuild_weights_draw, max(1, args.iterations // 20))
+        tree = _measure(dataset, _sum_tree_draw, args.iterations)
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            dataset.sample_indices(args.batch_size)
+        batch = (time.perf_counter() - start) / args.iterations
+
+        print(
+            f"{num_entries:>9} entries: rebuild weights {rebuild * 1e3:9.3f} ms/sample, "
+            f"sum tree {tree * 1e6:7.1f} us/sample ({rebuild / tree:.0f}x), "
+            f"batch of {args.batch_size} {batch * 1e6 / args.batch_size:5.2f} us/sample"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+import contextlib
+import hashlib
+import io
+import threading
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from tiktorch import converters
+from tiktorch.client import Client, RetryPolicy
+from tiktorch.proto import data_store_pb2_grpc, inference_pb2, inference_pb2_grpc
+from tiktorch.server.data_store import ChecksumError, DataStore, RangeUpload
+from tiktorch.server.device_pool import TorchDevicePool
+from tiktorch.server.grpc import data_store_servicer as data_store_servicer_module
+from tiktorch.server.grpc.data_store_servicer import DataStoreServicer
+from tiktorch.server.grpc.flight_control_servicer import FlightControlServicer
+from tiktorch.server.grpc.inference_servicer import InferenceServicer
+from tiktorch.server.session.process import ModelInfo
+from tiktorch.server.session_manager import SessionManager
+from tiktorch.types import AxesPoint
+
+
+class NegatingInference(inference_pb2_grpc.InferenceServicer):
+    """
+    Model session negating its input, first fail_count predictions fail as unavailable
+    """
+
+    def __init__(self, data_store):
+        self.data_store = data_store
+        self.fail_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.barrier = None
+        self.lock = threading.Lock()
+
+    def CreateModelSession(self, request, context):
+        assert request.model_uri.startswith("upload://")
+        self.data_store.get(request.model_uri[len("upload://") :])
+        return inference_pb2.ModelSession(
+            id="session",
+            inputAxes="cyx",
+            outputAxes="cyx",
+            validShapes=[inference_pb2.Shape(dims=[_dim("c", 1), _dim("y", 32), _dim("x", 32)])],
+            halo=[_dim("y", 4), _dim("x", 4)],
+        )
+
+    def Predict(self, request, context):
+        with self.lock:
+            if self.fail_count:
+                self.fail_count -= 1
+                context.abort(grpc.StatusCode.UNAVAILABLE, "Try later")
+
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            if self.barrier is not None:
+                self.barrier.wait(timeout=5)
+            arr = converters.pb_tensor_to_numpy(request.tensor)
+            return inference_pb2.PredictResponse(tensor=converters.numpy_to_pb_tensor(-arr))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class InterruptingDataStore(DataStoreServicer):
+    """
+    Data store servicer failing downloads as unavailable after sending interrupt_after chunks
+    """
+
+    interrupt_after = None
+
+    def Download(self, request, context):
+        return self._interrupt(super().Download(request, context), context)
+
+    def DownloadArray(self, request, context):
+        return self._interrupt(super().DownloadArray(request, context), context)
+
+    def _interrupt(self, chunks, context):
+        for i, chunk in enumerate(chunks):
+            if i == self.interrupt_after:
+                self.interrupt_after = None
+                context.abort(grpc.StatusCode.UNAVAILABLE, "Interrupted")
+            yield chunk
+
+
+def _dim(name, size):
+    return inference_pb2.TensorDim(name=name, size=size)
+
+
+@pytest.fixture
+def data_store():
+    return DataStore()
+
+
+@pytest.fixture
+def inference(data_store):
+    return NegatingInference(data_store)
+
+
+@pytest.fixture
+def data_store_servicer(data_store):
+    return InterruptingDataStore(data_store)
+
+
+@pytest.fixture
+def client(srv_port, data_store, data_store_servicer, inference):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    inference_pb2_grpc.add_InferenceServicer_to_server(inference, server)
+    inference_pb2_grpc.add_FlightControlServicer_to_server(FlightControlServicer(), server)
+    data_store_pb2_grpc.add_DataStoreServicer_to_server(data_store_servicer, server)
+    server.add_insecure_port(f"127.0.0.1:{srv_port}")
+    server.start()
+
+    client = Client(f"127.0.0.1:{srv_port}", retry=RetryPolicy(initial_backoff=0.01), timeout=10)
+    assert client.wait_for_ready(timeout=5)
+    yield client
+
+    client.close()
+    server.stop(0).wait()
+
+
+def test_upload_in_chunks(client, data_store):
+    data = bytes(range(256)) * 100
+
+    res = client.upload(data, chunk_size=1000)
+
+    assert len(data) == res.size
+    assert data == data_store.get(res.id)
+
+
+def test_upload_file_from_current_position(client, data_store):
+    file = io.BytesIO(b"header" + b"x" * 5000)
+    file.seek(6)
+
+    res = client.upload(file, chunk_size=512)
+
+    assert b"x" * 5000 == data_store.get(res.id)
+
+
+@pytest.mark.parametrize("streams", [1, 3])
+def test_upload_parallel(client, data_store, streams):
+    data = np.random.bytes(10_000)
+
+    res = client.upload_parallel(data, streams=streams, chunk_size=1000)
+
+    assert 10_000 == res.size
+    assert data == data_store.get(res.id)
+
+
+def test_upload_parallel_resumes_upload(client, data_store, monkeypatch):
+    data = np.random.bytes(10_000)
+    upload = data_store.start_range_upload(10_000, hashlib.sha256(data).hexdigest(), 1000)
+    for offset in range(0, 5000, 1000):
+        upload.write(offset, data[offset : offset + 1000], hashlib.sha256(data[offset : offset + 1000]).hexdigest())
+
+    written = []
+    write = RangeUpload.write
+
+    def _write(self, offset, chunk, sha256):
+        if not written:
+            written.append(offset)
+            raise ChecksumError("corrupted")
+        written.append(offset)
+        write(self, offset, chunk, sha256)
+
+    monkeypatch.setattr(RangeUpload, "write", _write)
+
+    res = client.upload_parallel(io.BytesIO(data), streams=1, chunk_size=500)
+
+    assert data == data_store.get(res.id)
+    assert [5000, 5000, 6000, 7000, 8000, 9000] == written
+
+
+def test_download_is_resumed(client, data_store, data_store_servicer, monkeypatch):
+    monkeypatch.setattr(data_store_servicer_module, "DOWNLOAD_CHUNK_SIZE", 1000)
+    data = np.random.bytes(10_000)
+    upload_id = data_store.put(data)
+    data_store_servicer.interrupt_after = 3
+
+    assert data == client.download(upload_id)
+    assert data_store_servicer.interrupt_after is None
+
+    out = io.BytesIO()
+    client.download(upload_id, out, offset=2500, length=5000)
+    assert data[2500:7500] == out.getvalue()
+
+
+def test_chunked_array(client, data_store, data_store_servicer):
+    info = client.create_array((20, 30), np.float32, chunks=(8, 8), compression="zlib")
+    data = np.random.rand(15, 22).astype(np.float32)
+    client.write_array(info.arrayId, data, start=(3, 5))
+    data_store_servicer.interrupt_after = 5
+
+    result = client.download_array(info.arrayId)
+
+    assert data_store_servicer.interrupt_after is None
+    expected = np.zeros((20, 30), dtype=np.float32)
+    expected[3:18, 5:27] = data
+    np.testing.assert_array_equal(expected, result)
+
+
+def test_create_model_session_skips_stored_model(client, data_store, monkeypatch):
+    uploads = []
+    create_upload = data_store.create_upload
+
+    def _create_upload(size, **kwargs):
+        uploads.append(size)
+        return create_upload(size, **kwargs)
+
+    monkeypatch.setattr(data_store, "create_upload", _create_upload)
+
+    for _ in range(2):
+        assert "session" == client.create_model_session(b"model").id
+
+    assert [5] == uploads
+
+
+def test_predict_many_keeps_requests_in_flight(client, inference):
+    session = client.create_model_session(b"model")
+    inference.barrier = threading.Barrier(3)
+    arrays = [np.full((1, 4, 4), i, dtype=np.float32) for i in range(9)]
+
+    results = list(client.predict_many(session, arrays, max_in_flight=3))
+
+    assert 3 == inference.max_in_flight
+    assert all(np.array_equal(-a, r) for a, r in zip(arrays, results))
+
+
+def test_predict_many_consumes_arrays_lazily(client):
+    session = client.create_model_session(b"model")
+    consumed = []
+
+    def _arrays():
+        for i in range(10):
+            consumed.append(i)
+            yield np.zeros((1, 2, 2), dtype=np.float32)
+
+    results = client.predict_many(session, _arrays(), max_in_flight=2)
+    next(results)
+
+    assert [0, 1] == consumed
+    results.close()
+
+
+def test_retry_unavailable(client, inference):
+    session = client.create_model_session(b"model")
+    inference.fail_count = 2
+
+    assert np.array_equal(-np.ones((1, 2, 2)), client.predict(session, np.ones((1, 2, 2))))
+    assert not inference.fail_count
+
+
+def test_pipelined_requests_are_resent(client, inference):
+    session = client.create_model_session(b"model")
+    inference.fail_count = 3
+    arrays = [np.full((1, 2, 2), i, dtype=np.float32) for i in range(6)]
+
+    results = list(client.predict_many(session, arrays, max_in_flight=3))
+
+    assert all(np.array_equal(-a, r) for a, r in zip(arrays, results))
+
+
+def test_errors_are_not_retried(client):
+    session = inference_pb2.ModelSession(id="session")
+
+    with pytest.raises(grpc.RpcError):
+        client.predict(session, np.ones((1, 2), dtype=object))
+
+
+def test_predict_tiled(client):
+    session = client.create_model_session(b"model")
+    array = np.random.rand(1, 100, 70).astype(np.float32)
+
+    assert np.array_equal(-array, client.predict_tiled(session, array))
+
+
+class _RepeatingModelSession:
+    model_info = ModelInfo(name="repeating", input_axes="cyx", output_axes="cyx", valid_shapes=[], halo=[("y", 4)])
+
+    def __init__(self, repeats):
+        self.repeats = repeats
+        self.datasets = {}
+
+    @contextlib.contextmanager
+    def use(self, on_restore=None):
+        yield self
+
+    def forward(self, arr, dataset_id=""):
+        return np.concatenate([arr] * self.repeats)
+
+    def create_dataset_description(self, mean, stddev, statistics=None):
+        id_ = f"ds{len(self.datasets)}"
+        self.datasets[id_] = {"mean": mean, "stddev": stddev, "statistics": statistics}
+        return id_
+
+    def get_dataset_description(self, id_):
+        return self.datasets.get(id_)
+
+
+@pytest.fixture
+def shm_client(srv_port):
+    session_manager = SessionManager()
+    session = session_manager.create_session()
+    session.model_session = _RepeatingModelSession(repeats=2)
+
+    data_store = DataStore()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    servicer = InferenceServicer(TorchDevicePool(), session_manager, data_store, shared_memory=True)
+    inference_pb2_grpc.add_InferenceServicer_to_server(servicer, server)
+    data_store_pb2_grpc.add_DataStoreServicer_to_server(DataStoreServicer(data_store), server)
+    server.add_insecure_port(f"127.0.0.1:{srv_port}")
+    server.start()
+
+    client = Client(f"127.0.0.1:{srv_port}", shared_memory=True, timeout=10)
+    yield client, inference_pb2.ModelSession(id=session.id), session.model_session
+
+    client.close()
+    server.stop(0).wait()
+
+
+def test_predict_through_shared_memory(shm_client):
+    client, session, _ = shm_client
+    arrays = [np.random.rand(1, 64, 64) for _ in range(5)]
+
+    assert np.array_equal(np.concatenate([arrays[0]] * 2), client.predict(session, arrays[0]))
+    for arr, res in zip(arrays, client.predict_many(session, arrays, max_in_flight=2)):
+        assert np.array_equal(np.concatenate([arr] * 2), res)
+
+
+def test_shared_output_grows_after_overflow(shm_client):
+    client, session, model_session = shm_client
+    arr = np.random.rand(1, 512, 512)
+    model_session.repeats = 8
+
+    for _ in range(2):
+        assert np.array_equal(np.concatenate([arr] * 8), client.predict(session, arr))
+
+
+def test_predict_volume(shm_client):
+    client, session, _ = shm_client
+    session = inference_pb2.ModelSession(
+        id=session.id,
+        inputAxes="cyx",
+        outputAxes="cyx",
+        validShapes=[inference_pb2.Shape(dims=[_dim("c", 1), _dim("y", 32), _dim("x", 32)])],
+        halo=[_dim("y", 4)],
+    )
+    volume = np.random.rand(1, 100, 70).astype(np.float32)
+    upload = client.upload_array(volume)
+
+    expected = np.concatenate([volume] * 2)
+    assert np.array_equal(expected[:, 6:24, :30], client.predict_region(session, upload.id, [0, 10, 0], [1, 20, 30]))
+    assert np.array_equal(expected, client.predict_volume(session, upload.id, volume.shape))
+
+
+def test_predict_volume_into_chunked_array(shm_client):
+    client, session, _ = shm_client
+    session = inference_pb2.ModelSession(
+        id=session.id,
+        inputAxes="cyx",
+        outputAxes="cyx",
+        validShapes=[inference_pb2.Shape(dims=[_dim("c", 1), _dim("y", 32), _dim("x", 32)])],
+        halo=[_dim("y", 4)],
+    )
+    volume = np.random.rand(1, 100, 70).astype(np.float32)
+    input_array = client.create_array(volume.shape, volume.dtype)
+    client.write_array(input_array.arrayId, volume)
+    output_array = client.create_array((2, 100, 70), np.float32, chunks=(2, 32, 32))
+
+    assert (
+        client.predict_volume(session, input_array.arrayId, volume.shape, output_array_id=output_array.arrayId) is None
+    )
+    assert np.array_equal(np.concatenate([volume] * 2), client.download_array(output_array.arrayId))
+
+
+def test_prediction_job(shm_client):
+    client, session, _ = shm_client
+    volume = np.random.rand(1, 100, 70).astype(np.float32)
+    upload = client.upload_array(volume)
+
+    job = client.submit_prediction_job(
+        session, upload.id, tile_shape=AxesPoint("cyx", [1, 32, 32]), chunks=(2, 32, 32), compression="zlib"
+    )
+    statuses = list(client.watch_job(job.jobId))
+
+    assert inference_pb2.JobStatus.State.DONE == statuses[-1].state
+    assert statuses[-1].tilesDone == statuses[-1].tilesTotal
+    assert [2, 32, 32] == client.array_info(statuses[-1].outputArrayId).chunks
+    assert np.array_equal(np.concatenate([volume] * 2), client.download_array(statuses[-1].outputArrayId))
+
+
+def test_dataset_statistics(shm_client):
+    client, session, model_session = shm_client
+    volume = np.random.randint(0, 1000, (1, 64, 64)).astype(np.uint16)
+    volume_id = client.upload_array(volume).id
+
+    stored = client.compute_dataset_statistics(session, volume_id, percentiles=[5, 95], histogram_bins=8)
+    streamed = client.compute_stream_statistics(session, np.split(volume, 4, axis=1), percentiles=[5, 95])
+
+    assert stored.statistics.mean == pytest.approx(volume.mean())
+    assert streamed.statistics.mean == pytest.approx(volume.mean())
+    assert list(stored.statistics.percentileValues) == list(streamed.statistics.percentileValues)
+    assert volume.std() == pytest.approx(model_session.datasets[stored.id]["stddev"])
+    assert stored == client.get_dataset_description(session, stored.id)
@@ -1,10 +1,24 @@
 import os
+import shutil
 import socket
 import sys
+import threading
+from concurrent import futures
 
+import grpc
 import pytest
 
-from tiktorch.launcher import ConnConf, LocalServerLauncher, RemoteSSHServerLauncher, SSHCred, client_factory, wait
+from tiktorch.launcher import (
+    ConnConf,
+    IServerLauncher,
+    LocalServerLauncher,
+    RemoteSSHServerLauncher,
+    SSHCred,
+    client_factory,
+    wait,
+)
+from tiktorch.proto import inference_pb2_grpc
+from tiktorch.server.grpc.flight_control_servicer import FlightControlServicer
 
 SSH_HOST_VAR = "TEST_SSH_HOST"
 SSH_PORT_VAR = "TEST_SSH_PORT"
@@ -23,10 +37,82 @@ def test_start_local_server(srv_port):
     client = client_factory(conn_conf)
 
     assert client.ping()
+    assert conn_conf.unix_socket is None
 
     launcher.stop()
 
 
+def _start_flight_control(port):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    inference_pb2_grpc.add_FlightControlServicer_to_server(FlightControlServicer(), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    return server
+
+
+def test_client_waits_for_server_to_become_ready(srv_port):
+    client = client_factory(ConnConf("127.0.0.1", srv_port, timeout=5))
+    servers = []
+    timer = threading.Timer(0.2, lambda: servers.append(_start_flight_control(srv_port)))
+    try:
+        assert not client.ping()
+
+        timer.start()
+
+        assert client.wait_for_ready(timeout=5)
+    finally:
+        timer.join()
+        for srv in servers:
+            srv.stop(0).wait()
+        client.close()
+
+
+def test_client_channel_reconnects_after_server_restart(srv_port):
+    client = client_factory(ConnConf("127.0.0.1", srv_port, timeout=5))
+    server = _start_flight_control(srv_port)
+    try:
+        assert client.ping()
+
+        server.stop(0).wait()
+        assert not client.ping()
+
+        server = _start_flight_control(srv_port)
+        assert client.wait_for_ready(timeout=5)
+    finally:
+        server.stop(0).wait()
+        client.close()
+
+
+class _UnavailableOnShutdown(FlightControlServicer):
+    def Shutdown(self, request, context):
+        context.abort(grpc.StatusCode.UNAVAILABLE, "Server is stopping")
+
+
+class _InProcessLauncher(IServerLauncher):
+    def __init__(self, conn_conf, servicer):
+        self._conn_conf = conn_conf
+        self._servicer = servicer
+        self.server = None
+
+    def _start_server(self, dummy, kill_timeout):
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_FlightControlServicer_to_server(self._servicer, self.server)
+        self.server.add_insecure_port(self._conn_conf.target)
+        self.server.start()
+        self._wait_for_server()
+
+
+def test_stop_tolerates_shutdown_reply_cancelled_by_server_stop(srv_port):
+    launcher = _InProcessLauncher(ConnConf("127.0.0.1", srv_port, timeout=5), _UnavailableOnShutdown())
+    launcher.start()
+    try:
+        launcher.stop()
+
+        assert IServerLauncher.State.Stopped == launcher._state
+    finally:
+        launcher.server.stop(0).wait()
+
+
 def test_start_remote_server(srv_port):
     host, ssh_port = os.getenv(SSH_HOST_VAR), os.getenv(SSH_PORT_VAR, 22)
     user, pwd = os.getenv(SSH_USER_VAR), os.getenv(SSH_PWD_VAR)
@@ -53,3 +139,27 @@ def test_start_remote_server(srv_port):
         launcher.stop()
 
     assert not launcher.is_server_running()
+
+
+def test_conn_conf_prefers_unix_socket():
+    conn_conf = ConnConf("127.0.0.1", 5567, timeout=5)
+    assert "127.0.0.1:5567" == conn_conf.target
+
+    conn_conf.unix_socket = "/tmp/tiktorch/server.sock"
+    assert "unix:/tmp/tiktorch/server.sock" == conn_conf.target
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="unix sockets are not available")
+def test_local_launcher_keeps_socket_path_to_itself(srv_port, monkeypatch):
+    conn_conf = ConnConf("127.0.0.1", srv_port, timeout=5)
+    launcher = LocalServerLauncher(conn_conf)
+    monkeypatch.setattr(launcher, "_wait_for_server", lambda: None)
+    monkeypatch.setattr("subprocess.Popen", lambda cmd, **kwargs: cmd)
+
+    launcher._start_server(dummy=False, kill_timeout=10)
+    try:
+        assert launcher.unix_socket is not None
+        assert launcher.unix_socket in launcher._process
+        assert conn_conf.unix_socket is None
+    finally:
+        shutil.rmtree(os.path.dirname(launcher.unix_socket))
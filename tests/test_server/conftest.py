@@ -0,0 +1,81 @@
+import contextlib
+import io
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+from tiktorch.server.data_store import DataStore
+from tiktorch.server.session_manager import SessionManager
+
+
+def npy(array):
+    buf = io.BytesIO()
+    np.save(buf, array)
+    return buf.getvalue()
+
+
+class FakeModelSession:
+    """
+    In-process model session, forward applies given function to its input
+    Forward blocks while gate is cleared and raises if fail is set
+    """
+
+    def __init__(self, forward=lambda arr: arr, model_info=None):
+        self.model_info = model_info
+        self._forward = forward
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+        self.calls = 0
+        self.dataset_ids = set()
+        self.datasets = {}
+
+    @contextlib.contextmanager
+    def use(self, on_restore=None):
+        yield self
+
+    def forward(self, arr, dataset_id=""):
+        self.gate.wait(timeout=10)
+        self.calls += 1
+        self.dataset_ids.add(dataset_id)
+        if self.fail:
+            raise RuntimeError("Forward failed")
+        return self._forward(arr)
+
+    def create_dataset_description(self, mean, stddev, statistics=None):
+        id_ = uuid.uuid4().hex
+        self.datasets[id_] = {"mean": mean, "stddev": stddev, "statistics": statistics}
+        return id_
+
+    def get_dataset_description(self, id_):
+        return self.datasets.get(id_)
+
+
+@pytest.fixture(scope="module")
+def session_manager():
+    return SessionManager()
+
+
+@pytest.fixture(scope="module")
+def data_store():
+    return DataStore(spool_threshold=1024)
+
+
+@pytest.fixture
+def model_session(request):
+    """
+    Test modules parametrize fake model session by keyword arguments in module level MODEL_SESSION_PARAMS
+    """
+    return FakeModelSession(**getattr(request.module, "MODEL_SESSION_PARAMS", {}))
+
+
+@pytest.fixture
+def session(session_manager, model_session):
+    session = session_manager.create_session()
+    session.model_session = model_session
+    yield session
+    # tests may close session themselves
+    with contextlib.suppress(ValueError):
+        session_manager.close_session(session.id)
@@ -0,0 +1,90 @@
+import json
+import multiprocessing as mp
+import threading
+
+import numpy as np
+import pytest
+
+from tiktorch.server.chunked_array import ChunkedArray, default_chunks
+from tiktorch.types import read_roi
+
+
+@pytest.fixture(params=[None, "zlib"])
+def array(tmp_path, request):
+    return ChunkedArray.create(tmp_path / "array", (5, 37, 23), np.float32, (2, 8, 10), compression=request.param)
+
+
+def test_regions_are_written_and_read(array):
+    expected = np.zeros(array.shape, dtype=np.float32)
+    rng = np.random.RandomState(0)
+    for _ in range(20):
+        start = rng.randint(0, array.shape)
+        stop = rng.randint(start, array.shape) + 1
+        data = rng.rand(*(stop - start)).astype(np.float32)
+        array.write(start, data)
+        expected[tuple(slice(a, b) for a, b in zip(start, stop))] = data
+
+    np.testing.assert_array_equal(expected, array[:])
+    np.testing.assert_array_equal(expected[1:4, 5:30, 9:11], array.read([1, 5, 9], [4, 30, 11]))
+    np.testing.assert_array_equal(expected[:, 7:], ChunkedArray(array.path)[:, 7:])
+
+
+def test_unwritten_chunks_read_as_fill_value(tmp_path):
+    array = ChunkedArray.create(tmp_path / "array", (10, 10), np.uint8, (4, 4), fill_value=7)
+    array[2:3, 2:3] = 1
+
+    expected = np.full((10, 10), 7, dtype=np.uint8)
+    expected[2, 2] = 1
+    np.testing.assert_array_equal(expected, array[:])
+    assert ["0.0"] == sorted(p.name for p in array.path.iterdir() if not p.name.startswith("."))
+
+
+def test_header_follows_zarr_format(array):
+    header = json.loads((array.path / ".zarray").read_text())
+
+    assert 2 == header["zarr_format"]
+    assert [5, 37, 23] == header["shape"]
+    assert [2, 8, 10] == header["chunks"]
+    assert "<f4" == header["dtype"]
+
+
+@pytest.mark.parametrize("start, stop", [([0, 0], [1, 1]), ([0, 0, 0], [1, 1, 24]), ([0, -1, 0], [1, 2, 1])])
+def test_regions_outside_of_array_are_refused(array, start, stop):
+    with pytest.raises(ValueError):
+        array.read(start, stop)
+
+    with pytest.raises(ValueError):
+        array.write(start, np.zeros(np.subtract(stop, start), dtype=np.float32))
+
+
+def test_read_roi_reflects_chunked_array(array):
+    data = np.random.rand(*array.shape).astype(np.float32)
+    array[:] = data
+
+    np.testing.assert_array_equal(read_roi(data, [-2, 30, -3], [3, 40, 5]), read_roi(array, [-2, 30, -3], [3, 40, 5]))
+
+
+def test_default_chunks():
+    assert (4, 250, 250) == default_chunks((4, 1000, 1000), np.float32, chunk_size=2**20)
+    assert (3, 5) == default_chunks((3, 5), np.float64)
+
+
+def _write_rows(path, rows):
+    array = ChunkedArray(path)
+    for row in rows:
+        array[row : row + 1] = np.full((1, array.shape[1]), row, dtype=array.dtype)
+
+
+def test_concurrent_writes_to_shared_chunks(tmp_path):
+    # every chunk holds rows written by several threads of several processes
+    array = ChunkedArray.create(tmp_path / "array", (64, 6), np.int32, (16, 4), compression="zlib")
+    ctx = mp.get_context("spawn")
+    processes = [ctx.Process(target=_write_rows, args=(array.path, range(i, 64, 4))) for i in range(2)]
+    threads = [threading.Thread(target=_write_rows, args=(array.path, range(i, 64, 4))) for i in range(2, 4)]
+    for worker in processes + threads:
+        worker.start()
+    for worker in processes + threads:
+        worker.join()
+
+    assert all(p.exitcode == 0 for p in processes)
+    np.testing.assert_array_equal(np.repeat(np.arange(64, dtype=np.int32)[:, None], 6, axis=1), array[:])
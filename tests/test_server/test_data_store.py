@@ -0,0 +1,354 @@
+import hashlib
+import io
+import time
+
+import numpy as np
+import pytest
+
+from tiktorch.server.data_store import ChecksumError, DataStore, QuotaExceeded
+
+
+@pytest.fixture
+def data_store(tmp_path):
+    return DataStore(spool_threshold=1024, spool_dir=tmp_path)
+
+
+def _upload(data_store, data, chunk_size=100):
+    upload = data_store.create_upload(len(data))
+    for i in range(0, len(data), chunk_size):
+        upload.write(data[i : i + chunk_size])
+    return upload
+
+
+@pytest.mark.parametrize("size", [10, 1024, 1025, 5000])
+def test_uploaded_data_is_stored(data_store, size):
+    data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    upload = _upload(data_store, data)
+
+    assert (size > 1024) == upload.is_spooled
+    assert hashlib.sha256(data).hexdigest() == upload.sha256
+
+    id_ = data_store.put_upload(upload)
+
+    assert data == data_store.get(id_)
+    with data_store.open(id_) as f:
+        assert data == f.read()
+
+
+def test_spooled_upload_is_removed_with_blob(data_store, tmp_path):
+    id_ = data_store.put_upload(_upload(data_store, b"x" * 2000))
+    assert 1 == len(list(tmp_path.iterdir()))
+
+    data_store.remove(id_)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_close_removes_temporary_files():
+    data_store = DataStore(spool_threshold=1024)
+    data_store.put(b"x" * 2000)
+    data_store.start_range_upload(2000, hashlib.sha256(b"y" * 2000).hexdigest(), 1000).write(
+        0, b"y" * 1000, hashlib.sha256(b"y" * 1000).hexdigest()
+    )
+    data_store.create_chunked_array((10,), np.uint8)
+    assert len(list(data_store.spool_dir.iterdir())) == 3
+
+    data_store.close()
+
+    assert not data_store.spool_dir.exists()
+
+
+def test_truncated_upload_is_discarded(data_store, tmp_path):
+    upload = data_store.create_upload(4000)
+    upload.write(b"x" * 2000)
+
+    with pytest.raises(RuntimeError):
+        data_store.put_upload(upload)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_writing_past_announced_size_raises(data_store):
+    upload = data_store.create_upload(10)
+    upload.write(b"x" * 6)
+
+    with pytest.raises(ValueError):
+        upload.write(b"x" * 6)
+
+
+def test_blobs_are_addressed_by_content(data_store, tmp_path):
+    data = b"x" * 2000
+
+    id_ = data_store.put_upload(_upload(data_store, data))
+
+    assert hashlib.sha256(data).hexdigest() == id_
+    assert id_ == data_store.put(data)
+    assert (id_, 2000) == data_store.stat(id_)
+    assert 1 == len(list(tmp_path.iterdir()))
+    assert data_store.stat("unknown") is None
+
+
+def test_persistent_store_survives_restart(tmp_path):
+    data_store = DataStore(spool_threshold=1024, root=tmp_path)
+    small_id = data_store.put(b"small")
+    big_id = data_store.put_upload(_upload(data_store, b"x" * 2000))
+    removed_id = data_store.put(b"removed")
+    data_store.remove(removed_id)
+
+    data_store = DataStore(spool_threshold=1024, root=tmp_path)
+
+    assert b"small" == data_store.get(small_id)
+    assert b"x" * 2000 == data_store.get(big_id)
+    assert data_store.stat(removed_id) is None
+
+
+def test_blobs_not_matching_index_are_dropped(tmp_path):
+    data_store = DataStore(root=tmp_path)
+    missing_id = data_store.put(b"missing")
+    corrupted_id = data_store.put(b"corrupted")
+    kept_id = data_store.put(b"kept")
+
+    (tmp_path / "blobs" / missing_id).unlink()
+    (tmp_path / "blobs" / corrupted_id).write_bytes(b"short")
+    (tmp_path / "blobs" / "orphan").write_bytes(b"orphan")
+
+    data_store = DataStore(root=tmp_path)
+
+    assert data_store.stat(missing_id) is None
+    assert data_store.stat(corrupted_id) is None
+    assert b"kept" == data_store.get(kept_id)
+    assert [kept_id] == [p.name for p in (tmp_path / "blobs").iterdir()]
+
+
+def _npy(array):
+    buf = io.BytesIO()
+    np.save(buf, array)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("spooled", [False, True])
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_open_array(tmp_path, spooled, order):
+    data_store = DataStore(spool_threshold=1024 if spooled else 2**20, spool_dir=tmp_path)
+    array = np.asarray(np.arange(3 * 40 * 50, dtype=np.float32).reshape(3, 40, 50), order=order)
+    id_ = data_store.put(_npy(array))
+
+    opened = data_store.open_array(id_)
+
+    assert isinstance(opened, np.memmap) == spooled
+    assert not opened.flags.writeable
+    np.testing.assert_array_equal(array, opened)
+
+
+@pytest.mark.parametrize("data", [b"not an array", _npy(np.array([None, 1]))])
+def test_open_array_refuses_other_data(data_store, data):
+    id_ = data_store.put(data)
+
+    with pytest.raises(ValueError):
+        data_store.open_array(id_)
+
+
+def test_chunked_arrays(tmp_path):
+    data_store = DataStore(root=tmp_path)
+    id_ = data_store.create_chunked_array((4, 10), np.uint16, (2, 4), compression="zlib")
+    data_store.get_chunked_array(id_)[1:3, 2:9] = 5
+    removed_id = data_store.create_chunked_array((4, 10), np.uint16)
+    data_store.remove(removed_id)
+
+    data_store = DataStore(root=tmp_path)
+
+    expected = np.zeros((4, 10), dtype=np.uint16)
+    expected[1:3, 2:9] = 5
+    np.testing.assert_array_equal(expected, data_store.get_chunked_array(id_)[:])
+    assert data_store.get_chunked_array(removed_id) is None
+    assert data_store.stat(id_) is None
+    assert 4 * 10 * 2 == data_store.usage().size
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestRangeUpload:
+    DATA = bytes(range(256)) * 10
+
+    def test_chunks_in_any_order(self, data_store):
+        upload = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 1000)
+        for offset in [2000, 0, 1000]:
+            chunk = self.DATA[offset : offset + 1000]
+            upload.write(offset, chunk, _sha256(chunk))
+
+        assert self.DATA == data_store.get(data_store.finish_range_upload(upload))
+        assert data_store.get_range_upload(upload.sha256) is None
+
+    def test_resume(self, data_store):
+        upload = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 1000)
+        upload.write(2000, self.DATA[2000:], _sha256(self.DATA[2000:]))
+        upload.write(0, self.DATA[:1000], _sha256(self.DATA[:1000]))
+
+        resumed = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 500)
+
+        assert upload is resumed
+        assert [(0, 1000), (2000, 2560)] == resumed.received()
+        with pytest.raises(RuntimeError):
+            data_store.finish_range_upload(upload)
+        assert upload is data_store.get_range_upload(upload.sha256)
+
+    @pytest.mark.parametrize("offset, chunk", [(500, b"x" * 1000), (1000, b"x" * 999), (3000, b"x")])
+    def test_chunks_not_matching_layout_are_refused(self, data_store, offset, chunk):
+        upload = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 1000)
+
+        with pytest.raises(ValueError):
+            upload.write(offset, chunk, _sha256(chunk))
+
+    def test_chunk_not_matching_sha256_is_refused(self, data_store):
+        upload = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 1000)
+
+        with pytest.raises(ChecksumError):
+            upload.write(0, self.DATA[:1000], _sha256(b"other"))
+
+        assert not upload.received()
+
+    def test_data_not_matching_sha256_is_discarded(self, data_store, tmp_path):
+        upload = data_store.start_range_upload(len(self.DATA), _sha256(b"other"), 2000)
+        upload.write(0, self.DATA[:2000], _sha256(self.DATA[:2000]))
+        upload.write(2000, self.DATA[2000:], _sha256(self.DATA[2000:]))
+
+        with pytest.raises(ChecksumError):
+            data_store.finish_range_upload(upload)
+
+        assert data_store.get_range_upload(upload.sha256) is None
+        assert not list(tmp_path.iterdir())
+
+    def test_abandoned_upload_expires(self, tmp_path):
+        data_store = DataStore(spool_dir=tmp_path, upload_ttl=0.2)
+        abandoned = data_store.start_range_upload(len(self.DATA), _sha256(self.DATA), 1000)
+        abandoned.write(0, self.DATA[:1000], _sha256(self.DATA[:1000]))
+        active = data_store.start_range_upload(len(self.DATA), _sha256(b"other"), 1000)
+
+        time.sleep(0.15)
+        active.write(0, self.DATA[:1000], _sha256(self.DATA[:1000]))
+        time.sleep(0.1)
+
+        assert data_store.get_range_upload(abandoned.sha256) is None
+        assert active is data_store.get_range_upload(active.sha256)
+        assert 1 == len(list(tmp_path.iterdir()))
+        with pytest.raises(RuntimeError):
+            abandoned.write(1000, self.DATA[1000:2000], _sha256(self.DATA[1000:2000]))
+
+    def test_sha256_should_be_hex_encoded(self, data_store):
+        with pytest.raises(ValueError):
+            data_store.start_range_upload(10, "../escape", 1000)
+
+
+class TestLimits:
+    def test_least_recently_used_blobs_are_evicted(self):
+        data_store = DataStore(quota=3000)
+        ids = [data_store.put(bytes([i]) * 1000) for i in range(3)]
+        data_store.get(ids[0])
+
+        new_id = data_store.put(b"x" * 1500)
+
+        assert [ids[0], new_id] == [id_ for id_ in ids + [new_id] if data_store.stat(id_)]
+        assert 2 == data_store.usage().evicted
+
+    def test_announced_uploads_dont_evict_blobs(self):
+        data_store = DataStore(quota=300)
+        ids = [data_store.put(bytes([i]) * 100) for i in range(3)]
+
+        duplicate = data_store.create_upload(100)
+        duplicate.write(bytes([1]) * 100)
+        assert ids[1] == data_store.put_upload(duplicate)
+        data_store.create_upload(300).discard()
+        data_store.start_range_upload(300, hashlib.sha256(b"abandoned").hexdigest(), 100)
+
+        assert all(data_store.stat(id_) for id_ in ids)
+        assert 0 == data_store.usage().evicted
+
+    def test_pinned_blobs_are_not_evicted(self):
+        data_store = DataStore(quota=3000)
+        pinned_id = data_store.put(b"p" * 2000)
+        data_store.pin(pinned_id)
+        other_id = data_store.put(b"o" * 1000)
+
+        with pytest.raises(QuotaExceeded):
+            data_store.create_upload(1001)
+
+        data_store.put(b"x" * 1000)
+        assert data_store.stat(pinned_id)
+        assert not data_store.stat(other_id)
+
+        data_store.unpin(pinned_id)
+        data_store.put(b"y" * 2500)
+        assert not data_store.stat(pinned_id)
+
+    def test_unused_blobs_expire(self):
+        data_store = DataStore(ttl=0.1)
+        expiring_id = data_store.put(b"expiring")
+        pinned_id = data_store.put(b"pinned")
+        data_store.pin(pinned_id)
+        kept_id = data_store.put(b"kept", ttl=60)
+
+        time.sleep(0.2)
+
+        assert data_store.stat(expiring_id) is None
+        assert data_store.stat(pinned_id)
+        assert data_store.stat(kept_id)
+
+        data_store.unpin(pinned_id)
+        time.sleep(0.2)
+        assert data_store.stat(pinned_id) is None
+
+    def test_chunked_arrays_count_towards_quota(self):
+        data_store = DataStore(quota=3000)
+        blob_id = data_store.put(b"b" * 1000)
+        data_store.create_chunked_array((10, 100), np.uint8)
+
+        with pytest.raises(QuotaExceeded):
+            data_store.create_chunked_array((11, 100), np.uint16)
+
+        data_store.create_chunked_array((12, 100), np.uint8)
+        assert data_store.stat(blob_id) is None
+        assert 2200 == data_store.usage().size
+
+    def test_unused_chunked_arrays_expire(self):
+        data_store = DataStore(ttl=0.1)
+        expiring_id = data_store.create_chunked_array((4, 4), np.uint8)
+        pinned_id = data_store.create_chunked_array((4, 4), np.uint8)
+        data_store.pin(pinned_id)
+        path = data_store.get_chunked_array(expiring_id).path
+
+        time.sleep(0.2)
+
+        assert data_store.get_chunked_array(expiring_id) is None
+        assert not path.exists()
+        assert data_store.get_chunked_array(pinned_id) is not None
+
+        data_store.unpin(pinned_id)
+        time.sleep(0.2)
+        assert data_store.get_chunked_array(pinned_id) is None
+        assert 2 == data_store.usage().expired
+
+    def test_usage(self):
+        data_store = DataStore(quota=100)
+        pinned_id = data_store.put(b"x" * 10)
+        data_store.put(b"y" * 20)
+        data_store.pin(pinned_id)
+        data_store.pin(pinned_id)
+        data_store.unpin(pinned_id)
+
+        assert (2, 30, 10, 100, 0, 0) == data_store.usage()
+
+    def test_persistent_store_keeps_ttl_and_use_order(self, tmp_path):
+        data_store = DataStore(root=tmp_path, quota=2000)
+        first_id = data_store.put(b"1" * 1000, ttl=60)
+        second_id = data_store.put(b"2" * 1000)
+        data_store.pin(first_id)
+
+        data_store = DataStore(root=tmp_path, quota=2000, ttl=0.1)
+        third_id = data_store.put(b"3" * 1000)
+        time.sleep(0.2)
+
+        assert data_store.stat(first_id)
+        assert data_store.stat(second_id) is None
+        assert data_store.stat(third_id) is None
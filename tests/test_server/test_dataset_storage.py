@@ -0,0 +1,133 @@
+import time
+
+import numpy as np
+import pytest
+
+from tiktorch.server.dataset_storage import InMemoryStorage, MmapArena
+
+
+@pytest.fixture
+def arena(tmp_path):
+    arena = MmapArena(tmp_path / "arena", chunk_size=4096)
+    yield arena
+    arena.close()
+
+
+def _arrays(value, shape=(8, 8)):
+    return np.full(shape, value, dtype=np.float32), np.full(shape, value, dtype=np.uint8)
+
+
+def test_stored_arrays_are_returned(arena):
+    raw = np.arange(12, dtype=np.float64).reshape(3, 4)
+    label = np.ones((3, 4), dtype=bool)
+    key = arena.put((raw, label))
+
+    ret_raw, ret_label = arena.get(key)
+
+    assert np.array_equal(raw, ret_raw)
+    assert np.array_equal(label, ret_label)
+    assert ret_raw.dtype == raw.dtype and ret_label.dtype == label.dtype
+
+
+def test_arrays_are_kept_across_release_put_and_compaction(arena):
+    keys = [arena.put(_arrays(i)) for i in range(20)]
+    held = arena.get(keys[2])
+    arena.release(keys[2])
+
+    arena.put(_arrays(100))
+    arena.compact()
+    for i in range(20):
+        arena.put(_arrays(200 + i))
+
+    assert np.all(held[0] == 2) and np.all(held[1] == 2)
+    assert not any(np.shares_memory(a, b) for a in held for b in arena.get(keys[3]))
+
+
+def test_released_entries_are_readable_until_compaction(arena):
+    key = arena.put(_arrays(3))
+    arena.release(key)
+
+    assert np.all(arena.get(key)[0] == 3)
+
+    arena.compact()
+
+    assert key not in arena
+    with pytest.raises(KeyError):
+        arena.get(key)
+
+
+def test_compaction_reuses_space_of_released_entries(arena):
+    keys = [arena.put(_arrays(i)) for i in range(20)]
+    num_chunks = arena.num_chunks
+
+    for key in keys[::2]:
+        arena.release(key)
+    arena.compact()
+
+    for i in range(10):
+        arena.put(_arrays(100 + i))
+
+    assert num_chunks == arena.num_chunks
+    for i, key in enumerate(keys[1::2]):
+        assert np.all(arena.get(key)[0] == 2 * i + 1)
+
+
+def test_compaction_removes_sparse_chunks(arena):
+    keys = [arena.put(_arrays(i)) for i in range(40)]
+    assert arena.num_chunks > 2
+
+    kept = keys[::10]
+    for key in keys:
+        if key not in kept:
+            arena.release(key)
+
+    arrays_before = arena.get(kept[1])
+    assert arena.compact() > 0
+
+    assert 1 == arena.num_chunks
+    assert not arena.released_bytes
+    for key in kept:
+        assert np.all(arena.get(key)[1] == key)
+    # arrays handed out before compaction stay valid
+    assert np.all(arrays_before[0] == 10)
+
+
+def test_entries_larger_than_chunk(arena):
+    key = arena.put((np.ones((64, 64), dtype=np.float64),))
+
+    assert (64, 64) == arena.get(key)[0].shape
+
+    arena.release(key)
+    arena.compact()
+    assert 0 == arena.num_chunks
+
+
+def test_background_compaction(tmp_path):
+    arena = MmapArena(tmp_path / "arena", chunk_size=4096, compact_interval=0.01)
+    try:
+        key = arena.put(_arrays(1))
+        arena.release(key)
+
+        deadline = time.monotonic() + 2
+        while key in arena and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert key not in arena
+    finally:
+        arena.close()
+
+
+def test_close_removes_chunk_files(tmp_path):
+    arena = MmapArena(tmp_path / "arena", chunk_size=4096)
+    arena.put(_arrays(1))
+    arena.close()
+
+    assert not list((tmp_path / "arena").iterdir())
+
+
+def test_in_memory_storage_replaces_in_place():
+    storage = InMemoryStorage()
+    key = storage.put(_arrays(1))
+
+    assert key == storage.replace(key, _arrays(2))
+    assert np.all(storage.get(key)[0] == 2)
@@ -1,4 +1,5 @@
 import math
+import threading
 from collections import Counter
 
 import numpy as np
@@ -7,6 +8,7 @@
 
 from tiktorch import tiktypes as types
 from tiktorch.server import datasets
+from tiktorch.server.dataset_storage import MmapArena
 
 
 class TestDynamicDataset:
@@ -91,6 +93,29 @@ def test_access_by_index_to_deleted_element_is_allowed(self, dataset):
 
         assert dataset[0]
 
+    def test_sparse_labels_are_densified_on_access(self, dataset):
+        label = np.zeros((3, 3), dtype=np.uint8)
+        label[1, 2] = 2
+        labels = types.TikTensorBatch([types.SparseTikTensor(label, id_=(0, 0))])
+        data = types.TikTensorBatch([types.TikTensor(np.ones(shape=(3, 3)), id_=(0, 0))])
+        dataset.update(data, labels)
+
+        ret_data, ret_label = dataset[0]
+
+        assert torch.equal(torch.ones(3, 3), ret_data)
+        assert torch.equal(torch.from_numpy(label).float(), ret_label)
+
+    def test_sparse_label_can_be_replaced_by_dense_label(self, dataset):
+        label = np.zeros((3, 3), dtype=np.uint8)
+        label[0, 1] = 1
+        data = types.TikTensorBatch([types.TikTensor(np.ones(shape=(3, 3)), id_=(0, 0))])
+        dataset.update(data, types.TikTensorBatch([types.SparseTikTensor(label, id_=(0, 0))]))
+
+        dataset.update(data, types.TikTensorBatch([types.TikTensor(np.full((3, 3), 2.0), id_=(0, 0))]))
+
+        _, ret_label = dataset[0]
+        assert torch.equal(torch.full((3, 3), 2.0), ret_label)
+
     def test_initial_get_weights(self, simple_dataset):
         expected = torch.DoubleTensor([1.0, 1.0])
         assert torch.equal(expected, simple_dataset.get_weights())
@@ -106,6 +131,126 @@ def test_access_by_index_changes_weight(self, simple_dataset):
         weights = simple_dataset.get_weights().tolist()
         assert [0.81, 1.0] == weights
 
+    def test_sample_indices_skips_removed_entries(self, simple_dataset):
+        simple_dataset.remove((0, 0))
+
+        assert set(simple_dataset.sample_indices(100).tolist()) == {1}
+
+    def test_sample_indices_of_empty_dataset_raises(self, dataset):
+        with pytest.raises(datasets.EmptyDataset):
+            dataset.sample_indices(1)
+
+    def test_weights_are_kept_when_growing(self, dataset):
+        num_samples = 3000
+        tensors = types.TikTensorBatch([types.TikTensor(np.ones(shape=(1,)), id_=(i,)) for i in range(num_samples)])
+        dataset.update(tensors, tensors)
+        _ = dataset[0]
+
+        weights = dataset.get_weights()
+        assert num_samples == len(weights)
+        assert math.isclose(0.9, weights[0])
+        assert math.isclose(num_samples - 0.1, float(weights.sum()))
+
+
+class TestArenaBackedDynamicDataset:
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        dataset = datasets.DynamicDataset(storage=MmapArena(tmp_path, chunk_size=4096))
+        yield dataset
+        dataset.close()
+
+    @staticmethod
+    def _batch(*ids, value=1.0):
+        return types.TikTensorBatch([types.TikTensor(np.full((3, 3), value), id_=id_) for id_ in ids])
+
+    def test_access_by_index(self, dataset):
+        dataset.update(self._batch((0, 0), value=2.0), self._batch((0, 0), value=3.0))
+        data, label = dataset[0]
+
+        assert torch.equal(torch.full((3, 3), 2.0), data)
+        assert torch.equal(torch.full((3, 3), 3.0), label)
+
+    def test_updating_entry_replaces_data(self, dataset):
+        dataset.update(self._batch((0, 0), value=2.0), self._batch((0, 0)))
+        dataset.update(self._batch((0, 0), value=5.0), self._batch((0, 0)))
+        dataset._storage.compact()
+
+        assert 1 == len(dataset)
+        assert torch.equal(torch.full((3, 3), 5.0), dataset[0][0])
+
+    def test_accessing_reclaimed_entry_raises(self, dataset):
+        dataset.update(self._batch((0, 0)), self._batch((0, 0)))
+        dataset.remove((0, 0))
+        assert dataset[0]
+
+        dataset._storage.compact()
+
+        with pytest.raises(datasets.EntryRemoved):
+            dataset[0]
+
+    def test_slots_of_reclaimed_entries_are_reused(self, dataset):
+        dataset.update(self._batch((0, 0), (1, 0)), self._batch((0, 0), (1, 0)))
+        dataset.remove((0, 0))
+        dataset._storage.compact()
+
+        dataset.update(self._batch((2, 0), value=7.0), self._batch((2, 0)))
+
+        assert 2 == len(dataset)
+        assert 2 == len(dataset.get_weights())
+        assert torch.equal(torch.full((3, 3), 7.0), dataset[0][0])
+
+        dataset.update(self._batch((0, 0), value=9.0), self._batch((0, 0)))
+        assert 3 == len(dataset)
+        assert torch.equal(torch.full((3, 3), 9.0), dataset[2][0])
+
+    def test_saved_entries_are_loaded(self, dataset, tmp_path):
+        dataset.update(self._batch((0, 0), (1, 0), value=2.0), self._batch((0, 0), (1, 0)))
+        label = np.zeros((3, 3), dtype=np.uint8)
+        label[1, 2] = 5
+        dataset.update(self._batch((2, 0), value=4.0), types.TikTensorBatch([types.SparseTikTensor(label, id_=(2, 0))]))
+        dataset.remove((1, 0))
+        assert dataset[0]
+        dataset.save(tmp_path / "saved")
+
+        loaded = datasets.DynamicDataset()
+        loaded.load(tmp_path / "saved")
+
+        assert 2 == len(loaded)
+        assert np.allclose(dataset.get_weights()[[0, 2]], loaded.get_weights())
+        assert torch.equal(torch.full((3, 3), 2.0), loaded[0][0])
+        assert torch.equal(torch.full((3, 3), 4.0), loaded[1][0])
+        assert torch.equal(torch.from_numpy(label).float(), loaded[1][1])
+
+
+class TestSumTree:
+    def test_sampling_distribution(self):
+        tree = datasets._SumTree(capacity=4)
+        for weight in [0.1, 0.0, 0.2, 0.7]:
+            tree.append(weight)
+
+        num_samples = 100_000
+        counts = np.bincount(tree.sample(num_samples), minlength=4) / num_samples
+
+        assert 0 == counts[1]
+        assert np.allclose([0.1, 0.0, 0.2, 0.7], counts, atol=0.01)
+
+    def test_updating_weight_updates_total(self):
+        tree = datasets._SumTree(capacity=2)
+        for _ in range(5):
+            tree.append(1.0)
+
+        tree[3] = 4.0
+
+        assert 8.0 == tree.total
+        assert [1.0, 1.0, 1.0, 4.0, 1.0] == tree.weights.tolist()
+
+    def test_sampling_with_zero_total_raises(self):
+        tree = datasets._SumTree()
+        tree.append(0.0)
+
+        with pytest.raises(datasets.EmptyDataset):
+            tree.sample(1)
+
 
 class TestDynamicWeightedRandomSampler:
     class DatasetStub:
@@ -143,3 +288,98 @@ def test_distribution(self):
         assert math.isclose(0.7, norm_2, abs_tol=0.01)
         assert math.isclose(0.2, norm_1, abs_tol=0.01)
         assert math.isclose(0.1, norm_0, abs_tol=0.01)
+
+
+class TestPrefetchingLoader:
+    @staticmethod
+    def _batch(*ids, value=1.0):
+        return types.TikTensorBatch([types.TikTensor(np.full((3, 3), value), id_=id_) for id_ in ids])
+
+    @pytest.fixture
+    def dataset(self):
+        dataset = datasets.DynamicDataset()
+        dataset.update(self._batch((0, 0), (1, 0)), self._batch((0, 0), (1, 0)))
+        return dataset
+
+    @pytest.fixture
+    def make_loader(self):
+        loaders = []
+
+        def _make(*args, **kwargs):
+            loader = datasets.PrefetchingLoader(*args, **kwargs)
+            loaders.append(loader)
+            return loader
+
+        yield _make
+
+        for loader in loaders:
+            loader.close()
+
+    def test_returns_collated_batches(self, dataset, make_loader):
+        loader = iter(make_loader(dataset, batch_size=4))
+        data, labels = next(loader)
+
+        assert (4, 3, 3) == data.shape
+        assert (4, 3, 3) == labels.shape
+        assert torch.float == data.dtype
+
+    def test_applies_transform_in_workers(self, dataset, make_loader):
+        dataset.transform = lambda data, label: (data * 2, label)
+        data, labels = next(iter(make_loader(dataset, batch_size=2)))
+
+        assert torch.equal(torch.full((2, 3, 3), 2.0), data)
+        assert torch.equal(torch.ones(2, 3, 3), labels)
+
+    def test_staging_buffers_are_reused(self, dataset, make_loader):
+        loader = iter(make_loader(dataset, batch_size=2, num_workers=1, prefetch=1))
+        pointers = {next(loader)[0].data_ptr() for _ in range(10)}
+
+        assert len(pointers) <= 2
+
+    def test_picks_up_dataset_updates(self, make_loader):
+        dataset = datasets.DynamicDataset()
+        # single worker keeps batches in order, so at most prefetch + 1 batches drawn before update are returned
+        loader = iter(make_loader(dataset, batch_size=1, num_workers=1, prefetch=1))
+
+        dataset.update(self._batch((0, 0), value=3.0), self._batch((0, 0), value=3.0))
+        data, _ = next(loader)
+        assert torch.equal(torch.full((1, 3, 3), 3.0), data)
+
+        dataset.remove((0, 0))
+        dataset.update(self._batch((1, 0), value=5.0), self._batch((1, 0), value=5.0))
+        for _ in range(3):
+            data, _ = next(loader)
+
+        assert torch.equal(torch.full((1, 3, 3), 5.0), data)
+
+    def test_worker_errors_are_raised_to_consumer(self, dataset, make_loader):
+        def _fail(data, label):
+            raise RuntimeError("broken transform")
+
+        dataset.transform = _fail
+        loader = iter(make_loader(dataset, batch_size=1))
+
+        with pytest.raises(RuntimeError):
+            next(loader)
+
+    def test_close_stops_workers_waiting_for_data(self, make_loader):
+        loader = make_loader(datasets.DynamicDataset(), batch_size=1)
+        loader.start()
+        loader.close()
+
+    def test_get_times_out_without_data(self, make_loader):
+        loader = make_loader(datasets.DynamicDataset(), batch_size=1)
+
+        assert loader.get(timeout=0.1) is None
+
+    def test_close_stops_waiting_consumer(self, make_loader):
+        loader = make_loader(datasets.DynamicDataset(), batch_size=1)
+        batches = []
+        consumer = threading.Thread(target=lambda: batches.extend(loader))
+        consumer.start()
+
+        loader.close()
+        consumer.join(timeout=2)
+
+        assert not consumer.is_alive()
+        assert not batches
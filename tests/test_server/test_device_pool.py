@@ -0,0 +1,52 @@
+import pytest
+
+from tiktorch.server.device_pool import DeviceStatus, TorchDevicePool
+
+
+@pytest.fixture
+def device_pool():
+    return TorchDevicePool(cpu_cores=[0, 1, 2, 3])
+
+
+def _cpu(device_pool):
+    return {d.id: d for d in device_pool.list_devices()}["cpu"]
+
+
+def test_cpu_reports_cores(device_pool):
+    cpu = _cpu(device_pool)
+    assert DeviceStatus.AVAILABLE == cpu.status
+    assert 4 == cpu.total_cores
+    assert 4 == cpu.available_cores
+
+
+def test_leasing_cpu_without_core_count_leases_all_cores(device_pool):
+    lease = device_pool.lease(["cpu"])
+
+    assert [0, 1, 2, 3] == lease.cpu_cores
+    assert DeviceStatus.IN_USE == _cpu(device_pool).status
+
+    with pytest.raises(Exception):
+        device_pool.lease(["cpu"], cpu_cores=1)
+
+
+def test_leasing_cpu_cores(device_pool):
+    first = device_pool.lease(["cpu"], cpu_cores=1)
+    second = device_pool.lease(["cpu"], cpu_cores=2)
+
+    assert not set(first.cpu_cores) & set(second.cpu_cores)
+    assert 1 == _cpu(device_pool).available_cores
+    assert DeviceStatus.AVAILABLE == _cpu(device_pool).status
+
+    with pytest.raises(Exception):
+        device_pool.lease(["cpu"], cpu_cores=2)
+
+    with pytest.raises(Exception):
+        device_pool.lease(["cpu"])
+
+
+def test_terminating_lease_releases_cores(device_pool):
+    lease = device_pool.lease(["cpu"], cpu_cores=3)
+    lease.terminate()
+
+    assert 4 == _cpu(device_pool).available_cores
+    assert [] == lease.cpu_cores
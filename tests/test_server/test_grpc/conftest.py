@@ -0,0 +1,27 @@
+import pytest
+
+from tiktorch.proto import inference_pb2_grpc
+from tiktorch.server.device_pool import TorchDevicePool
+from tiktorch.server.grpc import inference_servicer
+
+
+@pytest.fixture(scope="module")
+def grpc_add_to_server():
+    return inference_pb2_grpc.add_InferenceServicer_to_server
+
+
+@pytest.fixture(scope="module")
+def grpc_servicer(session_manager, data_store):
+    return inference_servicer.InferenceServicer(
+        TorchDevicePool(), session_manager, data_store, shared_memory=True, statistics_workers=2
+    )
+
+
+@pytest.fixture(scope="module")
+def grpc_stub_cls(grpc_channel):
+    return inference_pb2_grpc.InferenceStub
+
+
+@pytest.fixture
+def session_id(session):
+    return session.id
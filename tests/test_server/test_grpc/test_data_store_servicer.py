@@ -1,6 +1,7 @@
 import hashlib
 
 import grpc
+import numpy as np
 import pytest
 
 from tiktorch.proto import data_store_pb2, data_store_pb2_grpc
@@ -63,3 +64,213 @@ def _gen():
 
         with pytest.raises(grpc.RpcError) as e:
             res = grpc_stub.Upload(_gen())
+
+    def test_calling_upload_exceeding_announced_size(self, grpc_stub):
+        def _gen():
+            yield data_store_pb2.UploadRequest(info=data_store_pb2.UploadInfo(size=6))
+            yield data_store_pb2.UploadRequest(content=b"aabbbacaaraa")
+
+        with pytest.raises(grpc.RpcError):
+            grpc_stub.Upload(_gen())
+
+
+class TestRemove:
+    def test_removed_upload_is_gone(self, grpc_stub, data_store):
+        id_ = data_store.put(b"data")
+
+        grpc_stub.Remove(data_store_pb2.RemoveRequest(uploadId=id_))
+
+        with pytest.raises(Exception):
+            data_store.get(id_)
+
+
+class TestStat:
+    def test_stat_stored_upload(self, grpc_stub, data_store):
+        id_ = data_store.put(b"data")
+
+        res = grpc_stub.Stat(data_store_pb2.StatRequest(uploadId=id_))
+
+        assert res.exists
+        assert 4 == res.size
+
+    def test_stat_unknown_upload(self, grpc_stub):
+        res = grpc_stub.Stat(data_store_pb2.StatRequest(uploadId="unknown"))
+
+        assert not res.exists
+
+
+class TestRangeUpload:
+    DATA = bytes(range(256)) * 10
+    SHA256 = hashlib.sha256(DATA).hexdigest()
+
+    def _chunk(self, offset, size=1000):
+        content = self.DATA[offset : offset + size]
+        return data_store_pb2.UploadChunk(
+            uploadId=self.SHA256, offset=offset, content=content, sha256=hashlib.sha256(content).hexdigest()
+        )
+
+    def test_upload_in_parallel_streams(self, grpc_stub, data_store):
+        status = grpc_stub.StartUpload(
+            data_store_pb2.StartUploadRequest(size=len(self.DATA), sha256=self.SHA256, chunkSize=1000)
+        )
+        assert not status.stored
+        assert not status.received
+
+        first = grpc_stub.UploadChunks.future(iter([self._chunk(0), self._chunk(1000)]))
+        second = grpc_stub.UploadChunks.future(iter([self._chunk(2000)]))
+        first.result(), second.result()
+
+        status = grpc_stub.GetUploadStatus(data_store_pb2.UploadStatusRequest(uploadId=self.SHA256))
+        assert [(0, len(self.DATA))] == [(r.offset, r.size) for r in status.received]
+
+        for _ in range(2):
+            res = grpc_stub.FinishUpload(data_store_pb2.FinishUploadRequest(uploadId=self.SHA256))
+            assert self.SHA256 == res.id
+            assert self.DATA == data_store.get(res.id)
+
+        status = grpc_stub.StartUpload(
+            data_store_pb2.StartUploadRequest(size=len(self.DATA), sha256=self.SHA256, chunkSize=1000)
+        )
+        assert status.stored
+        data_store.remove(self.SHA256)
+
+    def test_corrupted_chunk(self, grpc_stub, data_store):
+        grpc_stub.StartUpload(
+            data_store_pb2.StartUploadRequest(size=len(self.DATA), sha256=self.SHA256, chunkSize=1000)
+        )
+        chunk = self._chunk(1000)
+        chunk.content = b"x" * 1000
+
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.UploadChunks(iter([self._chunk(0), chunk]))
+
+        assert grpc.StatusCode.DATA_LOSS == e.value.code()
+        status = grpc_stub.GetUploadStatus(data_store_pb2.UploadStatusRequest(uploadId=self.SHA256))
+        assert [(0, 1000)] == [(r.offset, r.size) for r in status.received]
+
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.FinishUpload(data_store_pb2.FinishUploadRequest(uploadId=self.SHA256))
+        assert grpc.StatusCode.FAILED_PRECONDITION == e.value.code()
+
+    def test_unknown_upload(self, grpc_stub):
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.GetUploadStatus(data_store_pb2.UploadStatusRequest(uploadId="unknown"))
+
+        assert grpc.StatusCode.NOT_FOUND == e.value.code()
+
+
+class TestUsage:
+    def test_get_usage(self, grpc_stub, data_store):
+        id_ = data_store.put(b"usage")
+        data_store.pin(id_)
+
+        res = grpc_stub.GetUsage(data_store_pb2.UsageRequest())
+
+        data_store.unpin(id_)
+        data_store.remove(id_)
+        assert 5 <= res.pinnedSize <= res.size
+        assert not res.quota
+
+    def test_upload_exceeding_quota(self):
+        servicer = data_store_servicer.DataStoreServicer(DataStore(quota=10))
+
+        class _Context:
+            def abort(self, code, details):
+                raise grpc.RpcError(code)
+
+        requests = [data_store_pb2.UploadRequest(info=data_store_pb2.UploadInfo(size=11))]
+        with pytest.raises(grpc.RpcError) as e:
+            servicer.Upload(iter(requests), _Context())
+
+        assert (grpc.StatusCode.FAILED_PRECONDITION,) == e.value.args
+
+
+class TestDownload:
+    DATA = bytes(range(256)) * 40
+
+    @pytest.fixture
+    def upload_id(self, data_store, monkeypatch):
+        monkeypatch.setattr(data_store_servicer, "DOWNLOAD_CHUNK_SIZE", 1000)
+        id_ = data_store.put(self.DATA)
+        yield id_
+        data_store.remove(id_)
+
+    @pytest.mark.parametrize("offset, length", [(0, 0), (0, len(DATA)), (500, 2000), (10000, 0), (10239, 10)])
+    def test_download(self, grpc_stub, upload_id, offset, length):
+        chunks = list(
+            grpc_stub.Download(data_store_pb2.DownloadRequest(uploadId=upload_id, offset=offset, length=length))
+        )
+
+        end = len(self.DATA) if not length else offset + length
+        assert self.DATA[offset:end] == b"".join(c.content for c in chunks)
+        assert all(len(c.content) <= 1000 for c in chunks)
+        assert [offset + 1000 * i for i in range(len(chunks))] == [c.offset for c in chunks]
+        assert {len(self.DATA)} == {c.size for c in chunks}
+
+    def test_download_spooled_blob(self, tmp_path):
+        data_store = DataStore(spool_threshold=100, spool_dir=tmp_path)
+        id_ = data_store.put(self.DATA)
+        servicer = data_store_servicer.DataStoreServicer(data_store)
+
+        chunks = servicer.Download(data_store_pb2.DownloadRequest(uploadId=id_, offset=10), None)
+
+        assert self.DATA[10:] == b"".join(c.content for c in chunks)
+
+    def test_offset_past_end(self, grpc_stub, upload_id):
+        with pytest.raises(grpc.RpcError) as e:
+            list(grpc_stub.Download(data_store_pb2.DownloadRequest(uploadId=upload_id, offset=len(self.DATA) + 1)))
+
+        assert grpc.StatusCode.OUT_OF_RANGE == e.value.code()
+
+    def test_unknown_upload(self, grpc_stub):
+        with pytest.raises(grpc.RpcError) as e:
+            list(grpc_stub.Download(data_store_pb2.DownloadRequest(uploadId="unknown")))
+
+        assert grpc.StatusCode.NOT_FOUND == e.value.code()
+
+
+class TestChunkedArray:
+    def test_write_and_download(self, grpc_stub, data_store):
+        info = grpc_stub.CreateArray(
+            data_store_pb2.CreateArrayRequest(shape=[10, 7], dtype="int16", chunks=[4, 4], compression="zlib")
+        )
+        assert [10, 7] == info.shape
+        assert "int16" == info.dtype
+        assert info == grpc_stub.GetArrayInfo(data_store_pb2.ArrayInfoRequest(arrayId=info.arrayId))
+
+        data = np.arange(24, dtype=np.int16).reshape(4, 6)
+        region = data_store_pb2.ArrayRegion(arrayId=info.arrayId, start=[3, 1], shape=[4, 6], content=data.tobytes())
+        grpc_stub.WriteArray(iter([region]))
+
+        chunks = list(grpc_stub.DownloadArray(data_store_pb2.DownloadArrayRequest(arrayId=info.arrayId, firstChunk=1)))
+
+        assert [1, 2, 3, 4, 5] == [c.chunk for c in chunks]
+        assert [[0, 4], [4, 0], [4, 4], [8, 0], [8, 4]] == [c.start for c in chunks]
+        assert [[4, 3], [4, 4], [4, 3], [2, 4], [2, 3]] == [c.shape for c in chunks]
+        expected = np.zeros((10, 7), dtype=np.int16)
+        expected[3:7, 1:7] = data
+        np.testing.assert_array_equal(expected[4:8, 4:7], np.frombuffer(chunks[2].content, np.int16).reshape(4, 3))
+        np.testing.assert_array_equal(expected, data_store.get_chunked_array(info.arrayId)[:])
+
+    @pytest.mark.parametrize("rq", [dict(shape=[10], dtype="nonsense"), dict(shape=[10], dtype="uint8", chunks=[1, 1])])
+    def test_invalid_array(self, grpc_stub, rq):
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.CreateArray(data_store_pb2.CreateArrayRequest(**rq))
+
+        assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+    def test_region_outside_of_array(self, grpc_stub):
+        info = grpc_stub.CreateArray(data_store_pb2.CreateArrayRequest(shape=[10], dtype="uint8"))
+
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.WriteArray(
+                iter([data_store_pb2.ArrayRegion(arrayId=info.arrayId, start=[8], shape=[4], content=bytes(4))])
+            )
+
+        assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+    def test_unknown_array(self, grpc_stub):
+        with pytest.raises(grpc.RpcError) as e:
+            list(grpc_stub.DownloadArray(data_store_pb2.DownloadArrayRequest(arrayId="unknown")))
+
+        assert grpc.StatusCode.NOT_FOUND == e.value.code()
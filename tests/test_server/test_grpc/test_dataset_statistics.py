@@ -0,0 +1,126 @@
+import grpc
+import numpy as np
+import pytest
+
+from tests.test_server.conftest import npy
+from tiktorch import converters
+from tiktorch.proto import inference_pb2
+
+
+def _assert_statistics(data, statistics):
+    assert data.size == statistics.count
+    np.testing.assert_allclose(data.mean(dtype=np.float64), statistics.mean)
+    np.testing.assert_allclose(data.var(dtype=np.float64), statistics.variance)
+    assert [data.min(), data.max()] == [statistics.min, statistics.max]
+
+
+def test_statistics_of_upload(grpc_stub, session, data_store):
+    data = np.random.randint(0, 4096, (3, 200, 100)).astype(np.uint16)
+    volume_id = data_store.put(npy(data))
+
+    res = grpc_stub.ComputeDatasetStatistics(
+        inference_pb2.DatasetStatisticsRequest(
+            modelSessionId=session.id, volumeId=volume_id, percentiles=[1, 99], histogramBins=16
+        )
+    )
+
+    _assert_statistics(data, res.statistics)
+    assert [1, 99] == list(res.statistics.percentiles)
+    np.testing.assert_allclose(np.percentile(data, [1, 99]), res.statistics.percentileValues, rtol=0.02)
+    assert data.size == sum(res.statistics.histogram)
+    assert 17 == len(res.statistics.histogramEdges)
+    description = session.model_session.datasets[res.id]
+    assert res.statistics.mean == description["mean"]
+    np.testing.assert_allclose(data.std(), description["stddev"])
+    assert 0 == data_store.usage().pinned_size
+
+
+def test_statistics_of_chunked_array(grpc_stub, session, data_store):
+    data = np.random.rand(2, 30, 20).astype(np.float32)
+    volume_id = data_store.create_chunked_array(data.shape, data.dtype, (1, 8, 8))
+    data_store.get_chunked_array(volume_id)[:] = data
+
+    res = grpc_stub.ComputeDatasetStatistics(
+        inference_pb2.DatasetStatisticsRequest(modelSessionId=session.id, volumeId=volume_id)
+    )
+
+    _assert_statistics(data, res.statistics)
+    assert not res.statistics.histogram
+
+
+def test_statistics_of_stream(grpc_stub, session):
+    arrays = [np.random.randint(0, 255, (1, 16, 16)).astype(np.uint8) for _ in range(10)]
+    requests = [inference_pb2.DatasetStatisticsRequest(modelSessionId=session.id, percentiles=[50])] + [
+        inference_pb2.DatasetStatisticsRequest(tensor=converters.numpy_to_pb_tensor(arr)) for arr in arrays
+    ]
+
+    res = grpc_stub.ComputeStreamStatistics(iter(requests))
+
+    _assert_statistics(np.concatenate(arrays), res.statistics)
+    assert 1 == len(res.statistics.percentileValues)
+
+
+def test_statistics_are_kept_in_description(grpc_stub, session, data_store):
+    volume_id = data_store.put(npy(np.arange(100, dtype=np.uint8)))
+    res = grpc_stub.ComputeDatasetStatistics(
+        inference_pb2.DatasetStatisticsRequest(modelSessionId=session.id, volumeId=volume_id, percentiles=[50])
+    )
+
+    description = grpc_stub.GetDatasetDescription(
+        inference_pb2.DatasetDescriptionRequest(modelSessionId=session.id, id=res.id)
+    )
+
+    assert res == description
+
+
+def test_description_without_statistics(grpc_stub, session):
+    res = grpc_stub.CreateDatasetDescription(
+        inference_pb2.CreateDatasetDescriptionRequest(modelSessionId=session.id, mean=1.0, stddev=2.0)
+    )
+
+    description = grpc_stub.GetDatasetDescription(
+        inference_pb2.DatasetDescriptionRequest(modelSessionId=session.id, id=res.id)
+    )
+
+    assert res.id == description.id
+    assert not description.HasField("statistics")
+
+
+def test_constant_volume_is_only_shifted(grpc_stub, session, data_store):
+    volume_id = data_store.put(npy(np.full((1, 10, 10), 7, dtype=np.uint8)))
+
+    res = grpc_stub.ComputeDatasetStatistics(
+        inference_pb2.DatasetStatisticsRequest(modelSessionId=session.id, volumeId=volume_id)
+    )
+
+    description = session.model_session.datasets[res.id]
+    assert 0 == res.statistics.variance
+    assert (7.0, 1.0) == (description["mean"], description["stddev"])
+
+
+@pytest.mark.parametrize(
+    "data, percentiles, code",
+    [
+        (np.zeros(3), [101], grpc.StatusCode.INVALID_ARGUMENT),
+        (np.full(3, np.nan), [], grpc.StatusCode.INVALID_ARGUMENT),
+        (None, [], grpc.StatusCode.NOT_FOUND),
+    ],
+)
+def test_invalid_statistics_request(grpc_stub, session, data_store, data, percentiles, code):
+    volume_id = "unknown" if data is None else data_store.put(npy(data))
+
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.ComputeDatasetStatistics(
+            inference_pb2.DatasetStatisticsRequest(
+                modelSessionId=session.id, volumeId=volume_id, percentiles=percentiles
+            )
+        )
+
+    assert code == e.value.code()
+
+
+def test_unknown_dataset_description(grpc_stub, session):
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.GetDatasetDescription(inference_pb2.DatasetDescriptionRequest(modelSessionId=session.id, id="x"))
+
+    assert grpc.StatusCode.NOT_FOUND == e.value.code()
@@ -81,6 +81,28 @@ def test_list_devices(self, grpc_stub):
         assert "cpu" in device_by_id
         assert inference_pb2.Device.Status.AVAILABLE == device_by_id["cpu"].status
 
+    def test_list_devices_reports_cpu_cores(self, grpc_stub):
+        resp = grpc_stub.ListDevices(inference_pb2.Empty())
+        cpu = {d.id: d for d in resp.devices}["cpu"]
+        assert cpu.totalCores > 0
+        assert cpu.totalCores == cpu.availableCores
+
+    def test_leasing_cpu_cores(self, grpc_stub, pybio_dummy_model_bytes):
+        total_cores = self._query_devices(grpc_stub)["cpu"].totalCores
+
+        model = grpc_stub.CreateModelSession(
+            inference_pb2.CreateModelSessionRequest(
+                model_blob=inference_pb2.Blob(content=pybio_dummy_model_bytes.getvalue()),
+                deviceIds=["cpu"],
+                cpuCores=1,
+            )
+        )
+
+        cpu = self._query_devices(grpc_stub)["cpu"]
+        assert total_cores - 1 == cpu.availableCores
+
+        grpc_stub.CloseModelSession(model)
+
     def _query_devices(self, grpc_stub):
         dev_resp = grpc_stub.ListDevices(inference_pb2.Empty())
         device_by_id = {d.id: d for d in dev_resp.devices}
@@ -164,3 +186,32 @@ def test_call_predict(self, grpc_stub, pybio_dummy_model_bytes):
         grpc_stub.CloseModelSession(model)
 
         assert_array_equal(expected, converters.pb_tensor_to_numpy(res.tensor))
+
+    def test_call_predict_normalizes_input_by_dataset(self, grpc_stub, pybio_dummy_model_bytes):
+        model = grpc_stub.CreateModelSession(valid_model_request(pybio_dummy_model_bytes))
+        dataset = grpc_stub.CreateDatasetDescription(
+            inference_pb2.CreateDatasetDescriptionRequest(modelSessionId=model.id, mean=100.0, stddev=4.0)
+        )
+
+        arr = np.arange(32 * 32, dtype=np.uint16).reshape(1, 1, 32, 32)
+        expected = (arr.astype(np.float32) - 100) / 4 + 1
+        input_tensor = converters.numpy_to_pb_tensor(arr)
+        res = grpc_stub.Predict(
+            inference_pb2.PredictRequest(modelSessionId=model.id, tensor=input_tensor, datasetId=dataset.id)
+        )
+
+        grpc_stub.CloseModelSession(model)
+
+        assert_array_equal(expected, converters.pb_tensor_to_numpy(res.tensor))
+
+    def test_dataset_description_requires_positive_stddev(self, grpc_stub, pybio_dummy_model_bytes):
+        model = grpc_stub.CreateModelSession(valid_model_request(pybio_dummy_model_bytes))
+
+        with pytest.raises(grpc.RpcError) as e:
+            grpc_stub.CreateDatasetDescription(
+                inference_pb2.CreateDatasetDescriptionRequest(modelSessionId=model.id, mean=1.0, stddev=0.0)
+            )
+
+        grpc_stub.CloseModelSession(model)
+
+        assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
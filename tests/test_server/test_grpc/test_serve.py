@@ -0,0 +1,72 @@
+import socket
+import threading
+
+import grpc
+import pytest
+
+from tiktorch.proto import inference_pb2, inference_pb2_grpc
+from tiktorch.server.grpc import serve
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "server.sock")
+
+
+def _serve_in_thread(*args, **kwargs):
+    thread = threading.Thread(target=serve, args=args, kwargs=kwargs, daemon=True)
+    thread.start()
+    return thread
+
+
+def _shutdown(target, thread):
+    with grpc.insecure_channel(target) as chan:
+        try:
+            inference_pb2_grpc.FlightControlStub(chan).Shutdown(inference_pb2.Empty())
+        except grpc.RpcError as e:
+            # server may stop before reply is sent
+            assert grpc.StatusCode.UNAVAILABLE == e.code()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+def test_serve_on_unix_socket_only(socket_path):
+    thread = _serve_in_thread("127.0.0.1", None, unix_socket=socket_path)
+    target = f"unix:{socket_path}"
+
+    with grpc.insecure_channel(target) as chan:
+        grpc.channel_ready_future(chan).result(timeout=10)
+        inference_pb2_grpc.FlightControlStub(chan).Ping(inference_pb2.Empty())
+        devices = inference_pb2_grpc.InferenceStub(chan).ListDevices(inference_pb2.Empty())
+        assert "cpu" in [d.id for d in devices.devices]
+
+    _shutdown(target, thread)
+
+
+def test_serve_on_tcp_and_unix_socket(srv_port, socket_path):
+    thread = _serve_in_thread("127.0.0.1", srv_port, unix_socket=socket_path)
+
+    for target in [f"unix:{socket_path}", f"127.0.0.1:{srv_port}"]:
+        with grpc.insecure_channel(target) as chan:
+            grpc.channel_ready_future(chan).result(timeout=10)
+            inference_pb2_grpc.FlightControlStub(chan).Ping(inference_pb2.Empty())
+
+    _shutdown(f"unix:{socket_path}", thread)
+
+
+def test_stale_socket_is_replaced_and_removed_on_shutdown(tmp_path, socket_path):
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(socket_path)
+    stale.close()
+
+    thread = _serve_in_thread("127.0.0.1", None, unix_socket=socket_path)
+    with grpc.insecure_channel(f"unix:{socket_path}") as chan:
+        grpc.channel_ready_future(chan).result(timeout=10)
+
+    _shutdown(f"unix:{socket_path}", thread)
+    assert not list(tmp_path.iterdir())
+
+
+def test_serve_requires_listener():
+    with pytest.raises(ValueError):
+        serve("127.0.0.1", None)
@@ -0,0 +1,117 @@
+import grpc
+import numpy as np
+import pytest
+
+from tiktorch import converters
+from tiktorch.proto import inference_pb2
+from tiktorch.server.data_store import DataStore
+from tiktorch.server.device_pool import TorchDevicePool
+from tiktorch.server.grpc import inference_servicer
+from tiktorch.server.session_manager import SessionManager
+from tiktorch.shared_memory import SharedSegment, numpy_to_pb_shared_tensor
+
+MODEL_SESSION_PARAMS = {"forward": lambda arr: np.concatenate([arr, arr]) * 2}
+
+
+@pytest.fixture
+def segments():
+    input_segment, output_segment = SharedSegment(4096), SharedSegment(4096)
+    yield input_segment, output_segment
+    input_segment.close()
+    output_segment.close()
+
+
+def test_predict_through_shared_memory(grpc_stub, session_id, segments):
+    input_segment, output_segment = segments
+    arr = np.arange(12, dtype=np.float32).reshape(1, 3, 4)
+    input_segment.array(arr.dtype, arr.shape)[...] = arr
+
+    res = grpc_stub.Predict(
+        inference_pb2.PredictRequest(
+            modelSessionId=session_id,
+            sharedTensor=numpy_to_pb_shared_tensor(arr, input_segment.path),
+            sharedOutput=inference_pb2.SharedTensor(path=output_segment.path, offset=64),
+        )
+    )
+
+    assert not res.HasField("tensor")
+    assert output_segment.path == res.sharedTensor.path
+    assert [2, 3, 4] == [dim.size for dim in res.sharedTensor.shape]
+    output = output_segment.array(res.sharedTensor.dtype, (2, 3, 4), offset=res.sharedTensor.offset)
+    np.testing.assert_array_equal(np.concatenate([arr, arr]) * 2, output)
+
+
+def test_output_not_fitting_into_segment_is_returned_inline(grpc_stub, session_id, segments):
+    input_segment, output_segment = segments
+    arr = np.ones((1, 32, 32), dtype=np.float64)
+
+    res = grpc_stub.Predict(
+        inference_pb2.PredictRequest(
+            modelSessionId=session_id,
+            tensor=converters.numpy_to_pb_tensor(arr),
+            sharedOutput=inference_pb2.SharedTensor(path=output_segment.path),
+        )
+    )
+
+    assert not res.HasField("sharedTensor")
+    np.testing.assert_array_equal(np.full((2, 32, 32), 2.0), converters.pb_tensor_to_numpy(res.tensor))
+
+
+def test_files_other_than_segments_are_refused(grpc_stub, session_id, tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(bytes(64))
+
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.Predict(
+            inference_pb2.PredictRequest(
+                modelSessionId=session_id,
+                sharedTensor=numpy_to_pb_shared_tensor(np.zeros(8, dtype=np.float64), str(path)),
+            )
+        )
+
+    assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+
+@pytest.mark.parametrize("dtype, shape", [("O", (8,)), ("not a dtype", (8,)), ("float64", (1024,))])
+def test_invalid_shared_tensor(grpc_stub, session_id, segments, dtype, shape):
+    input_segment, _ = segments
+    shared_tensor = numpy_to_pb_shared_tensor(np.empty(shape), input_segment.path)
+    shared_tensor.dtype = dtype
+
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.Predict(inference_pb2.PredictRequest(modelSessionId=session_id, sharedTensor=shared_tensor))
+
+    assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+
+def test_output_is_returned_inline_if_segment_is_gone(grpc_stub, session, segments):
+    _, output_segment = segments
+
+    def _forward(arr):
+        output_segment.close()
+        return np.concatenate([arr, arr]) * 2
+
+    session.model_session._forward = _forward
+
+    res = grpc_stub.Predict(
+        inference_pb2.PredictRequest(
+            modelSessionId=session.id,
+            tensor=converters.numpy_to_pb_tensor(np.ones((1, 2, 2))),
+            sharedOutput=inference_pb2.SharedTensor(path=output_segment.path),
+        )
+    )
+
+    np.testing.assert_array_equal(np.full((2, 2, 2), 2.0), converters.pb_tensor_to_numpy(res.tensor))
+
+
+def test_shared_memory_disabled(segments):
+    servicer = inference_servicer.InferenceServicer(TorchDevicePool(), SessionManager(), DataStore())
+
+    class _Context:
+        def abort(self, code, details):
+            raise grpc.RpcError(code)
+
+    with pytest.raises(grpc.RpcError) as e:
+        servicer.Predict(inference_pb2.PredictRequest(sharedOutput=inference_pb2.SharedTensor(path="x")), _Context())
+
+    assert (grpc.StatusCode.FAILED_PRECONDITION,) == e.value.args
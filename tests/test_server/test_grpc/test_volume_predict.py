@@ -0,0 +1,126 @@
+import grpc
+import numpy as np
+import pytest
+
+from tests.test_server.conftest import npy
+from tiktorch import converters
+from tiktorch.proto import inference_pb2
+from tiktorch.server.session.process import ModelInfo
+
+MODEL_SESSION_PARAMS = {
+    "model_info": ModelInfo(
+        name="identity", input_axes="cyx", output_axes="cyx", valid_shapes=[], halo=[("y", 2), ("x", 1)]
+    )
+}
+
+
+@pytest.fixture
+def volume(data_store):
+    array = np.random.rand(2, 30, 20)
+    return array, data_store.put(npy(array))
+
+
+def _predict(grpc_stub, session_id, upload_id, start, stop):
+    res = grpc_stub.Predict(
+        inference_pb2.PredictRequest(
+            modelSessionId=session_id,
+            volumeRegion=inference_pb2.VolumeRegion(uploadId=upload_id, start=start, stop=stop),
+        )
+    )
+    return converters.pb_tensor_to_numpy(res.tensor)
+
+
+def test_region_is_read_with_halo(grpc_stub, session_id, volume):
+    array, upload_id = volume
+
+    res = _predict(grpc_stub, session_id, upload_id, [0, 10, 5], [2, 20, 15])
+
+    np.testing.assert_array_equal(array[:, 8:22, 4:16], res)
+
+
+def test_halo_outside_of_volume_is_reflected(grpc_stub, session_id, volume):
+    array, upload_id = volume
+
+    res = _predict(grpc_stub, session_id, upload_id, [0, 0, 10], [2, 10, 20])
+
+    expected = np.pad(array[:, 0:12, 9:20], [(0, 0), (2, 0), (0, 1)], mode="reflect")
+    np.testing.assert_array_equal(expected, res)
+
+
+@pytest.mark.parametrize("start, stop", [([0, 0], [2, 10]), ([0, 40, 0], [2, 50, 10])])
+def test_invalid_region(grpc_stub, session_id, volume, start, stop):
+    with pytest.raises(grpc.RpcError) as e:
+        _predict(grpc_stub, session_id, volume[1], start, stop)
+
+    assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+
+def test_unknown_volume(grpc_stub, session_id):
+    with pytest.raises(grpc.RpcError) as e:
+        _predict(grpc_stub, session_id, "unknown", [0, 0, 0], [1, 1, 1])
+
+    assert grpc.StatusCode.NOT_FOUND == e.value.code()
+
+
+def test_output_is_written_to_chunked_array(grpc_stub, session_id, data_store):
+    array = np.random.rand(2, 30, 20).astype(np.float32)
+    input_id = data_store.create_chunked_array(array.shape, array.dtype, (1, 8, 8))
+    data_store.get_chunked_array(input_id)[:] = array
+    output_id = data_store.create_chunked_array(array.shape, array.dtype, (2, 16, 16), compression="zlib")
+
+    for start, stop in [([0, 0, 0], [2, 16, 16]), ([0, 16, 0], [2, 32, 16]), ([0, 0, 16], [2, 32, 32])]:
+        res = grpc_stub.Predict(
+            inference_pb2.PredictRequest(
+                modelSessionId=session_id,
+                volumeRegion=inference_pb2.VolumeRegion(uploadId=input_id, start=start, stop=stop),
+                outputArrayId=output_id,
+            )
+        )
+        assert not res.HasField("tensor")
+
+    np.testing.assert_array_equal(array, data_store.get_chunked_array(output_id)[:])
+
+
+def test_output_array_requires_volume_region(grpc_stub, session_id, data_store):
+    output_id = data_store.create_chunked_array((1, 2, 2), np.float64)
+
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.Predict(
+            inference_pb2.PredictRequest(
+                modelSessionId=session_id,
+                tensor=converters.numpy_to_pb_tensor(np.zeros((1, 2, 2))),
+                outputArrayId=output_id,
+            )
+        )
+
+    assert grpc.StatusCode.INVALID_ARGUMENT == e.value.code()
+
+
+def test_prediction_job(grpc_stub, session_id, volume, data_store):
+    array, upload_id = volume
+    tile_shape = [inference_pb2.TensorDim(name=name, size=size) for name, size in [("c", 2), ("y", 14), ("x", 12)]]
+
+    status = grpc_stub.SubmitPredictionJob(
+        inference_pb2.PredictionJobRequest(modelSessionId=session_id, volumeId=upload_id, tileShape=tile_shape)
+    )
+    statuses = list(grpc_stub.WatchJob(inference_pb2.JobRequest(jobId=status.jobId)))
+
+    assert inference_pb2.JobStatus.State.DONE == statuses[-1].state
+    assert all(s.state != inference_pb2.JobStatus.State.DONE for s in statuses[:-1])
+    assert [3 * 2] * len(statuses) == [s.tilesTotal for s in statuses]
+    assert statuses[-1] == grpc_stub.GetJobStatus(inference_pb2.JobRequest(jobId=status.jobId))
+    np.testing.assert_array_equal(array, data_store.get_chunked_array(statuses[-1].outputArrayId)[:])
+
+
+def test_unknown_job(grpc_stub):
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.GetJobStatus(inference_pb2.JobRequest(jobId="unknown"))
+
+    assert grpc.StatusCode.NOT_FOUND == e.value.code()
+
+
+def test_job_of_unknown_volume(grpc_stub, session_id):
+    with pytest.raises(grpc.RpcError) as e:
+        grpc_stub.SubmitPredictionJob(inference_pb2.PredictionJobRequest(modelSessionId=session_id, volumeId="unknown"))
+
+    assert grpc.StatusCode.NOT_FOUND == e.value.code()
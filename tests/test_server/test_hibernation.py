@@ -0,0 +1,184 @@
+import time
+
+import numpy as np
+import pytest
+
+from tiktorch import tiktypes
+from tiktorch.configkeys import TRAINING
+from tiktorch.server.device_pool import DeviceStatus, TorchDevicePool
+from tiktorch.server.session import process
+from tiktorch.server.session.hibernation import HibernationMonitor, ModelSessionHandle
+from tiktorch.server.session.process import ModelInfo, ModelSessionProcess, SessionSnapshot
+
+
+class ProcStub:
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class ClientStub:
+    def __init__(self, snapshot):
+        self.datasets = dict(snapshot.datasets) if snapshot else {}
+        self.is_shutdown = False
+
+    def get_model_info(self):
+        return ModelInfo("stub", "yx", "yx", valid_shapes=[[("y", 8), ("x", 8)]], halo=[("y", 0), ("x", 0)])
+
+    def create_dataset_description(self, mean, stddev):
+        id_ = f"ds{len(self.datasets)}"
+        self.datasets[id_] = {"mean": mean, "stddev": stddev}
+        return id_
+
+    def get_snapshot(self):
+        return SessionSnapshot(datasets=dict(self.datasets))
+
+    def shutdown(self):
+        self.is_shutdown = True
+
+
+class StartProcessStub:
+    def __init__(self):
+        self.calls = []
+        self.clients = []
+
+    def __call__(self, *, model_zip, devices, extract_path, snapshot, shared_weights_path, cpu_cores):
+        self.calls.append({"model_zip": model_zip, "devices": devices, "snapshot": snapshot, "cpu_cores": cpu_cores})
+        client = ClientStub(snapshot)
+        self.clients.append(client)
+        return ProcStub(), client
+
+
+@pytest.fixture
+def device_pool():
+    return TorchDevicePool()
+
+
+@pytest.fixture
+def start_process():
+    return StartProcessStub()
+
+
+@pytest.fixture
+def handle(device_pool, start_process):
+    handle = ModelSessionHandle(device_pool, b"model", ["cpu"], start_process=start_process)
+    yield handle
+    handle.close()
+
+
+def _cpu_status(device_pool):
+    return {d.id: d.status for d in device_pool.list_devices()}["cpu"]
+
+
+def test_hibernation_releases_devices(handle, device_pool, start_process):
+    assert DeviceStatus.IN_USE == _cpu_status(device_pool)
+
+    assert handle.hibernate()
+
+    assert handle.is_hibernated
+    assert start_process.clients[0].is_shutdown
+    assert DeviceStatus.AVAILABLE == _cpu_status(device_pool)
+
+
+def test_use_restores_hibernated_session(handle, device_pool, start_process):
+    with handle.use() as client:
+        ds_id = client.create_dataset_description(mean=1.0, stddev=2.0)
+
+    handle.hibernate()
+
+    with handle.use() as client:
+        assert ds_id in client.datasets
+
+    assert not handle.is_hibernated
+    assert handle.last_restore_duration is not None
+    assert start_process.calls[1]["model_zip"] is None
+    assert DeviceStatus.IN_USE == _cpu_status(device_pool)
+
+
+def test_restore_duration_is_reported_to_restoring_use(handle):
+    restores = []
+    with handle.use(on_restore=restores.append):
+        pass
+
+    handle.hibernate()
+    with handle.use(on_restore=restores.append):
+        pass
+
+    assert [handle.last_restore_duration] == restores
+
+
+def test_session_in_use_is_not_hibernated(handle):
+    with handle.use():
+        assert not handle.hibernate()
+
+    assert handle.hibernate()
+
+
+def test_recently_used_session_is_not_hibernated(handle):
+    with handle.use():
+        pass
+
+    assert not handle.hibernate(min_idle_time=60)
+    assert not handle.is_hibernated
+
+
+def test_closing_hibernated_session(handle, device_pool):
+    handle.hibernate()
+    handle.close()
+
+    assert DeviceStatus.AVAILABLE == _cpu_status(device_pool)
+
+    with pytest.raises(RuntimeError):
+        with handle.use():
+            pass
+
+
+def test_monitor_hibernates_idle_sessions(handle):
+    monitor = HibernationMonitor(idle_timeout=0.05, check_interval=0.01)
+    monitor.watch(handle)
+    try:
+        deadline = time.monotonic() + 2
+        while not handle.is_hibernated and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.stop()
+
+    assert handle.is_hibernated
+
+
+class ModelStub:
+    name = "stub"
+    input_axes = "yx"
+    output_axes = "yx"
+    input_shape = [("y", 8), ("x", 8)]
+    halo = [("y", 0), ("x", 0)]
+
+    def set_break_callback(self, cb):
+        pass
+
+
+def test_hibernated_session_keeps_training_data(device_pool, monkeypatch):
+    monkeypatch.setattr(process, "eval_model_zip", lambda *args, **kwargs: ModelStub())
+    sessions = []
+
+    def start_process(*, model_zip, devices, extract_path, snapshot, shared_weights_path, cpu_cores):
+        sessions.append(ModelSessionProcess(model_zip, devices, extract_path=extract_path, snapshot=snapshot))
+        return ProcStub(), sessions[-1]
+
+    handle = ModelSessionHandle(device_pool, None, ["cpu"], start_process=start_process)
+    try:
+        with handle.use() as client:
+            data = tiktypes.TikTensorBatch([tiktypes.TikTensor(np.full((8, 8), 3.0), id_=(0, 0))])
+            labels = tiktypes.TikTensorBatch([tiktypes.TikTensor(np.ones((8, 8)), id_=(0, 0))])
+            client.update_dataset(TRAINING, data, labels)
+
+        assert handle.hibernate()
+
+        with handle.use():
+            dataset = sessions[-1]._worker._supervisor.get_dataset(TRAINING)
+            assert 1 == len(dataset)
+            assert np.array_equal(np.full((8, 8), 3.0), dataset[0][0].numpy())
+    finally:
+        handle.close()
@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+import pytest
+
+from tests.test_server.conftest import npy
+from tiktorch.server.data_store import DataStore
+from tiktorch.server.prediction_jobs import JobManager, JobState
+from tiktorch.server.session.process import ModelInfo
+
+MODEL_SESSION_PARAMS = {
+    "forward": lambda arr: np.concatenate([arr, arr]),
+    "model_info": ModelInfo(
+        name="repeating",
+        input_axes="cyx",
+        output_axes="cyx",
+        valid_shapes=[[("c", 1), ("y", 32), ("x", 32)]],
+        halo=[("y", 4), ("x", 2)],
+    ),
+}
+
+
+@pytest.fixture
+def job_manager(data_store):
+    return JobManager(data_store, workers=3)
+
+
+def _wait(job):
+    status = job.wait()
+    while status.state not in (JobState.DONE, JobState.FAILED, JobState.CANCELLED):
+        status = job.wait(status.version, timeout=10)
+    return status
+
+
+def test_volume_is_predicted_into_created_array(job_manager, data_store, session):
+    volume = np.random.rand(1, 100, 70).astype(np.float32)
+    volume_id = data_store.put(npy(volume))
+
+    job = job_manager.submit(session, volume_id, chunks=(2, 16, 16), compression="zlib")
+    status = _wait(job)
+
+    assert JobState.DONE == status.state
+    assert (15, 15) == (status.tiles_done, status.tiles_total)
+    output = data_store.get_chunked_array(status.output_array_id)
+    assert (2, 16, 16) == output.chunks
+    np.testing.assert_array_equal(np.concatenate([volume, volume]), output[:])
+    assert job is job_manager.get(job.id)
+    assert 0 == data_store.usage().pinned_size
+
+
+def test_chunked_volume_is_predicted_into_given_array(job_manager, data_store, session):
+    volume = np.random.rand(1, 50, 40)
+    volume_id = data_store.create_chunked_array(volume.shape, volume.dtype, (1, 10, 10))
+    data_store.get_chunked_array(volume_id)[:] = volume
+    output_id = data_store.create_chunked_array((2, 50, 40), np.float32)
+
+    status = _wait(
+        job_manager.submit(session, volume_id, output_array_id=output_id, tile_shape={"c": 1, "y": 20, "x": 20})
+    )
+
+    assert JobState.DONE == status.state
+    assert output_id == status.output_array_id
+    assert 5 * 3 == status.tiles_total
+    np.testing.assert_array_equal(
+        np.concatenate([volume, volume]).astype(np.float32), data_store.get_chunked_array(output_id)[:]
+    )
+
+
+def test_volume_does_not_expire_while_predicted(session):
+    data_store = DataStore(ttl=0.05)
+    volume_id = data_store.create_chunked_array((1, 64, 64), np.float32)
+    session.model_session.gate.clear()
+
+    job = JobManager(data_store).submit(session, volume_id)
+    time.sleep(0.2)
+
+    assert data_store.get_chunked_array(volume_id) is not None
+    session.model_session.gate.set()
+    assert JobState.DONE == _wait(job).state
+    assert 0 == data_store.usage().pinned_size
+
+
+def test_tiles_are_normalized_by_dataset(job_manager, data_store, session):
+    volume_id = data_store.put(npy(np.zeros((1, 64, 64), dtype=np.uint8)))
+
+    status = _wait(job_manager.submit(session, volume_id, dataset_id="dataset"))
+
+    assert JobState.DONE == status.state
+    assert {"dataset"} == session.model_session.dataset_ids
+
+
+def test_failed_prediction_fails_job(job_manager, data_store, session):
+    session.model_session.fail = True
+    volume_id = data_store.put(npy(np.zeros((1, 64, 64))))
+
+    status = _wait(job_manager.submit(session, volume_id))
+
+    assert JobState.FAILED == status.state
+    assert "Forward failed" == status.error
+    assert 1 == session.model_session.calls
+
+
+def test_job_is_cancelled_when_session_is_closed(job_manager, data_store, session, session_manager):
+    session.model_session.gate.clear()
+    volume_id = data_store.put(npy(np.zeros((1, 200, 200))))
+    job = job_manager.submit(session, volume_id)
+
+    session_manager.close_session(session.id)
+    session.model_session.gate.set()
+    status = _wait(job)
+
+    assert JobState.CANCELLED == status.state
+    assert status.tiles_done < status.tiles_total
+
+
+@pytest.mark.parametrize(
+    "data, tile_shape",
+    [(npy(np.zeros((64, 64))), None), (b"not an array", None), (npy(np.zeros((1, 64, 64))), {"y": 32})],
+)
+def test_invalid_job(job_manager, data_store, session, data, tile_shape):
+    with pytest.raises(ValueError):
+        job_manager.submit(session, data_store.put(data), tile_shape=tile_shape)
+
+
+def test_unknown_volume(job_manager, session):
+    with pytest.raises(KeyError):
+        job_manager.submit(session, "unknown")
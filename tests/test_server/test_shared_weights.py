@@ -0,0 +1,58 @@
+import pytest
+import torch
+
+from tiktorch.server.model_adapter._shared_weights import assign_state_dict, load_shared_state_dict, map_state_dict
+
+
+def _make_model():
+    return torch.nn.Sequential(torch.nn.Conv2d(1, 2, 3), torch.nn.BatchNorm2d(2), torch.nn.Conv2d(2, 1, 1))
+
+
+@pytest.fixture
+def weights_file(tmp_path):
+    model = _make_model()
+    path = tmp_path / "weights.pt"
+    torch.save(model.state_dict(), path)
+    return model, path
+
+
+def test_shared_model_produces_same_output(weights_file, tmp_path):
+    model, path = weights_file
+    shared_model = _make_model()
+
+    assign_state_dict(shared_model, load_shared_state_dict(path, tmp_path / "shared" / "abc"))
+
+    model.eval()
+    shared_model.eval()
+    inp = torch.rand(1, 1, 16, 16)
+    with torch.no_grad():
+        assert torch.allclose(model(inp), shared_model(inp))
+
+
+def test_parameters_are_not_copied(weights_file, tmp_path):
+    _, path = weights_file
+    state = load_shared_state_dict(path, tmp_path / "abc")
+    shared_model = _make_model()
+
+    assign_state_dict(shared_model, state)
+
+    assert shared_model[0].weight.data_ptr() == state["0.weight"].data_ptr()
+    assert not shared_model[0].weight.requires_grad
+
+
+def test_shared_file_is_created_once(weights_file, tmp_path):
+    _, path = weights_file
+    load_shared_state_dict(path, tmp_path / "abc")
+    path.unlink()
+
+    state = load_shared_state_dict(path, tmp_path / "abc")
+    assert set(state) == set(map_state_dict(tmp_path / "abc"))
+
+
+def test_assign_raises_on_mismatching_state(weights_file, tmp_path):
+    _, path = weights_file
+    state = load_shared_state_dict(path, tmp_path / "abc")
+    del state["0.weight"]
+
+    with pytest.raises(ValueError):
+        assign_state_dict(_make_model(), state)
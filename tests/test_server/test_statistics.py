@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from tiktorch.server.chunked_array import ChunkedArray
+from tiktorch.server.statistics import RELATIVE_ACCURACY, Sketch, compute_sketch, volume_blocks
+
+
+def _data(dtype, size=10000):
+    rng = np.random.RandomState(0)
+    if np.dtype(dtype).kind == "f":
+        return rng.normal(3, 10, size).astype(dtype)
+
+    info = np.iinfo(dtype)
+    return rng.randint(info.min, int(info.max) + 1, size).astype(dtype)
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int8, np.uint16, np.int32, np.float32, np.float64])
+def test_sketch_summarizes_data(dtype):
+    data = _data(dtype)
+
+    sketch = Sketch.of(data)
+
+    assert data.size == sketch.count
+    assert data.min() == sketch.min
+    assert data.max() == sketch.max
+    np.testing.assert_allclose(data.mean(dtype=np.float64), sketch.mean, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(data.var(dtype=np.float64), sketch.variance, rtol=1e-9)
+
+
+@pytest.mark.parametrize("dtype", [np.uint16, np.float32])
+def test_quantiles_have_bounded_relative_error(dtype):
+    data = _data(dtype)
+    q = np.linspace(0, 1, 21)
+
+    res = Sketch.of(data).quantiles(q)
+
+    expected = np.sort(data.astype(np.float64))[np.floor(q * (data.size - 1)).astype(int)]
+    np.testing.assert_allclose(res, expected, rtol=RELATIVE_ACCURACY, atol=1e-9)
+
+
+def test_merged_sketches_equal_sketch_of_all_data():
+    data = _data(np.float32)
+    merged = Sketch()
+    for part in np.array_split(data, 7):
+        merged.merge(Sketch.of(part))
+
+    sketch = Sketch.of(data)
+
+    assert sketch.count == merged.count
+    assert (sketch.min, sketch.max) == (merged.min, merged.max)
+    np.testing.assert_allclose(sketch.mean, merged.mean)
+    np.testing.assert_allclose(sketch.variance, merged.variance)
+    np.testing.assert_array_equal(sketch.quantiles([0.1, 0.5, 0.9]), merged.quantiles([0.1, 0.5, 0.9]))
+    np.testing.assert_array_equal(sketch.histogram(10)[0], merged.histogram(10)[0])
+
+
+def test_non_finite_values_are_ignored():
+    sketch = Sketch.of(np.array([1.0, np.nan, 3.0, np.inf, -np.inf]))
+
+    assert 2 == sketch.count
+    assert 2.0 == sketch.mean
+    assert [1.0, 3.0] == [sketch.min, sketch.max]
+
+
+def test_summary():
+    data = np.arange(1000, dtype=np.uint16)
+
+    stats = Sketch.of(data).summary(percentiles=[0, 50, 100], histogram_bins=4)
+
+    assert 1000 == stats.count
+    assert [0, 50, 100] == stats.percentiles
+    np.testing.assert_allclose([0, 499.5, 999], stats.percentile_values, rtol=RELATIVE_ACCURACY)
+    assert 1000 == sum(stats.histogram)
+    assert [0, 249.75, 499.5, 749.25, 999] == stats.histogram_edges
+    np.testing.assert_allclose(data.std(), stats.stddev)
+
+
+def test_empty_sketch():
+    stats = Sketch.of(np.zeros((0, 3))).summary(percentiles=[50])
+
+    assert 0 == stats.count
+    assert np.isnan(stats.mean)
+    assert np.isnan(stats.percentile_values[0])
+
+
+def test_invalid_quantiles():
+    with pytest.raises(ValueError):
+        Sketch.of(np.arange(3)).quantiles([1.5])
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_sketch_of_chunked_volume(tmp_path, workers):
+    data = _data(np.float32, 30 * 40 * 5).reshape(30, 40, 5)
+    array = ChunkedArray.create(tmp_path / "array", data.shape, data.dtype, (7, 16, 5), compression="zlib")
+    array[:] = data
+
+    sketch = compute_sketch(volume_blocks(array), workers=workers)
+
+    assert data.size == sketch.count
+    np.testing.assert_allclose(data.mean(dtype=np.float64), sketch.mean, rtol=1e-9)
+    np.testing.assert_allclose(data.var(dtype=np.float64), sketch.variance, rtol=1e-9)
+
+
+def test_failing_block_fails_computation():
+    def _fail():
+        raise RuntimeError("Read failed")
+
+    blocks = [lambda: np.ones(3)] * 5 + [_fail] + [lambda: np.ones(3)] * 5
+
+    with pytest.raises(RuntimeError):
+        compute_sketch(blocks, workers=2)
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_blocks_of_memory_mapped_volume_are_views(tmp_path, order):
+    data = np.asarray(_data(np.float32, 60 * 70).reshape(60, 70), order=order)
+    np.save(tmp_path / "volume.npy", data)
+    volume = np.load(tmp_path / "volume.npy", mmap_mode="r")
+
+    blocks = [read() for read in volume_blocks(volume)]
+
+    assert all(np.shares_memory(block, volume) for block in blocks)
+    np.testing.assert_allclose(data.mean(dtype=np.float64), compute_sketch(volume_blocks(volume)).mean, rtol=1e-9)
@@ -6,6 +6,9 @@
 import pytest
 import torch
 
+from tiktorch import tiktypes
+from tiktorch.configkeys import TRAINING
+from tiktorch.server.datasets import PrefetchingLoader
 from tiktorch.server.session import State
 from tiktorch.server.session.backend import commands
 from tiktorch.server.session.backend.supervisor import Supervisor
@@ -35,10 +38,14 @@ def set_max_num_iterations(self, val):
         def stop_training(self, max_num_iterations=None, max_num_epochs=None):
             return self._break_cb and self._break_cb() or self.iteration_count >= self.max_num_iterations
 
-        def train(self):
-            while not self.stop_training():
+        def train(self, batches):
+            self.batch_shapes = []
+            for data, labels in batches:
+                self.batch_shapes.append(tuple(data.shape))
                 self.iteration_count += 1
                 time.sleep(0.01)
+                if self.stop_training():
+                    break
 
     @pytest.fixture
     def exemplum(self):
@@ -56,6 +63,13 @@ def worker_thread(self, supervisor):
         supervisor.send_command(commands.StopCmd())
         t.join()
 
+    @pytest.fixture
+    def training_data(self, supervisor, worker_thread):
+        tensors = tiktypes.TikTensorBatch([tiktypes.TikTensor(np.ones((4, 4)), id_=(0,))])
+        update = commands.UpdateDatasetCmd(TRAINING, raw_data=tensors, labels=tensors).awaitable
+        supervisor.send_command(update)
+        update.wait()
+
     def test_not_running_worker_has_stopped_status(self, supervisor):
         assert State.Stopped == supervisor.state
 
@@ -86,7 +100,7 @@ def test_transition_to_running(self, supervisor, worker_thread):
     def test_exception_during_train_should_transition_to_paused(self, supervisor, worker_thread, exemplum):
         train_called = threading.Event()
 
-        def _exc():
+        def _exc(batches):
             train_called.set()
             raise Exception()
 
@@ -104,7 +118,7 @@ def _exc():
         time.sleep(0.2)  # FIXME: Find a better way to wait for pause event with timeout
         assert supervisor.state == State.Paused
 
-    def test_finished_training_should_transition_to_paused(self, supervisor, worker_thread, exemplum):
+    def test_finished_training_should_transition_to_paused(self, supervisor, worker_thread, exemplum, training_data):
         cmd = commands.ResumeCmd()
         supervisor.send_command(cmd)
 
@@ -120,3 +134,62 @@ def test_forward(self, supervisor, worker_thread, exemplum):
         forward_cmd = commands.ForwardPass(fut, np.array([1]))
         supervisor.send_command(forward_cmd)
         assert 42 == fut.result(timeout=0.5)
+
+    def test_forward_during_training_waits_at_most_one_iteration(
+        self, supervisor, worker_thread, exemplum, training_data
+    ):
+        supervisor.send_command(commands.ResumeCmd())
+        add_work = commands.SetMaxNumIterations(10_000).awaitable
+        supervisor.send_command(add_work)
+        add_work.wait()
+
+        while exemplum.iteration_count < 5:
+            time.sleep(0.01)
+
+        for _ in range(5):
+            fut = Future()
+            supervisor.send_command(commands.ForwardPass(fut, np.array([1])))
+            assert 42 == fut.result(timeout=0.5)
+
+        assert supervisor.state == State.Running
+        latency = supervisor.forward_latency.as_dict()
+        assert 5 == latency["count"]
+        assert latency["max_wait_during_training"] < 0.5
+
+    def test_update_dataset_is_visible_to_running_loader(self, supervisor, worker_thread):
+        loader = PrefetchingLoader(supervisor.get_dataset(TRAINING), batch_size=2)
+        try:
+            batches = iter(loader)
+            tensors = tiktypes.TikTensorBatch([tiktypes.TikTensor(np.ones((4, 4)), id_=(0,))])
+            update = commands.UpdateDatasetCmd(TRAINING, raw_data=tensors, labels=tensors).awaitable
+            supervisor.send_command(update)
+            update.wait()
+
+            data, labels = next(batches)
+            assert (2, 4, 4) == data.shape
+        finally:
+            loader.close()
+
+    def test_training_draws_batches_from_training_dataset(self, supervisor, worker_thread, exemplum, training_data):
+        supervisor.send_command(commands.ResumeCmd())
+        supervisor.send_command(commands.SetMaxNumIterations(3))
+
+        while supervisor.state != State.Idle:
+            time.sleep(0.01)
+
+        assert 3 == exemplum.iteration_count
+        assert {(1, 4, 4)} == set(exemplum.batch_shapes)
+
+    def test_forward_is_not_held_up_by_training_without_data(self, supervisor, worker_thread, exemplum):
+        supervisor.send_command(commands.ResumeCmd())
+        add_work = commands.SetMaxNumIterations(10).awaitable
+        supervisor.send_command(add_work)
+        add_work.wait()
+        time.sleep(0.2)
+
+        fut = Future()
+        supervisor.send_command(commands.ForwardPass(fut, np.array([1])))
+
+        assert 42 == fut.result(timeout=1)
+        assert supervisor.state == State.Running
+        assert 0 == exemplum.iteration_count
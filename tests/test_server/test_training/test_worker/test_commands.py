@@ -1,9 +1,12 @@
 from concurrent.futures import Future
 from unittest import mock
 
+import numpy as np
 import pytest
 
+from tiktorch.server.session import types
 from tiktorch.server.session.backend import commands as cmds
+from tiktorch.tiktypes import TikTensor, TikTensorBatch
 
 
 class TestCommandQueue:
@@ -17,6 +20,14 @@ def test_stop_command_has_higher_priorityj(self):
         received_cmd = cmd_queue.get_nowait()
         assert stop_cmd is received_cmd
 
+    def test_forward_pass_goes_before_other_commands(self):
+        cmd_queue = cmds.CommandPriorityQueue()
+        forward_cmd = cmds.ForwardPass(Future(), [1])
+        cmd_queue.put_nowait(cmds.ResumeCmd())
+        cmd_queue.put_nowait(forward_cmd)
+
+        assert forward_cmd is cmd_queue.get_nowait()
+
     def test_queue_order_is_stable(self):
         cmd_queue = cmds.CommandPriorityQueue()
         stop_cmds = [cmds.StopCmd() for _ in range(100)]
@@ -27,6 +38,69 @@ def test_queue_order_is_stable(self):
             assert expected_cmd is cmd_queue.get_nowait()
 
 
+class TestDatasetUpdateCoalescing:
+    @staticmethod
+    def _update(name, ids, value=1.0):
+        batch = TikTensorBatch([TikTensor(np.full((2, 2), value), id_=id_) for id_ in ids])
+        return cmds.UpdateDatasetCmd(name, raw_data=batch, labels=batch)
+
+    @pytest.fixture
+    def cmd_queue(self):
+        return cmds.CommandPriorityQueue()
+
+    def test_later_update_supersedes_pending_one(self, cmd_queue):
+        first = self._update("training", [(0,), (1,)])
+        second = self._update("training", [(1,), (2,)])
+        cmd_queue.put_nowait(first)
+        cmd_queue.put_nowait(second)
+
+        assert [(0,)] == first.ids
+        assert [(1,), (2,)] == second.ids
+
+    def test_updates_of_different_datasets_are_kept(self, cmd_queue):
+        first = self._update("training", [(0,)])
+        cmd_queue.put_nowait(first)
+        cmd_queue.put_nowait(self._update("validation", [(0,)]))
+
+        assert [(0,)] == first.ids
+
+    def test_started_update_is_not_superseded(self, cmd_queue):
+        first = self._update("training", [(0,)])
+        cmd_queue.put_nowait(first)
+        assert first is cmd_queue.get_nowait()
+
+        cmd_queue.put_nowait(self._update("training", [(0,)]))
+
+        assert [(0,)] == first.ids
+
+    def test_removal_cancels_pending_update(self, cmd_queue):
+        update = self._update("training", [(0,), (1,)])
+        cmd_queue.put_nowait(update.awaitable)
+        cmd_queue.put_nowait(cmds.RemoveDataCmd("training", [(1,)]))
+
+        assert [(0,)] == update.ids
+
+    def test_superseded_update_does_not_touch_dataset(self, cmd_queue):
+        update = self._update("training", [(0,)])
+        cmd_queue.put_nowait(update)
+        cmd_queue.put_nowait(cmds.RemoveDataCmd("training", [(0,)]))
+        supervisor = mock.Mock()
+
+        update.execute(cmds.Context(supervisor=supervisor))
+
+        supervisor.get_dataset.assert_not_called()
+
+    def test_executing_update(self):
+        update = self._update("training", [(0,), (1,)], value=2.0)
+        supervisor = mock.Mock()
+
+        update.execute(cmds.Context(supervisor=supervisor))
+
+        supervisor.get_dataset.assert_called_once_with("training")
+        data, labels = supervisor.get_dataset.return_value.update.call_args[0]
+        assert [(0,), (1,)] == data.ids == labels.ids
+
+
 class TestForwardPassCmd:
     class FailException(Exception):
         pass
@@ -56,3 +130,17 @@ def test_executing_resolves_future_if_raised(self):
 
         with pytest.raises(self.FailException):
             assert fut.result(timeout=0)
+
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float64])
+    def test_input_is_normalized(self, dtype):
+        fut = Future()
+        input_tensor = np.arange(24, dtype=dtype).reshape(2, 3, 4)
+        cmd = cmds.ForwardPass(fut, input_tensor, types.Normalization(mean=10.0, stddev=4.0))
+        supervisor = mock.Mock()
+        supervisor.forward.side_effect = lambda arr: arr
+
+        cmd.execute(cmds.Context(supervisor=supervisor))
+
+        res = fut.result(timeout=0)
+        assert np.float32 == res.dtype
+        np.testing.assert_allclose((input_tensor.astype(np.float64) - 10) / 4, res, rtol=1e-6)
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from tiktorch.shared_memory import (
+    SharedSegment,
+    is_segment_path,
+    numpy_to_pb_shared_tensor,
+    pb_shared_tensor_to_numpy,
+    segment_dir,
+    write_shared_output,
+)
+
+
+@pytest.fixture
+def segment():
+    segment = SharedSegment(1024)
+    yield segment
+    segment.close()
+
+
+def test_segment_arrays_are_mapped_from_file(segment):
+    arr = segment.array(np.int32, (4, 4), offset=64)
+    arr[...] = np.arange(16).reshape(4, 4)
+
+    mapped = pb_shared_tensor_to_numpy(numpy_to_pb_shared_tensor(arr, segment.path, offset=64))
+
+    np.testing.assert_array_equal(arr, mapped)
+
+
+def test_write_output(segment):
+    target = numpy_to_pb_shared_tensor(np.empty(0), segment.path, offset=128)
+
+    written = write_shared_output(np.full((2, 3), 7, dtype=np.uint8), target)
+
+    assert 128 == written.offset
+    np.testing.assert_array_equal(np.full((2, 3), 7), segment.array(np.uint8, (2, 3), offset=128))
+
+
+def test_array_larger_than_segment_raises(segment):
+    with pytest.raises(ValueError):
+        segment.array(np.float64, (129,))
+
+    with pytest.raises(ValueError):
+        pb_shared_tensor_to_numpy(numpy_to_pb_shared_tensor(np.empty(129), segment.path))
+
+
+def test_object_arrays_are_refused(segment):
+    segment.array(np.uint8, (1024,))[...] = 0x41
+    tensor = numpy_to_pb_shared_tensor(np.empty(8, dtype=np.uint8), segment.path)
+    tensor.dtype = "O"
+
+    with pytest.raises(ValueError):
+        pb_shared_tensor_to_numpy(tensor)
+
+
+def test_close_removes_file(segment):
+    segment.close()
+
+    assert not os.path.exists(segment.path)
+
+
+def test_only_segment_files_are_accepted(segment, tmp_path):
+    assert is_segment_path(segment.path)
+
+    other = tmp_path / os.path.basename(segment.path)
+    other.write_bytes(b"")
+    assert not is_segment_path(str(other))
+
+    link = segment_dir() / f"{os.path.basename(segment.path)}_link"
+    link.symlink_to(other)
+    try:
+        assert not is_segment_path(str(link))
+    finally:
+        link.unlink()
+
+    assert not is_segment_path(str(segment_dir() / "some_file"))
@@ -1,6 +1,17 @@
+import multiprocessing
+
+import numpy as np
 import torch
 
-from tiktorch.tiktypes import LabeledTikTensor, LabeledTikTensorBatch
+from tiktorch.tiktypes import (
+    LabeledTikTensor,
+    LabeledTikTensorBatch,
+    PackedTikTensorBatch,
+    SparseTikTensor,
+    TikTensor,
+    TikTensorBatch,
+)
+from tiktorch.types import NDArray, NDArrayBatch, SparseNDArray
 
 
 def test_tt():
@@ -14,3 +25,63 @@ def test_ttb():
     assert isinstance(a.as_torch(), list)
     assert len(a.as_torch()) == 1
     assert all([len(aa) == 2 for aa in a.as_torch()])
+
+
+def test_sparse_ndarray_roundtrip():
+    dense = np.zeros((300, 20), dtype=np.uint8)
+    dense[250, 3] = 2
+    dense[1, 19] = 1
+
+    sparse = SparseNDArray.from_dense(dense, id_=(1,))
+
+    assert 2 == sparse.nnz
+    assert np.uint16 == sparse.coords.dtype
+    assert sparse.nbytes < dense.nbytes
+    assert np.array_equal(dense, sparse.as_numpy())
+
+
+def test_sparse_tik_tensor_batch_from_ndarray_batch():
+    dense = np.zeros((5, 5), dtype=np.float32)
+    dense[2, 2] = 1.0
+    batch = TikTensorBatch(NDArrayBatch([SparseNDArray.from_dense(dense, id_=(0,)), NDArray(dense, id_=(1,))]))
+
+    sparse, tensor = batch
+    assert isinstance(sparse, SparseTikTensor)
+    assert (0,) == sparse.id
+    assert torch.float32 == sparse.dtype
+    assert (5, 5) == sparse.shape
+    assert torch.equal(tensor.as_torch(), sparse.as_torch())
+
+
+def test_labeled_sparse_tik_tensor():
+    dense = np.zeros((4, 4), dtype=np.uint8)
+    dense[1, 3] = 7
+    sparse = SparseTikTensor(dense, id_=(2,))
+
+    labeled = sparse.add_label(np.ones((4, 4)))
+
+    assert (2,) == labeled.id
+    assert torch.equal(torch.from_numpy(dense), labeled.drop_label().as_torch())
+    assert not isinstance(sparse, TikTensor)
+
+
+def test_packed_tik_tensor_batch():
+    batch = TikTensorBatch([TikTensor(torch.rand(3, 4), id_=(0,)), TikTensor(torch.arange(5), id_=(1,))])
+    packed = batch.pack()
+
+    assert isinstance(packed, PackedTikTensorBatch)
+    assert batch.ids == packed.ids
+    assert all(torch.equal(a, b) for a, b in zip(batch.as_torch(), packed.as_torch()))
+    assert packed[1].as_torch().data_ptr() == packed.as_torch()[1].data_ptr()
+
+
+def test_packed_tik_tensor_batch_is_sent_as_one_buffer():
+    packed = TikTensorBatch([TikTensor(torch.ones(2, 2) * i, id_=(i,)) for i in range(4)]).pack()
+    recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+
+    send_conn.send(packed)
+    received = recv_conn.recv()
+
+    assert packed.ids == received.ids
+    assert [2.0] == received[2].as_torch().unique().tolist()
+    assert set(vars(received)) == {"_packed"}
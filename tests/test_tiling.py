@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from tiktorch.types import AxesPoint, Stitcher, Tiling, choose_tile_shape
+
+
+def _predict_tiles(tiling, array, model, output_axes):
+    stitcher = Stitcher(tiling, output_axes)
+    for idx in range(len(tiling)):
+        tile = tiling.read(array, idx)
+        assert tiling.tile_shape.values.tolist() == list(tile.shape)
+        stitcher.put(idx, model(tile))
+
+    return stitcher.result
+
+
+def test_choose_smallest_covering_shape():
+    valid = [AxesPoint("yx", [64, 64]), AxesPoint("yx", [32, 32]), AxesPoint("xy", [128, 16])]
+
+    assert AxesPoint("yx", [32, 32]) == choose_tile_shape(AxesPoint("yx", [20, 30]), valid)
+    assert AxesPoint("yx", [16, 128]) == choose_tile_shape(AxesPoint("yx", [10, 100]), valid)
+    assert AxesPoint("yx", [64, 64]) == choose_tile_shape(AxesPoint("yx", [100, 100]), valid)
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 37, 53), (1, 1, 8, 64), (1, 1, 5, 3)])
+def test_identity_prediction_is_reassembled(shape):
+    array = np.random.rand(*shape).astype(np.float32)
+    tiling = Tiling(AxesPoint("bcyx", shape), AxesPoint("bcyx", [1, 1, 16, 16]), AxesPoint("yx", [2, 3]))
+
+    assert np.array_equal(array, _predict_tiles(tiling, array, lambda t: t, "bcyx"))
+
+
+def test_halo_reduced_output_is_placed_without_cropping():
+    array = np.arange(40 * 40, dtype=np.float32).reshape(40, 40)
+    tiling = Tiling(AxesPoint("yx", [40, 40]), AxesPoint("yx", [16, 16]), AxesPoint("yx", [4, 4]))
+
+    assert np.array_equal(array, _predict_tiles(tiling, array, lambda t: t[4:-4, 4:-4], "yx"))
+
+
+def test_halo_provides_context():
+    array = np.random.rand(30, 30)
+
+    def box_filter(tile):
+        return sum(np.roll(np.roll(tile, dy, 0), dx, 1) for dy in (-1, 0, 1) for dx in (-1, 0, 1)) / 9
+
+    tiling = Tiling(AxesPoint("yx", [30, 30]), AxesPoint("yx", [12, 12]), AxesPoint("yx", [1, 1]))
+    result = _predict_tiles(tiling, array, box_filter, "yx")
+
+    assert np.allclose(box_filter(array)[1:-1, 1:-1], result[1:-1, 1:-1])
+
+
+def test_output_channels_differ_from_input():
+    array = np.random.rand(1, 20, 20)
+    tiling = Tiling(AxesPoint("cyx", [1, 20, 20]), AxesPoint("cyx", [1, 8, 8]))
+
+    result = _predict_tiles(tiling, array, lambda t: np.concatenate([t, -t]), "cyx")
+
+    assert (2, 20, 20) == result.shape
+    assert np.array_equal(-array[0], result[1])
+
+
+def test_halo_larger_than_tile_raises():
+    with pytest.raises(ValueError):
+        Tiling(AxesPoint("yx", [40, 40]), AxesPoint("yx", [8, 8]), AxesPoint("yx", [4, 4]))
@@ -0,0 +1,169 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from tiktorch.types import ROI, AxesPoint, NDArray, PackedNDArrayBatch, Point, tile_grid
+
+
+class TestAxesPoint:
+    def test_arithmetic_aligns_axes(self):
+        a = AxesPoint("yx", [10, 20])
+        b = AxesPoint("xy", [1, 2])
+
+        assert AxesPoint("yx", [12, 21]) == a + b
+        assert AxesPoint("yx", [8, 19]) == a - b
+        assert AxesPoint("yx", [5, 10]) == a // 2
+        assert AxesPoint("xy", [21, 12]) == a + b
+
+    def test_reflected_arithmetic(self):
+        a = AxesPoint("yx", [10, 20])
+
+        assert AxesPoint("yx", [-9, -19]) == 1 - a
+        assert AxesPoint("yx", [11, 21]) == 1 + a
+        assert AxesPoint("yx", [20, 40]) == 2 * a
+
+    def test_points_equal_up_to_axis_order_hash_equally(self):
+        a = AxesPoint("yx", [10, 20])
+        b = AxesPoint("xy", [20, 10])
+
+        assert a == b
+        assert hash(a) == hash(b)
+        assert {a: 1}[b] == 1
+        assert 1 == len({a, b})
+
+    def test_comparison_holds_for_all_axes(self):
+        a = AxesPoint("yx", [1, 5])
+
+        assert a < AxesPoint("yx", [2, 6])
+        assert not a < AxesPoint("yx", [2, 5])
+        assert a <= AxesPoint("xy", [5, 1])
+
+    def test_access_by_axis_and_index(self):
+        p = AxesPoint("czyx", [1, 2, 3, 4])
+
+        assert 3 == p["y"] == p[2]
+        assert [1, 2, 3, 4] == list(p)
+        assert {"c": 1, "z": 2, "y": 3, "x": 4} == p.as_dict()
+
+    def test_values_are_immutable(self):
+        p = AxesPoint("yx", [1, 2])
+
+        with pytest.raises(ValueError):
+            p.values[0] = 5
+
+        with pytest.raises(AttributeError):
+            p.z = 3
+
+    def test_drop_and_insert_axes(self):
+        p = AxesPoint("bcyx", [1, 2, 3, 4])
+
+        assert AxesPoint("yx", [3, 4]) == p.drop("bc")
+        assert AxesPoint("yxc", [3, 4, 1]) == p.drop("bc").insert("c", 1)
+        assert AxesPoint("byx", [1, 3, 4]) == p.drop("c").transpose("byx")
+
+    def test_from_point(self):
+        assert AxesPoint("yx", [1, 2]) == AxesPoint.from_point(Point(y=1, x=2))
+
+    def test_mismatching_values_raise(self):
+        with pytest.raises(ValueError):
+            AxesPoint("yx", [1, 2, 3])
+
+
+class TestROI:
+    @pytest.fixture
+    def roi(self):
+        return ROI(AxesPoint("yx", [10, 10]), AxesPoint("yx", [20, 30]))
+
+    def test_shape(self, roi):
+        assert AxesPoint("yx", [10, 20]) == roi.shape
+
+    def test_contains(self, roi):
+        assert AxesPoint("yx", [10, 29]) in roi
+        assert AxesPoint("yx", [20, 15]) not in roi
+        assert roi.contains(ROI(AxesPoint("yx", [12, 12]), AxesPoint("yx", [20, 30])))
+        assert not roi.contains(ROI(AxesPoint("yx", [12, 12]), AxesPoint("yx", [21, 30])))
+
+    def test_intersection(self, roi):
+        other = ROI(AxesPoint("xy", [25, 15]), AxesPoint("xy", [40, 40]))
+
+        assert ROI(AxesPoint("yx", [15, 25]), AxesPoint("yx", [20, 30])) == roi.intersection(other)
+        assert roi.intersection(roi.translate(AxesPoint("yx", [10, 0]))) is None
+
+    def test_pad_and_slices(self, roi):
+        padded = roi.pad(AxesPoint("yx", [2, 4]))
+
+        assert (slice(8, 22), slice(6, 34)) == padded.as_slices()
+
+
+class TestTileGrid:
+    def test_tiles_cover_volume(self):
+        grid = tile_grid(AxesPoint("yx", [10, 7]), AxesPoint("yx", [4, 4]))
+
+        assert 6 == len(grid)
+        covered = np.zeros((10, 7), dtype=int)
+        for start, stop in zip(grid.inner_start, grid.inner_stop):
+            covered[start[0] : stop[0], start[1] : stop[1]] += 1
+
+        assert np.all(covered == 1)
+        assert [8, 4] == grid.inner_start[-1].tolist()
+        assert [10, 7] == grid.inner_stop[-1].tolist()
+
+    def test_halo_and_padding(self):
+        grid = tile_grid(AxesPoint("yx", [8, 8]), AxesPoint("yx", [4, 4]), halo=AxesPoint("xy", [1, 2]))
+
+        assert [-2, -1] == grid.outer_start[0].tolist()
+        assert [6, 5] == grid.outer_stop[0].tolist()
+        assert [0, 0] == grid.read_start[0].tolist()
+        assert [2, 1] == grid.pad_before[0].tolist()
+        assert [2, 1] == grid.pad_after[-1].tolist()
+        assert ROI(AxesPoint("yx", [2, 3]), AxesPoint("yx", [10, 9])) == grid.outer_roi(3)
+
+    def test_keep_tile_shape_moves_border_tiles_inside(self):
+        grid = tile_grid(AxesPoint("zyx", [5, 10, 10]), AxesPoint("zyx", [5, 4, 4]), keep_tile_shape=True)
+
+        assert np.all(grid.inner_stop - grid.inner_start == [5, 4, 4])
+        assert [0, 6, 6] == grid.inner_start[-1].tolist()
+
+    def test_invalid_tile_shape_raises(self):
+        with pytest.raises(ValueError):
+            tile_grid(AxesPoint("yx", [8, 8]), AxesPoint("yx", [0, 4]))
+
+
+class TestPackedNDArrayBatch:
+    @pytest.fixture
+    def arrays(self):
+        return [
+            NDArray(np.arange(6, dtype=np.float32).reshape(2, 3), id_=(0, 1)),
+            NDArray(np.ones((5,), dtype=np.uint8), id_=(1, 1)),
+            NDArray(np.arange(8, dtype=np.int64).reshape(2, 2, 2)[:, :, 0], id_=(2, 1)),
+        ]
+
+    def test_items_are_views_into_buffer(self, arrays):
+        packed = PackedNDArrayBatch.pack(arrays)
+
+        assert 3 == len(packed)
+        for original, item in zip(arrays, packed):
+            assert original.id == item.id
+            assert np.array_equal(original.as_numpy(), item.as_numpy())
+            assert np.shares_memory(packed.buffer, item.as_numpy())
+
+    def test_items_are_aligned(self, arrays):
+        packed = PackedNDArrayBatch.pack(arrays)
+
+        assert all(offset % PackedNDArrayBatch.ALIGNMENT == 0 for offset in packed.offsets)
+
+    def test_array_metas(self, arrays):
+        packed = PackedNDArrayBatch.pack(arrays)
+
+        assert [{"dtype": "|u1", "shape": (5,), "id": (1, 1)}] == packed.array_metas()[1:2]
+
+    def test_pickle_roundtrip(self, arrays):
+        packed = pickle.loads(pickle.dumps(PackedNDArrayBatch.pack(arrays)))
+
+        assert [a.id for a in arrays] == packed.ids
+        assert all(np.array_equal(a.as_numpy(), b) for a, b in zip(arrays, packed.as_numpy()))
+
+    def test_buffer_too_small_raises(self):
+        with pytest.raises(ValueError):
+            PackedNDArrayBatch(b"1234", ["<f8"], [(1,)], [0])
@@ -0,0 +1,5 @@
+from tiktorch.types import Stitcher, Tiling, choose_tile_shape
+
+from .channel import ChannelPool
+from .client import Client, session_tiling
+from .retry import RetryPolicy
@@ -0,0 +1,96 @@
+import itertools
+import threading
+from typing import Dict, List, Tuple, Type, TypeVar
+
+import grpc
+
+_100_MB = 100 * 1024 * 1024
+
+CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", _100_MB),
+    ("grpc.max_receive_message_length", _100_MB),
+    ("grpc.keepalive_time_ms", 10_000),
+    ("grpc.keepalive_timeout_ms", 5_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.initial_reconnect_backoff_ms", 20),
+    ("grpc.min_reconnect_backoff_ms", 20),
+    ("grpc.max_reconnect_backoff_ms", 1_000),
+    # every channel gets its own connection instead of sharing one subchannel
+    ("grpc.use_local_subchannel_pool", 1),
+]
+
+S = TypeVar("S")
+
+
+class ChannelPool:
+    """
+    Fixed set of channels to one server, handed out round robin
+
+    Each channel has its own HTTP/2 connection, so large concurrent requests
+    are not serialized through single connection flow control window
+    """
+
+    def __init__(self, address: str, size: int = 2) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size should be positive, got {size}")
+
+        self.__address = address
+        self.__channels: List[grpc.Channel] = [
+            grpc.insecure_channel(address, options=CHANNEL_OPTIONS) for _ in range(size)
+        ]
+        self.__next = itertools.cycle(range(size))
+        self.__stubs: Dict[Tuple[int, type], object] = {}
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    @property
+    def address(self) -> str:
+        return self.__address
+
+    def __len__(self) -> int:
+        return len(self.__channels)
+
+    def get(self) -> grpc.Channel:
+        with self.__lock:
+            return self.__channels[self.__next_idx()]
+
+    def stub(self, stub_cls: Type[S]) -> S:
+        """
+        Returns stub bound to the next channel, stubs are created once per channel
+        """
+        with self.__lock:
+            key = (self.__next_idx(), stub_cls)
+            stub = self.__stubs.get(key)
+            if stub is None:
+                stub = self.__stubs[key] = stub_cls(self.__channels[key[0]])
+
+            return stub
+
+    def wait_for_ready(self, timeout: float) -> bool:
+        """
+        Blocks until every channel of the pool is connected
+        """
+        try:
+            for channel in self.__channels:
+                grpc.channel_ready_future(channel).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            return False
+
+        return True
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__closed = True
+
+        for channel in self.__channels:
+            channel.close()
+
+    def __next_idx(self) -> int:
+        if self.__closed:
+            raise RuntimeError("Channel pool is closed")
+
+        return next(self.__next)
@@ -0,0 +1,777 @@
+import collections
+import hashlib
+import io
+import itertools
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import grpc
+import numpy as np
+
+from tiktorch import converters, shared_memory
+from tiktorch.proto import data_store_pb2, data_store_pb2_grpc, inference_pb2, inference_pb2_grpc
+from tiktorch.types import AxesPoint, Stitcher, Tiling, choose_tile_shape
+
+from .channel import ChannelPool
+from .retry import NO_RETRY, RetryPolicy
+from .segments import SegmentPool
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+RANGE_CHUNK_SIZE = 1024 * 1024
+
+BytesLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+_FINAL_JOB_STATES = (
+    inference_pb2.JobStatus.State.DONE,
+    inference_pb2.JobStatus.State.FAILED,
+    inference_pb2.JobStatus.State.CANCELLED,
+)
+
+
+class _Prediction:
+    """
+    Predict request with shared memory segments holding its input and output
+    """
+
+    __slots__ = ("request", "segments")
+
+    def __init__(self, request: inference_pb2.PredictRequest, segments: Sequence[shared_memory.SharedSegment] = ()):
+        self.request = request
+        self.segments = segments
+
+
+class Client:
+    """
+    Client of tiktorch server
+
+    Idempotent calls (predictions, uploads, queries) are retried according to retry policy,
+    calls creating server side state are not
+    """
+
+    def __init__(
+        self,
+        address: str,
+        *,
+        pool_size: int = 2,
+        retry: Optional[RetryPolicy] = None,
+        timeout: Optional[float] = None,
+        shared_memory: bool = False,
+    ) -> None:
+        """
+        address: host:port of the server or unix:path of its socket
+        timeout: deadline in seconds for single call
+        shared_memory: pass prediction tensors through shared memory segments instead of messages,
+            server has to run on the same host with shared memory enabled
+        """
+        self.__pool = ChannelPool(address, size=pool_size)
+        self.__retry = RetryPolicy() if retry is None else retry
+        self.__timeout = timeout
+        self.__segments = SegmentPool() if shared_memory else None
+        # output segment size is guessed from previous output of the session
+        self.__output_sizes: Dict[str, int] = {}
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__pool.close()
+        if self.__segments is not None:
+            self.__segments.close()
+
+    def wait_for_ready(self, timeout: float) -> bool:
+        return self.__pool.wait_for_ready(timeout)
+
+    def ping(self) -> bool:
+        try:
+            self.__pool.stub(inference_pb2_grpc.FlightControlStub).Ping(inference_pb2.Empty(), timeout=self.__timeout)
+            return True
+        except grpc.RpcError:
+            return False
+
+    def list_devices(self) -> inference_pb2.Devices:
+        return self.__call(inference_pb2_grpc.InferenceStub, "ListDevices", inference_pb2.Empty())
+
+    def upload(
+        self,
+        data: Union[BytesLike, BinaryIO],
+        *,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        skip_existing: bool = True,
+        ttl: Optional[float] = None,
+    ) -> data_store_pb2.UploadResponse:
+        """
+        Streams bytes or content of binary file (from its current position) into server data store
+        skip_existing: hash data first and don't send it if server already stores it
+        ttl: seconds after which unused upload expires on server (server default if None)
+        """
+        size, read = _reader(data)
+
+        def _chunks():
+            for offset in range(0, size, chunk_size):
+                yield read(offset, chunk_size)
+
+        if skip_existing:
+            sha256 = hashlib.sha256()
+            for chunk in _chunks():
+                sha256.update(chunk)
+
+            upload_id = sha256.hexdigest()
+            stat = self.stat_upload(upload_id)
+            if stat is not None and stat.size == size:
+                return data_store_pb2.UploadResponse(id=upload_id, size=size, sha256=upload_id)
+
+        def _requests():
+            yield data_store_pb2.UploadRequest(info=data_store_pb2.UploadInfo(size=size, ttl=ttl or 0))
+            for chunk in _chunks():
+                yield data_store_pb2.UploadRequest(content=chunk)
+
+        stub = self.__pool.stub(data_store_pb2_grpc.DataStoreStub)
+        return self.__retry.call(lambda: stub.Upload(_requests(), timeout=self.__timeout))
+
+    def upload_parallel(
+        self,
+        data: Union[BytesLike, BinaryIO],
+        *,
+        streams: int = 4,
+        chunk_size: int = RANGE_CHUNK_SIZE,
+        ttl: Optional[float] = None,
+    ) -> data_store_pb2.UploadResponse:
+        """
+        Uploads bytes or content of binary file (from its current position) in chunks sent over several streams
+        Chunks are verified by server, failed ones are sent again and interrupted upload of the same data
+        (e.g. by client restart) is resumed
+        Streams go over pooled channels, with pool_size >= streams each of them has its own connection
+        """
+        size, read = _reader(data)
+        sha256 = hashlib.sha256()
+        for offset in range(0, size, chunk_size):
+            sha256.update(read(offset, chunk_size))
+        upload_id = sha256.hexdigest()
+
+        rq = data_store_pb2.StartUploadRequest(size=size, sha256=upload_id, chunkSize=chunk_size, ttl=ttl or 0)
+        status = self.__call(data_store_pb2_grpc.DataStoreStub, "StartUpload", rq)
+        backoffs = self.__retry.backoffs()
+
+        def _send(offsets):
+            def _requests():
+                for offset in offsets:
+                    chunk = read(offset, status.chunkSize)
+                    sha256 = hashlib.sha256(chunk).hexdigest()
+                    yield data_store_pb2.UploadChunk(uploadId=upload_id, offset=offset, content=chunk, sha256=sha256)
+
+            stub = self.__pool.stub(data_store_pb2_grpc.DataStoreStub)
+            return stub.UploadChunks(_requests(), timeout=self.__timeout)
+
+        with futures.ThreadPoolExecutor(max_workers=streams) as executor:
+            while not status.stored:
+                missing = _missing_chunks(status)
+                if not missing:
+                    break
+
+                groups = np.array_split(missing, min(streams, len(missing)))
+                errors = []
+                for fut in [executor.submit(_send, group.tolist()) for group in groups]:
+                    try:
+                        fut.result()
+                    except grpc.RpcError as e:
+                        errors.append(e)
+
+                received = _received_size(status)
+                rq = data_store_pb2.UploadStatusRequest(uploadId=upload_id)
+                status = self.__call(data_store_pb2_grpc.DataStoreStub, "GetUploadStatus", rq)
+                if not errors:
+                    continue
+
+                error = errors[0]
+                if not (self.__retry.is_retryable(error) or error.code() == grpc.StatusCode.DATA_LOSS):
+                    raise error
+
+                if _received_size(status) > received:
+                    # only rounds without any progress count as failed attempts
+                    backoffs = self.__retry.backoffs()
+
+                delay = next(backoffs, None)
+                if delay is None:
+                    raise error
+
+                logger.debug("Upload of %s chunks failed with %s, retrying in %.3fs", len(missing), error.code(), delay)
+                time.sleep(delay)
+
+        if status.stored:
+            return data_store_pb2.UploadResponse(id=upload_id, size=size, sha256=upload_id)
+
+        rq = data_store_pb2.FinishUploadRequest(uploadId=upload_id)
+        return self.__call(data_store_pb2_grpc.DataStoreStub, "FinishUpload", rq)
+
+    def upload_array(self, array: np.ndarray, **kwargs) -> data_store_pb2.UploadResponse:
+        """
+        Uploads array in .npy format, so that server can predict its regions (see predict_volume)
+        kwargs are passed to upload
+        """
+        array = np.ascontiguousarray(array)
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, np.lib.format.header_data_from_array_1_0(array))
+        header_size = header.tell()
+        data = bytearray(header_size + array.nbytes)
+        data[:header_size] = header.getbuffer()
+        memoryview(data)[header_size:] = memoryview(array).cast("B")
+        return self.upload(data, **kwargs)
+
+    def stat_upload(self, upload_id: str) -> Optional[data_store_pb2.StatResponse]:
+        """
+        Returns None if server doesn't store upload with given id (sha256 of its content)
+        """
+        try:
+            res = self.__call(data_store_pb2_grpc.DataStoreStub, "Stat", data_store_pb2.StatRequest(uploadId=upload_id))
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            return None
+
+        return res if res.exists else None
+
+    def download(
+        self, upload_id: str, out: Optional[BinaryIO] = None, *, offset: int = 0, length: Optional[int] = None
+    ) -> Optional[bytes]:
+        """
+        Streams stored blob or its range, interrupted download is resumed after the last received chunk
+        out: binary file to write data into, data is returned if not given
+        """
+        buffer = io.BytesIO() if out is None else out
+        end = None if length is None else offset + length
+        backoffs = self.__retry.backoffs()
+
+        while end is None or offset < end:
+            rq = data_store_pb2.DownloadRequest(
+                uploadId=upload_id, offset=offset, length=0 if end is None else end - offset
+            )
+            stub = self.__pool.stub(data_store_pb2_grpc.DataStoreStub)
+            try:
+                for chunk in stub.Download(rq, timeout=self.__timeout):
+                    buffer.write(chunk.content)
+                    offset += len(chunk.content)
+                    backoffs = self.__retry.backoffs()
+                break
+            except grpc.RpcError as e:
+                if not self.__retry.is_retryable(e):
+                    raise
+
+                delay = next(backoffs, None)
+                if delay is None:
+                    raise
+
+                logger.debug("Download failed at offset %s with %s, retrying in %.3fs", offset, e.code(), delay)
+                time.sleep(delay)
+
+        return buffer.getvalue() if out is None else None
+
+    def create_array(
+        self,
+        shape: Sequence[int],
+        dtype,
+        *,
+        chunks: Optional[Sequence[int]] = None,
+        compression: Optional[str] = None,
+    ) -> data_store_pb2.ArrayInfo:
+        """
+        Creates chunked array filled with zeros on the server, e.g. for predict_volume output
+        chunks: shape of chunks, chosen by server if not given
+        compression: None or "zlib"
+        """
+        rq = data_store_pb2.CreateArrayRequest(
+            shape=list(shape), dtype=np.dtype(dtype).name, chunks=list(chunks or ()), compression=compression or ""
+        )
+        return self.__call(data_store_pb2_grpc.DataStoreStub, "CreateArray", rq, retry=NO_RETRY)
+
+    def array_info(self, array_id: str) -> data_store_pb2.ArrayInfo:
+        return self.__call(
+            data_store_pb2_grpc.DataStoreStub, "GetArrayInfo", data_store_pb2.ArrayInfoRequest(arrayId=array_id)
+        )
+
+    def write_array(self, array_id: str, data: np.ndarray, start: Optional[Sequence[int]] = None) -> None:
+        """
+        Writes data into chunked array at start (origin if not given), data is sent split along chunks
+        """
+        info = self.array_info(array_id)
+        data = np.asarray(data, dtype=info.dtype)
+        if data.ndim != len(info.shape):
+            raise ValueError(f"Data of shape {data.shape} doesn't match array of shape {tuple(info.shape)}")
+
+        start = np.zeros(data.ndim, dtype=np.int64) if start is None else np.array(start, dtype=np.int64)
+
+        def _requests():
+            for lo, hi in _chunk_overlaps(start, start + data.shape, np.array(info.chunks, dtype=np.int64)):
+                block = data[tuple(slice(a, b) for a, b in zip(lo - start, hi - start))]
+                yield data_store_pb2.ArrayRegion(
+                    arrayId=array_id, start=lo.tolist(), shape=(hi - lo).tolist(), content=block.tobytes()
+                )
+
+        stub = self.__pool.stub(data_store_pb2_grpc.DataStoreStub)
+        self.__retry.call(lambda: stub.WriteArray(_requests(), timeout=self.__timeout))
+
+    def download_array(self, array_id: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Downloads chunked array chunk by chunk, interrupted download is resumed after the last received chunk
+        out: array (e.g. memory mapped) to write chunks into
+        """
+        info = self.array_info(array_id)
+        if out is None:
+            out = np.empty(list(info.shape), dtype=info.dtype)
+        elif out.shape != tuple(info.shape):
+            raise ValueError(f"Output of shape {out.shape} doesn't match array of shape {tuple(info.shape)}")
+
+        first_chunk = 0
+        backoffs = self.__retry.backoffs()
+        while True:
+            rq = data_store_pb2.DownloadArrayRequest(arrayId=array_id, firstChunk=first_chunk)
+            stub = self.__pool.stub(data_store_pb2_grpc.DataStoreStub)
+            try:
+                for region in stub.DownloadArray(rq, timeout=self.__timeout):
+                    chunk = np.frombuffer(region.content, dtype=info.dtype).reshape(list(region.shape))
+                    out[tuple(slice(a, a + size) for a, size in zip(region.start, region.shape))] = chunk
+                    first_chunk = region.chunk + 1
+                    backoffs = self.__retry.backoffs()
+                return out
+            except grpc.RpcError as e:
+                if not self.__retry.is_retryable(e):
+                    raise
+
+                delay = next(backoffs, None)
+                if delay is None:
+                    raise
+
+                logger.debug(
+                    "Array download failed at chunk %s with %s, retrying in %.3fs", first_chunk, e.code(), delay
+                )
+                time.sleep(delay)
+
+    def data_store_usage(self) -> data_store_pb2.Usage:
+        return self.__call(data_store_pb2_grpc.DataStoreStub, "GetUsage", data_store_pb2.UsageRequest())
+
+    def remove_upload(self, upload_id: str) -> None:
+        self.__call(data_store_pb2_grpc.DataStoreStub, "Remove", data_store_pb2.RemoveRequest(uploadId=upload_id))
+
+    def create_model_session(
+        self, model: Union[BytesLike, BinaryIO], *, device_ids: Sequence[str] = ("cpu",), cpu_cores: int = 0
+    ) -> inference_pb2.ModelSession:
+        """
+        Uploads model archive in chunks unless server already has it and creates session from it
+        Upload is kept on the server, so sessions of the same model can be created without uploading it again
+        """
+        upload = self.upload(model)
+        rq = inference_pb2.CreateModelSessionRequest(
+            model_uri=f"upload://{upload.id}", deviceIds=list(device_ids), cpuCores=cpu_cores
+        )
+        return self.__call(inference_pb2_grpc.InferenceStub, "CreateModelSession", rq, retry=NO_RETRY)
+
+    def close_model_session(self, session: inference_pb2.ModelSession) -> None:
+        self.__call(inference_pb2_grpc.InferenceStub, "CloseModelSession", session)
+
+    def create_dataset_description(self, session: inference_pb2.ModelSession, mean: float, stddev: float) -> str:
+        """
+        Returns id of dataset description, inputs predicted with it are normalized on the server,
+        so they can be sent as raw integer data
+        """
+        rq = inference_pb2.CreateDatasetDescriptionRequest(modelSessionId=session.id, mean=mean, stddev=stddev)
+        return self.__call(inference_pb2_grpc.InferenceStub, "CreateDatasetDescription", rq).id
+
+    def compute_dataset_statistics(
+        self,
+        session: inference_pb2.ModelSession,
+        volume_id: str,
+        *,
+        percentiles: Sequence[float] = (),
+        histogram_bins: int = 0,
+    ) -> inference_pb2.DatasetDescription:
+        """
+        Creates dataset description from mean and stddev of stored volume (see upload_array and create_array),
+        which are computed on the server together with other statistics kept in the description
+        percentiles: in [0, 100], approximated with relative error of about 1%
+        """
+        rq = inference_pb2.DatasetStatisticsRequest(
+            modelSessionId=session.id,
+            volumeId=volume_id,
+            percentiles=list(percentiles),
+            histogramBins=histogram_bins,
+        )
+        return self.__call(inference_pb2_grpc.InferenceStub, "ComputeDatasetStatistics", rq, retry=NO_RETRY)
+
+    def compute_stream_statistics(
+        self,
+        session: inference_pb2.ModelSession,
+        arrays: Iterable[np.ndarray],
+        *,
+        percentiles: Sequence[float] = (),
+        histogram_bins: int = 0,
+    ) -> inference_pb2.DatasetDescription:
+        """
+        Same as compute_dataset_statistics for arrays that aren't stored on the server, they are sent one by one
+        """
+
+        def _requests():
+            yield inference_pb2.DatasetStatisticsRequest(
+                modelSessionId=session.id, percentiles=list(percentiles), histogramBins=histogram_bins
+            )
+            for array in arrays:
+                yield inference_pb2.DatasetStatisticsRequest(tensor=converters.numpy_to_pb_tensor(array))
+
+        return self.__call(inference_pb2_grpc.InferenceStub, "ComputeStreamStatistics", _requests(), retry=NO_RETRY)
+
+    def get_dataset_description(
+        self, session: inference_pb2.ModelSession, dataset_id: str
+    ) -> inference_pb2.DatasetDescription:
+        rq = inference_pb2.DatasetDescriptionRequest(modelSessionId=session.id, id=dataset_id)
+        return self.__call(inference_pb2_grpc.InferenceStub, "GetDatasetDescription", rq)
+
+    def predict(self, session: inference_pb2.ModelSession, array: np.ndarray, *, dataset_id: str = "") -> np.ndarray:
+        prediction = self.__prepare(session, array, dataset_id)
+        try:
+            resp = self.__call(inference_pb2_grpc.InferenceStub, "Predict", prediction.request)
+            return self.__read_output(prediction, resp)
+        finally:
+            self.__release(prediction)
+
+    def predict_region(
+        self,
+        session: inference_pb2.ModelSession,
+        upload_id: str,
+        start: Sequence[int],
+        stop: Sequence[int],
+        *,
+        dataset_id: str = "",
+    ) -> np.ndarray:
+        """
+        Predicts region [start, stop) of array uploaded by upload_array extended by halo of the model
+        (parts outside of the array are filled by reflection)
+        """
+        prediction = self.__prepare_region(session, upload_id, start, stop, dataset_id)
+        try:
+            resp = self.__call(inference_pb2_grpc.InferenceStub, "Predict", prediction.request)
+            return self.__read_output(prediction, resp)
+        finally:
+            self.__release(prediction)
+
+    def predict_many(
+        self,
+        session: inference_pb2.ModelSession,
+        arrays: Iterable[np.ndarray],
+        *,
+        max_in_flight: int = 4,
+        dataset_id: str = "",
+    ) -> Iterator[np.ndarray]:
+        """
+        Yields predictions in order of arrays keeping up to max_in_flight requests running,
+        so that transfers overlap with computation on the server
+
+        arrays are consumed lazily, requests that failed with retryable error are resent
+        """
+        predictions = (self.__prepare(session, array, dataset_id) for array in arrays)
+        return self.__predict_pipelined(predictions, max_in_flight)
+
+    def __predict_pipelined(self, predictions: Iterable[_Prediction], max_in_flight: int) -> Iterator[np.ndarray]:
+        if max_in_flight < 1:
+            raise ValueError(f"Number of requests in flight should be positive, got {max_in_flight}")
+
+        in_flight = collections.deque()
+        try:
+            for prediction in predictions:
+                stub = self.__pool.stub(inference_pb2_grpc.InferenceStub)
+                in_flight.append((prediction, stub.Predict.future(prediction.request, timeout=self.__timeout)))
+
+                if len(in_flight) >= max_in_flight:
+                    yield self.__predict_result(*in_flight.popleft())
+
+            while in_flight:
+                yield self.__predict_result(*in_flight.popleft())
+        finally:
+            for prediction, future in in_flight:
+                future.cancel()
+                self.__release(prediction)
+
+    def predict_tiled(
+        self,
+        session: inference_pb2.ModelSession,
+        array: np.ndarray,
+        *,
+        tile_shape: Optional[AxesPoint] = None,
+        max_in_flight: int = 4,
+        dataset_id: str = "",
+    ) -> np.ndarray:
+        """
+        Predicts array of any size by splitting it into tiles of one of session valid shapes (with halo)
+
+        array axes are session input axes, result has session output axes
+        """
+        tiling = session_tiling(session, array.shape, tile_shape=tile_shape)
+        stitcher = Stitcher(tiling, session.outputAxes)
+        tiles = (tiling.read(array, idx) for idx in range(len(tiling)))
+        outputs = self.predict_many(session, tiles, max_in_flight=max_in_flight, dataset_id=dataset_id)
+        for idx, output in enumerate(outputs):
+            stitcher.put(idx, output)
+
+        return stitcher.result
+
+    def predict_volume(
+        self,
+        session: inference_pb2.ModelSession,
+        upload_id: str,
+        shape: Sequence[int],
+        *,
+        tile_shape: Optional[AxesPoint] = None,
+        max_in_flight: int = 4,
+        dataset_id: str = "",
+        output_array_id: str = "",
+    ) -> Optional[np.ndarray]:
+        """
+        Like predict_tiled, but for array of given shape uploaded by upload_array or chunked array
+
+        Server reads tiles from the stored array, so only tile coordinates and predictions are transferred
+        output_array_id: chunked array (see create_array) to write predictions to on the server, None is returned
+        """
+        tiling = session_tiling(session, shape, tile_shape=tile_shape)
+        predictions = (
+            self.__prepare_region(session, upload_id, *tiling.region(idx), dataset_id, output_array_id)
+            for idx in range(len(tiling))
+        )
+        outputs = self.__predict_pipelined(predictions, max_in_flight)
+        if output_array_id:
+            collections.deque(outputs, maxlen=0)
+            return None
+
+        stitcher = Stitcher(tiling, session.outputAxes)
+        for idx, output in enumerate(outputs):
+            stitcher.put(idx, output)
+
+        return stitcher.result
+
+    def submit_prediction_job(
+        self,
+        session: inference_pb2.ModelSession,
+        volume_id: str,
+        *,
+        output_array_id: str = "",
+        tile_shape: Optional[AxesPoint] = None,
+        chunks: Optional[Sequence[int]] = None,
+        compression: Optional[str] = None,
+        dataset_id: str = "",
+    ) -> inference_pb2.JobStatus:
+        """
+        Starts predicting whole volume (see upload_array and create_array) on the server in background,
+        job keeps running if connection is lost, see watch_job
+        output_array_id: chunked array to write predictions to, job creates one with given chunks and compression
+            if not set
+        dataset_id: tiles are normalized by this dataset description on the server, see create_dataset_description
+        """
+        rq = inference_pb2.PredictionJobRequest(
+            modelSessionId=session.id,
+            volumeId=volume_id,
+            outputArrayId=output_array_id,
+            outputChunks=list(chunks or ()),
+            outputCompression=compression or "",
+            tileShape=[] if tile_shape is None else [_dim(axis, size) for axis, size in tile_shape.as_dict().items()],
+            datasetId=dataset_id,
+        )
+        return self.__call(inference_pb2_grpc.InferenceStub, "SubmitPredictionJob", rq, retry=NO_RETRY)
+
+    def job_status(self, job_id: str) -> inference_pb2.JobStatus:
+        return self.__call(inference_pb2_grpc.InferenceStub, "GetJobStatus", inference_pb2.JobRequest(jobId=job_id))
+
+    def cancel_job(self, job_id: str) -> inference_pb2.JobStatus:
+        return self.__call(inference_pb2_grpc.InferenceStub, "CancelJob", inference_pb2.JobRequest(jobId=job_id))
+
+    def watch_job(self, job_id: str) -> Iterator[inference_pb2.JobStatus]:
+        """
+        Yields job status on every change until job is finished, watching is resumed after connection loss
+        """
+        rq = inference_pb2.JobRequest(jobId=job_id)
+        backoffs = self.__retry.backoffs()
+        while True:
+            # jobs run for long, so watching them isn't limited by call timeout
+            call = self.__pool.stub(inference_pb2_grpc.InferenceStub).WatchJob(rq)
+            try:
+                for status in call:
+                    backoffs = self.__retry.backoffs()
+                    yield status
+                    if status.state in _FINAL_JOB_STATES:
+                        return
+            except grpc.RpcError as e:
+                if not self.__retry.is_retryable(e):
+                    raise
+
+                delay = next(backoffs, None)
+                if delay is None:
+                    raise
+
+                logger.debug("Watching job %s failed with %s, retrying in %.3fs", job_id, e.code(), delay)
+                time.sleep(delay)
+            finally:
+                call.cancel()
+
+    def __predict_result(self, prediction: _Prediction, future: grpc.Future) -> np.ndarray:
+        try:
+            try:
+                resp = future.result()
+            except grpc.RpcError as e:
+                if not self.__retry.is_retryable(e):
+                    raise
+
+                logger.debug("Pipelined prediction failed with %s, resending", e.code())
+                resp = self.__call(inference_pb2_grpc.InferenceStub, "Predict", prediction.request)
+
+            return self.__read_output(prediction, resp)
+        finally:
+            self.__release(prediction)
+
+    def __prepare(self, session: inference_pb2.ModelSession, array: np.ndarray, dataset_id: str) -> _Prediction:
+        array = np.ascontiguousarray(array)
+        if self.__segments is None:
+            rq = inference_pb2.PredictRequest(
+                modelSessionId=session.id, tensor=converters.numpy_to_pb_tensor(array), datasetId=dataset_id
+            )
+            return _Prediction(rq)
+
+        input_segment = self.__segments.acquire(array.nbytes)
+        output_segment = self.__segments.acquire(max(array.nbytes, self.__output_sizes.get(session.id, 0)))
+        input_segment.array(array.dtype, array.shape)[...] = array
+        rq = inference_pb2.PredictRequest(
+            modelSessionId=session.id,
+            sharedTensor=shared_memory.numpy_to_pb_shared_tensor(array, input_segment.path),
+            sharedOutput=inference_pb2.SharedTensor(path=output_segment.path),
+            datasetId=dataset_id,
+        )
+        return _Prediction(rq, [input_segment, output_segment])
+
+    def __prepare_region(
+        self,
+        session: inference_pb2.ModelSession,
+        upload_id: str,
+        start: Sequence[int],
+        stop: Sequence[int],
+        dataset_id: str,
+        output_array_id: str = "",
+    ) -> _Prediction:
+        region = inference_pb2.VolumeRegion(uploadId=upload_id, start=list(start), stop=list(stop))
+        rq = inference_pb2.PredictRequest(
+            modelSessionId=session.id, volumeRegion=region, datasetId=dataset_id, outputArrayId=output_array_id
+        )
+        if self.__segments is None or output_array_id:
+            return _Prediction(rq)
+
+        # only output goes through shared memory, its size is unknown until first output of the session
+        output_segment = self.__segments.acquire(self.__output_sizes.get(session.id, 1))
+        rq.sharedOutput.path = output_segment.path
+        return _Prediction(rq, [output_segment])
+
+    def __read_output(self, prediction: _Prediction, resp: inference_pb2.PredictResponse) -> Optional[np.ndarray]:
+        if prediction.request.outputArrayId:
+            return None
+
+        if not resp.HasField("sharedTensor"):
+            output = converters.pb_tensor_to_numpy(resp.tensor)
+            if prediction.segments:
+                # output didn't fit into segment, next one for the session should be bigger
+                self.__output_sizes[prediction.request.modelSessionId] = output.nbytes
+            return output
+
+        tensor = resp.sharedTensor
+        output_segment = prediction.segments[-1]
+        if tensor.path != output_segment.path:
+            raise ValueError(f"Server wrote output to unexpected file {tensor.path}")
+
+        output = output_segment.array(tensor.dtype, [dim.size for dim in tensor.shape], tensor.offset)
+        # segment is reused by following requests
+        return output.copy()
+
+    def __release(self, prediction: _Prediction) -> None:
+        segments, prediction.segments = prediction.segments, ()
+        for segment in segments:
+            self.__segments.release(segment)
+
+    def __call(self, stub_cls, method: str, rq, retry: Optional[RetryPolicy] = None):
+        retry = self.__retry if retry is None else retry
+        return retry.call(lambda: getattr(self.__pool.stub(stub_cls), method)(rq, timeout=self.__timeout))
+
+
+def _dim(axis: str, size: int) -> inference_pb2.TensorDim:
+    return inference_pb2.TensorDim(name=axis, size=int(size))
+
+
+def _reader(data: Union[BytesLike, BinaryIO]) -> Tuple[int, Callable[[int, int], bytes]]:
+    """
+    Size of bytes or binary file (from its current position) and function reading its chunk at given offset
+    """
+    if isinstance(data, io.IOBase):
+        start = data.tell()
+        size = data.seek(0, io.SEEK_END) - start
+        lock = threading.Lock()
+
+        def _read(offset, length):
+            with lock:
+                data.seek(start + offset)
+                return data.read(length)
+
+    else:
+        view = memoryview(data).cast("B")
+        size = view.nbytes
+
+        def _read(offset, length):
+            return bytes(view[offset : offset + length])
+
+    return size, _read
+
+
+def _received_size(status: data_store_pb2.UploadStatus) -> int:
+    return sum(r.size for r in status.received)
+
+
+def _missing_chunks(status: data_store_pb2.UploadStatus) -> List[int]:
+    """
+    Offsets of chunks not received by server
+    """
+    missing = []
+    offset = 0
+    for received in sorted(status.received, key=lambda r: r.offset):
+        missing.extend(range(offset, received.offset, status.chunkSize))
+        offset = received.offset + received.size
+    missing.extend(range(offset, status.size, status.chunkSize))
+    return missing
+
+
+def _chunk_overlaps(start: np.ndarray, stop: np.ndarray, chunks: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Start and stop of overlaps of region with chunks of given shape
+    """
+    if np.any(stop <= start):
+        return
+
+    first, last = start // chunks, (stop - 1) // chunks
+    for index in itertools.product(*(range(a, b + 1) for a, b in zip(first.tolist(), last.tolist()))):
+        chunk_start = np.array(index, dtype=np.int64) * chunks
+        yield np.maximum(start, chunk_start), np.minimum(stop, chunk_start + chunks)
+
+
+def session_tiling(
+    session: inference_pb2.ModelSession, shape: Sequence[int], *, tile_shape: Optional[AxesPoint] = None
+) -> Tiling:
+    """
+    Tiling of array with given shape (in session input axes) into session valid shapes
+    """
+    axes = session.inputAxes
+    if len(axes) != len(shape):
+        raise ValueError(f"Array of shape {tuple(shape)} doesn't match input axes {axes!r}")
+
+    array_shape = AxesPoint(axes, shape)
+    if tile_shape is None:
+        valid_shapes = [AxesPoint.from_dict(axes, {dim.name: dim.size for dim in s.dims}) for s in session.validShapes]
+        tile_shape = choose_tile_shape(array_shape, valid_shapes)
+
+    halo = AxesPoint.from_dict(axes, {dim.name: dim.size for dim in session.halo}, missing=0)
+    return Tiling(array_shape, tile_shape, halo)
@@ -0,0 +1,68 @@
+import logging
+import random
+import time
+from typing import Callable, FrozenSet, Iterator, TypeVar
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_CODES = frozenset([grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.RESOURCE_EXHAUSTED])
+
+
+class RetryPolicy:
+    """
+    Retries calls failing with transient status codes, waiting exponentially growing
+    randomized delay between attempts
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        *,
+        initial_backoff: float = 0.05,
+        max_backoff: float = 2.0,
+        multiplier: float = 2.0,
+        retryable_codes: FrozenSet[grpc.StatusCode] = RETRYABLE_CODES,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"Number of attempts should be positive, got {max_attempts}")
+
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.retryable_codes = retryable_codes
+
+    def backoffs(self) -> Iterator[float]:
+        """
+        Delays before each retry ("full jitter"), there are max_attempts - 1 of them
+        """
+        backoff = self.initial_backoff
+        for _ in range(self.max_attempts - 1):
+            yield random.uniform(0, backoff)
+            backoff = min(backoff * self.multiplier, self.max_backoff)
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, grpc.RpcError) and error.code() in self.retryable_codes
+
+    def call(self, fn: Callable[[], T]) -> T:
+        backoffs = self.backoffs()
+        while True:
+            try:
+                return fn()
+            except grpc.RpcError as e:
+                if not self.is_retryable(e):
+                    raise
+
+                delay = next(backoffs, None)
+                if delay is None:
+                    raise
+
+                logger.debug("Call failed with %s, retrying in %.3fs", e.code(), delay)
+                time.sleep(delay)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,54 @@
+import threading
+from typing import List
+
+from tiktorch.shared_memory import SharedSegment
+
+_MIN_SEGMENT_SIZE = 1024 * 1024
+
+
+class SegmentPool:
+    """
+    Reuses shared memory segments between requests, creating and truncating files is costly
+    """
+
+    def __init__(self, max_free: int = 8) -> None:
+        self.__max_free = max_free
+        self.__free: List[SharedSegment] = []
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    def acquire(self, nbytes: int) -> SharedSegment:
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("Segment pool is closed")
+
+            fitting = [seg for seg in self.__free if seg.size >= nbytes]
+            if fitting:
+                segment = min(fitting, key=lambda seg: seg.size)
+                self.__free.remove(segment)
+                return segment
+
+        # power of two sizes let segments be reused for arrays of similar size
+        size = max(_MIN_SEGMENT_SIZE, 1 << max(nbytes - 1, 0).bit_length())
+        return SharedSegment(size)
+
+    def release(self, segment: SharedSegment) -> None:
+        with self.__lock:
+            if not self.__closed:
+                self.__free.append(segment)
+                if len(self.__free) <= self.__max_free:
+                    return
+
+                # drop the smallest segment, bigger ones fit more requests
+                segment = min(self.__free, key=lambda seg: seg.size)
+                self.__free.remove(segment)
+
+        segment.close()
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__closed = True
+            free, self.__free = self.__free, []
+
+        for segment in free:
+            segment.close()
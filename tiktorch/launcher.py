@@ -1,7 +1,10 @@
+import copy
 import enum
 import logging
+import shutil
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 from socket import timeout
@@ -11,10 +14,23 @@
 from paramiko import AutoAddPolicy, SSHClient
 
 from tiktorch.proto import inference_pb2, inference_pb2_grpc
-from tiktorch.rpc import Timeout
+from tiktorch.rpc import Shutdown, Timeout
 
 HEARTBEAT_INTERVAL = 10  # seconds
 KILL_TIMEOUT = 60  # seconds
+STARTUP_TIMEOUT = 10  # seconds
+
+# Keepalive pings detect dead connections between heartbeats,
+# short reconnect backoff lets launcher notice freshly started server quickly
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 10_000),
+    ("grpc.keepalive_timeout_ms", 5_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.initial_reconnect_backoff_ms", 20),
+    ("grpc.min_reconnect_backoff_ms", 20),
+    ("grpc.max_reconnect_backoff_ms", 500),
+]
 
 
 class AlreadyRunningError(Exception):
@@ -22,39 +38,65 @@ class AlreadyRunningError(Exception):
 
 
 class ConnConf:
-    def __init__(self, addr, port, timeout):
+    def __init__(self, addr, port, timeout, unix_socket: Optional[str] = None):
         self.addr = addr
         self.port = port
         self.timeout = timeout
+        self.unix_socket = unix_socket
 
     def get_timeout(self):
         return self.timeout
 
+    @property
+    def target(self) -> str:
+        """
+        gRPC channel target, unix socket is preferred if server listens on one
+        """
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+
+        return f"{self.addr}:{self.port}"
+
 
 class _GRPCClientWrapper:
-    def __init__(self, conn_str):
+    """
+    Flight control client keeping one channel open for its whole lifetime
+    """
+
+    def __init__(self, conn_str, timeout: Optional[float] = None):
         self.__conn_str = conn_str
+        self.__timeout = timeout
+        self.__channel = grpc.insecure_channel(conn_str, options=CHANNEL_OPTIONS)
+        self.__client = inference_pb2_grpc.FlightControlStub(self.__channel)
 
     def ping(self):
         try:
-            with grpc.insecure_channel(self.__conn_str) as chan:
-                client = inference_pb2_grpc.FlightControlStub(chan)
-                client.Ping(inference_pb2.Empty())
-
-                return True
+            self.__client.Ping(inference_pb2.Empty(), timeout=self.__timeout)
+            return True
         except Exception as e:
             return False
 
+    def wait_for_ready(self, timeout: float) -> bool:
+        """
+        Blocks until server accepts connections and responds to ping
+        """
+        try:
+            grpc.channel_ready_future(self.__channel).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            return False
+
+        return self.ping()
+
     def shutdown(self):
-        with grpc.insecure_channel(self.__conn_str) as chan:
-            client = inference_pb2_grpc.FlightControlStub(chan)
-            client.Shutdown(inference_pb2.Empty())
+        self.__client.Shutdown(inference_pb2.Empty(), timeout=self.__timeout)
+        return True
 
-            return True
+    def close(self):
+        self.__channel.close()
 
 
 def client_factory(conn_conf: ConnConf):
-    return _GRPCClientWrapper(f"{conn_conf.addr}:{conn_conf.port}")
+    return _GRPCClientWrapper(conn_conf.target, timeout=conn_conf.get_timeout())
 
 
 class IServerLauncher:
@@ -63,6 +105,7 @@ class State(enum.Enum):
         Running = "Running"
 
     __conn_conf = None
+    __client: Optional[_GRPCClientWrapper] = None
     _state: State = State.Stopped
     _heartbeat_worker: Optional[threading.Thread] = None
 
@@ -83,6 +126,19 @@ def _conn_conf(self, value: ConnConf) -> None:
             raise ValueError("Should be instance of ConnConf")
 
         self.__conn_conf = value
+        self._close_client()
+
+    @property
+    def _client(self) -> _GRPCClientWrapper:
+        if self.__client is None:
+            self.__client = client_factory(self._conn_conf)
+
+        return self.__client
+
+    def _close_client(self) -> None:
+        if self.__client is not None:
+            self.__client.close()
+            self.__client = None
 
     def _hearbeat(self, interval: int):
         while not self._stop.wait(timeout=interval):
@@ -94,11 +150,14 @@ def _start_server(self, dummy: bool, kill_timeout: int):
 
     def _ping(self):
         try:
-            c = client_factory(self.__conn_conf)
-            return c.ping()
+            return self._client.ping()
         except Timeout:
             return False
 
+    def _wait_for_server(self, timeout: float = STARTUP_TIMEOUT) -> None:
+        if not self._client.wait_for_ready(timeout):
+            raise Timeout()
+
     def is_server_running(self):
         return self._ping()
 
@@ -119,14 +178,18 @@ def stop(self):
 
         self._stop.set()
 
-        c = client_factory(self._conn_conf)
         try:
-            c.shutdown()
+            self._client.shutdown()
         except Shutdown:
             pass
-
-        self._state = self.State.Stopped
-        self._heartbeat_worker.join()
+        except grpc.RpcError as e:
+            # server may stop before its reply to shutdown is sent
+            if e.code() != grpc.StatusCode.UNAVAILABLE:
+                raise
+        finally:
+            self._state = self.State.Stopped
+            self._heartbeat_worker.join()
+            self._close_client()
 
 
 def wait(done, interval=0.1, max_wait=10):
@@ -145,10 +208,24 @@ def wait(done, interval=0.1, max_wait=10):
 
 
 class LocalServerLauncher(IServerLauncher):
-    def __init__(self, conn_conf: ConnConf, path=None):
-        self._conn_conf = conn_conf
+    def __init__(self, conn_conf: ConnConf, path=None, *, unix_socket: bool = sys.platform != "win32"):
+        """
+        unix_socket: server additionally listens on unix socket in private temporary directory,
+        launcher connects through it and exposes its path, so that same host clients avoid loopback TCP
+        """
+        # socket path is set on own copy, conn_conf of caller may be shared
+        self._conn_conf = copy.copy(conn_conf)
         self._process = None
         self._path = path
+        self._unix_socket = unix_socket
+        self._socket_dir = None
+
+    @property
+    def unix_socket(self) -> Optional[str]:
+        """
+        Path of unix socket the running server listens on, if any
+        """
+        return self._conn_conf.unix_socket
 
     def _start_server(self, dummy: bool, kill_timeout: int):
         addr, port = self._conn_conf.addr, self._conn_conf.port
@@ -170,13 +247,28 @@ def _start_server(self, dummy: bool, kill_timeout: int):
         if dummy:
             cmd.append("--dummy")
 
+        if self._unix_socket:
+            self._socket_dir = tempfile.mkdtemp(prefix="tiktorch_")
+            self._conn_conf.unix_socket = f"{self._socket_dir}/server.sock"
+            self._close_client()
+            cmd += ["--unix-socket", self._conn_conf.unix_socket]
+
         self._process = subprocess.Popen(cmd, stdout=sys.stdout, stderr=sys.stderr)
 
         try:
-            wait(self.is_server_running)
+            self._wait_for_server()
         except Timeout:
             raise Exception("Failed to start local TikTorchServer")
 
+    def stop(self):
+        try:
+            super().stop()
+        finally:
+            if self._socket_dir is not None:
+                self._conn_conf.unix_socket = None
+                shutil.rmtree(self._socket_dir, ignore_errors=True)
+                self._socket_dir = None
+
 
 class SSHCred:
     def __init__(self, user: str, password: Optional[str] = None, key_path: Optional[str] = None) -> None:
@@ -264,6 +356,6 @@ def _monitor_and_report():
             raise RuntimeError("Failed to start TiktorchServer")
 
         try:
-            wait(self.is_server_running)
+            self._wait_for_server()
         except Timeout:
             raise Exception("Failed to start local TikTorchServer")
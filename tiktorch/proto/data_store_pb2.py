@@ -19,7 +19,7 @@
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x10\x64\x61ta_store.proto\":\n\x0eUploadResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\r\x12\x0e\n\x06sha256\x18\x03 \x01(\t\"\x1a\n\nUploadInfo\x12\x0c\n\x04size\x18\x01 \x01(\r\"J\n\rUploadRequest\x12\x1b\n\x04info\x18\x01 \x01(\x0b\x32\x0b.UploadInfoH\x00\x12\x11\n\x07\x63ontent\x18\x02 \x01(\x0cH\x00\x42\t\n\x07payload\"!\n\rRemoveRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\"\x10\n\x0eRemoveResponse2g\n\tDataStore\x12-\n\x06Upload\x12\x0e.UploadRequest\x1a\x0f.UploadResponse\"\x00(\x01\x12+\n\x06Remove\x12\x0e.RemoveRequest\x1a\x0f.RemoveResponse\"\x00\x62\x06proto3')
+  serialized_pb=_b('\n\x10\x64\x61ta_store.proto\":\n\x0eUploadResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\x12\x0e\n\x06sha256\x18\x03 \x01(\t\"\'\n\nUploadInfo\x12\x0c\n\x04size\x18\x01 \x01(\x04\x12\x0b\n\x03ttl\x18\x02 \x01(\x01\"J\n\rUploadRequest\x12\x1b\n\x04info\x18\x01 \x01(\x0b\x32\x0b.UploadInfoH\x00\x12\x11\n\x07\x63ontent\x18\x02 \x01(\x0cH\x00\x42\t\n\x07payload\"!\n\rRemoveRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\"\x10\n\x0eRemoveResponse\"\x1f\n\x0bStatRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\",\n\x0cStatResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x0c\n\x04size\x18\x02 \x01(\x04\"R\n\x12StartUploadRequest\x12\x0c\n\x04size\x18\x01 \x01(\x04\x12\x0e\n\x06sha256\x18\x02 \x01(\t\x12\x11\n\tchunkSize\x18\x03 \x01(\x04\x12\x0b\n\x03ttl\x18\x04 \x01(\x01\")\n\tByteRange\x12\x0e\n\x06offset\x18\x01 \x01(\x04\x12\x0c\n\x04size\x18\x02 \x01(\x04\"o\n\x0cUploadStatus\x12\x10\n\x08uploadId\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\x12\x11\n\tchunkSize\x18\x03 \x01(\x04\x12\x1c\n\x08received\x18\x04 \x03(\x0b\x32\n.ByteRange\x12\x0e\n\x06stored\x18\x05 \x01(\x08\"P\n\x0bUploadChunk\x12\x10\n\x08uploadId\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\x0c\x12\x0e\n\x06sha256\x18\x04 \x01(\t\"\'\n\x13UploadStatusRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\"\'\n\x13\x46inishUploadRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\"\x0e\n\x0cUsageRequest\"i\n\x05Usage\x12\r\n\x05\x62lobs\x18\x01 \x01(\x04\x12\x0c\n\x04size\x18\x02 \x01(\x04\x12\x12\n\npinnedSize\x18\x03 \x01(\x04\x12\r\n\x05quota\x18\x04 \x01(\x04\x12\x0f\n\x07\x65victed\x18\x05 \x01(\x04\x12\x0f\n\x07\x65xpired\x18\x06 \x01(\x04\"C\n\x0f\x44ownloadRequest\x12\x10\n\x08uploadId\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0e\n\x06length\x18\x03 \x01(\x04\">\n\rDownloadChunk\x12\x0e\n\x06offset\x18\x01 \x01(\x04\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\x12\x0c\n\x04size\x18\x03 \x01(\x04\"W\n\x12\x43reateArrayRequest\x12\r\n\x05shape\x18\x01 \x03(\x04\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x0e\n\x06\x63hunks\x18\x03 \x03(\x04\x12\x13\n\x0b\x63ompression\x18\x04 \x01(\t\"#\n\x10\x41rrayInfoRequest\x12\x0f\n\x07\x61rrayId\x18\x01 \x01(\t\"_\n\tArrayInfo\x12\x0f\n\x07\x61rrayId\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\x04\x12\r\n\x05\x64type\x18\x03 \x01(\t\x12\x0e\n\x06\x63hunks\x18\x04 \x03(\x04\x12\x13\n\x0b\x63ompression\x18\x05 \x01(\t\"\\\n\x0b\x41rrayRegion\x12\x0f\n\x07\x61rrayId\x18\x01 \x01(\t\x12\r\n\x05start\x18\x02 \x03(\x04\x12\r\n\x05shape\x18\x03 \x03(\x04\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\x0c\x12\r\n\x05\x63hunk\x18\x05 \x01(\x04\"\x14\n\x12WriteArrayResponse\";\n\x14\x44ownloadArrayRequest\x12\x0f\n\x07\x61rrayId\x18\x01 \x01(\t\x12\x12\n\nfirstChunk\x18\x02 \x01(\x04\x32\x90\x05\n\tDataStore\x12-\n\x06Upload\x12\x0e.UploadRequest\x1a\x0f.UploadResponse\"\x00(\x01\x12+\n\x06Remove\x12\x0e.RemoveRequest\x1a\x0f.RemoveResponse\"\x00\x12\x30\n\x08\x44ownload\x12\x10.DownloadRequest\x1a\x0e.DownloadChunk\"\x00\x30\x01\x12%\n\x04Stat\x12\x0c.StatRequest\x1a\r.StatResponse\"\x00\x12#\n\x08GetUsage\x12\r.UsageRequest\x1a\x06.Usage\"\x00\x12\x33\n\x0bStartUpload\x12\x13.StartUploadRequest\x1a\r.UploadStatus\"\x00\x12/\n\x0cUploadChunks\x12\x0c.UploadChunk\x1a\r.UploadStatus\"\x00(\x01\x12\x38\n\x0fGetUploadStatus\x12\x14.UploadStatusRequest\x1a\r.UploadStatus\"\x00\x12\x37\n\x0c\x46inishUpload\x12\x14.FinishUploadRequest\x1a\x0f.UploadResponse\"\x00\x12\x30\n\x0b\x43reateArray\x12\x13.CreateArrayRequest\x1a\n.ArrayInfo\"\x00\x12/\n\x0cGetArrayInfo\x12\x11.ArrayInfoRequest\x1a\n.ArrayInfo\"\x00\x12\x33\n\nWriteArray\x12\x0c.ArrayRegion\x1a\x13.WriteArrayResponse\"\x00(\x01\x12\x38\n\rDownloadArray\x12\x15.DownloadArrayRequest\x1a\x0c.ArrayRegion\"\x00\x30\x01\x62\x06proto3')
 )
 
 
@@ -41,7 +41,7 @@
       serialized_options=None, file=DESCRIPTOR),
     _descriptor.FieldDescriptor(
       name='size', full_name='UploadResponse.size', index=1,
-      number=2, type=13, cpp_type=3, label=1,
+      number=2, type=4, cpp_type=4, label=1,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
@@ -79,7 +79,622 @@
   fields=[
     _descriptor.FieldDescriptor(
       name='size', full_name='UploadInfo.size', index=0,
-      number=1, type=13, cpp_type=3, label=1,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='ttl', full_name='UploadInfo.ttl', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=80,
+  serialized_end=119,
+)
+
+
+_UPLOADREQUEST = _descriptor.Descriptor(
+  name='UploadRequest',
+  full_name='UploadRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='info', full_name='UploadRequest.info', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='UploadRequest.content', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='payload', full_name='UploadRequest.payload',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=121,
+  serialized_end=195,
+)
+
+
+_REMOVEREQUEST = _descriptor.Descriptor(
+  name='RemoveRequest',
+  full_name='RemoveRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='RemoveRequest.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=197,
+  serialized_end=230,
+)
+
+
+_REMOVERESPONSE = _descriptor.Descriptor(
+  name='RemoveResponse',
+  full_name='RemoveResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=232,
+  serialized_end=248,
+)
+
+
+_STATREQUEST = _descriptor.Descriptor(
+  name='StatRequest',
+  full_name='StatRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='StatRequest.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=250,
+  serialized_end=281,
+)
+
+
+_STATRESPONSE = _descriptor.Descriptor(
+  name='StatResponse',
+  full_name='StatResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='exists', full_name='StatResponse.exists', index=0,
+      number=1, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='StatResponse.size', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=283,
+  serialized_end=327,
+)
+
+
+_STARTUPLOADREQUEST = _descriptor.Descriptor(
+  name='StartUploadRequest',
+  full_name='StartUploadRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='size', full_name='StartUploadRequest.size', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sha256', full_name='StartUploadRequest.sha256', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunkSize', full_name='StartUploadRequest.chunkSize', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='ttl', full_name='StartUploadRequest.ttl', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=329,
+  serialized_end=411,
+)
+
+
+_BYTERANGE = _descriptor.Descriptor(
+  name='ByteRange',
+  full_name='ByteRange',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='ByteRange.offset', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='ByteRange.size', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=413,
+  serialized_end=454,
+)
+
+
+_UPLOADSTATUS = _descriptor.Descriptor(
+  name='UploadStatus',
+  full_name='UploadStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='UploadStatus.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='UploadStatus.size', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunkSize', full_name='UploadStatus.chunkSize', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='received', full_name='UploadStatus.received', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='stored', full_name='UploadStatus.stored', index=4,
+      number=5, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=456,
+  serialized_end=567,
+)
+
+
+_UPLOADCHUNK = _descriptor.Descriptor(
+  name='UploadChunk',
+  full_name='UploadChunk',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='UploadChunk.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='UploadChunk.offset', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='UploadChunk.content', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sha256', full_name='UploadChunk.sha256', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=569,
+  serialized_end=649,
+)
+
+
+_UPLOADSTATUSREQUEST = _descriptor.Descriptor(
+  name='UploadStatusRequest',
+  full_name='UploadStatusRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='UploadStatusRequest.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=651,
+  serialized_end=690,
+)
+
+
+_FINISHUPLOADREQUEST = _descriptor.Descriptor(
+  name='FinishUploadRequest',
+  full_name='FinishUploadRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='FinishUploadRequest.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=692,
+  serialized_end=731,
+)
+
+
+_USAGEREQUEST = _descriptor.Descriptor(
+  name='UsageRequest',
+  full_name='UsageRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=733,
+  serialized_end=747,
+)
+
+
+_USAGE = _descriptor.Descriptor(
+  name='Usage',
+  full_name='Usage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='blobs', full_name='Usage.blobs', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='Usage.size', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='pinnedSize', full_name='Usage.pinnedSize', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='quota', full_name='Usage.quota', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='evicted', full_name='Usage.evicted', index=4,
+      number=5, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='expired', full_name='Usage.expired', index=5,
+      number=6, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=749,
+  serialized_end=854,
+)
+
+
+_DOWNLOADREQUEST = _descriptor.Descriptor(
+  name='DownloadRequest',
+  full_name='DownloadRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='DownloadRequest.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='DownloadRequest.offset', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='length', full_name='DownloadRequest.length', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=856,
+  serialized_end=923,
+)
+
+
+_DOWNLOADCHUNK = _descriptor.Descriptor(
+  name='DownloadChunk',
+  full_name='DownloadChunk',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='DownloadChunk.offset', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='DownloadChunk.content', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='DownloadChunk.size', index=2,
+      number=3, type=4, cpp_type=4, label=1,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
@@ -96,29 +711,43 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=80,
-  serialized_end=106,
+  serialized_start=925,
+  serialized_end=987,
 )
 
 
-_UPLOADREQUEST = _descriptor.Descriptor(
-  name='UploadRequest',
-  full_name='UploadRequest',
+_CREATEARRAYREQUEST = _descriptor.Descriptor(
+  name='CreateArrayRequest',
+  full_name='CreateArrayRequest',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='info', full_name='UploadRequest.info', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='shape', full_name='CreateArrayRequest.shape', index=0,
+      number=1, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
     _descriptor.FieldDescriptor(
-      name='content', full_name='UploadRequest.content', index=1,
-      number=2, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b(""),
+      name='dtype', full_name='CreateArrayRequest.dtype', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunks', full_name='CreateArrayRequest.chunks', index=2,
+      number=3, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='compression', full_name='CreateArrayRequest.compression', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
@@ -133,24 +762,21 @@
   syntax='proto3',
   extension_ranges=[],
   oneofs=[
-    _descriptor.OneofDescriptor(
-      name='payload', full_name='UploadRequest.payload',
-      index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=108,
-  serialized_end=182,
+  serialized_start=989,
+  serialized_end=1076,
 )
 
 
-_REMOVEREQUEST = _descriptor.Descriptor(
-  name='RemoveRequest',
-  full_name='RemoveRequest',
+_ARRAYINFOREQUEST = _descriptor.Descriptor(
+  name='ArrayInfoRequest',
+  full_name='ArrayInfoRequest',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='uploadId', full_name='RemoveRequest.uploadId', index=0,
+      name='arrayId', full_name='ArrayInfoRequest.arrayId', index=0,
       number=1, type=9, cpp_type=9, label=1,
       has_default_value=False, default_value=_b("").decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
@@ -168,18 +794,174 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=184,
-  serialized_end=217,
+  serialized_start=1078,
+  serialized_end=1113,
 )
 
 
-_REMOVERESPONSE = _descriptor.Descriptor(
-  name='RemoveResponse',
-  full_name='RemoveResponse',
+_ARRAYINFO = _descriptor.Descriptor(
+  name='ArrayInfo',
+  full_name='ArrayInfo',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='arrayId', full_name='ArrayInfo.arrayId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='shape', full_name='ArrayInfo.shape', index=1,
+      number=2, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='dtype', full_name='ArrayInfo.dtype', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunks', full_name='ArrayInfo.chunks', index=3,
+      number=4, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='compression', full_name='ArrayInfo.compression', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1115,
+  serialized_end=1210,
+)
+
+
+_ARRAYREGION = _descriptor.Descriptor(
+  name='ArrayRegion',
+  full_name='ArrayRegion',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='arrayId', full_name='ArrayRegion.arrayId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='start', full_name='ArrayRegion.start', index=1,
+      number=2, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='shape', full_name='ArrayRegion.shape', index=2,
+      number=3, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='content', full_name='ArrayRegion.content', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunk', full_name='ArrayRegion.chunk', index=4,
+      number=5, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1212,
+  serialized_end=1304,
+)
+
+
+_WRITEARRAYRESPONSE = _descriptor.Descriptor(
+  name='WriteArrayResponse',
+  full_name='WriteArrayResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1306,
+  serialized_end=1326,
+)
+
+
+_DOWNLOADARRAYREQUEST = _descriptor.Descriptor(
+  name='DownloadArrayRequest',
+  full_name='DownloadArrayRequest',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
+    _descriptor.FieldDescriptor(
+      name='arrayId', full_name='DownloadArrayRequest.arrayId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='firstChunk', full_name='DownloadArrayRequest.firstChunk', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -192,8 +974,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=219,
-  serialized_end=235,
+  serialized_start=1328,
+  serialized_end=1387,
 )
 
 _UPLOADREQUEST.fields_by_name['info'].message_type = _UPLOADINFO
@@ -203,11 +985,30 @@
 _UPLOADREQUEST.oneofs_by_name['payload'].fields.append(
   _UPLOADREQUEST.fields_by_name['content'])
 _UPLOADREQUEST.fields_by_name['content'].containing_oneof = _UPLOADREQUEST.oneofs_by_name['payload']
+_UPLOADSTATUS.fields_by_name['received'].message_type = _BYTERANGE
 DESCRIPTOR.message_types_by_name['UploadResponse'] = _UPLOADRESPONSE
 DESCRIPTOR.message_types_by_name['UploadInfo'] = _UPLOADINFO
 DESCRIPTOR.message_types_by_name['UploadRequest'] = _UPLOADREQUEST
 DESCRIPTOR.message_types_by_name['RemoveRequest'] = _REMOVEREQUEST
 DESCRIPTOR.message_types_by_name['RemoveResponse'] = _REMOVERESPONSE
+DESCRIPTOR.message_types_by_name['StatRequest'] = _STATREQUEST
+DESCRIPTOR.message_types_by_name['StatResponse'] = _STATRESPONSE
+DESCRIPTOR.message_types_by_name['StartUploadRequest'] = _STARTUPLOADREQUEST
+DESCRIPTOR.message_types_by_name['ByteRange'] = _BYTERANGE
+DESCRIPTOR.message_types_by_name['UploadStatus'] = _UPLOADSTATUS
+DESCRIPTOR.message_types_by_name['UploadChunk'] = _UPLOADCHUNK
+DESCRIPTOR.message_types_by_name['UploadStatusRequest'] = _UPLOADSTATUSREQUEST
+DESCRIPTOR.message_types_by_name['FinishUploadRequest'] = _FINISHUPLOADREQUEST
+DESCRIPTOR.message_types_by_name['UsageRequest'] = _USAGEREQUEST
+DESCRIPTOR.message_types_by_name['Usage'] = _USAGE
+DESCRIPTOR.message_types_by_name['DownloadRequest'] = _DOWNLOADREQUEST
+DESCRIPTOR.message_types_by_name['DownloadChunk'] = _DOWNLOADCHUNK
+DESCRIPTOR.message_types_by_name['CreateArrayRequest'] = _CREATEARRAYREQUEST
+DESCRIPTOR.message_types_by_name['ArrayInfoRequest'] = _ARRAYINFOREQUEST
+DESCRIPTOR.message_types_by_name['ArrayInfo'] = _ARRAYINFO
+DESCRIPTOR.message_types_by_name['ArrayRegion'] = _ARRAYREGION
+DESCRIPTOR.message_types_by_name['WriteArrayResponse'] = _WRITEARRAYRESPONSE
+DESCRIPTOR.message_types_by_name['DownloadArrayRequest'] = _DOWNLOADARRAYREQUEST
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 UploadResponse = _reflection.GeneratedProtocolMessageType('UploadResponse', (_message.Message,), dict(
@@ -245,6 +1046,132 @@
   ))
 _sym_db.RegisterMessage(RemoveResponse)
 
+StatRequest = _reflection.GeneratedProtocolMessageType('StatRequest', (_message.Message,), dict(
+  DESCRIPTOR = _STATREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:StatRequest)
+  ))
+_sym_db.RegisterMessage(StatRequest)
+
+StatResponse = _reflection.GeneratedProtocolMessageType('StatResponse', (_message.Message,), dict(
+  DESCRIPTOR = _STATRESPONSE,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:StatResponse)
+  ))
+_sym_db.RegisterMessage(StatResponse)
+
+StartUploadRequest = _reflection.GeneratedProtocolMessageType('StartUploadRequest', (_message.Message,), dict(
+  DESCRIPTOR = _STARTUPLOADREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:StartUploadRequest)
+  ))
+_sym_db.RegisterMessage(StartUploadRequest)
+
+ByteRange = _reflection.GeneratedProtocolMessageType('ByteRange', (_message.Message,), dict(
+  DESCRIPTOR = _BYTERANGE,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:ByteRange)
+  ))
+_sym_db.RegisterMessage(ByteRange)
+
+UploadStatus = _reflection.GeneratedProtocolMessageType('UploadStatus', (_message.Message,), dict(
+  DESCRIPTOR = _UPLOADSTATUS,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:UploadStatus)
+  ))
+_sym_db.RegisterMessage(UploadStatus)
+
+UploadChunk = _reflection.GeneratedProtocolMessageType('UploadChunk', (_message.Message,), dict(
+  DESCRIPTOR = _UPLOADCHUNK,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:UploadChunk)
+  ))
+_sym_db.RegisterMessage(UploadChunk)
+
+UploadStatusRequest = _reflection.GeneratedProtocolMessageType('UploadStatusRequest', (_message.Message,), dict(
+  DESCRIPTOR = _UPLOADSTATUSREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:UploadStatusRequest)
+  ))
+_sym_db.RegisterMessage(UploadStatusRequest)
+
+FinishUploadRequest = _reflection.GeneratedProtocolMessageType('FinishUploadRequest', (_message.Message,), dict(
+  DESCRIPTOR = _FINISHUPLOADREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:FinishUploadRequest)
+  ))
+_sym_db.RegisterMessage(FinishUploadRequest)
+
+UsageRequest = _reflection.GeneratedProtocolMessageType('UsageRequest', (_message.Message,), dict(
+  DESCRIPTOR = _USAGEREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:UsageRequest)
+  ))
+_sym_db.RegisterMessage(UsageRequest)
+
+Usage = _reflection.GeneratedProtocolMessageType('Usage', (_message.Message,), dict(
+  DESCRIPTOR = _USAGE,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:Usage)
+  ))
+_sym_db.RegisterMessage(Usage)
+
+DownloadRequest = _reflection.GeneratedProtocolMessageType('DownloadRequest', (_message.Message,), dict(
+  DESCRIPTOR = _DOWNLOADREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:DownloadRequest)
+  ))
+_sym_db.RegisterMessage(DownloadRequest)
+
+DownloadChunk = _reflection.GeneratedProtocolMessageType('DownloadChunk', (_message.Message,), dict(
+  DESCRIPTOR = _DOWNLOADCHUNK,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:DownloadChunk)
+  ))
+_sym_db.RegisterMessage(DownloadChunk)
+
+CreateArrayRequest = _reflection.GeneratedProtocolMessageType('CreateArrayRequest', (_message.Message,), dict(
+  DESCRIPTOR = _CREATEARRAYREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:CreateArrayRequest)
+  ))
+_sym_db.RegisterMessage(CreateArrayRequest)
+
+ArrayInfoRequest = _reflection.GeneratedProtocolMessageType('ArrayInfoRequest', (_message.Message,), dict(
+  DESCRIPTOR = _ARRAYINFOREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:ArrayInfoRequest)
+  ))
+_sym_db.RegisterMessage(ArrayInfoRequest)
+
+ArrayInfo = _reflection.GeneratedProtocolMessageType('ArrayInfo', (_message.Message,), dict(
+  DESCRIPTOR = _ARRAYINFO,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:ArrayInfo)
+  ))
+_sym_db.RegisterMessage(ArrayInfo)
+
+ArrayRegion = _reflection.GeneratedProtocolMessageType('ArrayRegion', (_message.Message,), dict(
+  DESCRIPTOR = _ARRAYREGION,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:ArrayRegion)
+  ))
+_sym_db.RegisterMessage(ArrayRegion)
+
+WriteArrayResponse = _reflection.GeneratedProtocolMessageType('WriteArrayResponse', (_message.Message,), dict(
+  DESCRIPTOR = _WRITEARRAYRESPONSE,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:WriteArrayResponse)
+  ))
+_sym_db.RegisterMessage(WriteArrayResponse)
+
+DownloadArrayRequest = _reflection.GeneratedProtocolMessageType('DownloadArrayRequest', (_message.Message,), dict(
+  DESCRIPTOR = _DOWNLOADARRAYREQUEST,
+  __module__ = 'data_store_pb2'
+  # @@protoc_insertion_point(class_scope:DownloadArrayRequest)
+  ))
+_sym_db.RegisterMessage(DownloadArrayRequest)
+
 
 
 _DATASTORE = _descriptor.ServiceDescriptor(
@@ -253,8 +1180,8 @@
   file=DESCRIPTOR,
   index=0,
   serialized_options=None,
-  serialized_start=237,
-  serialized_end=340,
+  serialized_start=1390,
+  serialized_end=2046,
   methods=[
   _descriptor.MethodDescriptor(
     name='Upload',
@@ -274,6 +1201,105 @@
     output_type=_REMOVERESPONSE,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='Download',
+    full_name='DataStore.Download',
+    index=2,
+    containing_service=None,
+    input_type=_DOWNLOADREQUEST,
+    output_type=_DOWNLOADCHUNK,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='Stat',
+    full_name='DataStore.Stat',
+    index=3,
+    containing_service=None,
+    input_type=_STATREQUEST,
+    output_type=_STATRESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetUsage',
+    full_name='DataStore.GetUsage',
+    index=4,
+    containing_service=None,
+    input_type=_USAGEREQUEST,
+    output_type=_USAGE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='StartUpload',
+    full_name='DataStore.StartUpload',
+    index=5,
+    containing_service=None,
+    input_type=_STARTUPLOADREQUEST,
+    output_type=_UPLOADSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='UploadChunks',
+    full_name='DataStore.UploadChunks',
+    index=6,
+    containing_service=None,
+    input_type=_UPLOADCHUNK,
+    output_type=_UPLOADSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetUploadStatus',
+    full_name='DataStore.GetUploadStatus',
+    index=7,
+    containing_service=None,
+    input_type=_UPLOADSTATUSREQUEST,
+    output_type=_UPLOADSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='FinishUpload',
+    full_name='DataStore.FinishUpload',
+    index=8,
+    containing_service=None,
+    input_type=_FINISHUPLOADREQUEST,
+    output_type=_UPLOADRESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='CreateArray',
+    full_name='DataStore.CreateArray',
+    index=9,
+    containing_service=None,
+    input_type=_CREATEARRAYREQUEST,
+    output_type=_ARRAYINFO,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetArrayInfo',
+    full_name='DataStore.GetArrayInfo',
+    index=10,
+    containing_service=None,
+    input_type=_ARRAYINFOREQUEST,
+    output_type=_ARRAYINFO,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='WriteArray',
+    full_name='DataStore.WriteArray',
+    index=11,
+    containing_service=None,
+    input_type=_ARRAYREGION,
+    output_type=_WRITEARRAYRESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='DownloadArray',
+    full_name='DataStore.DownloadArray',
+    index=12,
+    containing_service=None,
+    input_type=_DOWNLOADARRAYREQUEST,
+    output_type=_ARRAYREGION,
+    serialized_options=None,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_DATASTORE)
 
@@ -24,6 +24,61 @@ def __init__(self, channel):
         request_serializer=data__store__pb2.RemoveRequest.SerializeToString,
         response_deserializer=data__store__pb2.RemoveResponse.FromString,
         )
+    self.Download = channel.unary_stream(
+        '/DataStore/Download',
+        request_serializer=data__store__pb2.DownloadRequest.SerializeToString,
+        response_deserializer=data__store__pb2.DownloadChunk.FromString,
+        )
+    self.Stat = channel.unary_unary(
+        '/DataStore/Stat',
+        request_serializer=data__store__pb2.StatRequest.SerializeToString,
+        response_deserializer=data__store__pb2.StatResponse.FromString,
+        )
+    self.GetUsage = channel.unary_unary(
+        '/DataStore/GetUsage',
+        request_serializer=data__store__pb2.UsageRequest.SerializeToString,
+        response_deserializer=data__store__pb2.Usage.FromString,
+        )
+    self.StartUpload = channel.unary_unary(
+        '/DataStore/StartUpload',
+        request_serializer=data__store__pb2.StartUploadRequest.SerializeToString,
+        response_deserializer=data__store__pb2.UploadStatus.FromString,
+        )
+    self.UploadChunks = channel.stream_unary(
+        '/DataStore/UploadChunks',
+        request_serializer=data__store__pb2.UploadChunk.SerializeToString,
+        response_deserializer=data__store__pb2.UploadStatus.FromString,
+        )
+    self.GetUploadStatus = channel.unary_unary(
+        '/DataStore/GetUploadStatus',
+        request_serializer=data__store__pb2.UploadStatusRequest.SerializeToString,
+        response_deserializer=data__store__pb2.UploadStatus.FromString,
+        )
+    self.FinishUpload = channel.unary_unary(
+        '/DataStore/FinishUpload',
+        request_serializer=data__store__pb2.FinishUploadRequest.SerializeToString,
+        response_deserializer=data__store__pb2.UploadResponse.FromString,
+        )
+    self.CreateArray = channel.unary_unary(
+        '/DataStore/CreateArray',
+        request_serializer=data__store__pb2.CreateArrayRequest.SerializeToString,
+        response_deserializer=data__store__pb2.ArrayInfo.FromString,
+        )
+    self.GetArrayInfo = channel.unary_unary(
+        '/DataStore/GetArrayInfo',
+        request_serializer=data__store__pb2.ArrayInfoRequest.SerializeToString,
+        response_deserializer=data__store__pb2.ArrayInfo.FromString,
+        )
+    self.WriteArray = channel.stream_unary(
+        '/DataStore/WriteArray',
+        request_serializer=data__store__pb2.ArrayRegion.SerializeToString,
+        response_deserializer=data__store__pb2.WriteArrayResponse.FromString,
+        )
+    self.DownloadArray = channel.unary_stream(
+        '/DataStore/DownloadArray',
+        request_serializer=data__store__pb2.DownloadArrayRequest.SerializeToString,
+        response_deserializer=data__store__pb2.ArrayRegion.FromString,
+        )
 
 
 class DataStoreServicer(object):
@@ -44,6 +99,83 @@ def Remove(self, request, context):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def Download(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def Stat(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetUsage(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def StartUpload(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def UploadChunks(self, request_iterator, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetUploadStatus(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def FinishUpload(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def CreateArray(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetArrayInfo(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def WriteArray(self, request_iterator, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def DownloadArray(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_DataStoreServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -57,6 +189,61 @@ def add_DataStoreServicer_to_server(servicer, server):
           request_deserializer=data__store__pb2.RemoveRequest.FromString,
           response_serializer=data__store__pb2.RemoveResponse.SerializeToString,
       ),
+      'Download': grpc.unary_stream_rpc_method_handler(
+          servicer.Download,
+          request_deserializer=data__store__pb2.DownloadRequest.FromString,
+          response_serializer=data__store__pb2.DownloadChunk.SerializeToString,
+      ),
+      'Stat': grpc.unary_unary_rpc_method_handler(
+          servicer.Stat,
+          request_deserializer=data__store__pb2.StatRequest.FromString,
+          response_serializer=data__store__pb2.StatResponse.SerializeToString,
+      ),
+      'GetUsage': grpc.unary_unary_rpc_method_handler(
+          servicer.GetUsage,
+          request_deserializer=data__store__pb2.UsageRequest.FromString,
+          response_serializer=data__store__pb2.Usage.SerializeToString,
+      ),
+      'StartUpload': grpc.unary_unary_rpc_method_handler(
+          servicer.StartUpload,
+          request_deserializer=data__store__pb2.StartUploadRequest.FromString,
+          response_serializer=data__store__pb2.UploadStatus.SerializeToString,
+      ),
+      'UploadChunks': grpc.stream_unary_rpc_method_handler(
+          servicer.UploadChunks,
+          request_deserializer=data__store__pb2.UploadChunk.FromString,
+          response_serializer=data__store__pb2.UploadStatus.SerializeToString,
+      ),
+      'GetUploadStatus': grpc.unary_unary_rpc_method_handler(
+          servicer.GetUploadStatus,
+          request_deserializer=data__store__pb2.UploadStatusRequest.FromString,
+          response_serializer=data__store__pb2.UploadStatus.SerializeToString,
+      ),
+      'FinishUpload': grpc.unary_unary_rpc_method_handler(
+          servicer.FinishUpload,
+          request_deserializer=data__store__pb2.FinishUploadRequest.FromString,
+          response_serializer=data__store__pb2.UploadResponse.SerializeToString,
+      ),
+      'CreateArray': grpc.unary_unary_rpc_method_handler(
+          servicer.CreateArray,
+          request_deserializer=data__store__pb2.CreateArrayRequest.FromString,
+          response_serializer=data__store__pb2.ArrayInfo.SerializeToString,
+      ),
+      'GetArrayInfo': grpc.unary_unary_rpc_method_handler(
+          servicer.GetArrayInfo,
+          request_deserializer=data__store__pb2.ArrayInfoRequest.FromString,
+          response_serializer=data__store__pb2.ArrayInfo.SerializeToString,
+      ),
+      'WriteArray': grpc.stream_unary_rpc_method_handler(
+          servicer.WriteArray,
+          request_deserializer=data__store__pb2.ArrayRegion.FromString,
+          response_serializer=data__store__pb2.WriteArrayResponse.SerializeToString,
+      ),
+      'DownloadArray': grpc.unary_stream_rpc_method_handler(
+          servicer.DownloadArray,
+          request_deserializer=data__store__pb2.DownloadArrayRequest.FromString,
+          response_serializer=data__store__pb2.ArrayRegion.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'DataStore', rpc_method_handlers)
@@ -19,7 +19,7 @@
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x0finference.proto\"Y\n\x06\x44\x65vice\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1e\n\x06status\x18\x02 \x01(\x0e\x32\x0e.Device.Status\"#\n\x06Status\x12\r\n\tAVAILABLE\x10\x00\x12\n\n\x06IN_USE\x10\x01\"W\n\x1f\x43reateDatasetDescriptionRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x0c\n\x04mean\x18\x03 \x01(\x01\x12\x0e\n\x06stddev\x18\x04 \x01(\x01\" \n\x12\x44\x61tasetDescription\x12\n\n\x02id\x18\x01 \x01(\t\"\'\n\x04\x42lob\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\"i\n\x19\x43reateModelSessionRequest\x12\x13\n\tmodel_uri\x18\x01 \x01(\tH\x00\x12\x1b\n\nmodel_blob\x18\x02 \x01(\x0b\x32\x05.BlobH\x00\x12\x11\n\tdeviceIds\x18\x05 \x03(\tB\x07\n\x05model\"!\n\x05Shape\x12\x18\n\x04\x64ims\x18\x01 \x03(\x0b\x32\n.TensorDim\"\x9b\x01\n\x0cModelSession\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tinputAxes\x18\x03 \x01(\t\x12\x12\n\noutputAxes\x18\x04 \x01(\t\x12\x13\n\x0bhasTraining\x18\x05 \x01(\x08\x12\x1b\n\x0bvalidShapes\x18\x06 \x03(\x0b\x32\x06.Shape\x12\x18\n\x04halo\x18\x07 \x03(\x0b\x32\n.TensorDim\"\x9e\x01\n\x08LogEntry\x12\x11\n\ttimestamp\x18\x01 \x01(\r\x12\x1e\n\x05level\x18\x02 \x01(\x0e\x32\x0f.LogEntry.Level\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"N\n\x05Level\x12\n\n\x06NOTSET\x10\x00\x12\t\n\x05\x44\x45\x42UG\x10\x01\x12\x08\n\x04INFO\x10\x02\x12\x0b\n\x07WARNING\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x12\x0c\n\x08\x43RITICAL\x10\x05\"#\n\x07\x44\x65vices\x12\x18\n\x07\x64\x65vices\x18\x01 \x03(\x0b\x32\x07.Device\"\'\n\tTensorDim\x12\x0c\n\x04size\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\"B\n\x06Tensor\x12\x0e\n\x06\x62uffer\x18\x01 \x01(\x0c\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x19\n\x05shape\x18\x03 \x03(\x0b\x32\n.TensorDim\"T\n\x0ePredictRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x17\n\x06tensor\x18\x02 \x01(\x0b\x32\x07.Tensor\x12\x11\n\tdatasetId\x18\x03 \x01(\t\"*\n\x0fPredictResponse\x12\x17\n\x06tensor\x18\x01 \x01(\x0b\x32\x07.Tensor\"\x07\n\x05\x45mpty\"\x1e\n\tModelInfo\x12\x11\n\tdeviceIds\x18\x01 \x03(\t\"^\n CreateModelSessionChunkedRequest\x12\x1a\n\x04info\x18\x01 \x01(\x0b\x32\n.ModelInfoH\x00\x12\x16\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x05.BlobH\x00\x42\x06\n\x04\x64\x61ta2\xc6\x02\n\tInference\x12\x41\n\x12\x43reateModelSession\x12\x1a.CreateModelSessionRequest\x1a\r.ModelSession\"\x00\x12,\n\x11\x43loseModelSession\x12\r.ModelSession\x1a\x06.Empty\"\x00\x12S\n\x18\x43reateDatasetDescription\x12 .CreateDatasetDescriptionRequest\x1a\x13.DatasetDescription\"\x00\x12 \n\x07GetLogs\x12\x06.Empty\x1a\t.LogEntry\"\x00\x30\x01\x12!\n\x0bListDevices\x12\x06.Empty\x1a\x08.Devices\"\x00\x12.\n\x07Predict\x12\x0f.PredictRequest\x1a\x10.PredictResponse\"\x00\x32G\n\rFlightControl\x12\x18\n\x04Ping\x12\x06.Empty\x1a\x06.Empty\"\x00\x12\x1c\n\x08Shutdown\x12\x06.Empty\x1a\x06.Empty\"\x00\x62\x06proto3')
+  serialized_pb=_b('\n\x0finference.proto\"\x85\x01\n\x06\x44\x65vice\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1e\n\x06status\x18\x02 \x01(\x0e\x32\x0e.Device.Status\x12\x12\n\ntotalCores\x18\x03 \x01(\r\x12\x16\n\x0e\x61vailableCores\x18\x04 \x01(\r\"#\n\x06Status\x12\r\n\tAVAILABLE\x10\x00\x12\n\n\x06IN_USE\x10\x01\"W\n\x1f\x43reateDatasetDescriptionRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x0c\n\x04mean\x18\x03 \x01(\x01\x12\x0e\n\x06stddev\x18\x04 \x01(\x01\"H\n\x12\x44\x61tasetDescription\x12\n\n\x02id\x18\x01 \x01(\t\x12&\n\nstatistics\x18\x02 \x01(\x0b\x32\x12.DatasetStatistics\"?\n\x19\x44\x61tasetDescriptionRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\n\n\x02id\x18\x02 \x01(\t\"\x89\x01\n\x18\x44\x61tasetStatisticsRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x10\n\x08volumeId\x18\x02 \x01(\t\x12\x17\n\x06tensor\x18\x03 \x01(\x0b\x32\x07.Tensor\x12\x13\n\x0bpercentiles\x18\x04 \x03(\x01\x12\x15\n\rhistogramBins\x18\x05 \x01(\r\"\xb6\x01\n\x11\x44\x61tasetStatistics\x12\r\n\x05\x63ount\x18\x01 \x01(\x04\x12\x0c\n\x04mean\x18\x02 \x01(\x01\x12\x10\n\x08variance\x18\x03 \x01(\x01\x12\x0b\n\x03min\x18\x04 \x01(\x01\x12\x0b\n\x03max\x18\x05 \x01(\x01\x12\x13\n\x0bpercentiles\x18\x06 \x03(\x01\x12\x18\n\x10percentileValues\x18\x07 \x03(\x01\x12\x11\n\thistogram\x18\x08 \x03(\x04\x12\x16\n\x0ehistogramEdges\x18\t \x03(\x01\"\'\n\x04\x42lob\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\"{\n\x19\x43reateModelSessionRequest\x12\x13\n\tmodel_uri\x18\x01 \x01(\tH\x00\x12\x1b\n\nmodel_blob\x18\x02 \x01(\x0b\x32\x05.BlobH\x00\x12\x11\n\tdeviceIds\x18\x05 \x03(\t\x12\x10\n\x08\x63puCores\x18\x06 \x01(\rB\x07\n\x05model\"!\n\x05Shape\x12\x18\n\x04\x64ims\x18\x01 \x03(\x0b\x32\n.TensorDim\"\x9b\x01\n\x0cModelSession\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tinputAxes\x18\x03 \x01(\t\x12\x12\n\noutputAxes\x18\x04 \x01(\t\x12\x13\n\x0bhasTraining\x18\x05 \x01(\x08\x12\x1b\n\x0bvalidShapes\x18\x06 \x03(\x0b\x32\x06.Shape\x12\x18\n\x04halo\x18\x07 \x03(\x0b\x32\n.TensorDim\"\x9e\x01\n\x08LogEntry\x12\x11\n\ttimestamp\x18\x01 \x01(\r\x12\x1e\n\x05level\x18\x02 \x01(\x0e\x32\x0f.LogEntry.Level\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"N\n\x05Level\x12\n\n\x06NOTSET\x10\x00\x12\t\n\x05\x44\x45\x42UG\x10\x01\x12\x08\n\x04INFO\x10\x02\x12\x0b\n\x07WARNING\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x12\x0c\n\x08\x43RITICAL\x10\x05\"#\n\x07\x44\x65vices\x12\x18\n\x07\x64\x65vices\x18\x01 \x03(\x0b\x32\x07.Device\"\'\n\tTensorDim\x12\x0c\n\x04size\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\"B\n\x06Tensor\x12\x0e\n\x06\x62uffer\x18\x01 \x01(\x0c\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x19\n\x05shape\x18\x03 \x03(\x0b\x32\n.TensorDim\"V\n\x0cSharedTensor\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\r\n\x05\x64type\x18\x03 \x01(\t\x12\x19\n\x05shape\x18\x04 \x03(\x0b\x32\n.TensorDim\"\xda\x01\n\x0ePredictRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x17\n\x06tensor\x18\x02 \x01(\x0b\x32\x07.Tensor\x12\x11\n\tdatasetId\x18\x03 \x01(\t\x12#\n\x0csharedTensor\x18\x04 \x01(\x0b\x32\r.SharedTensor\x12#\n\x0csharedOutput\x18\x05 \x01(\x0b\x32\r.SharedTensor\x12#\n\x0cvolumeRegion\x18\x06 \x01(\x0b\x32\r.VolumeRegion\x12\x15\n\routputArrayId\x18\x07 \x01(\t\"=\n\x0cVolumeRegion\x12\x10\n\x08uploadId\x18\x01 \x01(\t\x12\r\n\x05start\x18\x02 \x03(\x03\x12\x0c\n\x04stop\x18\x03 \x03(\x03\"g\n\x0fPredictResponse\x12\x17\n\x06tensor\x18\x01 \x01(\x0b\x32\x07.Tensor\x12#\n\x0csharedTensor\x18\x02 \x01(\x0b\x32\r.SharedTensor\x12\x16\n\x0erestoreSeconds\x18\x03 \x01(\x01\"\x07\n\x05\x45mpty\"\x1e\n\tModelInfo\x12\x11\n\tdeviceIds\x18\x01 \x03(\t\"^\n CreateModelSessionChunkedRequest\x12\x1a\n\x04info\x18\x01 \x01(\x0b\x32\n.ModelInfoH\x00\x12\x16\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x05.BlobH\x00\x42\x06\n\x04\x64\x61ta\"\xba\x01\n\x14PredictionJobRequest\x12\x16\n\x0emodelSessionId\x18\x01 \x01(\t\x12\x10\n\x08volumeId\x18\x02 \x01(\t\x12\x15\n\routputArrayId\x18\x03 \x01(\t\x12\x14\n\x0coutputChunks\x18\x04 \x03(\x04\x12\x19\n\x11outputCompression\x18\x05 \x01(\t\x12\x1d\n\ttileShape\x18\x06 \x03(\x0b\x32\n.TensorDim\x12\x11\n\tdatasetId\x18\x07 \x01(\t\"\x1b\n\nJobRequest\x12\r\n\x05jobId\x18\x01 \x01(\t\"\xd0\x01\n\tJobStatus\x12\r\n\x05jobId\x18\x01 \x01(\t\x12\x1f\n\x05state\x18\x02 \x01(\x0e\x32\x10.JobStatus.State\x12\x11\n\ttilesDone\x18\x03 \x01(\x04\x12\x12\n\ntilesTotal\x18\x04 \x01(\x04\x12\x15\n\routputArrayId\x18\x05 \x01(\t\x12\r\n\x05\x65rror\x18\x06 \x01(\t\"F\n\x05State\x12\x0b\n\x07PENDING\x10\x00\x12\x0b\n\x07RUNNING\x10\x01\x12\x08\n\x04\x44ONE\x10\x02\x12\n\n\x06\x46\x41ILED\x10\x03\x12\r\n\tCANCELLED\x10\x04\x32\xe7\x05\n\tInference\x12\x41\n\x12\x43reateModelSession\x12\x1a.CreateModelSessionRequest\x1a\r.ModelSession\"\x00\x12,\n\x11\x43loseModelSession\x12\r.ModelSession\x1a\x06.Empty\"\x00\x12S\n\x18\x43reateDatasetDescription\x12 .CreateDatasetDescriptionRequest\x1a\x13.DatasetDescription\"\x00\x12L\n\x18\x43omputeDatasetStatistics\x12\x19.DatasetStatisticsRequest\x1a\x13.DatasetDescription\"\x00\x12M\n\x17\x43omputeStreamStatistics\x12\x19.DatasetStatisticsRequest\x1a\x13.DatasetDescription\"\x00(\x01\x12J\n\x15GetDatasetDescription\x12\x1a.DatasetDescriptionRequest\x1a\x13.DatasetDescription\"\x00\x12 \n\x07GetLogs\x12\x06.Empty\x1a\t.LogEntry\"\x00\x30\x01\x12!\n\x0bListDevices\x12\x06.Empty\x1a\x08.Devices\"\x00\x12.\n\x07Predict\x12\x0f.PredictRequest\x1a\x10.PredictResponse\"\x00\x12:\n\x13SubmitPredictionJob\x12\x15.PredictionJobRequest\x1a\n.JobStatus\"\x00\x12)\n\x0cGetJobStatus\x12\x0b.JobRequest\x1a\n.JobStatus\"\x00\x12\'\n\x08WatchJob\x12\x0b.JobRequest\x1a\n.JobStatus\"\x00\x30\x01\x12&\n\tCancelJob\x12\x0b.JobRequest\x1a\n.JobStatus\"\x00\x32G\n\rFlightControl\x12\x18\n\x04Ping\x12\x06.Empty\x1a\x06.Empty\"\x00\x12\x1c\n\x08Shutdown\x12\x06.Empty\x1a\x06.Empty\"\x00\x62\x06proto3')
 )
 
 
@@ -41,8 +41,8 @@
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=73,
-  serialized_end=108,
+  serialized_start=118,
+  serialized_end=153,
 )
 _sym_db.RegisterEnumDescriptor(_DEVICE_STATUS)
 
@@ -79,11 +79,45 @@
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=655,
-  serialized_end=733,
+  serialized_start=1148,
+  serialized_end=1226,
 )
 _sym_db.RegisterEnumDescriptor(_LOGENTRY_LEVEL)
 
+_JOBSTATUS_STATE = _descriptor.EnumDescriptor(
+  name='State',
+  full_name='JobStatus.State',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='PENDING', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='RUNNING', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='DONE', index=2, number=2,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='FAILED', index=3, number=3,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='CANCELLED', index=4, number=4,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=2345,
+  serialized_end=2415,
+)
+_sym_db.RegisterEnumDescriptor(_JOBSTATUS_STATE)
+
 
 _DEVICE = _descriptor.Descriptor(
   name='Device',
@@ -106,6 +140,20 @@
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='totalCores', full_name='Device.totalCores', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='availableCores', full_name='Device.availableCores', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -119,8 +167,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=19,
-  serialized_end=108,
+  serialized_start=20,
+  serialized_end=153,
 )
 
 
@@ -164,8 +212,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=110,
-  serialized_end=197,
+  serialized_start=155,
+  serialized_end=242,
 )
 
 
@@ -183,6 +231,13 @@
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='statistics', full_name='DatasetDescription.statistics', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -195,8 +250,192 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=199,
-  serialized_end=231,
+  serialized_start=244,
+  serialized_end=316,
+)
+
+
+_DATASETDESCRIPTIONREQUEST = _descriptor.Descriptor(
+  name='DatasetDescriptionRequest',
+  full_name='DatasetDescriptionRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='modelSessionId', full_name='DatasetDescriptionRequest.modelSessionId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='id', full_name='DatasetDescriptionRequest.id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=318,
+  serialized_end=381,
+)
+
+
+_DATASETSTATISTICSREQUEST = _descriptor.Descriptor(
+  name='DatasetStatisticsRequest',
+  full_name='DatasetStatisticsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='modelSessionId', full_name='DatasetStatisticsRequest.modelSessionId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='volumeId', full_name='DatasetStatisticsRequest.volumeId', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='tensor', full_name='DatasetStatisticsRequest.tensor', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='percentiles', full_name='DatasetStatisticsRequest.percentiles', index=3,
+      number=4, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='histogramBins', full_name='DatasetStatisticsRequest.histogramBins', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=384,
+  serialized_end=521,
+)
+
+
+_DATASETSTATISTICS = _descriptor.Descriptor(
+  name='DatasetStatistics',
+  full_name='DatasetStatistics',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='count', full_name='DatasetStatistics.count', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='mean', full_name='DatasetStatistics.mean', index=1,
+      number=2, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='variance', full_name='DatasetStatistics.variance', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='min', full_name='DatasetStatistics.min', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='max', full_name='DatasetStatistics.max', index=4,
+      number=5, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='percentiles', full_name='DatasetStatistics.percentiles', index=5,
+      number=6, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='percentileValues', full_name='DatasetStatistics.percentileValues', index=6,
+      number=7, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='histogram', full_name='DatasetStatistics.histogram', index=7,
+      number=8, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='histogramEdges', full_name='DatasetStatistics.histogramEdges', index=8,
+      number=9, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=524,
+  serialized_end=706,
 )
 
 
@@ -233,8 +472,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=233,
-  serialized_end=272,
+  serialized_start=708,
+  serialized_end=747,
 )
 
 
@@ -266,6 +505,13 @@
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='cpuCores', full_name='CreateModelSessionRequest.cpuCores', index=3,
+      number=6, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -281,8 +527,8 @@
       name='model', full_name='CreateModelSessionRequest.model',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=274,
-  serialized_end=379,
+  serialized_start=749,
+  serialized_end=872,
 )
 
 
@@ -312,8 +558,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=381,
-  serialized_end=414,
+  serialized_start=874,
+  serialized_end=907,
 )
 
 
@@ -385,8 +631,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=417,
-  serialized_end=572,
+  serialized_start=910,
+  serialized_end=1065,
 )
 
 
@@ -431,8 +677,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=575,
-  serialized_end=733,
+  serialized_start=1068,
+  serialized_end=1226,
 )
 
 
@@ -462,8 +708,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=735,
-  serialized_end=770,
+  serialized_start=1228,
+  serialized_end=1263,
 )
 
 
@@ -500,8 +746,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=772,
-  serialized_end=811,
+  serialized_start=1265,
+  serialized_end=1304,
 )
 
 
@@ -545,8 +791,60 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=813,
-  serialized_end=879,
+  serialized_start=1306,
+  serialized_end=1372,
+)
+
+
+_SHAREDTENSOR = _descriptor.Descriptor(
+  name='SharedTensor',
+  full_name='SharedTensor',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='path', full_name='SharedTensor.path', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='SharedTensor.offset', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='dtype', full_name='SharedTensor.dtype', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='shape', full_name='SharedTensor.shape', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1374,
+  serialized_end=1460,
 )
 
 
@@ -578,6 +876,79 @@
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sharedTensor', full_name='PredictRequest.sharedTensor', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sharedOutput', full_name='PredictRequest.sharedOutput', index=4,
+      number=5, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='volumeRegion', full_name='PredictRequest.volumeRegion', index=5,
+      number=6, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='outputArrayId', full_name='PredictRequest.outputArrayId', index=6,
+      number=7, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1463,
+  serialized_end=1681,
+)
+
+
+_VOLUMEREGION = _descriptor.Descriptor(
+  name='VolumeRegion',
+  full_name='VolumeRegion',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='uploadId', full_name='VolumeRegion.uploadId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='start', full_name='VolumeRegion.start', index=1,
+      number=2, type=3, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='stop', full_name='VolumeRegion.stop', index=2,
+      number=3, type=3, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -590,8 +961,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=881,
-  serialized_end=965,
+  serialized_start=1683,
+  serialized_end=1744,
 )
 
 
@@ -609,6 +980,20 @@
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sharedTensor', full_name='PredictResponse.sharedTensor', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='restoreSeconds', full_name='PredictResponse.restoreSeconds', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -621,8 +1006,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=967,
-  serialized_end=1009,
+  serialized_start=1746,
+  serialized_end=1849,
 )
 
 
@@ -645,8 +1030,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1011,
-  serialized_end=1018,
+  serialized_start=1851,
+  serialized_end=1858,
 )
 
 
@@ -676,8 +1061,8 @@
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1020,
-  serialized_end=1050,
+  serialized_start=1860,
+  serialized_end=1890,
 )
 
 
@@ -717,12 +1102,185 @@
       name='data', full_name='CreateModelSessionChunkedRequest.data',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=1052,
-  serialized_end=1146,
+  serialized_start=1892,
+  serialized_end=1986,
+)
+
+
+_PREDICTIONJOBREQUEST = _descriptor.Descriptor(
+  name='PredictionJobRequest',
+  full_name='PredictionJobRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='modelSessionId', full_name='PredictionJobRequest.modelSessionId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='volumeId', full_name='PredictionJobRequest.volumeId', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='outputArrayId', full_name='PredictionJobRequest.outputArrayId', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='outputChunks', full_name='PredictionJobRequest.outputChunks', index=3,
+      number=4, type=4, cpp_type=4, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='outputCompression', full_name='PredictionJobRequest.outputCompression', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='tileShape', full_name='PredictionJobRequest.tileShape', index=5,
+      number=6, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='datasetId', full_name='PredictionJobRequest.datasetId', index=6,
+      number=7, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1989,
+  serialized_end=2175,
+)
+
+
+_JOBREQUEST = _descriptor.Descriptor(
+  name='JobRequest',
+  full_name='JobRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='jobId', full_name='JobRequest.jobId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2177,
+  serialized_end=2204,
+)
+
+
+_JOBSTATUS = _descriptor.Descriptor(
+  name='JobStatus',
+  full_name='JobStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='jobId', full_name='JobStatus.jobId', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='state', full_name='JobStatus.state', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='tilesDone', full_name='JobStatus.tilesDone', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='tilesTotal', full_name='JobStatus.tilesTotal', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='outputArrayId', full_name='JobStatus.outputArrayId', index=4,
+      number=5, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='JobStatus.error', index=5,
+      number=6, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _JOBSTATUS_STATE,
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2207,
+  serialized_end=2415,
 )
 
 _DEVICE.fields_by_name['status'].enum_type = _DEVICE_STATUS
 _DEVICE_STATUS.containing_type = _DEVICE
+_DATASETDESCRIPTION.fields_by_name['statistics'].message_type = _DATASETSTATISTICS
+_DATASETSTATISTICSREQUEST.fields_by_name['tensor'].message_type = _TENSOR
 _CREATEMODELSESSIONREQUEST.fields_by_name['model_blob'].message_type = _BLOB
 _CREATEMODELSESSIONREQUEST.oneofs_by_name['model'].fields.append(
   _CREATEMODELSESSIONREQUEST.fields_by_name['model_uri'])
@@ -737,8 +1295,13 @@
 _LOGENTRY_LEVEL.containing_type = _LOGENTRY
 _DEVICES.fields_by_name['devices'].message_type = _DEVICE
 _TENSOR.fields_by_name['shape'].message_type = _TENSORDIM
+_SHAREDTENSOR.fields_by_name['shape'].message_type = _TENSORDIM
 _PREDICTREQUEST.fields_by_name['tensor'].message_type = _TENSOR
+_PREDICTREQUEST.fields_by_name['sharedTensor'].message_type = _SHAREDTENSOR
+_PREDICTREQUEST.fields_by_name['sharedOutput'].message_type = _SHAREDTENSOR
+_PREDICTREQUEST.fields_by_name['volumeRegion'].message_type = _VOLUMEREGION
 _PREDICTRESPONSE.fields_by_name['tensor'].message_type = _TENSOR
+_PREDICTRESPONSE.fields_by_name['sharedTensor'].message_type = _SHAREDTENSOR
 _CREATEMODELSESSIONCHUNKEDREQUEST.fields_by_name['info'].message_type = _MODELINFO
 _CREATEMODELSESSIONCHUNKEDREQUEST.fields_by_name['chunk'].message_type = _BLOB
 _CREATEMODELSESSIONCHUNKEDREQUEST.oneofs_by_name['data'].fields.append(
@@ -747,9 +1310,15 @@
 _CREATEMODELSESSIONCHUNKEDREQUEST.oneofs_by_name['data'].fields.append(
   _CREATEMODELSESSIONCHUNKEDREQUEST.fields_by_name['chunk'])
 _CREATEMODELSESSIONCHUNKEDREQUEST.fields_by_name['chunk'].containing_oneof = _CREATEMODELSESSIONCHUNKEDREQUEST.oneofs_by_name['data']
+_PREDICTIONJOBREQUEST.fields_by_name['tileShape'].message_type = _TENSORDIM
+_JOBSTATUS.fields_by_name['state'].enum_type = _JOBSTATUS_STATE
+_JOBSTATUS_STATE.containing_type = _JOBSTATUS
 DESCRIPTOR.message_types_by_name['Device'] = _DEVICE
 DESCRIPTOR.message_types_by_name['CreateDatasetDescriptionRequest'] = _CREATEDATASETDESCRIPTIONREQUEST
 DESCRIPTOR.message_types_by_name['DatasetDescription'] = _DATASETDESCRIPTION
+DESCRIPTOR.message_types_by_name['DatasetDescriptionRequest'] = _DATASETDESCRIPTIONREQUEST
+DESCRIPTOR.message_types_by_name['DatasetStatisticsRequest'] = _DATASETSTATISTICSREQUEST
+DESCRIPTOR.message_types_by_name['DatasetStatistics'] = _DATASETSTATISTICS
 DESCRIPTOR.message_types_by_name['Blob'] = _BLOB
 DESCRIPTOR.message_types_by_name['CreateModelSessionRequest'] = _CREATEMODELSESSIONREQUEST
 DESCRIPTOR.message_types_by_name['Shape'] = _SHAPE
@@ -758,11 +1327,16 @@
 DESCRIPTOR.message_types_by_name['Devices'] = _DEVICES
 DESCRIPTOR.message_types_by_name['TensorDim'] = _TENSORDIM
 DESCRIPTOR.message_types_by_name['Tensor'] = _TENSOR
+DESCRIPTOR.message_types_by_name['SharedTensor'] = _SHAREDTENSOR
 DESCRIPTOR.message_types_by_name['PredictRequest'] = _PREDICTREQUEST
+DESCRIPTOR.message_types_by_name['VolumeRegion'] = _VOLUMEREGION
 DESCRIPTOR.message_types_by_name['PredictResponse'] = _PREDICTRESPONSE
 DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
 DESCRIPTOR.message_types_by_name['ModelInfo'] = _MODELINFO
 DESCRIPTOR.message_types_by_name['CreateModelSessionChunkedRequest'] = _CREATEMODELSESSIONCHUNKEDREQUEST
+DESCRIPTOR.message_types_by_name['PredictionJobRequest'] = _PREDICTIONJOBREQUEST
+DESCRIPTOR.message_types_by_name['JobRequest'] = _JOBREQUEST
+DESCRIPTOR.message_types_by_name['JobStatus'] = _JOBSTATUS
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 Device = _reflection.GeneratedProtocolMessageType('Device', (_message.Message,), dict(
@@ -786,6 +1360,27 @@
   ))
 _sym_db.RegisterMessage(DatasetDescription)
 
+DatasetDescriptionRequest = _reflection.GeneratedProtocolMessageType('DatasetDescriptionRequest', (_message.Message,), dict(
+  DESCRIPTOR = _DATASETDESCRIPTIONREQUEST,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:DatasetDescriptionRequest)
+  ))
+_sym_db.RegisterMessage(DatasetDescriptionRequest)
+
+DatasetStatisticsRequest = _reflection.GeneratedProtocolMessageType('DatasetStatisticsRequest', (_message.Message,), dict(
+  DESCRIPTOR = _DATASETSTATISTICSREQUEST,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:DatasetStatisticsRequest)
+  ))
+_sym_db.RegisterMessage(DatasetStatisticsRequest)
+
+DatasetStatistics = _reflection.GeneratedProtocolMessageType('DatasetStatistics', (_message.Message,), dict(
+  DESCRIPTOR = _DATASETSTATISTICS,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:DatasetStatistics)
+  ))
+_sym_db.RegisterMessage(DatasetStatistics)
+
 Blob = _reflection.GeneratedProtocolMessageType('Blob', (_message.Message,), dict(
   DESCRIPTOR = _BLOB,
   __module__ = 'inference_pb2'
@@ -842,6 +1437,13 @@
   ))
 _sym_db.RegisterMessage(Tensor)
 
+SharedTensor = _reflection.GeneratedProtocolMessageType('SharedTensor', (_message.Message,), dict(
+  DESCRIPTOR = _SHAREDTENSOR,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:SharedTensor)
+  ))
+_sym_db.RegisterMessage(SharedTensor)
+
 PredictRequest = _reflection.GeneratedProtocolMessageType('PredictRequest', (_message.Message,), dict(
   DESCRIPTOR = _PREDICTREQUEST,
   __module__ = 'inference_pb2'
@@ -849,6 +1451,13 @@
   ))
 _sym_db.RegisterMessage(PredictRequest)
 
+VolumeRegion = _reflection.GeneratedProtocolMessageType('VolumeRegion', (_message.Message,), dict(
+  DESCRIPTOR = _VOLUMEREGION,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:VolumeRegion)
+  ))
+_sym_db.RegisterMessage(VolumeRegion)
+
 PredictResponse = _reflection.GeneratedProtocolMessageType('PredictResponse', (_message.Message,), dict(
   DESCRIPTOR = _PREDICTRESPONSE,
   __module__ = 'inference_pb2'
@@ -877,6 +1486,27 @@
   ))
 _sym_db.RegisterMessage(CreateModelSessionChunkedRequest)
 
+PredictionJobRequest = _reflection.GeneratedProtocolMessageType('PredictionJobRequest', (_message.Message,), dict(
+  DESCRIPTOR = _PREDICTIONJOBREQUEST,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:PredictionJobRequest)
+  ))
+_sym_db.RegisterMessage(PredictionJobRequest)
+
+JobRequest = _reflection.GeneratedProtocolMessageType('JobRequest', (_message.Message,), dict(
+  DESCRIPTOR = _JOBREQUEST,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:JobRequest)
+  ))
+_sym_db.RegisterMessage(JobRequest)
+
+JobStatus = _reflection.GeneratedProtocolMessageType('JobStatus', (_message.Message,), dict(
+  DESCRIPTOR = _JOBSTATUS,
+  __module__ = 'inference_pb2'
+  # @@protoc_insertion_point(class_scope:JobStatus)
+  ))
+_sym_db.RegisterMessage(JobStatus)
+
 
 
 _INFERENCE = _descriptor.ServiceDescriptor(
@@ -885,8 +1515,8 @@
   file=DESCRIPTOR,
   index=0,
   serialized_options=None,
-  serialized_start=1149,
-  serialized_end=1475,
+  serialized_start=2418,
+  serialized_end=3161,
   methods=[
   _descriptor.MethodDescriptor(
     name='CreateModelSession',
@@ -915,10 +1545,37 @@
     output_type=_DATASETDESCRIPTION,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='ComputeDatasetStatistics',
+    full_name='Inference.ComputeDatasetStatistics',
+    index=3,
+    containing_service=None,
+    input_type=_DATASETSTATISTICSREQUEST,
+    output_type=_DATASETDESCRIPTION,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='ComputeStreamStatistics',
+    full_name='Inference.ComputeStreamStatistics',
+    index=4,
+    containing_service=None,
+    input_type=_DATASETSTATISTICSREQUEST,
+    output_type=_DATASETDESCRIPTION,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetDatasetDescription',
+    full_name='Inference.GetDatasetDescription',
+    index=5,
+    containing_service=None,
+    input_type=_DATASETDESCRIPTIONREQUEST,
+    output_type=_DATASETDESCRIPTION,
+    serialized_options=None,
+  ),
   _descriptor.MethodDescriptor(
     name='GetLogs',
     full_name='Inference.GetLogs',
-    index=3,
+    index=6,
     containing_service=None,
     input_type=_EMPTY,
     output_type=_LOGENTRY,
@@ -927,7 +1584,7 @@
   _descriptor.MethodDescriptor(
     name='ListDevices',
     full_name='Inference.ListDevices',
-    index=4,
+    index=7,
     containing_service=None,
     input_type=_EMPTY,
     output_type=_DEVICES,
@@ -936,12 +1593,48 @@
   _descriptor.MethodDescriptor(
     name='Predict',
     full_name='Inference.Predict',
-    index=5,
+    index=8,
     containing_service=None,
     input_type=_PREDICTREQUEST,
     output_type=_PREDICTRESPONSE,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='SubmitPredictionJob',
+    full_name='Inference.SubmitPredictionJob',
+    index=9,
+    containing_service=None,
+    input_type=_PREDICTIONJOBREQUEST,
+    output_type=_JOBSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetJobStatus',
+    full_name='Inference.GetJobStatus',
+    index=10,
+    containing_service=None,
+    input_type=_JOBREQUEST,
+    output_type=_JOBSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='WatchJob',
+    full_name='Inference.WatchJob',
+    index=11,
+    containing_service=None,
+    input_type=_JOBREQUEST,
+    output_type=_JOBSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='CancelJob',
+    full_name='Inference.CancelJob',
+    index=12,
+    containing_service=None,
+    input_type=_JOBREQUEST,
+    output_type=_JOBSTATUS,
+    serialized_options=None,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_INFERENCE)
 
@@ -954,8 +1647,8 @@
   file=DESCRIPTOR,
   index=1,
   serialized_options=None,
-  serialized_start=1477,
-  serialized_end=1548,
+  serialized_start=3163,
+  serialized_end=3234,
   methods=[
   _descriptor.MethodDescriptor(
     name='Ping',
@@ -29,6 +29,21 @@ def __init__(self, channel):
         request_serializer=inference__pb2.CreateDatasetDescriptionRequest.SerializeToString,
         response_deserializer=inference__pb2.DatasetDescription.FromString,
         )
+    self.ComputeDatasetStatistics = channel.unary_unary(
+        '/Inference/ComputeDatasetStatistics',
+        request_serializer=inference__pb2.DatasetStatisticsRequest.SerializeToString,
+        response_deserializer=inference__pb2.DatasetDescription.FromString,
+        )
+    self.ComputeStreamStatistics = channel.stream_unary(
+        '/Inference/ComputeStreamStatistics',
+        request_serializer=inference__pb2.DatasetStatisticsRequest.SerializeToString,
+        response_deserializer=inference__pb2.DatasetDescription.FromString,
+        )
+    self.GetDatasetDescription = channel.unary_unary(
+        '/Inference/GetDatasetDescription',
+        request_serializer=inference__pb2.DatasetDescriptionRequest.SerializeToString,
+        response_deserializer=inference__pb2.DatasetDescription.FromString,
+        )
     self.GetLogs = channel.unary_stream(
         '/Inference/GetLogs',
         request_serializer=inference__pb2.Empty.SerializeToString,
@@ -44,6 +59,26 @@ def __init__(self, channel):
         request_serializer=inference__pb2.PredictRequest.SerializeToString,
         response_deserializer=inference__pb2.PredictResponse.FromString,
         )
+    self.SubmitPredictionJob = channel.unary_unary(
+        '/Inference/SubmitPredictionJob',
+        request_serializer=inference__pb2.PredictionJobRequest.SerializeToString,
+        response_deserializer=inference__pb2.JobStatus.FromString,
+        )
+    self.GetJobStatus = channel.unary_unary(
+        '/Inference/GetJobStatus',
+        request_serializer=inference__pb2.JobRequest.SerializeToString,
+        response_deserializer=inference__pb2.JobStatus.FromString,
+        )
+    self.WatchJob = channel.unary_stream(
+        '/Inference/WatchJob',
+        request_serializer=inference__pb2.JobRequest.SerializeToString,
+        response_deserializer=inference__pb2.JobStatus.FromString,
+        )
+    self.CancelJob = channel.unary_unary(
+        '/Inference/CancelJob',
+        request_serializer=inference__pb2.JobRequest.SerializeToString,
+        response_deserializer=inference__pb2.JobStatus.FromString,
+        )
 
 
 class InferenceServicer(object):
@@ -71,6 +106,27 @@ def CreateDatasetDescription(self, request, context):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def ComputeDatasetStatistics(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def ComputeStreamStatistics(self, request_iterator, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetDatasetDescription(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def GetLogs(self, request, context):
     # missing associated documentation comment in .proto file
     pass
@@ -92,6 +148,34 @@ def Predict(self, request, context):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def SubmitPredictionJob(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def GetJobStatus(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def WatchJob(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def CancelJob(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_InferenceServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -110,6 +194,21 @@ def add_InferenceServicer_to_server(servicer, server):
           request_deserializer=inference__pb2.CreateDatasetDescriptionRequest.FromString,
           response_serializer=inference__pb2.DatasetDescription.SerializeToString,
       ),
+      'ComputeDatasetStatistics': grpc.unary_unary_rpc_method_handler(
+          servicer.ComputeDatasetStatistics,
+          request_deserializer=inference__pb2.DatasetStatisticsRequest.FromString,
+          response_serializer=inference__pb2.DatasetDescription.SerializeToString,
+      ),
+      'ComputeStreamStatistics': grpc.stream_unary_rpc_method_handler(
+          servicer.ComputeStreamStatistics,
+          request_deserializer=inference__pb2.DatasetStatisticsRequest.FromString,
+          response_serializer=inference__pb2.DatasetDescription.SerializeToString,
+      ),
+      'GetDatasetDescription': grpc.unary_unary_rpc_method_handler(
+          servicer.GetDatasetDescription,
+          request_deserializer=inference__pb2.DatasetDescriptionRequest.FromString,
+          response_serializer=inference__pb2.DatasetDescription.SerializeToString,
+      ),
       'GetLogs': grpc.unary_stream_rpc_method_handler(
           servicer.GetLogs,
           request_deserializer=inference__pb2.Empty.FromString,
@@ -125,6 +224,26 @@ def add_InferenceServicer_to_server(servicer, server):
           request_deserializer=inference__pb2.PredictRequest.FromString,
           response_serializer=inference__pb2.PredictResponse.SerializeToString,
       ),
+      'SubmitPredictionJob': grpc.unary_unary_rpc_method_handler(
+          servicer.SubmitPredictionJob,
+          request_deserializer=inference__pb2.PredictionJobRequest.FromString,
+          response_serializer=inference__pb2.JobStatus.SerializeToString,
+      ),
+      'GetJobStatus': grpc.unary_unary_rpc_method_handler(
+          servicer.GetJobStatus,
+          request_deserializer=inference__pb2.JobRequest.FromString,
+          response_serializer=inference__pb2.JobStatus.SerializeToString,
+      ),
+      'WatchJob': grpc.unary_stream_rpc_method_handler(
+          servicer.WatchJob,
+          request_deserializer=inference__pb2.JobRequest.FromString,
+          response_serializer=inference__pb2.JobStatus.SerializeToString,
+      ),
+      'CancelJob': grpc.unary_unary_rpc_method_handler(
+          servicer.CancelJob,
+          request_deserializer=inference__pb2.JobRequest.FromString,
+          response_serializer=inference__pb2.JobStatus.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'Inference', rpc_method_handlers)
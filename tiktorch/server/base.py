@@ -20,13 +20,61 @@ def main():
     parsey = argparse.ArgumentParser()
     parsey.add_argument("--addr", type=str, default="127.0.0.1")
     parsey.add_argument("--port", type=str, default="5567")
+    parsey.add_argument("--unix-socket", type=str, default=None, help="also listen on unix socket at given path")
+    parsey.add_argument("--no-tcp", action="store_true", help="listen only on unix socket")
     parsey.add_argument("--debug", action="store_true")
     parsey.add_argument("--dummy", action="store_true")
     parsey.add_argument("--kill-timeout", type=int, default=KILL_TIMEOUT)
+    parsey.add_argument(
+        "--hibernate-after",
+        type=float,
+        default=None,
+        help="hibernate model sessions idle for given number of seconds (disabled by default)",
+    )
+    parsey.add_argument(
+        "--shared-weights",
+        action="store_true",
+        help="map weights of cpu sessions created from the same model archive from shared memory",
+    )
+
+    parsey.add_argument(
+        "--shared-memory",
+        action="store_true",
+        help="accept prediction tensors passed in shared memory by clients on the same host",
+    )
+    parsey.add_argument(
+        "--data-dir", type=str, default=None, help="keep uploaded models in given directory across restarts"
+    )
+    parsey.add_argument(
+        "--data-quota",
+        type=float,
+        default=None,
+        help="maximum size of uploaded data in MiB, least recently used uploads are evicted (unlimited by default)",
+    )
+    parsey.add_argument(
+        "--data-ttl", type=float, default=None, help="remove uploads and arrays unused for given number of seconds"
+    )
 
     args = parsey.parse_args()
-    print(f"Starting server on {args.addr}:{args.port}")
+    if args.no_tcp and not args.unix_socket:
+        parsey.error("--no-tcp requires --unix-socket")
+
+    port = None if args.no_tcp else args.port
+    if port is not None:
+        print(f"Starting server on {args.addr}:{args.port}")
+    if args.unix_socket:
+        print(f"Starting server on unix:{args.unix_socket}")
 
     from . import grpc
 
-    grpc.serve(args.addr, args.port)
+    grpc.serve(
+        args.addr,
+        port,
+        unix_socket=args.unix_socket,
+        hibernate_after=args.hibernate_after,
+        shared_weights=args.shared_weights,
+        shared_memory=args.shared_memory,
+        data_dir=args.data_dir,
+        data_quota=None if args.data_quota is None else int(args.data_quota * 1024 * 1024),
+        data_ttl=args.data_ttl,
+    )
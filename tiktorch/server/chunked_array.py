@@ -0,0 +1,283 @@
+"""
+N-dimensional arrays split into chunks of fixed shape stored in files on local disk
+
+Layout follows zarr format version 2 (.zarray header, chunk files named by their grid index, e.g. "0.3.1",
+raw C order bytes optionally compressed by zlib), so arrays can be opened by zarr too.
+Chunks are replaced atomically and modified under file locks, so regions of one array may be read and written
+from several threads and processes.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+HEADER_FILE = ".zarray"
+COMPRESSIONS = ("zlib",)
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_LOCKS_DIR = ".locks"
+# chunks share lock files, which keeps number of files low with little contention
+_LOCK_STRIPES = 64
+_ZLIB_LEVEL = 1
+
+
+def default_chunks(shape: Sequence[int], dtype, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, ...]:
+    """
+    Chunk shape of at most chunk_size bytes, largest axes are halved first
+    """
+    chunks = [max(int(size), 1) for size in shape]
+    itemsize = np.dtype(dtype).itemsize
+    while int(np.prod(chunks)) * itemsize > chunk_size and max(chunks) > 1:
+        axis = int(np.argmax(chunks))
+        chunks[axis] = (chunks[axis] + 1) // 2
+
+    return tuple(chunks)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path):
+    # every open creates new lock owner, so lock excludes other threads of this process too
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ChunkedArray:
+    """
+    Array stored in chunks in a directory, chunks never written read as fill_value
+
+    Regions are read and written by read/write or by indexing with slices (without step)
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Opens existing array, see create
+        """
+        self.path = Path(path)
+        header = json.loads((self.path / HEADER_FILE).read_text())
+        if header.get("zarr_format") != 2 or header.get("order") != "C" or header.get("filters"):
+            raise ValueError(f"Unsupported array format {header}")
+
+        compressor = header.get("compressor")
+        if compressor is not None and compressor.get("id") not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression {compressor}")
+
+        self.shape: Tuple[int, ...] = tuple(header["shape"])
+        self.chunks: Tuple[int, ...] = tuple(header["chunks"])
+        self.dtype = np.dtype(header["dtype"])
+        self.compression: Optional[str] = None if compressor is None else compressor["id"]
+        self.fill_value = header["fill_value"] or 0
+        self.grid: Tuple[int, ...] = tuple(-(-size // chunk) for size, chunk in zip(self.shape, self.chunks))
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        shape: Sequence[int],
+        dtype,
+        chunks: Optional[Sequence[int]] = None,
+        *,
+        compression: Optional[str] = None,
+        fill_value=0,
+    ) -> "ChunkedArray":
+        """
+        Creates array in new directory
+        chunks: shape of chunk, default_chunks if not given
+        compression: None or one of COMPRESSIONS
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(int(size) for size in shape)
+        chunks = default_chunks(shape, dtype) if chunks is None else tuple(int(size) for size in chunks)
+        if not shape or len(chunks) != len(shape):
+            raise ValueError(f"Chunks {chunks} don't match shape {shape}")
+
+        if any(size < 0 for size in shape) or any(size < 1 for size in chunks):
+            raise ValueError(f"Invalid shape {shape} or chunks {chunks}")
+
+        if int(np.prod(chunks)) * dtype.itemsize > MAX_CHUNK_SIZE:
+            raise ValueError(f"Chunks {chunks} exceed {MAX_CHUNK_SIZE} bytes")
+
+        if dtype.hasobject:
+            raise ValueError("Arrays of objects are not supported")
+
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported compression {compression!r}, expected one of {COMPRESSIONS}")
+
+        header = {
+            "zarr_format": 2,
+            "shape": shape,
+            "chunks": chunks,
+            "dtype": dtype.str,
+            "compressor": None if compression is None else {"id": compression, "level": _ZLIB_LEVEL},
+            "fill_value": np.array(fill_value, dtype=dtype).item(),
+            "order": "C",
+            "filters": None,
+        }
+        path = Path(path)
+        (path / _LOCKS_DIR).mkdir(parents=True)
+        (path / HEADER_FILE).write_text(json.dumps(header))
+        return cls(path)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def chunk_indices(self) -> Iterator[Tuple[int, ...]]:
+        """
+        Indices of all chunks in C order
+        """
+        return itertools.product(*(range(size) for size in self.grid))
+
+    def chunk_region(self, index: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start and stop of chunk, stop is clipped to the array shape
+        """
+        start = np.array(index, dtype=np.int64) * self.chunks
+        return start, np.minimum(start + self.chunks, self.shape)
+
+    def read(self, start: Sequence[int], stop: Sequence[int]) -> np.ndarray:
+        start, stop = self.__check_region(start, stop)
+        out = np.empty(stop - start, dtype=self.dtype)
+        for index, chunk_start, lo, hi in self.__overlapping_chunks(start, stop):
+            chunk = self.__load_chunk(index)
+            dst = tuple(slice(a, b) for a, b in zip(lo - start, hi - start))
+            if chunk is None:
+                out[dst] = self.fill_value
+            else:
+                out[dst] = chunk[tuple(slice(a, b) for a, b in zip(lo - chunk_start, hi - chunk_start))]
+
+        return out
+
+    def write(self, start: Sequence[int], data: np.ndarray) -> None:
+        data = np.asarray(data)
+        if data.ndim != self.ndim or len(start) != self.ndim:
+            raise ValueError(f"Data of shape {data.shape} at {start} doesn't match array of shape {self.shape}")
+
+        start, stop = self.__check_region(start, np.add(start, data.shape))
+        for index, chunk_start, lo, hi in self.__overlapping_chunks(start, stop):
+            src = data[tuple(slice(a, b) for a, b in zip(lo - start, hi - start))]
+            dst = tuple(slice(a, b) for a, b in zip(lo - chunk_start, hi - chunk_start))
+            chunk_stop = np.minimum(chunk_start + self.chunks, self.shape)
+            with self.__locked(index):
+                # chunks written only partially have to keep the rest of their content
+                chunk = None
+                if np.any(lo > chunk_start) or np.any(hi < chunk_stop):
+                    chunk = self.__load_chunk(index)
+
+                if chunk is None:
+                    chunk = np.full(self.chunks, self.fill_value, dtype=self.dtype)
+                else:
+                    chunk = np.array(chunk)
+
+                chunk[dst] = src
+                self.__store_chunk(index, chunk)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.read(*self.__key_region(key))
+
+    def __setitem__(self, key, value) -> None:
+        start, stop = self.__key_region(key)
+        self.write(start, np.broadcast_to(np.asarray(value, dtype=self.dtype), stop - start))
+
+    def __repr__(self) -> str:
+        return f"ChunkedArray({str(self.path)!r}, shape={self.shape}, chunks={self.chunks}, dtype={self.dtype})"
+
+    def __key_region(self, key) -> Tuple[np.ndarray, np.ndarray]:
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if len(key) > self.ndim or not all(isinstance(k, slice) for k in key):
+            raise TypeError(f"Array of {self.ndim} dimensions can only be indexed by slices, got {key}")
+
+        key = key + (slice(None),) * (self.ndim - len(key))
+        bounds = [k.indices(size) for k, size in zip(key, self.shape)]
+        if any(step != 1 for _, _, step in bounds):
+            raise TypeError("Slices with step are not supported")
+
+        start = np.array([b[0] for b in bounds], dtype=np.int64)
+        return start, np.maximum(start, [b[1] for b in bounds])
+
+    def __check_region(self, start: Sequence[int], stop: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        start, stop = np.array(start, dtype=np.int64), np.array(stop, dtype=np.int64)
+        if (
+            len(start) != self.ndim
+            or len(stop) != self.ndim
+            or np.any(start < 0)
+            or np.any(stop < start)
+            or np.any(stop > self.shape)
+        ):
+            raise ValueError(f"Region [{start.tolist()}, {stop.tolist()}) is outside of array of shape {self.shape}")
+
+        return start, stop
+
+    def __overlapping_chunks(
+        self, start: np.ndarray, stop: np.ndarray
+    ) -> Iterator[Tuple[Tuple[int, ...], np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yields index and start of chunks overlapping region with start and stop of their overlap
+        """
+        if np.any(stop <= start):
+            return
+
+        first, last = start // self.chunks, (stop - 1) // self.chunks
+        for index in itertools.product(*(range(a, b + 1) for a, b in zip(first.tolist(), last.tolist()))):
+            chunk_start = np.array(index, dtype=np.int64) * self.chunks
+            lo = np.maximum(start, chunk_start)
+            hi = np.minimum(stop, chunk_start + self.chunks)
+            yield index, chunk_start, lo, hi
+
+    def __chunk_path(self, index: Tuple[int, ...]) -> Path:
+        return self.path / ".".join(str(i) for i in index)
+
+    def __load_chunk(self, index: Tuple[int, ...]) -> Optional[np.ndarray]:
+        path = self.__chunk_path(index)
+        try:
+            if self.compression is None and fcntl is not None:
+                # replaced chunks stay mapped until readers are done with them
+                return np.memmap(path, dtype=self.dtype, mode="r", shape=self.chunks)
+
+            data = path.read_bytes()
+            if self.compression is not None:
+                data = zlib.decompress(data)
+        except FileNotFoundError:
+            return None
+
+        return np.frombuffer(data, dtype=self.dtype).reshape(self.chunks)
+
+    def __store_chunk(self, index: Tuple[int, ...], chunk: np.ndarray) -> None:
+        data = chunk.tobytes()
+        if self.compression is not None:
+            data = zlib.compress(data, _ZLIB_LEVEL)
+
+        with tempfile.NamedTemporaryFile(dir=self.path / _LOCKS_DIR, suffix=".tmp", delete=False) as f:
+            f.write(data)
+        os.replace(f.name, self.__chunk_path(index))
+
+    def __locked(self, index: Tuple[int, ...]):
+        stripe = int(np.ravel_multi_index(index, self.grid)) % _LOCK_STRIPES
+        return _file_lock(self.path / _LOCKS_DIR / str(stripe))
@@ -1,47 +1,859 @@
 import abc
+import hashlib
+import io
+import json
 import logging
-from uuid import uuid4
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tiktorch.server.chunked_array import ChunkedArray
 
 logger = logging.getLogger(__name__)
 
+SPOOL_THRESHOLD = 64 * 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# seconds after which range upload without new chunks is discarded
+UPLOAD_TTL = 60 * 60
+_READ_SIZE = 1024 * 1024
+
+_BLOBS_DIR = "blobs"
+_ARRAYS_DIR = "arrays"
+_SPOOL_DIR = "tmp"
+_INDEX_FILE = "index.json"
+_SHA256_RE = re.compile("[0-9a-f]{64}")
+
+
+class BlobInfo(NamedTuple):
+    id: str
+    size: int
+
+
+class DataStoreUsage(NamedTuple):
+    blobs: int
+    size: int
+    pinned_size: int
+    quota: Optional[int]
+    evicted: int
+    expired: int
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+def _read_npy_header(f: BinaryIO) -> Tuple[Tuple[int, ...], str, np.dtype, int]:
+    """
+    Returns shape, order, dtype and data offset of array in .npy format
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+    if dtype.hasobject:
+        raise ValueError("Arrays of objects are not supported")
+
+    return shape, "F" if fortran_order else "C", dtype, f.tell()
+
+
+class _Blob(abc.ABC):
+    size: int
+
+    @abc.abstractmethod
+    def read(self) -> bytes: ...
+
+    @abc.abstractmethod
+    def open(self) -> BinaryIO: ...
+
+    @abc.abstractmethod
+    def array(self) -> np.ndarray:
+        """
+        Read-only array stored in .npy format without loading it
+        """
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class _MemoryReader(io.RawIOBase):
+    """
+    Reads from buffer without copying it like BytesIO does
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.__view = memoryview(data).cast("B")
+        self.__pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__pos
+        elif whence == io.SEEK_END:
+            offset += len(self.__view)
+
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+
+        self.__pos = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        chunk = self.__view[self.__pos : self.__pos + len(buffer)]
+        buffer[: len(chunk)] = chunk
+        self.__pos += len(chunk)
+        return len(chunk)
+
+
+class _MemoryBlob(_Blob):
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.size = len(data)
+
+    def read(self) -> bytes:
+        return self.data
+
+    def open(self) -> BinaryIO:
+        return _MemoryReader(self.data)
+
+    def array(self) -> np.ndarray:
+        shape, order, dtype, offset = _read_npy_header(self.open())
+        count = int(np.prod(shape, dtype=np.int64))
+        arr = np.frombuffer(self.data, dtype=dtype, count=count, offset=offset).reshape(shape, order=order)
+        arr.flags.writeable = False
+        return arr
+
+
+class _FileBlob(_Blob):
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+
+    def read(self) -> bytes:
+        return self.path.read_bytes()
+
+    def open(self) -> BinaryIO:
+        return open(self.path, "rb")
+
+    def array(self) -> np.ndarray:
+        with self.open() as f:
+            shape, order, dtype, offset = _read_npy_header(f)
+
+        if not np.prod(shape, dtype=np.int64):
+            return np.empty(shape, dtype=dtype, order=order)
+
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape, order=order)
+
+    def close(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class Upload:
+    """
+    Receives blob in chunks computing its sha256 on the fly
+
+    Blobs up to spool_threshold bytes are written into buffer preallocated from announced size,
+    bigger ones are spooled to temporary file
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        spool_threshold: int = SPOOL_THRESHOLD,
+        spool_dir: Optional[Path] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.expected_size = size
+        self.ttl = ttl
+        self.__received = 0
+        self.__sha256 = hashlib.sha256()
+        self.__buffer: Optional[bytearray] = None
+        self.__file = None
+
+        if size <= spool_threshold:
+            self.__buffer = bytearray(size)
+        else:
+            self.__file = tempfile.NamedTemporaryFile(prefix="tiktorch_upload_", dir=spool_dir, delete=False)
+
+    @property
+    def size(self) -> int:
+        return self.__received
+
+    @property
+    def sha256(self) -> str:
+        return self.__sha256.hexdigest()
+
+    @property
+    def is_spooled(self) -> bool:
+        return self.__file is not None
+
+    def write(self, chunk: bytes) -> None:
+        end = self.__received + len(chunk)
+        if end > self.expected_size:
+            raise ValueError(f"Upload exceeds announced size of {self.expected_size} bytes")
+
+        if self.__file is not None:
+            self.__file.write(chunk)
+        else:
+            self.__buffer[self.__received : end] = chunk
+
+        self.__sha256.update(chunk)
+        self.__received = end
+
+    def finish(self) -> _Blob:
+        if self.__received != self.expected_size:
+            self.discard()
+            raise RuntimeError(f"Expected data of size {self.expected_size} bytes but got only {self.__received}")
+
+        if self.__file is None:
+            return _MemoryBlob(self.__buffer)
+
+        self.__file.close()
+        return _FileBlob(Path(self.__file.name), self.__received)
+
+    def discard(self) -> None:
+        self.__buffer = None
+        if self.__file is not None:
+            self.__file.close()
+            os.unlink(self.__file.name)
+            self.__file = None
+
+
+class ChecksumError(ValueError):
+    pass
+
+
+class RangeUpload:
+    """
+    Receives blob of known size and sha256 in fixed size chunks arriving in any order
+
+    Chunks are written into sparse temporary file, received ones are tracked, so interrupted upload can be resumed
+    """
+
+    def __init__(
+        self, size: int, sha256: str, chunk_size: int, *, spool_dir: Optional[Path] = None, ttl: Optional[float] = None
+    ) -> None:
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"Chunk size should be in range (0, {MAX_CHUNK_SIZE}], got {chunk_size}")
+
+        if not _SHA256_RE.fullmatch(sha256):
+            raise ValueError(f"Expected hex encoded sha256, got {sha256!r}")
+
+        self.expected_size = size
+        self.sha256 = sha256
+        self.chunk_size = chunk_size
+        self.ttl = ttl
+        self.last_used = time.monotonic()
+        self.__received = bytearray(-(-size // chunk_size))
+        self.__lock = threading.Lock()
+        self.__file = tempfile.NamedTemporaryFile(prefix="tiktorch_upload_", dir=spool_dir, delete=False)
+        self.__file.truncate(size)
+
+    @property
+    def size(self) -> int:
+        return sum(end - start for start, end in self.received())
+
+    def received(self) -> List[Tuple[int, int]]:
+        """
+        Received byte ranges as (start, end) pairs, adjacent chunks are merged
+        """
+        ranges = []
+        for idx, is_received in enumerate(self.__received):
+            if not is_received:
+                continue
+
+            start, end = idx * self.chunk_size, min((idx + 1) * self.chunk_size, self.expected_size)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+
+        return ranges
+
+    def write(self, offset: int, chunk: bytes, sha256: str) -> None:
+        idx, rest = divmod(offset, self.chunk_size)
+        if rest or idx >= len(self.__received):
+            raise ValueError(f"Offset {offset} isn't start of a chunk")
+
+        expected_len = min(self.chunk_size, self.expected_size - offset)
+        if len(chunk) != expected_len:
+            raise ValueError(f"Chunk at offset {offset} should have {expected_len} bytes, got {len(chunk)}")
+
+        if hashlib.sha256(chunk).hexdigest() != sha256:
+            raise ChecksumError(f"Chunk at offset {offset} doesn't match its sha256")
+
+        with self.__lock:
+            if self.__file is None:
+                raise RuntimeError("Upload is already finished")
+
+            self.__file.seek(offset)
+            self.__file.write(chunk)
+            self.__received[idx] = 1
+            self.last_used = time.monotonic()
+
+    def finish(self) -> _Blob:
+        with self.__lock:
+            if self.__file is None:
+                raise RuntimeError("Upload is already finished")
+
+            if not all(self.__received):
+                raise RuntimeError(f"{self.__received.count(0)} chunks of upload are missing")
+
+            self.__file.seek(0)
+            sha256 = hashlib.sha256()
+            buffer = bytearray(_READ_SIZE)
+            while True:
+                n = self.__file.readinto(buffer)
+                if not n:
+                    break
+                sha256.update(memoryview(buffer)[:n])
+
+            self.__file.close()
+            path, self.__file = Path(self.__file.name), None
+
+        if sha256.hexdigest() != self.sha256:
+            path.unlink()
+            raise ChecksumError("Uploaded data doesn't match its sha256")
+
+        return _FileBlob(path, self.expected_size)
+
+    def discard(self) -> None:
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                os.unlink(self.__file.name)
+                self.__file = None
+
+
+class _Entry:
+    __slots__ = ("blob", "ttl", "last_used", "pins")
+
+    def __init__(self, blob: _Blob, ttl: Optional[float]) -> None:
+        self.blob = blob
+        self.ttl = ttl
+        self.last_used = time.monotonic()
+        self.pins = 0
+
+    def is_expired(self, now: float, default_ttl: Optional[float]) -> bool:
+        ttl = default_ttl if self.ttl is None else self.ttl
+        return not self.pins and ttl is not None and now - self.last_used > ttl
+
+
+class _ArrayEntry:
+    __slots__ = ("array", "size", "last_used", "pins")
+
+    def __init__(self, array: ChunkedArray) -> None:
+        self.array = array
+        # size of array without compression, space it may take once all chunks are written
+        self.size = int(np.prod(array.shape, dtype=np.int64)) * array.dtype.itemsize
+        self.last_used = time.monotonic()
+        self.pins = 0
+
+    def is_expired(self, now: float, ttl: Optional[float]) -> bool:
+        return not self.pins and ttl is not None and now - self.last_used > ttl
+
 
 class IDataStore(abc.ABC):
     @abc.abstractmethod
-    def put(self, data: bytes) -> str:
+    def put(self, data: bytes, *, ttl: Optional[float] = None) -> str: ...
+
+    @abc.abstractmethod
+    def stat(self, id_: str) -> Optional[BlobInfo]:
+        """
+        Returns info of stored blob or None if there is no blob with such id
+        """
         ...
 
     @abc.abstractmethod
-    def get(self, id_: str) -> bytes:
+    def create_upload(self, size: int, *, ttl: Optional[float] = None) -> Upload:
+        """
+        Starts receiving blob of given size in chunks, raises QuotaExceeded if it can't fit into the store
+        """
+        ...
+
+    @abc.abstractmethod
+    def put_upload(self, upload: Union[Upload, RangeUpload]) -> str:
+        """
+        Stores completely received upload, raises if upload is incomplete
+        """
+        ...
+
+    @abc.abstractmethod
+    def start_range_upload(
+        self, size: int, sha256: str, chunk_size: int, *, ttl: Optional[float] = None
+    ) -> RangeUpload:
+        """
+        Starts receiving blob in chunks or returns unfinished upload of the same blob to resume it
+        """
+        ...
+
+    @abc.abstractmethod
+    def get_range_upload(self, id_: str) -> Optional[RangeUpload]: ...
+
+    @abc.abstractmethod
+    def finish_range_upload(self, upload: RangeUpload) -> str:
+        """
+        Stores completely received range upload, upload not matching its sha256 is discarded
+        """
         ...
 
+    @abc.abstractmethod
+    def get(self, id_: str) -> bytes: ...
+
+    @abc.abstractmethod
+    def open(self, id_: str) -> BinaryIO:
+        """
+        Opens stored blob for reading without loading it into memory
+        """
+        ...
+
+    @abc.abstractmethod
+    def open_array(self, id_: str) -> np.ndarray:
+        """
+        Returns read-only array stored in .npy format, stored in files ones are memory mapped
+        """
+        ...
+
+    @abc.abstractmethod
+    def create_chunked_array(
+        self, shape: Sequence[int], dtype, chunks: Optional[Sequence[int]] = None, *, compression: Optional[str] = None
+    ) -> str:
+        """
+        Creates writable chunked array filled with zeros and returns its id, see ChunkedArray.create
+        Raises QuotaExceeded if array doesn't fit into quota
+        """
+        ...
+
+    @abc.abstractmethod
+    def get_chunked_array(self, id_: str) -> Optional[ChunkedArray]: ...
+
     @abc.abstractmethod
     def remove(self, id_: str) -> None:
+        """
+        Removes blob or chunked array
+        """
+        ...
+
+    @abc.abstractmethod
+    def pin(self, id_: str) -> None:
+        """
+        Protects blob or chunked array from eviction and expiry until it's unpinned, pins are counted
+        """
+        ...
+
+    @abc.abstractmethod
+    def unpin(self, id_: str) -> None: ...
+
+    @abc.abstractmethod
+    def usage(self) -> DataStoreUsage: ...
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """
+        Removes temporary files of store, blobs of persistent store are kept
+        """
         ...
 
 
 class DataStore(IDataStore):
     """
-    Manages session lifecycle (create/close)
+    Content addressed blob store, blob id is sha256 of its content
+
+    If root directory is given, blobs are kept there together with an index and survive restarts.
+    Blobs unused for their ttl expire and least recently used ones are evicted to keep store within quota,
+    pinned blobs are never removed this way
+
+    Chunked arrays, which can be modified, are stored aside with random ids. Their uncompressed size counts
+    towards quota and unused ones expire after ttl of the store, but they are never evicted
     """
 
-    # TODO: Fix possible memory leakage
-    # Options:
-    # * Using temporary allocation for model upload
-    # * Maybe attach to a session id, for this session should be created without
-    # starting a model process
+    def __init__(
+        self,
+        *,
+        spool_threshold: int = SPOOL_THRESHOLD,
+        spool_dir: Optional[Path] = None,
+        root: Optional[Path] = None,
+        quota: Optional[int] = None,
+        ttl: Optional[float] = None,
+        upload_ttl: Optional[float] = UPLOAD_TTL,
+    ):
+        """
+        spool_threshold: uploads bigger than this are kept in temporary files in spool_dir
+        spool_dir: defaults to temporary directory removed on close
+        root: directory to persist blobs in, spool_dir defaults to its subdirectory
+        quota: maximum total size of stored blobs and chunked arrays in bytes, unfinished uploads aren't accounted
+        ttl: number of seconds after which unused blob expires, unless ttl is given for the blob
+        upload_ttl: number of seconds after which unfinished range upload without new chunks is discarded
+        """
+        # least recently used first
+        self.__entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.__range_uploads: Dict[str, RangeUpload] = {}
+        self.__arrays: Dict[str, _ArrayEntry] = {}
+        self.__arrays_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.__spool_tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.__lock = threading.Lock()
+        self.__root = None if root is None else Path(root)
+        self.__evicted = 0
+        self.__expired = 0
+        self.spool_threshold = spool_threshold
+        self.spool_dir = spool_dir
+        self.quota = quota
+        self.ttl = ttl
+        self.upload_ttl = upload_ttl
+
+        if self.__root is not None:
+            if spool_dir is None:
+                self.spool_dir = self.__root / _SPOOL_DIR
+                # uploads interrupted by restart
+                shutil.rmtree(self.spool_dir, ignore_errors=True)
+                self.spool_dir.mkdir(parents=True)
+            (self.__root / _BLOBS_DIR).mkdir(parents=True, exist_ok=True)
+            self.__load_index()
+            self.__load_arrays()
+        elif spool_dir is None:
+            self.__spool_tmp_dir = tempfile.TemporaryDirectory(prefix="tiktorch-spool-")
+            self.spool_dir = Path(self.__spool_tmp_dir.name)
+
+    def create_upload(self, size: int, *, ttl: Optional[float] = None) -> Upload:
+        with self.__lock:
+            # blobs are evicted once upload is finished, upload may turn out to be duplicate or be abandoned
+            self.__admit(size)
+
+        return Upload(size, spool_threshold=self.spool_threshold, spool_dir=self.spool_dir, ttl=ttl)
+
+    def put(self, data: bytes, *, ttl: Optional[float] = None) -> str:
+        upload = self.create_upload(len(data), ttl=ttl)
+        upload.write(data)
+        return self.put_upload(upload)
+
+    def put_upload(self, upload: Union[Upload, RangeUpload]) -> str:
+        blob = upload.finish()
+        id_ = upload.sha256
+
+        with self.__lock:
+            entry = self.__entries.get(id_)
+            if entry is not None:
+                blob.close()
+                self.__touch(id_, entry)
+                return id_
+
+            try:
+                self.__make_room(blob.size)
+            except QuotaExceeded:
+                blob.close()
+                raise
+
+            if self.__root is not None:
+                blob = self.__persist(id_, blob)
+
+            self.__entries[id_] = _Entry(blob, upload.ttl)
+            self.__write_index()
+
+        return id_
+
+    def start_range_upload(
+        self, size: int, sha256: str, chunk_size: int, *, ttl: Optional[float] = None
+    ) -> RangeUpload:
+        with self.__lock:
+            upload = self.__range_uploads.get(sha256)
+            if upload is None or upload.expected_size != size:
+                self.__admit(size)
+                if upload is not None:
+                    upload.discard()
+                upload = RangeUpload(size, sha256, chunk_size, spool_dir=self.spool_dir, ttl=ttl)
+                self.__range_uploads[sha256] = upload
+            else:
+                # resuming keeps upload from expiring
+                upload.last_used = time.monotonic()
+
+        return upload
 
-    def __init__(self):
-        self.__data_by_id = {}
+    def get_range_upload(self, id_: str) -> Optional[RangeUpload]:
+        with self.__lock:
+            self.__expire()
+            return self.__range_uploads.get(id_)
 
-    def put(self, data: bytes) -> str:
-        id_ = uuid4().hex
-        self.__data_by_id[id_] = data
+    def finish_range_upload(self, upload: RangeUpload) -> str:
+        try:
+            id_ = self.put_upload(upload)
+        except (ChecksumError, QuotaExceeded):
+            self.__forget_range_upload(upload)
+            raise
+
+        self.__forget_range_upload(upload)
         return id_
 
+    def stat(self, id_: str) -> Optional[BlobInfo]:
+        with self.__lock:
+            self.__expire()
+            entry = self.__entries.get(id_)
+
+        if entry is None:
+            return None
+
+        return BlobInfo(id_, entry.blob.size)
+
     def get(self, id_: str) -> bytes:
-        if id_ not in self.__data_by_id:
-            raise Exception(f"Data blob with id {id_} not found")
-        return self.__data_by_id[id_]
+        return self.__use(id_).read()
+
+    def open(self, id_: str) -> BinaryIO:
+        return self.__use(id_).open()
+
+    def open_array(self, id_: str) -> np.ndarray:
+        return self.__use(id_).array()
+
+    def create_chunked_array(
+        self, shape: Sequence[int], dtype, chunks: Optional[Sequence[int]] = None, *, compression: Optional[str] = None
+    ) -> str:
+        id_ = uuid.uuid4().hex
+        with self.__lock:
+            self.__make_room(int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize)
+
+        array = ChunkedArray.create(self.__array_path(id_), shape, dtype, chunks, compression=compression)
+        with self.__lock:
+            self.__arrays[id_] = _ArrayEntry(array)
+
+        return id_
+
+    def get_chunked_array(self, id_: str) -> Optional[ChunkedArray]:
+        with self.__lock:
+            self.__expire()
+            entry = self.__arrays.get(id_)
+            if entry is None:
+                return None
+
+            entry.last_used = time.monotonic()
+            return entry.array
 
     def remove(self, id_: str):
-        self.__data_by_id.pop(id_, None)
+        with self.__lock:
+            if id_ in self.__entries:
+                self.__drop(id_)
+
+            array_entry = self.__arrays.pop(id_, None)
+
+        if array_entry is not None:
+            shutil.rmtree(array_entry.array.path, ignore_errors=True)
+
+    def pin(self, id_: str) -> None:
+        with self.__lock:
+            array_entry = self.__arrays.get(id_)
+            if array_entry is not None:
+                array_entry.pins += 1
+                array_entry.last_used = time.monotonic()
+                return
+
+            entry = self.__get_entry(id_)
+            entry.pins += 1
+            self.__touch(id_, entry)
+            self.__write_index()
+
+    def unpin(self, id_: str) -> None:
+        with self.__lock:
+            array_entry = self.__arrays.get(id_)
+            if array_entry is not None and array_entry.pins:
+                array_entry.pins -= 1
+                array_entry.last_used = time.monotonic()
+                return
+
+            entry = self.__entries.get(id_)
+            if entry is not None and entry.pins:
+                entry.pins -= 1
+                # ttl is counted from the moment blob stopped being used
+                self.__touch(id_, entry)
+                self.__write_index()
+
+    def usage(self) -> DataStoreUsage:
+        with self.__lock:
+            self.__expire()
+            return DataStoreUsage(
+                blobs=len(self.__entries),
+                size=self.__size(),
+                pinned_size=self.__pinned_size(),
+                quota=self.quota,
+                evicted=self.__evicted,
+                expired=self.__expired,
+            )
+
+    def close(self) -> None:
+        with self.__lock:
+            for upload in self.__range_uploads.values():
+                upload.discard()
+            self.__range_uploads.clear()
+
+            for tmp_dir in (self.__arrays_dir, self.__spool_tmp_dir):
+                if tmp_dir is not None:
+                    tmp_dir.cleanup()
+
+    def __use(self, id_: str) -> _Blob:
+        with self.__lock:
+            entry = self.__get_entry(id_)
+            self.__touch(id_, entry)
+            return entry.blob
+
+    def __get_entry(self, id_: str) -> _Entry:
+        self.__expire()
+        entry = self.__entries.get(id_)
+        if entry is None:
+            raise Exception(f"Data blob with id {id_} not found")
+
+        return entry
+
+    def __touch(self, id_: str, entry: _Entry) -> None:
+        entry.last_used = time.monotonic()
+        self.__entries.move_to_end(id_)
+
+    def __size(self) -> int:
+        return sum(e.blob.size for e in self.__entries.values()) + sum(e.size for e in self.__arrays.values())
+
+    def __pinned_size(self) -> int:
+        pinned_blobs = sum(e.blob.size for e in self.__entries.values() if e.pins)
+        return pinned_blobs + sum(e.size for e in self.__arrays.values() if e.pins)
+
+    def __expire(self) -> None:
+        now = time.monotonic()
+        for id_ in [id_ for id_, entry in self.__entries.items() if entry.is_expired(now, self.ttl)]:
+            logger.debug("Data blob %s expired", id_)
+            self.__drop(id_)
+            self.__expired += 1
+
+        for id_ in [id_ for id_, entry in self.__arrays.items() if entry.is_expired(now, self.ttl)]:
+            logger.debug("Chunked array %s expired", id_)
+            shutil.rmtree(self.__arrays.pop(id_).array.path, ignore_errors=True)
+            self.__expired += 1
+
+        if self.upload_ttl is not None:
+            for sha256, upload in list(self.__range_uploads.items()):
+                if now - upload.last_used > self.upload_ttl:
+                    logger.debug("Unfinished upload %s expired", sha256)
+                    del self.__range_uploads[sha256]
+                    upload.discard()
+
+    def __admit(self, size: int) -> None:
+        """
+        Raises QuotaExceeded if blob or chunked array of given size can't fit into quota even after eviction
+        """
+        self.__expire()
+        if self.quota is None:
+            return
+
+        # chunked arrays are never evicted
+        kept_size = sum(e.blob.size for e in self.__entries.values() if e.pins)
+        kept_size += sum(e.size for e in self.__arrays.values())
+        if size > self.quota - kept_size:
+            raise QuotaExceeded(
+                f"{size} bytes don't fit into data store quota of {self.quota} bytes, "
+                f"{kept_size} bytes are used by model sessions and chunked arrays"
+            )
+
+    def __make_room(self, size: int) -> None:
+        """
+        Evicts least recently used unpinned blobs, so blob or chunked array of given size fits into quota
+        """
+        self.__admit(size)
+        if self.quota is None:
+            return
+
+        free = self.quota - self.__size()
+        for id_ in [id_ for id_, entry in self.__entries.items() if not entry.pins]:
+            if free >= size:
+                break
+
+            logger.debug("Evicting data blob %s", id_)
+            free += self.__entries[id_].blob.size
+            self.__drop(id_)
+            self.__evicted += 1
+
+    def __drop(self, id_: str) -> None:
+        self.__entries.pop(id_).blob.close()
+        self.__write_index()
+
+    def __forget_range_upload(self, upload: RangeUpload) -> None:
+        with self.__lock:
+            if self.__range_uploads.get(upload.sha256) is upload:
+                del self.__range_uploads[upload.sha256]
+
+    def __persist(self, id_: str, blob: _Blob) -> _FileBlob:
+        path = self.__root / _BLOBS_DIR / id_
+        if isinstance(blob, _FileBlob):
+            shutil.move(str(blob.path), str(path))
+        else:
+            with tempfile.NamedTemporaryFile(dir=self.spool_dir, delete=False) as f:
+                f.write(blob.read())
+            os.replace(f.name, path)
+
+        return _FileBlob(path, blob.size)
+
+    def __array_path(self, id_: str) -> Path:
+        if self.__root is not None:
+            return self.__root / _ARRAYS_DIR / id_
+
+        with self.__lock:
+            if self.__arrays_dir is None:
+                self.__arrays_dir = tempfile.TemporaryDirectory(prefix="tiktorch-arrays-", dir=self.spool_dir)
+
+        return Path(self.__arrays_dir.name) / id_
+
+    def __load_arrays(self) -> None:
+        arrays_dir = self.__root / _ARRAYS_DIR
+        arrays_dir.mkdir(exist_ok=True)
+        for path in arrays_dir.iterdir():
+            try:
+                self.__arrays[path.name] = _ArrayEntry(ChunkedArray(path))
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning("Removing unreadable chunked array %s: %s", path, e)
+                shutil.rmtree(path, ignore_errors=True)
+
+    def __write_index(self) -> None:
+        if self.__root is None:
+            return
+
+        # order is kept, so blobs used recently are evicted last after restart too
+        index = {id_: {"size": e.blob.size, "ttl": e.ttl} for id_, e in self.__entries.items()}
+        with tempfile.NamedTemporaryFile("w", dir=self.__root, suffix=".tmp", delete=False) as f:
+            json.dump(index, f)
+        os.replace(f.name, self.__root / _INDEX_FILE)
+
+    def __load_index(self) -> None:
+        index_path = self.__root / _INDEX_FILE
+        index = json.loads(index_path.read_text()) if index_path.exists() else {}
+        for path in self.__root.glob("*.tmp"):
+            path.unlink()
+
+        blobs_dir = self.__root / _BLOBS_DIR
+        for id_, entry in index.items():
+            path = blobs_dir / id_
+            if path.is_file() and path.stat().st_size == entry["size"]:
+                self.__entries[id_] = _Entry(_FileBlob(path, entry["size"]), entry.get("ttl"))
+
+        for path in blobs_dir.iterdir():
+            if path.name not in self.__entries:
+                logger.warning("Removing blob %s not matching data store index", path)
+                path.unlink()
+
+        if len(self.__entries) != len(index):
+            logger.warning("%s blobs of data store index not found", len(index) - len(self.__entries))
+            self.__write_index()
@@ -0,0 +1,371 @@
+"""
+Storage backends for DynamicDataset entries
+
+Entries are stored under integer keys. Released entries stay readable until storage reclaims them,
+so samples that were already scheduled for loading can still be accessed.
+"""
+
+from __future__ import annotations
+
+import abc
+import itertools
+import logging
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 64
+
+
+class IDatasetStorage(abc.ABC):
+    @abc.abstractmethod
+    def put(self, arrays: Sequence[np.ndarray]) -> int:
+        """
+        Stores arrays and returns key to access them
+        """
+        ...
+
+    @abc.abstractmethod
+    def get(self, key: int) -> Tuple[np.ndarray, ...]:
+        """
+        Returns arrays stored under key, raises KeyError if they were reclaimed
+        Returned arrays are not changed by later updates, releases or compaction of storage
+        """
+        ...
+
+    def replace(self, key: int, arrays: Sequence[np.ndarray]) -> int:
+        """
+        Stores new arrays in place of ones stored under key, returns key to access them
+        """
+        new_key = self.put(arrays)
+        self.release(key)
+        return new_key
+
+    @abc.abstractmethod
+    def release(self, key: int) -> None:
+        """
+        Marks arrays as no longer needed, storage can reclaim them afterwards
+        """
+        ...
+
+    @abc.abstractmethod
+    def __contains__(self, key: int) -> bool: ...
+
+    def close(self) -> None:
+        """
+        Frees resources held by storage
+        """
+        pass
+
+
+class InMemoryStorage(IDatasetStorage):
+    """
+    Keeps arrays in process memory, released entries are never reclaimed
+    """
+
+    def __init__(self) -> None:
+        self.__arrays: Dict[int, Tuple[np.ndarray, ...]] = {}
+        self.__keys = itertools.count()
+
+    def put(self, arrays: Sequence[np.ndarray]) -> int:
+        key = next(self.__keys)
+        self.__arrays[key] = tuple(arrays)
+        return key
+
+    def get(self, key: int) -> Tuple[np.ndarray, ...]:
+        return self.__arrays[key]
+
+    def replace(self, key: int, arrays: Sequence[np.ndarray]) -> int:
+        self.__arrays[key] = tuple(arrays)
+        return key
+
+    def release(self, key: int) -> None:
+        pass
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.__arrays
+
+
+class _Chunk:
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+        self.data = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+        self.top = 0
+        self.free_blocks: List[Tuple[int, int]] = []
+        self.live_bytes = 0
+
+    def allocate(self, nbytes: int) -> Optional[int]:
+        for idx, (offset, size) in enumerate(self.free_blocks):
+            if size >= nbytes:
+                if size == nbytes:
+                    del self.free_blocks[idx]
+                else:
+                    self.free_blocks[idx] = (offset + nbytes, size - nbytes)
+                self.live_bytes += nbytes
+                return offset
+
+        if self.top + nbytes <= self.size:
+            offset = self.top
+            self.top += nbytes
+            self.live_bytes += nbytes
+            return offset
+
+        return None
+
+    def free(self, offset: int, nbytes: int) -> None:
+        self.live_bytes -= nbytes
+        if offset + nbytes == self.top:
+            self.top = offset
+        else:
+            self.free_blocks.append((offset, nbytes))
+
+        # coalesce adjacent blocks and give trailing block back to bump allocator
+        self.free_blocks.sort()
+        merged = []
+        for block_offset, block_size in self.free_blocks:
+            if merged and merged[-1][0] + merged[-1][1] == block_offset:
+                merged[-1] = (merged[-1][0], merged[-1][1] + block_size)
+            else:
+                merged.append((block_offset, block_size))
+
+        while merged and merged[-1][0] + merged[-1][1] == self.top:
+            self.top = merged.pop()[0]
+
+        self.free_blocks = merged
+
+    def close(self) -> None:
+        self.data = None
+        if self.path.exists():
+            self.path.unlink()
+
+
+class _Record:
+    __slots__ = ("chunk", "offset", "nbytes", "fields", "released")
+
+    def __init__(self, chunk: _Chunk, offset: int, nbytes: int, fields: List[Tuple[str, tuple, int]]) -> None:
+        self.chunk = chunk
+        self.offset = offset
+        self.nbytes = nbytes
+        self.fields = fields  # (dtype, shape, offset relative to record)
+        self.released = False
+
+
+class MmapArena(IDatasetStorage):
+    """
+    Stores arrays in memory mapped chunk files on local disk, so dataset can grow past available RAM
+
+    Space of released entries is reclaimed by compaction: freed blocks are reused by later entries,
+    and sparsely used chunks are emptied by moving their live entries and then deleted.
+    Entries are copied out of chunks on access, so readers never see their space being reused.
+    If compact_interval is set, compaction runs periodically in a background thread.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        chunk_size: int = 64 * 1024 * 1024,
+        compact_threshold: float = 0.5,
+        compact_interval: Optional[float] = None,
+    ) -> None:
+        """
+        directory: where chunk files are created, temporary directory is used if not set
+        compact_threshold: chunks with smaller fraction of live bytes are emptied during compaction
+        """
+        self.__owns_directory = directory is None
+        if directory is None:
+            directory = Path(tempfile.mkdtemp(prefix="tiktorch_arena_"))
+
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.__directory = directory
+        self.__chunk_size = chunk_size
+        self.__compact_threshold = compact_threshold
+        self.__lock = threading.RLock()
+        self.__chunks: List[_Chunk] = []
+        self.__records: Dict[int, _Record] = {}
+        self.__keys = itertools.count()
+        self.__released_bytes = 0
+        self.__closed = False
+
+        self.__stop = threading.Event()
+        self.__compactor = None
+        if compact_interval is not None:
+            self.__compactor = threading.Thread(
+                target=self._compact_periodically, args=(compact_interval,), name="MmapArenaCompactor", daemon=True
+            )
+            self.__compactor.start()
+
+    @property
+    def num_chunks(self) -> int:
+        with self.__lock:
+            return len(self.__chunks)
+
+    @property
+    def allocated_bytes(self) -> int:
+        with self.__lock:
+            return sum(chunk.size for chunk in self.__chunks)
+
+    @property
+    def released_bytes(self) -> int:
+        """
+        Bytes held by released entries that were not reclaimed yet
+        """
+        with self.__lock:
+            return self.__released_bytes
+
+    def put(self, arrays: Sequence[np.ndarray]) -> int:
+        fields = []
+        nbytes = 0
+        contiguous = []
+        for arr in arrays:
+            arr = np.ascontiguousarray(arr)
+            fields.append((arr.dtype.str, arr.shape, nbytes))
+            contiguous.append(arr)
+            nbytes = _align(nbytes + arr.nbytes)
+
+        nbytes = max(nbytes, _ALIGNMENT)
+
+        with self.__lock:
+            self.__check_open()
+            chunk, offset = self.__allocate(nbytes)
+            for arr, (_, _, field_offset) in zip(contiguous, fields):
+                start = offset + field_offset
+                chunk.data[start : start + arr.nbytes] = arr.reshape(-1).view(np.uint8)
+
+            key = next(self.__keys)
+            self.__records[key] = _Record(chunk, offset, nbytes, fields)
+            return key
+
+    def get(self, key: int) -> Tuple[np.ndarray, ...]:
+        with self.__lock:
+            return self.__read(self.__records[key])
+
+    def release(self, key: int) -> None:
+        with self.__lock:
+            record = self.__records.get(key)
+            if record is None or record.released:
+                return
+
+            record.released = True
+            self.__released_bytes += record.nbytes
+
+    def __contains__(self, key: int) -> bool:
+        with self.__lock:
+            return key in self.__records
+
+    def compact(self) -> int:
+        """
+        Reclaims space of released entries and removes sparsely used chunks
+        Returns number of bytes given back to filesystem
+        """
+        with self.__lock:
+            for key, record in list(self.__records.items()):
+                if record.released:
+                    self.__drop(key)
+
+            self.__released_bytes = 0
+
+            allocated = sum(chunk.size for chunk in self.__chunks)
+            empty = [chunk for chunk in self.__chunks if not chunk.live_bytes]
+            sparse = [chunk for chunk in self.__chunks if 0 < chunk.live_bytes < chunk.size * self.__compact_threshold]
+            if len(sparse) == 1 and len(self.__chunks) - len(empty) == 1:
+                # moving entries of the only used chunk into a new one would not save anything
+                sparse = []
+
+            for chunk in empty + sparse:
+                if chunk.live_bytes:
+                    self.__evacuate(chunk, exclude=sparse)
+
+                self.__chunks.remove(chunk)
+                chunk.close()
+
+            freed = allocated - sum(chunk.size for chunk in self.__chunks)
+            if freed > 0:
+                logger.debug("Compaction released %d bytes, %d chunks left", freed, len(self.__chunks))
+
+            return max(freed, 0)
+
+    def close(self) -> None:
+        self.__stop.set()
+        if self.__compactor is not None and self.__compactor is not threading.current_thread():
+            self.__compactor.join()
+
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__closed = True
+            self.__records.clear()
+            for chunk in self.__chunks:
+                chunk.close()
+            self.__chunks.clear()
+
+        if self.__owns_directory:
+            shutil.rmtree(self.__directory, ignore_errors=True)
+
+    def _compact_periodically(self, interval: float) -> None:
+        while not self.__stop.wait(interval):
+            try:
+                if self.released_bytes:
+                    self.compact()
+            except Exception:
+                logger.exception("Failed to compact arena")
+
+    def __check_open(self) -> None:
+        if self.__closed:
+            raise RuntimeError("Arena is closed")
+
+    def __allocate(self, nbytes: int, exclude: Sequence[_Chunk] = ()) -> Tuple[_Chunk, int]:
+        for chunk in self.__chunks:
+            if chunk in exclude:
+                continue
+
+            offset = chunk.allocate(nbytes)
+            if offset is not None:
+                return chunk, offset
+
+        chunk = _Chunk(self.__directory / f"{uuid.uuid4().hex}.chunk", max(self.__chunk_size, nbytes))
+        self.__chunks.append(chunk)
+        return chunk, chunk.allocate(nbytes)
+
+    def __drop(self, key: int) -> None:
+        record = self.__records.pop(key)
+        record.chunk.free(record.offset, record.nbytes)
+
+    def __evacuate(self, chunk: _Chunk, exclude: Sequence[_Chunk]) -> None:
+        for key, record in self.__records.items():
+            if record.chunk is not chunk:
+                continue
+
+            new_chunk, new_offset = self.__allocate(record.nbytes, exclude=exclude)
+            new_chunk.data[new_offset : new_offset + record.nbytes] = chunk.data[
+                record.offset : record.offset + record.nbytes
+            ]
+            chunk.free(record.offset, record.nbytes)
+            record.chunk = new_chunk
+            record.offset = new_offset
+
+    def __read(self, record: _Record) -> Tuple[np.ndarray, ...]:
+        arrays = []
+        for dtype, shape, field_offset in record.fields:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            start = record.offset + field_offset
+            raw = record.chunk.data[start : start + count * dtype.itemsize]
+            # space of entry may be reused once it's released, so data is copied out of the mapping
+            arrays.append(np.array(raw.view(dtype).reshape(shape)))
+
+        return tuple(arrays)
+
+
+def _align(nbytes: int) -> int:
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
@@ -1,22 +1,45 @@
+import collections
 import logging
-from typing import List
-
+import pickle
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
 import torch
 from pybio.core.samplers.base import PyBioSampler
 from torch.utils.data import Sampler
 from torch.utils.data.dataset import Dataset
 
-from tiktorch.tiktypes import TikTensorBatch
+from tiktorch.server.dataset_storage import IDatasetStorage, InMemoryStorage
+from tiktorch.tiktypes import SparseTikTensor, TikTensorBatch
+from tiktorch.types import densify
 
 logger = logging.getLogger(__name__)
 
 
+# file listing entries written by DynamicDataset.save
+_INDEX_FILE = "index.pickle"
+
+# kind of label, stored as first array of every storage record
+_DENSE_LABEL = 0
+_SPARSE_LABEL = 1
+
+
+def _kind(kind: int) -> np.ndarray:
+    return np.array(kind, dtype=np.uint8)
+
+
 class EmptyDataset(Exception):
     pass
 
 
-# class EntryRemoved(Exception):
-#     pass
+class EntryRemoved(Exception):
+    """
+    Data of removed entry was already reclaimed by dataset storage
+    """
 
 
 # not needed anymore as we don't raise EntryRemoved (and only set the entry's weight to zero)
@@ -33,23 +56,127 @@ class EmptyDataset(Exception):
 #                 pass
 
 
+class _SumTree:
+    """
+    Weights stored in leaves of a binary tree where every node holds sum of its children
+    Updating a weight and drawing weighted random index are O(log n)
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = 1
+        while self._capacity < capacity:
+            self._capacity *= 2
+
+        self._tree = np.zeros(2 * self._capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, idx: int) -> float:
+        return float(self._tree[self._capacity + idx])
+
+    def __setitem__(self, idx: int, weight: float) -> None:
+        if not 0 <= idx < self._size:
+            raise IndexError(idx)
+
+        node = self._capacity + idx
+        self._tree[node] = weight
+        node //= 2
+        while node:
+            self._tree[node] = self._tree[2 * node] + self._tree[2 * node + 1]
+            node //= 2
+
+    @property
+    def total(self) -> float:
+        return float(self._tree[1])
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._tree[self._capacity : self._capacity + self._size]
+
+    def append(self, weight: float) -> int:
+        if self._size == self._capacity:
+            self._grow()
+
+        idx = self._size
+        self._size += 1
+        self[idx] = weight
+        return idx
+
+    def _grow(self) -> None:
+        leaves = self.weights.copy()
+        self._capacity *= 2
+        self._tree = np.zeros(2 * self._capacity, dtype=np.float64)
+        self._tree[self._capacity : self._capacity + len(leaves)] = leaves
+        for node in range(self._capacity - 1, 0, -1):
+            self._tree[node] = self._tree[2 * node] + self._tree[2 * node + 1]
+
+    def sample(self, n: int) -> np.ndarray:
+        """
+        Draws n indices with replacement, probability of each index is proportional to its weight
+        """
+        if self.total <= 0:
+            raise EmptyDataset()
+
+        if n == 1:
+            return np.array([self._sample_one(np.random.random_sample() * self.total)], dtype=np.int64)
+
+        values = np.random.random_sample(n) * self.total
+        nodes = np.ones(n, dtype=np.int64)
+        for _ in range(self._capacity.bit_length() - 1):
+            left = 2 * nodes
+            left_sums = self._tree[left]
+            # going right only into non empty subtrees guards against rounding errors
+            go_right = (values >= left_sums) & (self._tree[left + 1] > 0)
+            values -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+
+        return nodes - self._capacity
+
+    def _sample_one(self, value: float) -> int:
+        # scalar descent avoids per level overhead of numpy calls for the common single draw
+        tree = self._tree
+        node = 1
+        while node < self._capacity:
+            left = 2 * node
+            left_sum = tree[left]
+            if value >= left_sum and tree[left + 1] > 0:
+                value -= left_sum
+                node = left + 1
+            else:
+                node = left
+
+        return node - self._capacity
+
+
 class DynamicDataset(Dataset):
     class _Entry:
-        __slots__ = ("weight", "data", "num_updates", "removed")
+        __slots__ = ("id", "key", "num_updates", "removed")
 
-        def __init__(self, data, weight=1.0):
-            self.weight = weight
-            self.data = data
+        def __init__(self, id_, key):
+            self.id = id_
+            self.key = key
             self.num_updates = 0
             self.removed = False
 
-    def __init__(self, transform=None, gamma: float = 0.9, min_weight: float = 0.1) -> None:
+    def __init__(
+        self,
+        transform=None,
+        gamma: float = 0.9,
+        min_weight: float = 0.1,
+        storage: Optional[IDatasetStorage] = None,
+    ) -> None:
         assert transform is None or callable(transform), "Given 'transforms' is not callable"
         self.transform = transform
-        # the data dict holds values for each key, these values are typically a tuple of (raw img, label img)
+        # storage holds values for each entry, these values are typically a tuple of (raw img, label img)
+        self._storage = storage if storage is not None else InMemoryStorage()
 
         self._index_by_id = {}
         self._data: List[self._Entry] = []
+        self._removed = collections.deque()
+        self._weights = _SumTree()
+        self._weights_lock = threading.Lock()
         self._size = 0
 
         self.gamma = gamma
@@ -60,10 +187,21 @@ def __getitem__(self, index):
         if entry.removed:
             logger.warning("accessing deleted sample")
 
-        if entry.weight:
-            entry.weight = max(self.min_weight, entry.weight * self.gamma)
+        with self._weights_lock:
+            weight = self._weights[index]
+            if weight:
+                self._weights[index] = max(self.min_weight, weight * self.gamma)
+
+        try:
+            result = self._storage.get(entry.key)
+        except KeyError:
+            raise EntryRemoved(f"Data of entry {entry.id} was reclaimed") from None
+
+        kind, *result = result
+        if kind == _SPARSE_LABEL:
+            raw, coords, values, label_shape = result
+            result = raw, densify(coords, values, tuple(label_shape))
 
-        result = entry.data
         if self.transform is not None:
             result = self.transform(*result)
 
@@ -72,36 +210,106 @@ def __getitem__(self, index):
     def __len__(self):
         return self._size
 
-    def _update_or_create(self, id_, torch_image, torch_label) -> None:
+    def _update_or_create(self, id_, arrays) -> None:
         if id_ in self._index_by_id:
             idx = self._index_by_id[id_]
             entry = self._data[idx]
-            entry.data = torch_image, torch_label
+            entry.key = self._storage.replace(entry.key, arrays)
             entry.num_updates += 1
-            entry.weight += 1.0
+            with self._weights_lock:
+                self._weights[idx] += 1.0
 
             if entry.removed:
                 entry.removed = False
                 self._size += 1
 
         else:
-            new_entry = self._Entry(data=(torch_image, torch_label))
-            new_idx = len(self._data)
-            self._data.append(new_entry)
+            new_entry = self._Entry(id_, self._storage.put(arrays))
+            new_idx = self._take_reclaimed_slot()
+            with self._weights_lock:
+                if new_idx is None:
+                    new_idx = self._weights.append(1.0)
+                    self._data.append(new_entry)
+                else:
+                    self._weights[new_idx] = 1.0
+                    self._data[new_idx] = new_entry
+
             self._index_by_id[id_] = new_idx
             self._size += 1
 
+    def _take_reclaimed_slot(self) -> Optional[int]:
+        """
+        Returns index of removed entry whose data is gone from storage, so it can be reused for a new entry
+        """
+        while self._removed:
+            idx = self._removed[0]
+            entry = self._data[idx]
+            if entry.removed and entry.key in self._storage:
+                return None
+
+            self._removed.popleft()
+            if entry.removed:
+                del self._index_by_id[entry.id]
+                return idx
+
+        return None
+
     def remove(self, id_):
         idx = self._index_by_id.get(id_)
         if idx is None:
             logger.warning("Trying to delete non existing key from dataset %s", id_)
             return
 
-        self._data[idx].removed = True
-        self._data[idx].weight = 0.0
-        # self._data[idx].data = None  # leave data valid in case it was scheduled to be accessed already
+        entry = self._data[idx]
+        if entry.removed:
+            return
+
+        entry.removed = True
+        with self._weights_lock:
+            self._weights[idx] = 0.0
+        # storage keeps released data readable until it's reclaimed in case it was scheduled to be accessed already
+        self._storage.release(entry.key)
+        self._removed.append(idx)
         self._size -= 1
 
+    def close(self) -> None:
+        self._storage.close()
+
+    def save(self, path: Path) -> None:
+        """
+        Writes entries with their weights to directory, so they can be added to other dataset with load
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        index = []
+        for idx, entry in enumerate(self._data):
+            if entry.removed:
+                continue
+
+            file_name = f"{len(index)}.npz"
+            np.savez(path / file_name, *self._storage.get(entry.key))
+            with self._weights_lock:
+                weight = self._weights[idx]
+
+            index.append((entry.id, file_name, weight))
+
+        with open(path / _INDEX_FILE, "wb") as f:
+            pickle.dump(index, f)
+
+    def load(self, path: Path) -> None:
+        """
+        Adds entries written by save
+        """
+        with open(path / _INDEX_FILE, "rb") as f:
+            index = pickle.load(f)
+
+        for id_, file_name, weight in index:
+            with np.load(path / file_name) as npz:
+                arrays = [npz[f"arr_{i}"] for i in range(len(npz.files))]
+
+            self._update_or_create(id_, arrays)
+            with self._weights_lock:
+                self._weights[self._index_by_id[id_]] = weight
+
     def update(self, images: TikTensorBatch, labels: TikTensorBatch) -> None:
         if len(images) != len(labels):
             raise ValueError("images and labels should have length")
@@ -111,21 +319,35 @@ def update(self, images: TikTensorBatch, labels: TikTensorBatch) -> None:
                 raise ValueError(f"image(id={image.id}) and label(id={label.id}) should have same ids")
 
             numpy_image = image.as_numpy()
-            numpy_label = label.as_numpy()
+
+            if isinstance(label, SparseTikTensor):
+                # sparse labels are stored as (kind, raw, coords, values, shape) and densified on access
+                coords, values = label.as_coo()
+                arrays = _kind(_SPARSE_LABEL), numpy_image, coords, values, np.array(label.shape, dtype=np.int64)
+            else:
+                arrays = _kind(_DENSE_LABEL), numpy_image, label.as_numpy()
 
             id_ = image.id
 
-            self._update_or_create(id_, numpy_image, numpy_label)
+            self._update_or_create(id_, arrays)
 
     def get_weights(self) -> torch.DoubleTensor:
-        return torch.DoubleTensor([e.weight for e in self._data])
+        with self._weights_lock:
+            return torch.from_numpy(self._weights.weights.copy())
 
+    def sample_indices(self, n: int) -> np.ndarray:
+        """
+        Draws n indices with probability proportional to sample weights
+        Raises EmptyDataset if there is nothing to sample
+        """
+        with self._weights_lock:
+            return self._weights.sample(n)
 
-class DynamicWeightedRandomSampler(Sampler):
-    r"""Samples elements from [0,..,len(weights)-1] with given probabilities (weights).
 
-    Arguments:
-        dataset (DynamicDataset): providing get_weights method
+class _WeightedRandomDraws:
+    """
+    Endless draws of dataset indices with probability proportional to sample weights,
+    shared by torch and pybio samplers
     """
 
     def __init__(self, dataset: DynamicDataset) -> None:
@@ -137,33 +359,193 @@ def __iter__(self):
             if not len(self._dataset):
                 raise EmptyDataset()
 
-            weights = self._dataset.get_weights()
-            val = torch.multinomial(weights, num_samples=1)
-            yield int(val)
+            yield self._draw()
+
+    def _draw(self) -> int:
+        if isinstance(self._dataset, DynamicDataset):
+            return int(self._dataset.sample_indices(1)[0])
+
+        return int(torch.multinomial(self._dataset.get_weights(), num_samples=1))
 
     def __len__(self):
         return len(self._dataset)
 
 
-class DynamicWeightedRandomPyBioSampler(PyBioSampler):
+class DynamicWeightedRandomSampler(_WeightedRandomDraws, Sampler):
     r"""Samples elements from [0,..,len(weights)-1] with given probabilities (weights).
 
     Arguments:
         dataset (DynamicDataset): providing get_weights method
     """
 
-    def __init__(self, dataset: DynamicDataset) -> None:
+
+class _StagingBuffers:
+    """
+    Reusable collate buffers, pinned if batches are going to be copied to cuda device
+    """
+
+    def __init__(self, pin_memory: bool) -> None:
+        self._pin_memory = pin_memory
+        self._tensors: List[torch.Tensor] = []
+
+    def collate(self, samples: Sequence[Sequence[torch.Tensor]]) -> List[torch.Tensor]:
+        num_fields = len(samples[0])
+        if len(self._tensors) != num_fields:
+            self._tensors = [None] * num_fields
+
+        result = []
+        for field_idx in range(num_fields):
+            field = [s[field_idx] for s in samples]
+            shape = (len(field),) + tuple(field[0].shape)
+            buf = self._tensors[field_idx]
+            if buf is None or tuple(buf.shape) != shape or buf.dtype != field[0].dtype:
+                buf = torch.empty(shape, dtype=field[0].dtype, pin_memory=self._pin_memory)
+                self._tensors[field_idx] = buf
+
+            torch.stack(field, out=buf)
+            result.append(buf)
+
+        return result
+
+
+class PrefetchingLoader:
+    """
+    Samples, transforms and collates batches from DynamicDataset in background threads,
+    so the training loop only waits for an already assembled batch.
+
+    Threads (not processes) are used, so updates to the dataset are picked up immediately.
+    Returned batch tensors are staging buffers that are reused: each batch is valid until the next one is requested.
+    """
+
+    _POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        dataset: DynamicDataset,
+        batch_size: int,
+        *,
+        num_workers: int = 2,
+        prefetch: int = 4,
+        pin_memory: Optional[bool] = None,
+    ) -> None:
+        if num_workers < 1:
+            raise ValueError("num_workers should be at least 1")
+
+        if pin_memory is None:
+            pin_memory = torch.cuda.is_available()
+
         self._dataset = dataset
-        super().__init__(dataset)
+        self._batch_size = batch_size
+        self._ready = queue.Queue(maxsize=prefetch)
+        self._free = queue.Queue()
+        for _ in range(prefetch + num_workers):
+            self._free.put(_StagingBuffers(pin_memory))
+
+        self._in_use: Optional[_StagingBuffers] = None
+        self._stop = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"PrefetchingLoader[{idx}]", daemon=True)
+            for idx in range(num_workers)
+        ]
+        self._started = False
+
+    def _draw_batch(self) -> Optional[List[List[torch.Tensor]]]:
+        while not self._stop.is_set():
+            try:
+                indices = self._dataset.sample_indices(self._batch_size)
+            except EmptyDataset:
+                self._stop.wait(self._POLL_INTERVAL)
+                continue
+
+            try:
+                return [self._dataset[idx] for idx in indices.tolist()]
+            except EntryRemoved:
+                logger.debug("Sampled entry was removed while loading batch, drawing again")
+
+        return None
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                buffers = self._free.get(timeout=self._POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            try:
+                batch = self._draw_batch()
+                if batch is None:
+                    break
+
+                item = (buffers, buffers.collate(batch))
+            except Exception as e:
+                logger.exception("Failed to prepare batch")
+                item = (buffers, e)
+
+            while not self._stop.is_set():
+                try:
+                    self._ready.put(item, timeout=self._POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    pass
+
+    def start(self) -> None:
+        if not self._started:
+            self._started = True
+            for worker in self._workers:
+                worker.start()
 
     def __iter__(self):
-        while True:
-            if not len(self._dataset):
-                raise EmptyDataset()
-
-            weights = self._dataset.get_weights()
-            val = torch.multinomial(weights, num_samples=1)
-            yield int(val)
+        self.start()
+        return self
+
+    def __next__(self) -> List[torch.Tensor]:
+        batch = self.get()
+        if batch is None:
+            raise StopIteration
+
+        return batch
+
+    def get(self, timeout: Optional[float] = None) -> Optional[List[torch.Tensor]]:
+        """
+        Returns next batch, or None if loader was closed or no batch was ready within timeout
+        """
+        if self._in_use is not None:
+            self._free.put(self._in_use)
+            self._in_use = None
+
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            wait = self._POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+
+            try:
+                buffers, batch = self._ready.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+            if isinstance(batch, Exception):
+                self._free.put(buffers)
+                raise batch
+
+            self._in_use = buffers
+            return batch
+
+        return None
+
+    def close(self) -> None:
+        self._stop.set()
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.join()
+
+
+class DynamicWeightedRandomPyBioSampler(_WeightedRandomDraws, PyBioSampler):
+    r"""Samples elements from [0,..,len(weights)-1] with given probabilities (weights).
 
-    def __len__(self):
-        return len(self._dataset)
+    Arguments:
+        dataset (DynamicDataset): providing get_weights method
+    """
@@ -2,13 +2,16 @@
 
 import abc
 import enum
+import os
 import threading
 import uuid
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
 import torch
 
+CPU_DEVICE_ID = "cpu"
+
 
 @enum.unique
 class DeviceStatus(enum.Enum):
@@ -33,6 +36,20 @@ def status(self) -> DeviceStatus:
         """
         ...
 
+    @property
+    def total_cores(self) -> int:
+        """
+        Returns number of cpu cores managed by device (only applicable to cpu)
+        """
+        return 0
+
+    @property
+    def available_cores(self) -> int:
+        """
+        Returns number of cpu cores that can still be leased (only applicable to cpu)
+        """
+        return 0
+
 
 class ILease(abc.ABC):
     @property
@@ -58,6 +75,13 @@ def devices(self) -> List[IDevice]:
         """
         ...
 
+    @property
+    def cpu_cores(self) -> List[int]:
+        """
+        Returns ids of leased cpu cores
+        """
+        return []
+
 
 class IDevicePool(abc.ABC):
     @abc.abstractmethod
@@ -68,17 +92,20 @@ def list_devices(self) -> List[IDevice]:
         ...
 
     @abc.abstractmethod
-    def lease(self, device_ids: List[str]) -> ILease:
+    def lease(self, device_ids: List[str], cpu_cores: int = 0) -> ILease:
         """
         Lease devices for session
+        cpu_cores: number of cpu cores to lease if device_ids contains cpu, 0 means all of them
         """
         ...
 
 
 class _Device(IDevice):
-    def __init__(self, id_: str, status: DeviceStatus) -> None:
+    def __init__(self, id_: str, status: DeviceStatus, total_cores: int = 0, available_cores: int = 0) -> None:
         self.__id = id_
         self.__status = status
+        self.__total_cores = total_cores
+        self.__available_cores = available_cores
 
     @property
     def id(self) -> str:
@@ -88,6 +115,14 @@ def id(self) -> str:
     def status(self) -> DeviceStatus:
         return self.__status
 
+    @property
+    def total_cores(self) -> int:
+        return self.__total_cores
+
+    @property
+    def available_cores(self) -> int:
+        return self.__available_cores
+
 
 class _Lease(ILease):
     def __init__(self, pool, id_: str) -> None:
@@ -102,55 +137,106 @@ def id(self) -> str:
     def devices(self) -> List[IDevice]:
         return self.__pool._get_lease_devices(self.__id)
 
+    @property
+    def cpu_cores(self) -> List[int]:
+        return self.__pool._get_lease_cpu_cores(self.__id)
+
     def terminate(self) -> None:
         self.__pool._release_devices(self.__id)
 
 
+def _available_cpu_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+
+    return list(range(os.cpu_count() or 1))
+
+
 class TorchDevicePool(IDevicePool):
-    def __init__(self):
+    """
+    Device pool of torch devices
+    CPU is leased in units of cores, leased cores are exclusive to the lease
+    """
+
+    def __init__(self, cpu_cores: Optional[Sequence[int]] = None):
         self.__lease_id_by_device_id = {}
         self.__device_ids_by_lease_id = defaultdict(list)
+        self.__cpu_cores = sorted(cpu_cores) if cpu_cores is not None else _available_cpu_cores()
+        self.__lease_id_by_cpu_core = {}
+        self.__cpu_cores_by_lease_id = defaultdict(list)
         self.__lock = threading.Lock()
 
     def list_devices(self) -> List[IDevice]:
         with self.__lock:
-            ids = ["cpu"]
+            devices: List[IDevice] = [self.__cpu_device()]
 
             if torch.cuda.is_available():
-                ids += [f"cuda:{idx}" for idx in range(torch.cuda.device_count())]
+                for id_ in [f"cuda:{idx}" for idx in range(torch.cuda.device_count())]:
+                    status = DeviceStatus.AVAILABLE
+                    if id_ in self.__lease_id_by_device_id:
+                        status = DeviceStatus.IN_USE
 
-            devices: List[IDevice] = []
-            for id_ in ids:
-                status = DeviceStatus.AVAILABLE
-                if id_ in self.__lease_id_by_device_id:
-                    status = DeviceStatus.IN_USE
-
-                devices.append(_Device(id_=id_, status=status))
+                    devices.append(_Device(id_=id_, status=status))
 
             return devices
 
-    def lease(self, device_ids: List[str]) -> ILease:
+    def lease(self, device_ids: List[str], cpu_cores: int = 0) -> ILease:
         if not device_ids:
             raise Exception("No devices specified")
 
         with self.__lock:
             lease_id = uuid.uuid4().hex
             for dev_id in device_ids:
-                if dev_id in self.__lease_id_by_device_id:
+                if dev_id != CPU_DEVICE_ID and dev_id in self.__lease_id_by_device_id:
                     raise Exception(f"Device {dev_id} is already in use")
 
+            leased_cores = []
+            if CPU_DEVICE_ID in device_ids:
+                leased_cores = self.__pick_cpu_cores(cpu_cores)
+
+            for core in leased_cores:
+                self.__lease_id_by_cpu_core[core] = lease_id
+                self.__cpu_cores_by_lease_id[lease_id].append(core)
+
             for dev_id in device_ids:
-                self.__lease_id_by_device_id[dev_id] = lease_id
+                if dev_id != CPU_DEVICE_ID:
+                    self.__lease_id_by_device_id[dev_id] = lease_id
                 self.__device_ids_by_lease_id[lease_id].append(dev_id)
 
             return _Lease(self, id_=lease_id)
 
+    def __free_cpu_cores(self) -> List[int]:
+        return [core for core in self.__cpu_cores if core not in self.__lease_id_by_cpu_core]
+
+    def __pick_cpu_cores(self, count: int) -> List[int]:
+        free = self.__free_cpu_cores()
+        if not count:
+            if len(free) != len(self.__cpu_cores):
+                raise Exception(f"Device {CPU_DEVICE_ID} is already in use")
+            return free
+
+        if count > len(free):
+            raise Exception(f"Requested {count} cpu cores but only {len(free)} are available")
+
+        return free[:count]
+
+    def __cpu_device(self) -> IDevice:
+        available = len(self.__free_cpu_cores())
+        status = DeviceStatus.AVAILABLE if available else DeviceStatus.IN_USE
+        return _Device(id_=CPU_DEVICE_ID, status=status, total_cores=len(self.__cpu_cores), available_cores=available)
+
     def _get_lease_devices(self, lease_id: str) -> List[IDevice]:
         return [_Device(id_=dev_id, status=DeviceStatus.IN_USE) for dev_id in self.__device_ids_by_lease_id[lease_id]]
 
+    def _get_lease_cpu_cores(self, lease_id: str) -> List[int]:
+        return list(self.__cpu_cores_by_lease_id.get(lease_id, []))
+
     def _release_devices(self, lease_id: str) -> None:
         with self.__lock:
             dev_ids = self.__device_ids_by_lease_id.pop(lease_id, [])
 
             for id_ in dev_ids:
-                del self.__lease_id_by_device_id[id_]
+                self.__lease_id_by_device_id.pop(id_, None)
+
+            for core in self.__cpu_cores_by_lease_id.pop(lease_id, []):
+                del self.__lease_id_by_cpu_core[core]
@@ -1,19 +1,61 @@
+import os
+import shutil
+import stat
+import tempfile
 import threading
 from concurrent import futures
+from pathlib import Path
+from typing import Optional
 
 import grpc
 
 from tiktorch.proto import data_store_pb2_grpc, inference_pb2_grpc
 from tiktorch.server.data_store import DataStore
 from tiktorch.server.device_pool import TorchDevicePool
+from tiktorch.server.session.hibernation import HibernationMonitor
 from tiktorch.server.session_manager import SessionManager
+from tiktorch.shared_memory import SHM_PATH
 
 from .data_store_servicer import DataStoreServicer
 from .flight_control_servicer import FlightControlServicer
 from .inference_servicer import InferenceServicer
 
 
-def serve(host, port):
+def _make_shared_weights_dir() -> Path:
+    return Path(tempfile.mkdtemp(prefix="tiktorch_weights_", dir=SHM_PATH if SHM_PATH.is_dir() else None))
+
+
+def _remove_socket(path: str) -> None:
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def serve(
+    host,
+    port,
+    *,
+    unix_socket: Optional[str] = None,
+    hibernate_after: Optional[float] = None,
+    shared_weights: bool = False,
+    shared_memory: bool = False,
+    data_dir: Optional[str] = None,
+    data_quota: Optional[int] = None,
+    data_ttl: Optional[float] = None,
+):
+    """
+    Listens on host:port, unix_socket path or both (port set to None disables TCP)
+    shared_memory: accept Predict tensors passed in shared memory by clients on the same host
+    data_dir: persist uploads in this directory, so clients don't have to upload them again after restart
+    data_quota: maximum size of uploads and chunked arrays in bytes, least recently used uploads not used by model
+        sessions are evicted
+    data_ttl: number of seconds after which unused uploads and chunked arrays expire
+    """
+    if port is None and unix_socket is None:
+        raise ValueError("Either port or unix socket should be specified")
+
     _100_MB = 100 * 1024 * 1024
 
     done_evt = threading.Event()
@@ -23,21 +65,55 @@ def serve(host, port):
             ("grpc.max_send_message_length", _100_MB),
             ("grpc.max_receive_message_length", _100_MB),
             ("grpc.so_reuseport", 0),
+            # allow keepalive pings of launcher channels
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", 5_000),
         ],
     )
 
-    data_store = DataStore()
+    data_store = DataStore(root=None if data_dir is None else Path(data_dir), quota=data_quota, ttl=data_ttl)
+
+    hibernation_monitor = None
+    if hibernate_after:
+        hibernation_monitor = HibernationMonitor(idle_timeout=hibernate_after)
 
-    inference_svc = InferenceServicer(TorchDevicePool(), SessionManager(), data_store)
+    shared_weights_dir = None
+    if shared_weights:
+        shared_weights_dir = _make_shared_weights_dir()
+
+    inference_svc = InferenceServicer(
+        TorchDevicePool(),
+        SessionManager(),
+        data_store,
+        hibernation_monitor,
+        shared_weights_dir=shared_weights_dir,
+        shared_memory=shared_memory,
+    )
     fligh_svc = FlightControlServicer(done_evt=done_evt)
     data_svc = DataStoreServicer(data_store)
 
     inference_pb2_grpc.add_InferenceServicer_to_server(inference_svc, server)
     inference_pb2_grpc.add_FlightControlServicer_to_server(fligh_svc, server)
     data_store_pb2_grpc.add_DataStoreServicer_to_server(data_svc, server)
-    server.add_insecure_port(f"{host}:{port}")
+    if port is not None:
+        server.add_insecure_port(f"{host}:{port}")
+    if unix_socket is not None:
+        # socket left over by crashed server would make bind fail
+        _remove_socket(unix_socket)
+        server.add_insecure_port(f"unix:{unix_socket}")
     server.start()
 
     done_evt.wait()
 
     server.stop(0).wait()
+
+    if unix_socket is not None:
+        _remove_socket(unix_socket)
+
+    if hibernation_monitor is not None:
+        hibernation_monitor.stop()
+
+    if shared_weights_dir is not None:
+        shutil.rmtree(shared_weights_dir, ignore_errors=True)
+
+    data_store.close()
@@ -1,37 +1,232 @@
-import hashlib
+import itertools
 import logging
-import time
+from typing import Iterator
 
 import grpc
+import numpy as np
 
 from tiktorch.proto import data_store_pb2, data_store_pb2_grpc
-from tiktorch.server.data_store import IDataStore
+from tiktorch.server.chunked_array import ChunkedArray
+from tiktorch.server.data_store import ChecksumError, IDataStore, QuotaExceeded, RangeUpload
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class DataStoreServicer(data_store_pb2_grpc.DataStoreServicer):
     def __init__(self, data_store: IDataStore) -> None:
         self.__data_store = data_store
 
     def Upload(self, request_iterator: data_store_pb2.UploadRequest, context) -> data_store_pb2.UploadResponse:
-        # TODO: Move hash to data_store
-
         rq = next(request_iterator)
         if not rq.HasField("info"):
             raise ValueError("Header information is not provided")
 
-        expected_size = rq.info.size
-        data = b""
-        sha256 = hashlib.sha256()
+        try:
+            upload = self.__data_store.create_upload(rq.info.size, ttl=rq.info.ttl or None)
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        try:
+            for rq in request_iterator:
+                upload.write(rq.content)
+        except BaseException:
+            upload.discard()
+            raise
+
+        if upload.size != upload.expected_size:
+            logger.debug("Upload truncated expected %s bytes but received only %s", upload.expected_size, upload.size)
+
+        try:
+            id_ = self.__data_store.put_upload(upload)
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        return data_store_pb2.UploadResponse(id=id_, size=upload.size, sha256=upload.sha256)
+
+    def Remove(self, request: data_store_pb2.RemoveRequest, context) -> data_store_pb2.RemoveResponse:
+        self.__data_store.remove(request.uploadId)
+        return data_store_pb2.RemoveResponse()
+
+    def Download(self, request: data_store_pb2.DownloadRequest, context) -> Iterator[data_store_pb2.DownloadChunk]:
+        info = self.__data_store.stat(request.uploadId)
+        if info is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Upload {request.uploadId} not found")
+
+        if request.offset > info.size:
+            context.abort(grpc.StatusCode.OUT_OF_RANGE, f"Offset {request.offset} is past the end of {info.size} bytes")
+
+        end = info.size if not request.length else min(info.size, request.offset + request.length)
+        offset = request.offset
+        # next chunk is read only after previous one is sent, so there is one chunk in memory per download
+        with self.__data_store.open(request.uploadId) as f:
+            f.seek(offset)
+            while offset < end:
+                content = f.read(min(DOWNLOAD_CHUNK_SIZE, end - offset))
+                if not content:
+                    context.abort(grpc.StatusCode.DATA_LOSS, f"Upload {request.uploadId} is truncated at {offset}")
+                yield data_store_pb2.DownloadChunk(offset=offset, content=content, size=info.size)
+                offset += len(content)
+
+    def Stat(self, request: data_store_pb2.StatRequest, context) -> data_store_pb2.StatResponse:
+        info = self.__data_store.stat(request.uploadId)
+        if info is None:
+            return data_store_pb2.StatResponse(exists=False)
+
+        return data_store_pb2.StatResponse(exists=True, size=info.size)
+
+    def GetUsage(self, request: data_store_pb2.UsageRequest, context) -> data_store_pb2.Usage:
+        usage = self.__data_store.usage()
+        return data_store_pb2.Usage(
+            blobs=usage.blobs,
+            size=usage.size,
+            pinnedSize=usage.pinned_size,
+            quota=usage.quota or 0,
+            evicted=usage.evicted,
+            expired=usage.expired,
+        )
+
+    def StartUpload(self, request: data_store_pb2.StartUploadRequest, context) -> data_store_pb2.UploadStatus:
+        info = self.__data_store.stat(request.sha256)
+        if info is not None and info.size == request.size:
+            return data_store_pb2.UploadStatus(uploadId=info.id, size=info.size, stored=True)
+
+        try:
+            upload = self.__data_store.start_range_upload(
+                request.size, request.sha256, request.chunkSize, ttl=request.ttl or None
+            )
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        return self._upload_status(upload)
+
+    def UploadChunks(self, request_iterator: data_store_pb2.UploadChunk, context) -> data_store_pb2.UploadStatus:
+        upload = None
+        for rq in request_iterator:
+            if upload is None or upload.sha256 != rq.uploadId:
+                upload = self.__get_range_upload(rq.uploadId, context)
+
+            try:
+                upload.write(rq.offset, rq.content, rq.sha256)
+            except ChecksumError as e:
+                context.abort(grpc.StatusCode.DATA_LOSS, str(e))
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            except RuntimeError as e:
+                context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        if upload is None:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "No chunks sent")
+
+        return self._upload_status(upload)
+
+    def GetUploadStatus(self, request: data_store_pb2.UploadStatusRequest, context) -> data_store_pb2.UploadStatus:
+        info = self.__data_store.stat(request.uploadId)
+        if info is not None:
+            return data_store_pb2.UploadStatus(uploadId=info.id, size=info.size, stored=True)
+
+        return self._upload_status(self.__get_range_upload(request.uploadId, context))
+
+    def FinishUpload(self, request: data_store_pb2.FinishUploadRequest, context) -> data_store_pb2.UploadResponse:
+        upload = self.__data_store.get_range_upload(request.uploadId)
+        if upload is None:
+            # finished already, reply of previous call may have been lost
+            info = self.__data_store.stat(request.uploadId)
+            if info is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, f"Upload {request.uploadId} not found")
+            return data_store_pb2.UploadResponse(id=info.id, size=info.size, sha256=info.id)
+
+        try:
+            id_ = self.__data_store.finish_range_upload(upload)
+        except ChecksumError as e:
+            context.abort(grpc.StatusCode.DATA_LOSS, str(e))
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+        except RuntimeError as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        return data_store_pb2.UploadResponse(id=id_, size=upload.expected_size, sha256=upload.sha256)
+
+    def CreateArray(self, request: data_store_pb2.CreateArrayRequest, context) -> data_store_pb2.ArrayInfo:
+        try:
+            id_ = self.__data_store.create_chunked_array(
+                list(request.shape),
+                np.dtype(request.dtype),
+                list(request.chunks) or None,
+                compression=request.compression or None,
+            )
+        except QuotaExceeded as e:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+        except (TypeError, ValueError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
 
+        return self._array_info(id_, self.__data_store.get_chunked_array(id_))
+
+    def GetArrayInfo(self, request: data_store_pb2.ArrayInfoRequest, context) -> data_store_pb2.ArrayInfo:
+        return self._array_info(request.arrayId, self.__get_array(request.arrayId, context))
+
+    def WriteArray(self, request_iterator: data_store_pb2.ArrayRegion, context) -> data_store_pb2.WriteArrayResponse:
+        array, array_id = None, None
         for rq in request_iterator:
-            data += rq.content
-            sha256.update(rq.content)
+            if array is None or array_id != rq.arrayId:
+                array, array_id = self.__get_array(rq.arrayId, context), rq.arrayId
+
+            try:
+                data = np.frombuffer(rq.content, dtype=array.dtype).reshape(list(rq.shape))
+                array.write(list(rq.start), data)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        return data_store_pb2.WriteArrayResponse()
+
+    def DownloadArray(
+        self, request: data_store_pb2.DownloadArrayRequest, context
+    ) -> Iterator[data_store_pb2.ArrayRegion]:
+        array = self.__get_array(request.arrayId, context)
+        chunks = itertools.islice(array.chunk_indices(), request.firstChunk, None)
+        # single chunk is read at a time
+        for i, index in enumerate(chunks, start=request.firstChunk):
+            start, stop = array.chunk_region(index)
+            yield data_store_pb2.ArrayRegion(
+                arrayId=request.arrayId,
+                start=start.tolist(),
+                shape=(stop - start).tolist(),
+                content=array.read(start, stop).tobytes(),
+                chunk=i,
+            )
+
+    def __get_array(self, id_: str, context) -> ChunkedArray:
+        array = self.__data_store.get_chunked_array(id_)
+        if array is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Array {id_} not found")
+
+        return array
+
+    def __get_range_upload(self, id_: str, context) -> RangeUpload:
+        upload = self.__data_store.get_range_upload(id_)
+        if upload is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Upload {id_} not found")
+
+        return upload
 
-        id_ = self.__data_store.put(data)
-        if expected_size != len(data):
-            logger.debug("Upload truncated expected %s bytes but received only %s", expected_size, len(data))
-            raise RuntimeError(f"Expected data of size {expected_size} bytes but got only {len(data)}")
+    @staticmethod
+    def _array_info(id_: str, array: ChunkedArray) -> data_store_pb2.ArrayInfo:
+        return data_store_pb2.ArrayInfo(
+            arrayId=id_,
+            shape=array.shape,
+            dtype=str(array.dtype),
+            chunks=array.chunks,
+            compression=array.compression or "",
+        )
 
-        return data_store_pb2.UploadResponse(id=id_, size=len(data), sha256=sha256.hexdigest())
+    @staticmethod
+    def _upload_status(upload: RangeUpload) -> data_store_pb2.UploadStatus:
+        return data_store_pb2.UploadStatus(
+            uploadId=upload.sha256,
+            size=upload.expected_size,
+            chunkSize=upload.chunk_size,
+            received=[data_store_pb2.ByteRange(offset=start, size=end - start) for start, end in upload.received()],
+        )
@@ -1,51 +1,102 @@
+import functools
+import itertools
+import logging
+import os
 import time
+import urllib.parse
+from pathlib import Path
+from typing import Iterator, Optional
 
 import grpc
+import numpy as np
 
-from tiktorch import converters
+from tiktorch import converters, shared_memory
 from tiktorch.proto import inference_pb2, inference_pb2_grpc
+from tiktorch.server.chunked_array import ChunkedArray
 from tiktorch.server.data_store import IDataStore
 from tiktorch.server.device_pool import DeviceStatus, IDevicePool, TorchDevicePool
-from tiktorch.server.session.process import start_model_session_process
+from tiktorch.server.prediction_jobs import (
+    FINAL_STATES,
+    JobManager,
+    JobState,
+    JobStatus,
+    PredictionJob,
+    open_volume,
+    read_region,
+    write_region,
+)
+from tiktorch.server.session.hibernation import HibernationMonitor, ModelSessionHandle
 from tiktorch.server.session_manager import ISession, SessionManager
+from tiktorch.server.statistics import DatasetStatistics, Sketch, compute_sketch, volume_blocks
+
+logger = logging.getLogger(__name__)
+
+JOB_WATCH_INTERVAL = 1.0
 
 
 class InferenceServicer(inference_pb2_grpc.InferenceServicer):
-    def __init__(self, device_pool: IDevicePool, session_manager: SessionManager, data_store: IDataStore) -> None:
+    def __init__(
+        self,
+        device_pool: IDevicePool,
+        session_manager: SessionManager,
+        data_store: IDataStore,
+        hibernation_monitor: Optional[HibernationMonitor] = None,
+        shared_weights_dir: Optional[Path] = None,
+        shared_memory: bool = False,
+        job_workers: int = 2,
+        statistics_workers: int = 4,
+    ) -> None:
+        """
+        shared_memory: accept tensors in shared memory segments from clients on the same host
+        job_workers: number of tiles each prediction job processes concurrently
+        statistics_workers: number of chunks each statistics computation summarizes concurrently
+        """
         self.__device_pool = device_pool
         self.__session_manager = session_manager
         self.__data_store = data_store
+        self.__hibernation_monitor = hibernation_monitor
+        self.__shared_weights_dir = shared_weights_dir
+        self.__shared_memory = shared_memory
+        self.__jobs = JobManager(data_store, workers=job_workers)
+        self.__statistics_workers = statistics_workers
 
     def CreateModelSession(
         self, request: inference_pb2.CreateModelSessionRequest, context
     ) -> inference_pb2.ModelSession:
+        upload_id = None
         if request.HasField("model_uri"):
             if not request.model_uri.startswith("upload://"):
                 raise NotImplementedError("Only upload:// URI supported")
 
             upload_id = request.model_uri.replace("upload://", "")
-            content = self.__data_store.get(upload_id)
-        else:
-            content = request.model_blob.content
-
-        lease = self.__device_pool.lease(request.deviceIds)
+            # model upload can't be evicted from data store while session uses it
+            self.__data_store.pin(upload_id)
 
         try:
-            _, client = start_model_session_process(model_zip=content, devices=[d.id for d in lease.devices])
-        except Exception:
-            lease.terminate()
+            content = request.model_blob.content if upload_id is None else self.__data_store.get(upload_id)
+            model_session = ModelSessionHandle(
+                self.__device_pool,
+                content,
+                list(request.deviceIds),
+                cpu_cores=request.cpuCores,
+                shared_weights_dir=self.__shared_weights_dir,
+            )
+        except BaseException:
+            if upload_id is not None:
+                self.__data_store.unpin(upload_id)
             raise
 
+        model_info = model_session.model_info
+
         session = self.__session_manager.create_session()
-        session.on_close(lease.terminate)
-        session.on_close(client.shutdown)
-        session.client = client
+        session.on_close(model_session.close)
+        session.model_session = model_session
+        if upload_id is not None:
+            session.on_close(lambda: self.__data_store.unpin(upload_id))
 
-        try:
-            model_info = session.client.get_model_info()
-        except Exception:
-            lease.terminate()
-            raise
+        if self.__hibernation_monitor is not None:
+            self.__hibernation_monitor.watch(model_session)
+            session.on_close(lambda: self.__hibernation_monitor.unwatch(model_session))
 
         pb_valid_shapes = []
         for shape in model_info.valid_shapes:
@@ -69,9 +120,64 @@ def CreateDatasetDescription(
         self, request: inference_pb2.CreateDatasetDescriptionRequest, context
     ) -> inference_pb2.DatasetDescription:
         session = self._getModelSession(context, request.modelSessionId)
-        id = session.client.create_dataset_description(mean=request.mean, stddev=request.stddev)
+        if not request.stddev > 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid standard deviation {request.stddev}")
+
+        with session.model_session.use() as client:
+            id = client.create_dataset_description(mean=request.mean, stddev=request.stddev)
         return inference_pb2.DatasetDescription(id=id)
 
+    def ComputeDatasetStatistics(
+        self, request: inference_pb2.DatasetStatisticsRequest, context
+    ) -> inference_pb2.DatasetDescription:
+        session = self._getModelSession(context, request.modelSessionId)
+        self._checkStatisticsRequest(context, request)
+        volume = open_volume(self.__data_store, request.volumeId)
+        if volume is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Volume {request.volumeId} doesn't exist")
+
+        # volume can't be evicted or expire while it's read
+        self.__data_store.pin(request.volumeId)
+        try:
+            sketch = compute_sketch(volume_blocks(volume), workers=self.__statistics_workers)
+        finally:
+            self.__data_store.unpin(request.volumeId)
+
+        return self._createDescriptionFromSketch(context, session, request, sketch)
+
+    def ComputeStreamStatistics(
+        self, request_iterator: Iterator[inference_pb2.DatasetStatisticsRequest], context
+    ) -> inference_pb2.DatasetDescription:
+        first = next(request_iterator, None)
+        if first is None:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Stream is empty")
+
+        session = self._getModelSession(context, first.modelSessionId)
+        self._checkStatisticsRequest(context, first)
+        # chunks are decoded in the thread pool too
+        blocks = (
+            functools.partial(converters.pb_tensor_to_numpy, rq.tensor)
+            for rq in itertools.chain([first], request_iterator)
+            if rq.HasField("tensor")
+        )
+        sketch = compute_sketch(blocks, workers=self.__statistics_workers)
+        return self._createDescriptionFromSketch(context, session, first, sketch)
+
+    def GetDatasetDescription(
+        self, request: inference_pb2.DatasetDescriptionRequest, context
+    ) -> inference_pb2.DatasetDescription:
+        session = self._getModelSession(context, request.modelSessionId)
+        with session.model_session.use() as client:
+            description = client.get_dataset_description(request.id)
+
+        if description is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Dataset description {request.id} doesn't exist")
+
+        statistics = description.get("statistics")
+        return inference_pb2.DatasetDescription(
+            id=request.id, statistics=None if statistics is None else _pb_dataset_statistics(statistics)
+        )
+
     def CloseModelSession(self, request: inference_pb2.ModelSession, context) -> inference_pb2.Empty:
         self.__session_manager.close_session(request.id)
         return inference_pb2.Empty()
@@ -92,16 +198,154 @@ def ListDevices(self, request: inference_pb2.Empty, context) -> inference_pb2.De
             else:
                 raise ValueError(f"Unknown status value {dev.status}")
 
-            pb_devices.append(inference_pb2.Device(id=dev.id, status=pb_status))
+            pb_devices.append(
+                inference_pb2.Device(
+                    id=dev.id, status=pb_status, totalCores=dev.total_cores, availableCores=dev.available_cores
+                )
+            )
 
         return inference_pb2.Devices(devices=pb_devices)
 
     def Predict(self, request: inference_pb2.PredictRequest, context) -> inference_pb2.PredictResponse:
+        if request.HasField("sharedTensor") or request.HasField("sharedOutput"):
+            self._checkSharedMemory(context, request)
+
+        session = self._getModelSession(context, request.modelSessionId)
+        output_array = self._getOutputArray(context, request) if request.outputArrayId else None
+
+        if request.HasField("volumeRegion"):
+            arr = self._readVolumeRegion(context, session, request.volumeRegion)
+        elif request.HasField("sharedTensor"):
+            try:
+                arr = shared_memory.pb_shared_tensor_to_numpy(request.sharedTensor)
+            except (OSError, TypeError, ValueError) as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid shared tensor: {e}")
+        else:
+            arr = converters.pb_tensor_to_numpy(request.tensor)
+
+        restore_durations = []
+        with session.model_session.use(on_restore=restore_durations.append) as client:
+            res = client.forward(arr, dataset_id=request.datasetId)
+
+        response = inference_pb2.PredictResponse(restoreSeconds=sum(restore_durations))
+        if output_array is not None:
+            self._writeOutputArray(context, session, request.volumeRegion, res, output_array)
+            return response
+
+        if request.HasField("sharedOutput"):
+            # output is returned inline if it doesn't fit or segment is gone, forward pass was done already
+            try:
+                available = os.path.getsize(request.sharedOutput.path) - request.sharedOutput.offset
+                if res.nbytes <= available:
+                    response.sharedTensor.CopyFrom(shared_memory.write_shared_output(res, request.sharedOutput))
+                    return response
+            except (OSError, ValueError):
+                logger.warning("Failed to write output to %s", request.sharedOutput.path, exc_info=True)
+
+        response.tensor.CopyFrom(converters.numpy_to_pb_tensor(res))
+        return response
+
+    def SubmitPredictionJob(self, request: inference_pb2.PredictionJobRequest, context) -> inference_pb2.JobStatus:
         session = self._getModelSession(context, request.modelSessionId)
-        arr = converters.pb_tensor_to_numpy(request.tensor)
-        res = session.client.forward(arr)
-        pb_tensor = converters.numpy_to_pb_tensor(res)
-        return inference_pb2.PredictResponse(tensor=pb_tensor)
+        try:
+            job = self.__jobs.submit(
+                session,
+                request.volumeId,
+                output_array_id=request.outputArrayId,
+                tile_shape={dim.name: dim.size for dim in request.tileShape},
+                chunks=list(request.outputChunks) or None,
+                compression=request.outputCompression or None,
+                dataset_id=request.datasetId,
+            )
+        except KeyError as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        return _pb_job_status(job.status())
+
+    def GetJobStatus(self, request: inference_pb2.JobRequest, context) -> inference_pb2.JobStatus:
+        return _pb_job_status(self._getJob(context, request.jobId).status())
+
+    def WatchJob(self, request: inference_pb2.JobRequest, context) -> Iterator[inference_pb2.JobStatus]:
+        job = self._getJob(context, request.jobId)
+        status = job.status()
+        yield _pb_job_status(status)
+        while status.state not in FINAL_STATES and context.is_active():
+            # changes made while previous status was sent are coalesced
+            new_status = job.wait(status.version, timeout=JOB_WATCH_INTERVAL)
+            if new_status.version != status.version:
+                yield _pb_job_status(new_status)
+            status = new_status
+
+    def CancelJob(self, request: inference_pb2.JobRequest, context) -> inference_pb2.JobStatus:
+        job = self._getJob(context, request.jobId)
+        job.cancel()
+        return _pb_job_status(job.status())
+
+    def _checkSharedMemory(self, context, request: inference_pb2.PredictRequest) -> None:
+        if not self.__shared_memory:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "shared memory tensors are disabled")
+
+        if not _is_local_peer(context.peer()):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, "shared memory tensors are only accepted from this host")
+
+        for field in ("sharedTensor", "sharedOutput"):
+            if request.HasField(field) and not shared_memory.is_segment_path(getattr(request, field).path):
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"{field} doesn't refer to shared memory segment")
+
+    def _checkStatisticsRequest(self, context, request: inference_pb2.DatasetStatisticsRequest) -> None:
+        if any(not 0 <= p <= 100 for p in request.percentiles):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Percentiles have to be in [0, 100]")
+
+    def _createDescriptionFromSketch(
+        self, context, session: ISession, request: inference_pb2.DatasetStatisticsRequest, sketch: Sketch
+    ) -> inference_pb2.DatasetDescription:
+        if not sketch.count:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Dataset has no finite values")
+
+        statistics = sketch.summary(request.percentiles, request.histogramBins)
+        # constant datasets are only shifted to zero mean
+        stddev = statistics.stddev or 1.0
+        with session.model_session.use() as client:
+            id_ = client.create_dataset_description(mean=statistics.mean, stddev=stddev, statistics=statistics)
+
+        return inference_pb2.DatasetDescription(id=id_, statistics=_pb_dataset_statistics(statistics))
+
+    def _readVolumeRegion(self, context, session: ISession, region: inference_pb2.VolumeRegion) -> np.ndarray:
+        volume = open_volume(self.__data_store, region.uploadId)
+        if volume is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Upload {region.uploadId} doesn't exist")
+
+        try:
+            return read_region(volume, session.model_session.model_info, region.start, region.stop)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def _getOutputArray(self, context, request: inference_pb2.PredictRequest) -> ChunkedArray:
+        if not request.HasField("volumeRegion"):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "outputArrayId can only be used with volumeRegion")
+
+        array = self.__data_store.get_chunked_array(request.outputArrayId)
+        if array is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Array {request.outputArrayId} doesn't exist")
+
+        return array
+
+    def _writeOutputArray(
+        self, context, session: ISession, region: inference_pb2.VolumeRegion, res: np.ndarray, array: ChunkedArray
+    ) -> None:
+        try:
+            write_region(array, res, session.model_session.model_info, region.start, region.stop)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def _getJob(self, context, jobId: str) -> PredictionJob:
+        job = self.__jobs.get(jobId)
+        if job is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Job {jobId} doesn't exist")
+
+        return job
 
     def _getModelSession(self, context, modelSessionId: str) -> ISession:
         if not modelSessionId:
@@ -113,3 +357,42 @@ def _getModelSession(self, context, modelSessionId: str) -> ISession:
             context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"model-session with id {modelSessionId} doesn't exist")
 
         return session
+
+
+_PB_JOB_STATES = {
+    JobState.PENDING: inference_pb2.JobStatus.State.PENDING,
+    JobState.RUNNING: inference_pb2.JobStatus.State.RUNNING,
+    JobState.DONE: inference_pb2.JobStatus.State.DONE,
+    JobState.FAILED: inference_pb2.JobStatus.State.FAILED,
+    JobState.CANCELLED: inference_pb2.JobStatus.State.CANCELLED,
+}
+
+
+def _pb_job_status(status: JobStatus) -> inference_pb2.JobStatus:
+    return inference_pb2.JobStatus(
+        jobId=status.id,
+        state=_PB_JOB_STATES[status.state],
+        tilesDone=status.tiles_done,
+        tilesTotal=status.tiles_total,
+        outputArrayId=status.output_array_id,
+        error=status.error,
+    )
+
+
+def _pb_dataset_statistics(statistics: DatasetStatistics) -> inference_pb2.DatasetStatistics:
+    return inference_pb2.DatasetStatistics(
+        count=statistics.count,
+        mean=statistics.mean,
+        variance=statistics.variance,
+        min=statistics.min,
+        max=statistics.max,
+        percentiles=statistics.percentiles,
+        percentileValues=statistics.percentile_values,
+        histogram=statistics.histogram,
+        histogramEdges=statistics.histogram_edges,
+    )
+
+
+def _is_local_peer(peer: str) -> bool:
+    # e.g. "ipv6:%5B::1%5D:41234"
+    return urllib.parse.unquote(peer).startswith(("unix:", "ipv4:127.", "ipv6:[::1]"))
@@ -1,4 +1,5 @@
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
 from pybio.spec import nodes
 
@@ -7,12 +8,15 @@
 __all__ = ["ModelAdapter", "create_model_adapter"]
 
 
-def create_model_adapter(*, pybio_model: nodes.Model, devices=List[str]):
+def create_model_adapter(*, pybio_model: nodes.Model, devices=List[str], shared_weights_path: Optional[Path] = None):
+    """
+    shared_weights_path: if set, pytorch weights are mapped from file with given prefix shared between processes
+    """
     spec = pybio_model.spec
     if spec.framework == "pytorch":
         from ._exemplum import Exemplum
 
-        return Exemplum(pybio_model=pybio_model, devices=devices)
+        return Exemplum(pybio_model=pybio_model, devices=devices, shared_weights_path=shared_weights_path)
     elif spec.framework == "tensorflow":
         from ._tensorflow_model_adapter import TensorflowModelAdapter
 
@@ -19,6 +19,10 @@ def iteration_count(self) -> int:
 
     @abc.abstractmethod
     def set_break_callback(self, thunk: Callable[[], bool]) -> None:
+        """
+        Adapters that train should return from training at an iteration boundary once thunk returns True,
+        so pending commands (e.g. forward passes) wait at most one iteration
+        """
         ...
 
     @abc.abstractmethod
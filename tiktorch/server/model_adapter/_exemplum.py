@@ -1,5 +1,6 @@
 import logging
-from typing import Any, List, Sequence
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
 
 import torch
 from pybio.core.transformations.base import make_concatenated_apply
@@ -7,6 +8,7 @@
 from pybio.spec.utils import get_instance
 
 from ._base import ModelAdapter
+from ._shared_weights import assign_state_dict, load_shared_state_dict
 from ._utils import has_batch_dim
 
 logger = logging.getLogger(__name__)
@@ -30,9 +32,11 @@ def __init__(
         *,
         pybio_model: nodes.Model,
         devices=Sequence[str],
+        shared_weights_path: Optional[Path] = None,
     ):
         self._max_num_iterations = 0
         self._iteration_count = 0
+        self._break_cb = None
         spec = pybio_model.spec
         self.name = spec.name
 
@@ -76,8 +80,12 @@ def __init__(
             self.model.to(self.devices[0])
             assert isinstance(self.model, torch.nn.Module)
             if spec.prediction.weights is not None:
-                state = torch.load(spec.prediction.weights.source, map_location=self.devices[0])
-                self.model.load_state_dict(state)
+                if shared_weights_path is not None and self.devices[0].type == "cpu":
+                    state = load_shared_state_dict(spec.prediction.weights.source, shared_weights_path)
+                    assign_state_dict(self.model, state)
+                else:
+                    state = torch.load(spec.prediction.weights.source, map_location=self.devices[0])
+                    self.model.load_state_dict(state)
         # elif spec.framework == "tensorflow":
         #     import tensorflow as tf
         #     self.devices = []
@@ -117,10 +125,11 @@ def set_max_num_iterations(self, max_num_iterations: int) -> None:
         self._max_num_iterations = max_num_iterations
 
     def set_break_callback(self, cb):
-        return NotImplementedError
+        # kept for the adapter interface, exemplum only runs inference and has no training loop to break
+        self._break_cb = cb
 
     def fit(self):
-        raise NotImplementedError
+        raise NotImplementedError("Training of pybio models isn't supported")
 
-    def train(self):
-        raise NotImplementedError
+    def train(self, batches):
+        raise NotImplementedError("Training of pybio models isn't supported")
@@ -0,0 +1,119 @@
+"""
+Model weights shared between session processes of the same model
+
+State dict is written once into a flat file next to a json index describing each tensor.
+Session processes map this file instead of loading their own copy of the weights,
+so pages are shared through the OS page cache.
+"""
+
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 64
+_INDEX_SUFFIX = ".index.json"
+_DATA_SUFFIX = ".bin"
+
+
+def _atomic_write(path: Path, write_fn) -> None:
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def dump_state_dict(state: Dict[str, torch.Tensor], path_prefix: Path) -> None:
+    """
+    Writes state dict as raw tensor data with an index
+    Index is written last, so its presence means that data file is complete
+    """
+    index = []
+    offset = 0
+    arrays = []
+    for name, tensor in state.items():
+        arr = tensor.detach().cpu().contiguous().numpy()
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        index.append({"name": name, "dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset})
+        arrays.append((offset, arr))
+        offset += arr.nbytes
+
+    def _write_data(f):
+        for arr_offset, arr in arrays:
+            f.seek(arr_offset)
+            f.write(arr.tobytes())
+        f.truncate(max(offset, 1))
+
+    def _write_index(f):
+        f.write(json.dumps(index).encode("utf-8"))
+
+    _atomic_write(path_prefix.with_name(path_prefix.name + _DATA_SUFFIX), _write_data)
+    _atomic_write(path_prefix.with_name(path_prefix.name + _INDEX_SUFFIX), _write_index)
+
+
+def map_state_dict(path_prefix: Path) -> Dict[str, torch.Tensor]:
+    """
+    Maps state dict written by dump_state_dict
+    Mapping is copy-on-write: tensors share memory with other processes until written to
+    """
+    index = json.loads(path_prefix.with_name(path_prefix.name + _INDEX_SUFFIX).read_text())
+    data = np.memmap(path_prefix.with_name(path_prefix.name + _DATA_SUFFIX), mode="c")
+
+    state = {}
+    for entry in index:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arr = np.frombuffer(data, dtype=dtype, count=count, offset=entry["offset"]).reshape(entry["shape"])
+        state[entry["name"]] = torch.from_numpy(arr)
+
+    return state
+
+
+def load_shared_state_dict(weights_source, path_prefix: Path) -> Dict[str, torch.Tensor]:
+    """
+    Returns state dict backed by shared file at path_prefix, creating it from weights_source if needed
+    """
+    if not path_prefix.with_name(path_prefix.name + _INDEX_SUFFIX).exists():
+        logger.info("Creating shared weights %s", path_prefix)
+        path_prefix.parent.mkdir(parents=True, exist_ok=True)
+        dump_state_dict(torch.load(weights_source, map_location="cpu"), path_prefix)
+
+    return map_state_dict(path_prefix)
+
+
+def assign_state_dict(module: torch.nn.Module, state: Dict[str, torch.Tensor]) -> None:
+    """
+    Replaces module parameters and buffers with tensors from state without copying them
+    """
+    expected = set(module.state_dict().keys())
+    missing = expected - state.keys()
+    unexpected = state.keys() - expected
+    if missing or unexpected:
+        raise ValueError(f"State dict mismatch, missing keys: {sorted(missing)}, unexpected keys: {sorted(unexpected)}")
+
+    for name, tensor in state.items():
+        owner_name, _, attr = name.rpartition(".")
+        owner = module
+        for part in owner_name.split(".") if owner_name else []:
+            owner = getattr(owner, part)
+
+        current = getattr(owner, attr)
+
+        if current.shape != tensor.shape:
+            raise ValueError(f"Shape mismatch for {name}: expected {tuple(current.shape)}, got {tuple(tensor.shape)}")
+
+        if attr in owner._parameters:
+            owner._parameters[attr] = torch.nn.Parameter(tensor, requires_grad=False)
+        else:
+            owner._buffers[attr] = tensor
@@ -0,0 +1,393 @@
+"""
+Prediction of whole volumes stored in data store running in background, tile by tile into chunked arrays
+"""
+
+import enum
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tiktorch.server.chunked_array import ChunkedArray
+from tiktorch.server.data_store import IDataStore
+from tiktorch.server.session.process import ModelInfo
+from tiktorch.server.session_manager import ISession
+from tiktorch.types import AxesPoint, Tiling, choose_tile_shape, read_roi
+
+logger = logging.getLogger(__name__)
+
+Volume = Union[np.ndarray, ChunkedArray]
+
+
+def open_volume(data_store: IDataStore, id_: str) -> Optional[Volume]:
+    """
+    Chunked array or upload in .npy format with given id, None if there is none
+    """
+    array = data_store.get_chunked_array(id_)
+    if array is None and data_store.stat(id_) is not None:
+        return data_store.open_array(id_)
+
+    return array
+
+
+def read_region(volume: Volume, model_info: ModelInfo, start: Sequence[int], stop: Sequence[int]) -> np.ndarray:
+    """
+    Reads model input for region [start, stop) of volume, region is extended by model halo
+    """
+    if volume.ndim != len(model_info.input_axes):
+        raise ValueError(f"Volume has {volume.ndim} axes, model expects {model_info.input_axes}")
+
+    halo = dict(model_info.halo)
+    halo = np.array([halo.get(axis, 0) for axis in model_info.input_axes])
+    return np.ascontiguousarray(read_roi(volume, np.array(start) - halo, np.array(stop) + halo))
+
+
+def _place_output(
+    output_shape: Sequence[int], model_info: ModelInfo, start: Sequence[int], stop: Sequence[int]
+) -> Tuple[Tuple[slice, ...], np.ndarray, np.ndarray]:
+    """
+    Part of model output for region [start, stop) and its start in output volume,
+    third value marks axes with size of input volume
+    """
+    halo = dict(model_info.halo)
+    src, dst_start, is_input_size = [], [], []
+    for axis, size in zip(model_info.output_axes, output_shape):
+        if axis in model_info.input_axes:
+            idx = model_info.input_axes.index(axis)
+            axis_halo = halo.get(axis, 0)
+            region_size = stop[idx] - start[idx]
+            if size in (region_size, region_size + 2 * axis_halo):
+                crop = (size - region_size) // 2
+                src.append(slice(crop, crop + region_size))
+                dst_start.append(start[idx])
+                is_input_size.append(True)
+                continue
+
+            if start[idx] or axis_halo:
+                raise ValueError(f"Output of size {size} along {axis!r} doesn't match region of size {region_size}")
+
+        src.append(slice(None))
+        dst_start.append(0)
+        is_input_size.append(False)
+
+    return tuple(src), np.array(dst_start, dtype=np.int64), np.array(is_input_size)
+
+
+def output_shape(
+    volume_shape: Sequence[int],
+    tile_output_shape: Sequence[int],
+    model_info: ModelInfo,
+    start: Sequence[int],
+    stop: Sequence[int],
+) -> Tuple[int, ...]:
+    """
+    Shape of output volume for volume of given shape, given shape of output for its region [start, stop)
+    """
+    _, _, is_input_size = _place_output(tile_output_shape, model_info, start, stop)
+    shape = []
+    for axis, size, input_size in zip(model_info.output_axes, tile_output_shape, is_input_size):
+        shape.append(volume_shape[model_info.input_axes.index(axis)] if input_size else size)
+    return tuple(shape)
+
+
+def write_region(
+    array: ChunkedArray, output: np.ndarray, model_info: ModelInfo, start: Sequence[int], stop: Sequence[int]
+) -> None:
+    """
+    Writes model output for region [start, stop) into array
+
+    Along input axes output either has size of input with halo (halo is cropped off) or size of region.
+    Other axes (e.g. channels changed by model) are written whole, which is only possible if region
+    along them starts at 0 and has no halo (as in client Stitcher). Parts of region past the array are dropped.
+    """
+    if output.ndim != array.ndim:
+        raise ValueError(f"Output of shape {output.shape} doesn't fit {array}")
+
+    src, dst_start, _ = _place_output(output.shape, model_info, start, stop)
+    output = output[src]
+    # regions of tiles at the border may reach past the array
+    clipped = np.maximum(np.minimum(output.shape, np.subtract(array.shape, dst_start)), 0)
+    array.write(dst_start, output[tuple(slice(0, size) for size in clipped)])
+
+
+class JobState(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINAL_STATES = (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+
+class JobStatus(NamedTuple):
+    id: str
+    state: JobState
+    tiles_done: int
+    tiles_total: int
+    # empty until output array is created
+    output_array_id: str
+    error: str
+    # increases with every change of status
+    version: int
+
+
+class PredictionJob:
+    """
+    Predicts all tiles of volume in worker threads, so reading and writing of tiles overlaps with prediction
+
+    First tile is predicted alone, its output determines shape and dtype of output array if it has to be created
+    """
+
+    def __init__(
+        self,
+        session: ISession,
+        data_store: IDataStore,
+        volume: Volume,
+        tiling: Tiling,
+        *,
+        output_array_id: str = "",
+        chunks: Optional[Sequence[int]] = None,
+        compression: Optional[str] = None,
+        dataset_id: str = "",
+        workers: int = 2,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        dataset_id: description of dataset tiles are normalized by, see IRPCModelSession.forward
+        on_finish: called once job stops, before it's reported as finished
+        """
+        self.id = uuid.uuid4().hex
+        self.__session = session
+        self.__data_store = data_store
+        self.__volume = volume
+        self.__tiling = tiling
+        self.__output_array_id = output_array_id
+        self.__output: Optional[ChunkedArray] = None
+        # output array created by job, it's pinned until job is finished
+        self.__created_output_id = ""
+        self.__chunks = chunks
+        self.__compression = compression
+        self.__dataset_id = dataset_id
+        self.__workers = workers
+        self.__on_finish = on_finish
+
+        self.__cond = threading.Condition()
+        self.__state = JobState.PENDING
+        self.__tiles_done = 0
+        self.__error = ""
+        self.__version = 0
+        self.__next_tile = 0
+
+    def status(self) -> JobStatus:
+        with self.__cond:
+            return JobStatus(
+                id=self.id,
+                state=self.__state,
+                tiles_done=self.__tiles_done,
+                tiles_total=len(self.__tiling),
+                output_array_id=self.__output_array_id,
+                error=self.__error,
+                version=self.__version,
+            )
+
+    def wait(self, version: int = -1, timeout: Optional[float] = None) -> JobStatus:
+        """
+        Returns status once its version is newer than given one or job finished, or after timeout
+        """
+        with self.__cond:
+            self.__cond.wait_for(lambda: self.__version > version or self.__state in FINAL_STATES, timeout)
+            return self.status()
+
+    def start(self) -> None:
+        threading.Thread(target=self.__run, name=f"PredictionJob-{self.id}", daemon=True).start()
+
+    def cancel(self) -> None:
+        self.__set_state(JobState.CANCELLED)
+
+    def __run(self) -> None:
+        try:
+            if self.__set_state(JobState.RUNNING):
+                # output array is created from output of the first tile
+                self.__predict_tile(self.__take_tile())
+                workers = [threading.Thread(target=self.__work, daemon=True) for _ in range(self.__workers)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+        except Exception as e:
+            logger.exception("Prediction job %s failed", self.id)
+            self.__set_state(JobState.FAILED, error=str(e) or type(e).__name__)
+        finally:
+            if self.__created_output_id:
+                self.__data_store.unpin(self.__created_output_id)
+            if self.__on_finish is not None:
+                self.__on_finish()
+            self.__set_state(JobState.DONE)
+
+    def __work(self) -> None:
+        try:
+            idx = self.__take_tile()
+            while idx is not None:
+                self.__predict_tile(idx)
+                idx = self.__take_tile()
+        except Exception as e:
+            logger.exception("Prediction job %s failed", self.id)
+            self.__set_state(JobState.FAILED, error=str(e) or type(e).__name__)
+
+    def __take_tile(self) -> Optional[int]:
+        with self.__cond:
+            if self.__state != JobState.RUNNING or self.__next_tile >= len(self.__tiling):
+                return None
+
+            idx = self.__next_tile
+            self.__next_tile += 1
+            return idx
+
+    def __predict_tile(self, idx: Optional[int]) -> None:
+        if idx is None:
+            return
+
+        model_session = self.__session.model_session
+        start, stop = self.__tiling.region(idx)
+        arr = read_region(self.__volume, model_session.model_info, start, stop)
+        with model_session.use() as client:
+            res = client.forward(arr, dataset_id=self.__dataset_id)
+
+        if self.__output is None:
+            self.__output = self.__open_output(res, model_session.model_info, start, stop)
+
+        write_region(self.__output, res, model_session.model_info, start, stop)
+        with self.__cond:
+            self.__tiles_done += 1
+            self.__changed()
+
+    def __open_output(
+        self, res: np.ndarray, model_info: ModelInfo, start: np.ndarray, stop: np.ndarray
+    ) -> ChunkedArray:
+        if self.__output_array_id:
+            output = self.__data_store.get_chunked_array(self.__output_array_id)
+            if output is None:
+                raise ValueError(f"Array {self.__output_array_id} doesn't exist")
+            return output
+
+        shape = output_shape(self.__volume.shape, res.shape, model_info, start, stop)
+        id_ = self.__data_store.create_chunked_array(shape, res.dtype, self.__chunks, compression=self.__compression)
+        self.__data_store.pin(id_)
+        self.__created_output_id = id_
+        with self.__cond:
+            self.__output_array_id = id_
+            self.__changed()
+        return self.__data_store.get_chunked_array(id_)
+
+    def __set_state(self, state: JobState, error: str = "") -> bool:
+        """
+        Returns False if job is already finished
+        """
+        with self.__cond:
+            if self.__state in FINAL_STATES:
+                return False
+
+            self.__state = state
+            self.__error = error
+            self.__changed()
+            return True
+
+    def __changed(self) -> None:
+        self.__version += 1
+        self.__cond.notify_all()
+
+
+class JobManager:
+    """
+    Runs prediction jobs, jobs of closed sessions are cancelled, only keep_finished recent finished jobs are kept
+    """
+
+    def __init__(self, data_store: IDataStore, *, workers: int = 2, keep_finished: int = 100) -> None:
+        """
+        workers: number of tiles of a job processed concurrently
+        """
+        self.__data_store = data_store
+        self.__workers = workers
+        self.__keep_finished = keep_finished
+        self.__jobs: "OrderedDict[str, PredictionJob]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def submit(
+        self,
+        session: ISession,
+        volume_id: str,
+        *,
+        output_array_id: str = "",
+        tile_shape: Optional[Dict[str, int]] = None,
+        chunks: Optional[Sequence[int]] = None,
+        compression: Optional[str] = None,
+        dataset_id: str = "",
+    ) -> PredictionJob:
+        """
+        Starts predicting volume (chunked array or upload in .npy format) with axes of session input
+        Raises KeyError if volume doesn't exist and ValueError if it can't be predicted
+        tile_shape: one of valid shapes of the model by default
+        """
+        volume = open_volume(self.__data_store, volume_id)
+        if volume is None:
+            raise KeyError(f"Volume {volume_id} doesn't exist")
+
+        if output_array_id and self.__data_store.get_chunked_array(output_array_id) is None:
+            raise KeyError(f"Array {output_array_id} doesn't exist")
+
+        model_info = session.model_session.model_info
+        axes = model_info.input_axes
+        if volume.ndim != len(axes):
+            raise ValueError(f"Volume of shape {volume.shape} doesn't match input axes {axes!r}")
+
+        shape = AxesPoint(axes, volume.shape)
+        if tile_shape:
+            if set(tile_shape) != set(axes):
+                raise ValueError(f"Tile shape {tile_shape} doesn't match input axes {axes!r}")
+            tile = AxesPoint.from_dict(axes, tile_shape)
+        else:
+            tile = choose_tile_shape(shape, [AxesPoint.from_dict(axes, dict(s)) for s in model_info.valid_shapes])
+        tiling = Tiling(shape, tile, AxesPoint.from_dict(axes, dict(model_info.halo), missing=0))
+
+        # volume and output can't be evicted or expire while they are used
+        pinned = [volume_id, output_array_id] if output_array_id else [volume_id]
+        for id_ in pinned:
+            self.__data_store.pin(id_)
+
+        def on_finish():
+            for id_ in pinned:
+                self.__data_store.unpin(id_)
+
+        job = PredictionJob(
+            session,
+            self.__data_store,
+            volume,
+            tiling,
+            output_array_id=output_array_id,
+            chunks=chunks,
+            compression=compression,
+            dataset_id=dataset_id,
+            workers=self.__workers,
+            on_finish=on_finish,
+        )
+        with self.__lock:
+            self.__jobs[job.id] = job
+            self.__forget_finished()
+
+        session.on_close(job.cancel)
+        job.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[PredictionJob]:
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def __forget_finished(self) -> None:
+        finished = [id_ for id_, job in self.__jobs.items() if job.status().state in FINAL_STATES]
+        for id_ in finished[: max(len(finished) - self.__keep_finished, 0)]:
+            del self.__jobs[id_]
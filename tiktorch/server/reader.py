@@ -22,12 +22,35 @@ def guess_model_path(file_names: List[str]) -> Optional[str]:
     return None
 
 
-def eval_model_zip(model_zip: ZipFile, devices: Sequence[str], cache_path: Optional[Path] = None) -> ModelAdapter:
-    temp_path = Path(tempfile.mkdtemp(prefix="tiktorch_"))
+def is_extracted(path: Path) -> bool:
+    return path.is_dir() and guess_model_path([str(file_name) for file_name in path.glob("*")]) is not None
+
+
+def eval_model_zip(
+    model_zip: Optional[ZipFile],
+    devices: Sequence[str],
+    cache_path: Optional[Path] = None,
+    extract_path: Optional[Path] = None,
+    shared_weights_path: Optional[Path] = None,
+) -> ModelAdapter:
+    """
+    Extract model archive and create model adapter for it
+    If extract_path already contains extracted model, archive is not extracted again and may be omitted
+    """
+    if extract_path is None:
+        temp_path = Path(tempfile.mkdtemp(prefix="tiktorch_"))
+    else:
+        temp_path = extract_path
+        temp_path.mkdir(parents=True, exist_ok=True)
+
     if cache_path is None:
         cache_path = temp_path / "cache"
 
-    model_zip.extractall(temp_path)
+    if not is_extracted(temp_path):
+        if model_zip is None:
+            raise ValueError(f"No model archive provided and {temp_path} doesn't contain extracted model")
+
+        model_zip.extractall(temp_path)
 
     spec_file_str = guess_model_path([str(file_name) for file_name in temp_path.glob("*")])
     if not spec_file_str:
@@ -38,13 +61,14 @@ def eval_model_zip(model_zip: ZipFile, devices: Sequence[str], cache_path: Optio
     pybio_model = spec.utils.load_model(spec_file_str, root_path=temp_path, cache_path=cache_path)
 
     if pybio_model.spec.training is None:
-        return create_model_adapter(pybio_model=pybio_model, devices=devices)
+        return create_model_adapter(pybio_model=pybio_model, devices=devices, shared_weights_path=shared_weights_path)
     else:
         ret = train(pybio_model, _devices=devices)
 
     def _on_error(function, path, exc_info):
         logger.warning("Failed to delete temp directory %s", path)
 
-    shutil.rmtree(temp_path, onerror=_on_error)
+    if extract_path is None:
+        shutil.rmtree(temp_path, onerror=_on_error)
 
     return ret
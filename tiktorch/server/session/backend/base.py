@@ -4,6 +4,7 @@
 import threading
 import typing
 from concurrent.futures import Future
+from pathlib import Path
 
 from tiktorch.configkeys import TRAINING, VALIDATION
 from tiktorch.server.model_adapter import ModelAdapter
@@ -15,8 +16,8 @@
 
 
 class SessionBackend:
-    def __init__(self, exemplum: ModelAdapter):
-        self._supervisor = supervisor.Supervisor(exemplum)
+    def __init__(self, exemplum: ModelAdapter, *, dataset_dir: typing.Optional[Path] = None):
+        self._supervisor = supervisor.Supervisor(exemplum, dataset_dir=dataset_dir)
         self._supervisor_thread = threading.Thread(target=self._supervisor.run, name="ModelThread")
         self._supervisor_thread.start()
 
@@ -25,12 +26,26 @@ def update_dataset(self, name: str, *, data: TikTensorBatch, labels: TikTensorBa
         update_cmd = commands.UpdateDatasetCmd(name, raw_data=data, labels=labels)
         self._supervisor.send_command(update_cmd)
 
+    def remove_data(self, name: str, ids: typing.List) -> None:
+        assert name in (TRAINING, VALIDATION), f"{name} not in ({TRAINING}, {VALIDATION})"
+        self._supervisor.send_command(commands.RemoveDataCmd(name, ids))
+
+    def save_datasets(self, path: Path) -> None:
+        save_cmd = commands.SaveDatasetsCmd(path)
+        self._supervisor.send_command(save_cmd.awaitable)
+        save_cmd.awaitable.wait()
+
+    def load_datasets(self, path: Path) -> None:
+        load_cmd = commands.LoadDatasetsCmd(path)
+        self._supervisor.send_command(load_cmd.awaitable)
+        load_cmd.awaitable.wait()
+
     def set_max_num_iterations(self, num: int) -> None:
         self._supervisor.send_command(commands.SetMaxNumIterations(num))
 
-    def forward(self, input_tensor):
+    def forward(self, input_tensor, normalization: typing.Optional[types.Normalization] = None):
         res = Future()
-        self._supervisor.send_command(commands.ForwardPass(res, input_tensor))
+        self._supervisor.send_command(commands.ForwardPass(res, input_tensor, normalization))
         return res
 
     def shutdown(self) -> None:
@@ -55,5 +70,8 @@ def pause_training(self) -> None:
     def get_idle(self) -> bool:
         return self._supervisor.state == types.State.Paused
 
+    def get_forward_latency(self) -> dict:
+        return self._supervisor.forward_latency.as_dict()
+
     def on_idle(self, callback: typing.Callable[[], None]) -> None:
         self._supervisor.on_idle(callback)
@@ -4,16 +4,18 @@
 import logging
 import queue
 import threading
+import time
 import typing
 from dataclasses import dataclass, field
+from pathlib import Path
 
+from tiktorch.configkeys import TRAINING, VALIDATION
 from tiktorch.server.session import types
+from tiktorch.tiktypes import TikTensorBatch
 
 if typing.TYPE_CHECKING:
     from tiktorch.server.session.backend.supervisor import Supervisor
 
-    # from tiktorch.server.datasets import DynamicDataset
-
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,9 @@
     "ResumeCmd",
     "StopCmd",
     "UpdateDatasetCmd",
+    "RemoveDataCmd",
+    "SaveDatasetsCmd",
+    "LoadDatasetsCmd",
     "SetMaxNumIterations",
 ]
 
@@ -87,14 +92,60 @@ def execute(self, ctx: Context) -> None:
 
 class UpdateDatasetCmd(ICommand):
     def __init__(self, name, *, raw_data, labels):
-        self._name = name
-        self._raw_data = raw_data
-        self._labels = labels
+        if len(raw_data) != len(labels):
+            raise ValueError("raw_data and labels should have same length")
+
+        self.name = name
+        # entries are keyed by id so that pending updates can be superseded by newer ones
+        self._entries = {image.id: (image, label) for image, label in zip(raw_data, labels)}
+
+    @property
+    def ids(self) -> typing.List:
+        return list(self._entries)
+
+    def discard(self, id_) -> None:
+        """
+        Drops entry with given id, used when it's superseded by later command
+        """
+        self._entries.pop(id_, None)
+
+    def execute(self, ctx: Context) -> None:
+        if not self._entries:
+            logger.debug("All entries of %s were superseded", self)
+            return
+
+        dataset = ctx.session.get_dataset(self.name)
+        images, labels = zip(*self._entries.values())
+        dataset.update(TikTensorBatch(list(images)), TikTensorBatch(list(labels)))
+
+
+class RemoveDataCmd(ICommand):
+    def __init__(self, name, ids):
+        self.name = name
+        self.ids = list(ids)
+
+    def execute(self, ctx: Context) -> None:
+        dataset = ctx.session.get_dataset(self.name)
+        for id_ in self.ids:
+            dataset.remove(id_)
+
+
+class SaveDatasetsCmd(ICommand):
+    def __init__(self, path: Path) -> None:
+        self._path = path
 
     def execute(self, ctx: Context) -> None:
-        logger.warning("Not Implemented")
-        # dataset = ctx.exemplum.get_dataset(self._name)
-        # dataset.update(self._raw_data, self._labels)
+        for name in (TRAINING, VALIDATION):
+            ctx.session.get_dataset(name).save(self._path / name)
+
+
+class LoadDatasetsCmd(ICommand):
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def execute(self, ctx: Context) -> None:
+        for name in (TRAINING, VALIDATION):
+            ctx.session.get_dataset(name).load(self._path / name)
 
 
 class SetMaxNumIterations(ICommand):
@@ -106,19 +157,26 @@ def execute(self, ctx: Context) -> None:
 
 
 class ForwardPass(ICommand):
-    def __init__(self, future, input_tensor):
+    def __init__(self, future, input_tensor, normalization: typing.Optional[types.Normalization] = None):
         self._input_tensor = input_tensor
+        self._normalization = normalization
         self._future = future
+        self._created_at = time.monotonic()
 
     def execute(self, ctx: Context) -> None:
+        ctx.session.record_forward_wait(time.monotonic() - self._created_at)
         try:
-            self._future.set_result(ctx.session.forward(self._input_tensor))
+            input_tensor = self._input_tensor
+            if self._normalization is not None:
+                input_tensor = self._normalization(input_tensor)
+            self._future.set_result(ctx.session.forward(input_tensor))
         except Exception as e:
             self._future.set_exception(e)
 
 
 class CommandPriorityQueue(queue.PriorityQueue):
-    COMMAND_PRIORITIES = {StopCmd: 0}
+    # Forward passes go before other pending commands to keep inference latency low during training
+    COMMAND_PRIORITIES = {StopCmd: 0, ForwardPass: 1}
 
     @dataclass(order=True)
     class _PrioritizedItem:
@@ -138,3 +196,36 @@ def put(self, cmd: ICommand, block=True, timeout=None) -> None:
     def get(self, block=True, timeout=None):
         queue_item = super().get(block, timeout)
         return queue_item.item
+
+    # Following methods are called by queue.Queue while holding self.mutex
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        # (dataset name, entry id) -> pending command that is going to update this entry
+        self._pending_updates: typing.Dict[typing.Tuple[str, typing.Any], UpdateDatasetCmd] = {}
+
+    def _put(self, item):
+        cmd = _unwrap(item.item)
+        if isinstance(cmd, (UpdateDatasetCmd, RemoveDataCmd)):
+            for id_ in cmd.ids:
+                superseded = self._pending_updates.pop((cmd.name, id_), None)
+                if superseded is not None:
+                    superseded.discard(id_)
+
+                if isinstance(cmd, UpdateDatasetCmd):
+                    self._pending_updates[(cmd.name, id_)] = cmd
+
+        super()._put(item)
+
+    def _get(self):
+        item = super()._get()
+        cmd = _unwrap(item.item)
+        if isinstance(cmd, UpdateDatasetCmd):
+            for id_ in cmd.ids:
+                if self._pending_updates.get((cmd.name, id_)) is cmd:
+                    del self._pending_updates[(cmd.name, id_)]
+
+        return item
+
+
+def _unwrap(cmd: ICommand) -> ICommand:
+    return cmd._cmd if isinstance(cmd, AwaitableCommand) else cmd
@@ -2,24 +2,90 @@
 
 import logging
 import queue
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional
 
 import numpy as np
+import torch
 
+from tiktorch.configkeys import TRAINING, VALIDATION
+from tiktorch.server.dataset_storage import MmapArena
+from tiktorch.server.datasets import DynamicDataset, PrefetchingLoader
 from tiktorch.server.model_adapter import ModelAdapter
 from tiktorch.server.session import types
 from tiktorch.server.session.backend import commands
 
 logger = logging.getLogger(__name__)
 
+DATASET_COMPACT_INTERVAL = 30  # seconds
+TRAINING_BATCH_SIZE = 1
+# how long training waits for a batch before checking for pending commands again
+BATCH_WAIT_INTERVAL = 0.1  # seconds
+
+
+class LatencyStats:
+    """
+    Tracks time forward passes spent waiting in command queue
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._max_during_training = 0.0
+
+    def record(self, wait: float, during_training: bool) -> None:
+        with self._lock:
+            self._count += 1
+            self._total += wait
+            self._max = max(self._max, wait)
+            if during_training:
+                self._max_during_training = max(self._max_during_training, wait)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "count": self._count,
+                "mean_wait": self._total / self._count if self._count else 0.0,
+                "max_wait": self._max,
+                "max_wait_during_training": self._max_during_training,
+            }
+
 
 class Supervisor:
-    def __init__(self, exemplum: ModelAdapter) -> None:
+    def __init__(
+        self, exemplum: ModelAdapter, *, dataset_dir: Optional[Path] = None, batch_size: int = TRAINING_BATCH_SIZE
+    ) -> None:
+        """
+        dataset_dir: if set, training data is stored in memory mapped files in this directory
+        batch_size: size of batches training draws from training dataset
+        """
         self._state = types.State.Stopped
 
         self._command_queue = commands.CommandPriorityQueue()
         self._exemplum = exemplum
         self._exemplum.set_break_callback(self.has_commands)
         self._idle_callbacks = []
+        self.forward_latency = LatencyStats()
+        self._datasets = {name: self._create_dataset(name, dataset_dir) for name in (TRAINING, VALIDATION)}
+        self._batch_size = batch_size
+        # started on first training, so sessions only used for inference don't run loader threads
+        self._loader: Optional[PrefetchingLoader] = None
+
+    @staticmethod
+    def _create_dataset(name: str, dataset_dir: Optional[Path]) -> DynamicDataset:
+        if dataset_dir is None:
+            return DynamicDataset()
+
+        return DynamicDataset(storage=MmapArena(dataset_dir / name, compact_interval=DATASET_COMPACT_INTERVAL))
+
+    def get_dataset(self, name: str) -> DynamicDataset:
+        if name not in self._datasets:
+            raise ValueError(f"Unknown dataset {name}, expected one of {list(self._datasets)}")
+
+        return self._datasets[name]
 
     def send_command(self, cmd: commands.ICommand) -> None:
         if not isinstance(cmd, commands.ICommand):
@@ -43,6 +109,12 @@ def forward(self, input_tensor):
         assert isinstance(result, np.ndarray)
         return result
 
+    def record_forward_wait(self, wait: float) -> None:
+        during_training = self._state == types.State.Running
+        self.forward_latency.record(wait, during_training)
+        if during_training:
+            logger.debug("Forward pass waited %.3f s for training to yield", wait)
+
     def transition_to(self, new_state: types.State) -> None:
         logger.debug("Attempting transition to state %s", new_state)
         self._state = new_state
@@ -73,6 +145,10 @@ def run(self):
         except Exception:
             logger.exception("Uncaught exception in session worker")
         finally:
+            if self._loader is not None:
+                self._loader.close()
+            for dataset in self._datasets.values():
+                dataset.close()
             logger.info("Stopped session worker")
 
     def _run(self):
@@ -113,8 +189,11 @@ def _train(self):
         logger.info(
             "Start session for %d iterations", self._exemplum.max_num_iterations - self._exemplum.iteration_count
         )
+        if self._loader is None:
+            self._loader = PrefetchingLoader(self._datasets[TRAINING], self._batch_size)
+
         try:
-            self._exemplum.train()
+            self._exemplum.train(self._training_batches())
         except Exception as e:
             logger.error("Exception during session training. Pausing...", exc_info=True)
             # FIXME: Should we use PauseCmd here? Maybe we should only know about ICommand on this level.
@@ -122,6 +201,16 @@ def _train(self):
 
         self._update_state()
 
+    def _training_batches(self) -> Iterator[List[torch.Tensor]]:
+        """
+        Batches prefetched from training dataset, ends once commands are pending,
+        so they aren't held up while training waits for data
+        """
+        while not self.has_commands():
+            batch = self._loader.get(timeout=BATCH_WAIT_INTERVAL)
+            if batch is not None:
+                yield batch
+
     def _update_state(self):
         if self._state == types.State.Running:
             should_idle = not self.has_work()
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from tiktorch.server.device_pool import IDevicePool, ILease
+
+from .process import ModelInfo, SessionSnapshot, start_model_session_process
+from .rpc_interface import IRPCModelSession
+
+logger = logging.getLogger(__name__)
+
+PROCESS_JOIN_TIMEOUT = 10  # seconds
+
+
+class ModelSessionHandle:
+    """
+    Owns model session process together with its device lease
+    Process can be hibernated: session state is snapshotted, extracted model is kept on disk,
+    process and lease are terminated. Next access restores the process transparently.
+    """
+
+    def __init__(
+        self,
+        device_pool: IDevicePool,
+        model_zip: bytes,
+        device_ids: List[str],
+        *,
+        cpu_cores: int = 0,
+        shared_weights_dir: Optional[Path] = None,
+        start_process: Callable = start_model_session_process,
+    ) -> None:
+        """
+        cpu_cores: number of cpu cores to lease if device_ids contains cpu, 0 means all of them
+        shared_weights_dir: if set, weights of sessions created from identical model archives are shared
+        """
+        self.__device_pool = device_pool
+        self.__device_ids = list(device_ids)
+        self.__cpu_cores = cpu_cores
+        self.__shared_weights_path = None
+        if shared_weights_dir is not None:
+            self.__shared_weights_path = shared_weights_dir / hashlib.sha256(model_zip).hexdigest()
+
+        self.__start_process = start_process
+        self.__lock = threading.RLock()
+        self.__extract_path = Path(tempfile.mkdtemp(prefix="tiktorch_session_"))
+
+        self.__proc = None
+        self.__client: Optional[IRPCModelSession] = None
+        self.__lease: Optional[ILease] = None
+        self.__snapshot: Optional[SessionSnapshot] = None
+        self.__model_info: Optional[ModelInfo] = None
+        self.__in_use = 0
+        self.__closed = False
+
+        self.last_access = time.monotonic()
+        self.last_restore_duration: Optional[float] = None
+
+        try:
+            self.__start(model_zip)
+            self.__model_info = self.__client.get_model_info()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.__model_info
+
+    @property
+    def is_hibernated(self) -> bool:
+        with self.__lock:
+            return self.__client is None and not self.__closed
+
+    @property
+    def idle_time(self) -> float:
+        return time.monotonic() - self.last_access
+
+    @contextlib.contextmanager
+    def use(self, on_restore: Optional[Callable[[float], None]] = None) -> Iterator[IRPCModelSession]:
+        """
+        Returns client for model session process restoring it if it was hibernated
+        Session won't be hibernated while client is in use
+        on_restore: called with restore duration in seconds if session was restored for this use
+        """
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("Model session is closed")
+
+            if self.__client is None:
+                self.__restore()
+                if on_restore is not None:
+                    on_restore(self.last_restore_duration)
+
+            self.__in_use += 1
+            client = self.__client
+
+        try:
+            yield client
+        finally:
+            with self.__lock:
+                self.__in_use -= 1
+                self.last_access = time.monotonic()
+
+    def hibernate(self, min_idle_time: float = 0.0) -> bool:
+        """
+        Stops model session process and releases its devices
+        Returns False if session is currently in use, was used within min_idle_time seconds or is already hibernated
+        """
+        with self.__lock:
+            if self.__client is None or self.__in_use or self.idle_time < min_idle_time:
+                return False
+
+            logger.info("Hibernating model session process (idle for %.1f s)", self.idle_time)
+            self.__snapshot = self.__client.get_snapshot()
+            self.__stop()
+            return True
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__closed = True
+            self.__stop()
+            shutil.rmtree(self.__extract_path, ignore_errors=True)
+
+    def __start(self, model_zip: Optional[bytes]) -> None:
+        self.__lease = self.__device_pool.lease(self.__device_ids, self.__cpu_cores)
+        try:
+            self.__proc, self.__client = self.__start_process(
+                model_zip=model_zip,
+                devices=[d.id for d in self.__lease.devices],
+                extract_path=self.__extract_path,
+                snapshot=self.__snapshot,
+                shared_weights_path=self.__shared_weights_path,
+                cpu_cores=self.__lease.cpu_cores,
+            )
+        except Exception:
+            self.__lease.terminate()
+            self.__lease = None
+            raise
+
+    def __restore(self) -> None:
+        start = time.perf_counter()
+        self.__start(None)
+        # Block until model is loaded so reported latency includes model initialization
+        self.__client.get_model_info()
+        self.last_restore_duration = time.perf_counter() - start
+        logger.info("Restored model session process in %.3f s", self.last_restore_duration)
+
+    def __stop(self) -> None:
+        client, self.__client = self.__client, None
+        proc, self.__proc = self.__proc, None
+        lease, self.__lease = self.__lease, None
+
+        if client is not None:
+            try:
+                client.shutdown()
+            except Exception:
+                logger.exception("Failed to shutdown model session process")
+
+        if proc is not None:
+            proc.join(PROCESS_JOIN_TIMEOUT)
+            if proc.is_alive():
+                logger.warning("Model session process %s didn't exit in time, terminating", proc.pid)
+                proc.terminate()
+
+        if lease is not None:
+            lease.terminate()
+
+
+class HibernationMonitor:
+    """
+    Periodically hibernates model sessions that were idle longer than idle_timeout
+    """
+
+    def __init__(self, idle_timeout: float, check_interval: Optional[float] = None) -> None:
+        self.__idle_timeout = idle_timeout
+        self.__check_interval = check_interval or max(0.1, min(idle_timeout / 2, 10.0))
+        self.__handles: List[ModelSessionHandle] = []
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self._run, name="HibernationMonitor", daemon=True)
+        self.__thread.start()
+
+    def watch(self, handle: ModelSessionHandle) -> None:
+        with self.__lock:
+            self.__handles.append(handle)
+
+    def unwatch(self, handle: ModelSessionHandle) -> None:
+        with self.__lock:
+            if handle in self.__handles:
+                self.__handles.remove(handle)
+
+    def stop(self) -> None:
+        self.__stop.set()
+        self.__thread.join()
+
+    def _run(self) -> None:
+        while not self.__stop.wait(self.__check_interval):
+            with self.__lock:
+                handles = list(self.__handles)
+
+            for handle in handles:
+                if handle.is_hibernated or handle.idle_time < self.__idle_timeout:
+                    continue
+
+                try:
+                    # session may have been used since idle time was checked
+                    handle.hibernate(self.__idle_timeout)
+                except Exception:
+                    logger.exception("Failed to hibernate model session")
@@ -1,25 +1,33 @@
 import dataclasses
 import io
+import logging
 import multiprocessing as _mp
 import os
+import shutil
+import tempfile
 import uuid
 import zipfile
 from concurrent.futures import Future
 from multiprocessing.connection import Connection
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy
+import torch
 
 from tiktorch import log
 from tiktorch.rpc import Shutdown
 from tiktorch.rpc import mp as _mp_rpc
 from tiktorch.rpc.mp import MPServer
 from tiktorch.server.reader import eval_model_zip
+from tiktorch.tiktypes import TikTensorBatch
 
+from . import types
 from .backend import base
 from .rpc_interface import IRPCModelSession
 
+logger = logging.getLogger(__name__)
+
 
 @dataclasses.dataclass
 class ModelInfo:
@@ -31,27 +39,80 @@ class ModelInfo:
     halo: List[Tuple[str, int]]
 
 
+@dataclasses.dataclass
+class SessionSnapshot:
+    """
+    State of model session that should survive process restart
+    """
+
+    datasets: Dict[str, dict] = dataclasses.field(default_factory=dict)
+    # training and validation data saved outside of process' dataset directory, removed once restored
+    dataset_dir: Optional[Path] = None
+
+
 class ModelSessionProcess(IRPCModelSession):
-    def __init__(self, model_zip: bytes, devices: List[str]) -> None:
+    def __init__(
+        self,
+        model_zip: Optional[bytes],
+        devices: List[str],
+        *,
+        extract_path: Optional[Path] = None,
+        snapshot: Optional[SessionSnapshot] = None,
+        shared_weights_path: Optional[Path] = None,
+    ) -> None:
         cache_path = os.getenv("PYBIO_CACHE_PATH", None)
         if cache_path is not None:
             cache_path = Path(cache_path)
 
-        with zipfile.ZipFile(io.BytesIO(model_zip)) as model_file:
-            self._model = eval_model_zip(model_file, devices, cache_path=cache_path)
+        eval_kwargs = {
+            "cache_path": cache_path,
+            "extract_path": extract_path,
+            "shared_weights_path": shared_weights_path,
+        }
+        if model_zip is None:
+            self._model = eval_model_zip(None, devices, **eval_kwargs)
+        else:
+            with zipfile.ZipFile(io.BytesIO(model_zip)) as model_file:
+                self._model = eval_model_zip(model_file, devices, **eval_kwargs)
 
         self._datasets = {}
-        self._worker = base.SessionBackend(self._model)
-
-    def forward(self, input_tensor: numpy.ndarray) -> Future:
-        res = self._worker.forward(input_tensor)
+        if snapshot is not None:
+            self._datasets.update(snapshot.datasets)
+
+        self._extract_path = extract_path
+        self._dataset_dir = Path(tempfile.mkdtemp(prefix="tiktorch_datasets_"))
+        self._worker = base.SessionBackend(self._model, dataset_dir=self._dataset_dir)
+
+        if snapshot is not None and snapshot.dataset_dir is not None:
+            self._worker.load_datasets(snapshot.dataset_dir)
+            shutil.rmtree(snapshot.dataset_dir, ignore_errors=True)
+
+    def forward(self, input_tensor: numpy.ndarray, dataset_id: str = "") -> Future:
+        normalization = None
+        if dataset_id:
+            dataset = self._datasets.get(dataset_id)
+            if dataset is None:
+                raise ValueError(f"Dataset description {dataset_id} doesn't exist")
+            normalization = types.Normalization(dataset["mean"], dataset["stddev"])
+
+        # normalization runs on model thread, so large inputs don't hold up other calls to this process
+        res = self._worker.forward(input_tensor, normalization)
         return res
 
-    def create_dataset(self, mean, stddev):
+    def update_dataset(self, name: str, data: TikTensorBatch, labels: TikTensorBatch) -> None:
+        self._worker.update_dataset(name, data=data, labels=labels)
+
+    def remove_data(self, name: str, ids: List) -> None:
+        self._worker.remove_data(name, ids)
+
+    def create_dataset_description(self, mean, stddev, statistics=None):
         id_ = uuid.uuid4().hex
-        self._datasets[id_] = {"mean": mean, "stddev": stddev}
+        self._datasets[id_] = {"mean": mean, "stddev": stddev, "statistics": statistics}
         return id_
 
+    def get_dataset_description(self, id_: str) -> Optional[dict]:
+        return self._datasets.get(id_)
+
     def get_model_info(self) -> ModelInfo:
         return ModelInfo(
             self._model.name,
@@ -61,13 +122,56 @@ def get_model_info(self) -> ModelInfo:
             halo=self._model.halo,
         )
 
+    def get_forward_latency(self) -> dict:
+        return self._worker.get_forward_latency()
+
+    def get_snapshot(self) -> SessionSnapshot:
+        """
+        Training data is saved to extract path, which outlives process, if one is given
+        """
+        dataset_dir = None
+        if self._extract_path is not None:
+            dataset_dir = Path(tempfile.mkdtemp(prefix="snapshot_datasets_", dir=self._extract_path))
+            self._worker.save_datasets(dataset_dir)
+
+        return SessionSnapshot(datasets=dict(self._datasets), dataset_dir=dataset_dir)
+
     def shutdown(self) -> Shutdown:
         self._worker.shutdown()
+        shutil.rmtree(self._dataset_dir, ignore_errors=True)
         return Shutdown()
 
 
+_THREAD_LIMIT_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def _limit_cpu_cores(cpu_cores: List[int]) -> None:
+    """
+    Pin process to leased cpu cores and size torch thread pools accordingly
+    """
+    num_threads = len(cpu_cores)
+    for var in _THREAD_LIMIT_ENV_VARS:
+        os.environ[var] = str(num_threads)
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpu_cores)
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(num_threads)
+    except RuntimeError:
+        logger.warning("Failed to set number of interop threads, inter-op thread pool has already started")
+
+
 def _run_model_session_process(
-    conn: Connection, model_zip: bytes, devices: List[str], log_queue: Optional[_mp.Queue] = None
+    conn: Connection,
+    model_zip: Optional[bytes],
+    devices: List[str],
+    log_queue: Optional[_mp.Queue] = None,
+    extract_path: Optional[Path] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+    shared_weights_path: Optional[Path] = None,
+    cpu_cores: Optional[List[int]] = None,
 ):
     try:
         # from: https://github.com/pytorch/pytorch/issues/973#issuecomment-346405667
@@ -81,19 +185,40 @@ def _run_model_session_process(
     if log_queue:
         log.configure(log_queue)
 
-    session_proc = ModelSessionProcess(model_zip, devices)
+    if cpu_cores:
+        _limit_cpu_cores(cpu_cores)
+
+    session_proc = ModelSessionProcess(
+        model_zip, devices, extract_path=extract_path, snapshot=snapshot, shared_weights_path=shared_weights_path
+    )
     srv = MPServer(session_proc, conn)
     srv.listen()
 
 
 def start_model_session_process(
-    model_zip: bytes, devices: List[str], log_queue: Optional[_mp.Queue] = None
+    model_zip: Optional[bytes],
+    devices: List[str],
+    log_queue: Optional[_mp.Queue] = None,
+    *,
+    extract_path: Optional[Path] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+    shared_weights_path: Optional[Path] = None,
+    cpu_cores: Optional[List[int]] = None,
 ) -> Tuple[_mp.Process, IRPCModelSession]:
     client_conn, server_conn = _mp.Pipe()
     proc = _mp.Process(
         target=_run_model_session_process,
         name="ModelSessionProcess",
-        kwargs={"conn": server_conn, "devices": devices, "log_queue": log_queue, "model_zip": model_zip},
+        kwargs={
+            "conn": server_conn,
+            "devices": devices,
+            "log_queue": log_queue,
+            "model_zip": model_zip,
+            "extract_path": extract_path,
+            "snapshot": snapshot,
+            "shared_weights_path": shared_weights_path,
+            "cpu_cores": cpu_cores,
+        },
     )
     proc.start()
     return proc, _mp_rpc.create_client(IRPCModelSession, client_conn)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from tiktorch.rpc import RPCInterface, Shutdown, exposed
 from tiktorch.tiktypes import TikTensorBatch
@@ -39,13 +39,34 @@ def remove_data(self, name: str, ids: List[str]) -> None:
         raise NotImplementedError
 
     @exposed
-    def create_dataset_description(self, mean, stddev) -> str:
+    def create_dataset_description(self, mean, stddev, statistics=None) -> str:
+        """
+        statistics: DatasetStatistics the description was created from, kept with the description
+        """
         raise NotImplementedError
 
     @exposed
-    def forward(self, input_tensor):
+    def get_dataset_description(self, id_: str) -> Optional[dict]:
+        """
+        Mean, stddev and statistics of dataset description, None if it doesn't exist
+        """
+        raise NotImplementedError
+
+    @exposed
+    def forward(self, input_tensor, dataset_id: str = ""):
+        """
+        dataset_id: if set, input is normalized by mean and stddev of the dataset description and cast to float32
+        """
         raise NotImplementedError
 
     @exposed
     def get_model_info(self):
         raise NotImplementedError
+
+    @exposed
+    def get_snapshot(self):
+        raise NotImplementedError
+
+    @exposed
+    def get_forward_latency(self) -> dict:
+        raise NotImplementedError
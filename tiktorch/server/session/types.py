@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import dataclasses
 import enum
 from typing import TYPE_CHECKING, List
 
+import numpy as np
+
 if TYPE_CHECKING:
     import torch
 
@@ -15,6 +18,25 @@ class State(enum.Enum):
     Stopped = "stopped"
 
 
+@dataclasses.dataclass(frozen=True)
+class Normalization:
+    """
+    Zero mean, unit variance normalization of model input, see create_dataset_description
+    """
+
+    mean: float
+    stddev: float
+
+    def __call__(self, input_tensor: np.ndarray) -> np.ndarray:
+        """
+        Normalized float32 copy of input, cast happens in the subtraction loop, so no intermediate copy is made
+        """
+        out = np.empty(np.shape(input_tensor), dtype=np.float32)
+        np.subtract(input_tensor, np.float32(self.mean), out=out, casting="unsafe")
+        out *= np.float32(1 / self.stddev)
+        return out
+
+
 class Devices:
     def __init__(self):
         self.devices = []
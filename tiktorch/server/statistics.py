@@ -0,0 +1,274 @@
+"""
+Statistics of datasets, e.g. for normalization of model input, computed in one pass over chunks of data
+
+Every chunk is summarized by a Sketch in a thread pool, sketches of chunks are merged into the sketch of the dataset.
+Quantiles are approximated by counting values in logarithmically sized buckets (DDSketch), so they have bounded
+relative error and sketches merge exactly.
+"""
+
+import collections
+import dataclasses
+import math
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tiktorch.server.chunked_array import DEFAULT_CHUNK_SIZE, ChunkedArray
+
+RELATIVE_ACCURACY = 0.01
+# absolute values below are counted as zero, which bounds number of buckets
+MIN_INDEXABLE_VALUE = 1e-9
+
+# integers of up to 16 bits are counted by value, which is faster than bucketing every element
+_COUNTED_DTYPES = ("u1", "i1", "u2", "i2", "b1")
+
+
+@dataclasses.dataclass
+class DatasetStatistics:
+    count: int
+    mean: float
+    variance: float
+    min: float
+    max: float
+    # percentiles in [0, 100] and their approximate values
+    percentiles: List[float] = dataclasses.field(default_factory=list)
+    percentile_values: List[float] = dataclasses.field(default_factory=list)
+    # counts of values in bins between consecutive edges, see numpy.histogram
+    histogram: List[int] = dataclasses.field(default_factory=list)
+    histogram_edges: List[float] = dataclasses.field(default_factory=list)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class _Buckets:
+    """
+    Counts of values in buckets with consecutive indices starting at offset
+    """
+
+    def __init__(self, offset: int = 0, counts: Optional[np.ndarray] = None) -> None:
+        self.offset = offset
+        self.counts = np.zeros(0, dtype=np.int64) if counts is None else counts
+
+    @classmethod
+    def count(cls, keys: np.ndarray, weights: Optional[np.ndarray] = None) -> "_Buckets":
+        if not keys.size:
+            return cls()
+
+        offset = int(keys.min())
+        counts = np.bincount(keys - offset, weights=weights)
+        return cls(offset, counts.astype(np.int64))
+
+    def merge(self, other: "_Buckets") -> None:
+        if not other.counts.size:
+            return
+
+        if not self.counts.size:
+            self.offset, self.counts = other.offset, other.counts.copy()
+            return
+
+        offset = min(self.offset, other.offset)
+        end = max(self.offset + self.counts.size, other.offset + other.counts.size)
+        counts = np.zeros(end - offset, dtype=np.int64)
+        counts[self.offset - offset : self.offset - offset + self.counts.size] += self.counts
+        counts[other.offset - offset : other.offset - offset + other.counts.size] += other.counts
+        self.offset, self.counts = offset, counts
+
+    def keys(self) -> np.ndarray:
+        return np.arange(self.offset, self.offset + self.counts.size, dtype=np.int64)
+
+
+class Sketch:
+    """
+    Mergeable summary of values: count, mean, variance, min, max and approximate quantiles
+    NaN and infinite values are ignored
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Relative accuracy has to be in (0, 1), got {relative_accuracy}")
+
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # sum of squared differences from mean
+        self.__m2 = 0.0
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__positive = _Buckets()
+        # buckets of absolute values of negative values
+        self.__negative = _Buckets()
+        self.__zeros = 0
+
+    @property
+    def variance(self) -> float:
+        return self.__m2 / self.count if self.count else 0.0
+
+    @classmethod
+    def of(cls, data: np.ndarray, relative_accuracy: float = RELATIVE_ACCURACY) -> "Sketch":
+        sketch = cls(relative_accuracy)
+        data = np.asarray(data).reshape(-1, order="A")
+        if data.dtype.str[1:] in _COUNTED_DTYPES:
+            data = data.view(np.uint8) if data.dtype == np.bool_ else data
+            # values are counted once and summarized as weighted distinct values
+            offset = int(data.min()) if data.size else 0
+            weights = np.bincount(data.astype(np.intp) - offset)
+            values = np.flatnonzero(weights)
+            sketch.__add(values.astype(np.float64) + offset, weights[values])
+        else:
+            if data.dtype.kind == "f":
+                finite = np.isfinite(data)
+                if not finite.all():
+                    data = data[finite]
+            sketch.__add(data.astype(np.float64, copy=False), None)
+
+        return sketch
+
+    def merge(self, other: "Sketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches of different accuracy can't be merged")
+
+        if not other.count:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.__m2 += other.__m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.__positive.merge(other.__positive)
+        self.__negative.merge(other.__negative)
+        self.__zeros += other.__zeros
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """
+        Approximate quantiles for q in [0, 1], NaN if sketch is empty
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError(f"Quantiles have to be in [0, 1], got {q}")
+
+        if not self.count:
+            return np.full(q.shape, np.nan)
+
+        values, counts = self.__bucket_values()
+        ranks = q * (self.count - 1)
+        idx = np.searchsorted(np.cumsum(counts), ranks, side="right")
+        return np.clip(values[np.minimum(idx, values.size - 1)], self.min, self.max)
+
+    def histogram(self, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate counts of values in bins of equal width between min and max and edges of bins
+        """
+        if not self.count:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1)
+
+        values, counts = self.__bucket_values()
+        hist, edges = np.histogram(np.clip(values, self.min, self.max), bins, (self.min, self.max), weights=counts)
+        return hist.astype(np.int64), edges
+
+    def summary(self, percentiles: Sequence[float] = (), histogram_bins: int = 0) -> DatasetStatistics:
+        """
+        percentiles: in [0, 100]
+        """
+        percentiles = [float(p) for p in percentiles]
+        stats = DatasetStatistics(
+            count=self.count,
+            mean=self.mean if self.count else math.nan,
+            variance=self.variance if self.count else math.nan,
+            min=self.min if self.count else math.nan,
+            max=self.max if self.count else math.nan,
+            percentiles=percentiles,
+            percentile_values=self.quantiles(np.divide(percentiles, 100)).tolist(),
+        )
+        if histogram_bins:
+            hist, edges = self.histogram(histogram_bins)
+            stats.histogram, stats.histogram_edges = hist.tolist(), edges.tolist()
+
+        return stats
+
+    def __add(self, values: np.ndarray, weights: Optional[np.ndarray]) -> None:
+        count = values.size if weights is None else int(weights.sum())
+        if not count:
+            return
+
+        self.count = count
+        self.mean = float(np.average(values, weights=weights))
+        diff = values - self.mean
+        self.__m2 = float(np.dot(diff, diff if weights is None else diff * weights))
+        self.min, self.max = float(values.min()), float(values.max())
+
+        positive = values > MIN_INDEXABLE_VALUE
+        negative = values < -MIN_INDEXABLE_VALUE
+        self.__positive = self.__count_buckets(values[positive], None if weights is None else weights[positive])
+        self.__negative = self.__count_buckets(-values[negative], None if weights is None else weights[negative])
+        self.__zeros = count - int(self.__positive.counts.sum()) - int(self.__negative.counts.sum())
+
+    def __count_buckets(self, values: np.ndarray, weights: Optional[np.ndarray]) -> _Buckets:
+        keys = np.ceil(np.log(values) / self.__log_gamma).astype(np.int64)
+        return _Buckets.count(keys, weights)
+
+    def __bucket_values(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Representative values of buckets in ascending order and their counts
+        """
+
+        def value(keys):
+            # value with equal relative distance to both bounds of bucket
+            return 2 * np.power(self.__gamma, keys.astype(np.float64)) / (self.__gamma + 1)
+
+        values = np.concatenate([-value(self.__negative.keys())[::-1], [0.0], value(self.__positive.keys())])
+        counts = np.concatenate([self.__negative.counts[::-1], [self.__zeros], self.__positive.counts])
+        return values, counts
+
+
+def volume_blocks(volume: Union[np.ndarray, ChunkedArray]) -> Iterable[Callable[[], np.ndarray]]:
+    """
+    Readers of chunks of chunked array, or of blocks of about DEFAULT_CHUNK_SIZE bytes of other arrays
+    """
+    if isinstance(volume, ChunkedArray):
+        for index in volume.chunk_indices():
+            start, stop = volume.chunk_region(index)
+            yield lambda start=start, stop=stop: volume.read(start, stop)
+        return
+
+    # "A" keeps a view of Fortran ordered volumes too, so memory mapped uploads aren't read into memory at once
+    flat = volume.reshape(-1, order="A")
+    step = max(DEFAULT_CHUNK_SIZE // max(volume.dtype.itemsize, 1), 1)
+    for start in range(0, flat.size, step):
+        yield lambda start=start: flat[start : start + step]
+
+
+def compute_sketch(
+    blocks: Iterable[Callable[[], np.ndarray]], *, workers: int = 4, relative_accuracy: float = RELATIVE_ACCURACY
+) -> Sketch:
+    """
+    Sketch of all blocks, blocks are read and summarized in a thread pool while next ones are taken from iterable
+    Number of pending blocks is bounded, so blocks of e.g. a stream aren't all kept in memory
+    """
+    sketch = Sketch(relative_accuracy)
+    pending: Deque[Future] = collections.deque()
+
+    def summarize(read: Callable[[], np.ndarray]) -> Sketch:
+        return Sketch.of(read(), relative_accuracy)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Statistics") as executor:
+        try:
+            for read in blocks:
+                pending.append(executor.submit(summarize, read))
+                while len(pending) > 2 * workers or (pending and pending[0].done()):
+                    sketch.merge(pending.popleft().result())
+
+            while pending:
+                sketch.merge(pending.popleft().result())
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+    return sketch
@@ -0,0 +1,110 @@
+"""
+Memory mapped files used to pass tensors between client and server on the same host
+
+Segments are files named with SEGMENT_PREFIX directly in /dev/shm (or temporary directory if it's missing),
+server refuses to map anything else.
+"""
+
+import os
+import stat
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from tiktorch.proto import inference_pb2
+
+SHM_PATH = Path("/dev/shm")
+SEGMENT_PREFIX = "tiktorch_shm_"
+
+
+def segment_dir() -> Path:
+    return SHM_PATH if SHM_PATH.is_dir() else Path(tempfile.gettempdir())
+
+
+def is_segment_path(path: str) -> bool:
+    """
+    Checks that path names regular file with segment prefix in one of the segment directories
+    """
+    path = Path(path)
+    if not path.name.startswith(SEGMENT_PREFIX):
+        return False
+
+    allowed_dirs = {str(SHM_PATH), tempfile.gettempdir()}
+    if str(path.parent) not in allowed_dirs:
+        return False
+
+    try:
+        # symlinks could point anywhere
+        return stat.S_ISREG(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+class SharedSegment:
+    """
+    Memory mapped file holding arrays, removed on close
+    """
+
+    def __init__(self, size: int) -> None:
+        self.path = str(segment_dir() / f"{SEGMENT_PREFIX}{uuid.uuid4().hex}")
+        self.size = size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+        self.__data = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(size,))
+
+    def array(self, dtype, shape: Sequence[int], offset: int = 0) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if offset + nbytes > self.size:
+            raise ValueError(f"Array of {nbytes} bytes at offset {offset} doesn't fit into segment of {self.size}")
+
+        return self.__data[offset : offset + nbytes].view(dtype).reshape(shape)
+
+    def close(self) -> None:
+        self.__data = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def numpy_to_pb_shared_tensor(array: np.ndarray, path: str, offset: int = 0) -> inference_pb2.SharedTensor:
+    shape = [inference_pb2.TensorDim(size=dim) for dim in array.shape]
+    return inference_pb2.SharedTensor(path=path, offset=offset, dtype=str(array.dtype), shape=shape)
+
+
+def pb_shared_tensor_to_numpy(tensor: inference_pb2.SharedTensor, *, writable: bool = False) -> np.ndarray:
+    """
+    Maps array described by tensor, file should be checked with is_segment_path beforehand
+    """
+    if not tensor.dtype:
+        raise ValueError("Tensor dtype is not specified")
+
+    shape = tuple(dim.size for dim in tensor.shape)
+    dtype = np.dtype(tensor.dtype)
+    if dtype.hasobject:
+        raise ValueError("Arrays of objects are not supported")
+
+    nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    if tensor.offset + nbytes > os.path.getsize(tensor.path):
+        raise ValueError(f"Shared tensor doesn't fit into {tensor.path}")
+
+    return np.memmap(tensor.path, dtype=dtype, mode="r+" if writable else "r", offset=tensor.offset, shape=shape)
+
+
+def write_shared_output(array: np.ndarray, target: inference_pb2.SharedTensor) -> inference_pb2.SharedTensor:
+    """
+    Writes array to file of target at its offset, returns description of written tensor
+    """
+    written = numpy_to_pb_shared_tensor(array, target.path, target.offset)
+    out = pb_shared_tensor_to_numpy(written, writable=True)
+    # client maps the same pages, no need to flush
+    out[...] = array
+    return written
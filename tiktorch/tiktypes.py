@@ -1,12 +1,13 @@
 """
 Types defining interop between processes on the server
 """
+
 from typing import List, Optional, Sequence, Tuple, Union
 
 import torch
 from numpy import ndarray
 
-from tiktorch.types import LabeledNDArray, LabeledNDArrayBatch, NDArray, NDArrayBatch
+from tiktorch.types import LabeledNDArray, LabeledNDArrayBatch, NDArray, NDArrayBatch, PackedNDArrayBatch, SparseNDArray
 
 
 class TikTensor:
@@ -92,16 +93,63 @@ def as_numpy(self) -> Tuple[ndarray, ndarray]:
         return self._torch.numpy(), self._label.numpy()
 
 
+class SparseTikTensor:
+    """
+    Containter for mostly zero tensor (e.g. labels) in coordinate format
+    Data is kept sparse for transfer and storage and only densified on access
+    Provides the interface of TikTensor without holding a dense pytorch tensor
+    """
+
+    def __init__(
+        self,
+        tensor: Union[SparseNDArray, ndarray, torch.Tensor],
+        id_: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None,
+    ) -> None:
+        if not isinstance(tensor, SparseNDArray):
+            if isinstance(tensor, torch.Tensor):
+                tensor = tensor.to_dense().numpy()
+            tensor = SparseNDArray.from_dense(tensor, id_)
+        else:
+            assert id_ is None
+            id_ = tensor.id
+
+        self.id = id_
+        self._sparse = tensor
+
+    def add_label(self, label: Union[NDArray, ndarray, torch.Tensor]) -> "LabeledTikTensor":
+        return LabeledTikTensor(tensor=self.as_torch(), label=label, id_=self.id)
+
+    def as_torch(self) -> torch.Tensor:
+        return torch.from_numpy(self.as_numpy())
+
+    def as_numpy(self) -> ndarray:
+        return self._sparse.as_numpy()
+
+    def as_coo(self) -> Tuple[ndarray, ndarray]:
+        """
+        Returns coordinates (one row per axis) and values of nonzero elements
+        """
+        return self._sparse.coords, self._sparse.values
+
+    @property
+    def dtype(self):
+        return torch.from_numpy(self._sparse.values[:0]).dtype
+
+    @property
+    def shape(self):
+        return torch.Size(self._sparse.shape)
+
+
 class TikTensorBatch:
     """
     Batch of TikTensor
     """
 
-    def __init__(self, tensors: Union[List[TikTensor], NDArrayBatch]):
+    def __init__(self, tensors: Union[List[Union[TikTensor, SparseTikTensor]], NDArrayBatch]):
         if isinstance(tensors, NDArrayBatch):
-            tensors = [TikTensor(a) for a in tensors]
+            tensors = [SparseTikTensor(a) if isinstance(a, SparseNDArray) else TikTensor(a) for a in tensors]
 
-        assert all([isinstance(t, TikTensor) for t in tensors])
+        assert all([isinstance(t, (TikTensor, SparseTikTensor)) for t in tensors])
         self._tensors = tensors
 
     def tensor_metas(self):
@@ -128,6 +176,49 @@ def add_labels(self, labels: Sequence) -> "LabeledTikTensorBatch":
         assert len(labels) == len(self)
         return LabeledTikTensorBatch([t.add_label(l) for t, l in zip(self, labels)])
 
+    def pack(self) -> "PackedTikTensorBatch":
+        return PackedTikTensorBatch(PackedNDArrayBatch.pack([NDArray(t.as_numpy(), id_=t.id) for t in self]))
+
+
+class PackedTikTensorBatch(TikTensorBatch):
+    """
+    Batch of TikTensor sharing one contiguous buffer
+    Tensors are created as views on access, only the packed buffer is pickled
+    """
+
+    def __init__(self, packed: PackedNDArrayBatch):
+        self._packed = packed
+
+    @property
+    def packed(self) -> PackedNDArrayBatch:
+        return self._packed
+
+    def tensor_metas(self):
+        return self._packed.array_metas()
+
+    def __len__(self):
+        return len(self._packed)
+
+    def __getitem__(self, idx: int) -> TikTensor:
+        return TikTensor(torch.from_numpy(self._packed.view(idx)), id_=self._packed.ids[idx])
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def as_torch(self) -> List[torch.Tensor]:
+        return [torch.from_numpy(arr) for arr in self._packed.as_numpy()]
+
+    def as_numpy(self) -> List[ndarray]:
+        return self._packed.as_numpy()
+
+    @property
+    def ids(self) -> List[Tuple[int]]:
+        return self._packed.ids
+
+    def pack(self) -> "PackedTikTensorBatch":
+        return self
+
 
 class LabeledTikTensorBatch(TikTensorBatch):
     """
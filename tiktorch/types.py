@@ -1,6 +1,7 @@
 """
 Types defining interop between client and server
 """
+
 from dataclasses import dataclass
 from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
 
@@ -54,6 +55,72 @@ def drop_label(self) -> NDArray:
         return NDArray(array=self._numpy, id_=self.id)
 
 
+class SparseNDArray:
+    """
+    Containter for mostly zero array (e.g. brush stroke labels) in coordinate format
+    coords has one row per axis and one column per nonzero value
+    """
+
+    def __init__(
+        self, coords: np.ndarray, values: np.ndarray, shape: Sequence[int], id_: Optional[Tuple[int, ...]] = None
+    ) -> None:
+        coords = np.asarray(coords)
+        values = np.asarray(values)
+        shape = tuple(shape)
+        if coords.shape != (len(shape), len(values)):
+            raise ValueError(f"Expected coords of shape {(len(shape), len(values))}, got {coords.shape}")
+
+        self._coords = coords.astype(_coords_dtype(shape), copy=False)
+        self._values = values
+        self._shape = shape
+        self.id = id_
+
+    @classmethod
+    def from_dense(cls, array: np.ndarray, id_: Optional[Tuple[int, ...]] = None) -> "SparseNDArray":
+        coords = np.array(np.nonzero(array)).reshape(array.ndim, -1)
+        return cls(coords, array[tuple(coords)], array.shape, id_)
+
+    @property
+    def coords(self) -> np.ndarray:
+        return self._coords
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def dtype(self):
+        return self._values.dtype
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        return self._coords.nbytes + self._values.nbytes
+
+    def as_numpy(self) -> np.ndarray:
+        return densify(self._coords, self._values, self._shape)
+
+
+def _coords_dtype(shape: Sequence[int]) -> np.dtype:
+    return np.min_scalar_type(max(max(shape, default=1) - 1, 0))
+
+
+def densify(coords: np.ndarray, values: np.ndarray, shape: Sequence[int]) -> np.ndarray:
+    """
+    Creates dense array from coordinate format
+    """
+    dense = np.zeros(shape, dtype=values.dtype)
+    dense[tuple(coords)] = values
+    return dense
+
+
 class NDArrayBatch:
     """
     Batch of NDArrays
@@ -85,6 +152,102 @@ def __init__(self, arrays: List[LabeledNDArray]):
         super().__init__(arrays)
 
 
+class PackedNDArrayBatch(NDArrayBatch):
+    """
+    Batch of NDArrays packed into one contiguous buffer with a table of dtypes, shapes and offsets
+    Items are zero copy views into the buffer, so the whole batch is serialized as a single blob
+    """
+
+    ALIGNMENT = 64
+
+    def __init__(
+        self,
+        buffer: Union[bytes, np.ndarray],
+        dtypes: Sequence[str],
+        shapes: Sequence[Tuple[int, ...]],
+        offsets: Sequence[int],
+        ids: Optional[Sequence[Optional[Tuple[int, ...]]]] = None,
+    ) -> None:
+        if not len(dtypes) == len(shapes) == len(offsets):
+            raise ValueError("dtypes, shapes and offsets should have same length")
+
+        if ids is None:
+            ids = [None] * len(dtypes)
+        elif len(ids) != len(dtypes):
+            raise ValueError("ids should have same length as dtypes")
+
+        if not isinstance(buffer, np.ndarray):
+            buffer = np.frombuffer(buffer, dtype=np.uint8)
+
+        self._buffer = buffer
+        self._dtypes = [np.dtype(dtype) for dtype in dtypes]
+        self._shapes = [tuple(shape) for shape in shapes]
+        self._offsets = [int(offset) for offset in offsets]
+        self._ids = list(ids)
+
+        for dtype, shape, offset in zip(self._dtypes, self._shapes, self._offsets):
+            if offset + dtype.itemsize * int(np.prod(shape, dtype=np.int64)) > len(self._buffer):
+                raise ValueError(f"Item at offset {offset} with shape {shape} doesn't fit into buffer")
+
+    @classmethod
+    def pack(cls, arrays: Sequence[Union[NDArray, np.ndarray]]) -> "PackedNDArrayBatch":
+        contiguous, ids, offsets = [], [], []
+        size = 0
+        for arr in arrays:
+            if isinstance(arr, NDArray):
+                ids.append(arr.id)
+                arr = arr.as_numpy()
+            else:
+                ids.append(None)
+
+            arr = np.ascontiguousarray(arr)
+            contiguous.append(arr)
+            offsets.append(size)
+            size += -(-arr.nbytes // cls.ALIGNMENT) * cls.ALIGNMENT
+
+        buffer = np.empty(size, dtype=np.uint8)
+        for arr, offset in zip(contiguous, offsets):
+            buffer[offset : offset + arr.nbytes] = arr.reshape(-1).view(np.uint8)
+
+        return cls(buffer, [a.dtype.str for a in contiguous], [a.shape for a in contiguous], offsets, ids)
+
+    @property
+    def buffer(self) -> np.ndarray:
+        return self._buffer
+
+    @property
+    def offsets(self) -> List[int]:
+        return list(self._offsets)
+
+    @property
+    def ids(self) -> List[Optional[Tuple[int, ...]]]:
+        return list(self._ids)
+
+    def array_metas(self):
+        return [
+            {"dtype": dtype.str, "shape": shape, "id": id_}
+            for dtype, shape, id_ in zip(self._dtypes, self._shapes, self._ids)
+        ]
+
+    def view(self, idx: int) -> np.ndarray:
+        dtype, shape, offset = self._dtypes[idx], self._shapes[idx], self._offsets[idx]
+        count = int(np.prod(shape, dtype=np.int64))
+        return self._buffer[offset : offset + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    def __getitem__(self, idx: int) -> NDArray:
+        return NDArray(self.view(idx), id_=self._ids[idx])
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def as_numpy(self) -> List[np.ndarray]:
+        return [self.view(idx) for idx in range(len(self))]
+
+
 class Point:
     order: list
 
@@ -105,7 +268,6 @@ def __init__(self, order: Optional[list] = None, **axes: int):
         super().__init__()
 
     def __getitem__(self, key: Union[int, str]):
-        print("key", key)
         if isinstance(key, int):
             key = self.order[key]
 
@@ -227,6 +389,407 @@ def add_batch(self, b: int) -> "Point":
         return self
 
 
+class AxesPoint:
+    """
+    Point with fixed axis order backed by numpy array
+    Binary operations with points having same axes in different order align them by axis name
+    """
+
+    __slots__ = ("axes", "_values")
+
+    def __init__(self, axes: str, values: Sequence[int]) -> None:
+        values = np.array(values, dtype=np.int64)
+        if values.shape != (len(axes),):
+            raise ValueError(f"Expected {len(axes)} values for axes {axes!r}, got shape {values.shape}")
+        if len(set(axes)) != len(axes):
+            raise ValueError(f"Axes {axes!r} contain duplicates")
+
+        values.setflags(write=False)
+        self.axes = axes
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, axes: str, values: dict, missing: Optional[int] = None) -> "AxesPoint":
+        if missing is None:
+            return cls(axes, [values[a] for a in axes])
+
+        return cls(axes, [values.get(a, missing) for a in axes])
+
+    @classmethod
+    def from_point(cls, point: Point) -> "AxesPoint":
+        return cls("".join(point.order), list(point))
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def as_dict(self) -> dict:
+        return dict(zip(self.axes, self._values.tolist()))
+
+    def transpose(self, axes: str) -> "AxesPoint":
+        if axes == self.axes:
+            return self
+
+        if sorted(axes) != sorted(self.axes):
+            raise ValueError(f"Can't transpose {self.axes!r} to {axes!r}")
+
+        return AxesPoint(axes, self._values[[self.axes.index(a) for a in axes]])
+
+    def drop(self, axes: str) -> "AxesPoint":
+        keep = [i for i, a in enumerate(self.axes) if a not in axes]
+        return AxesPoint("".join(self.axes[i] for i in keep), self._values[keep])
+
+    def insert(self, axis: str, value: int, index: int = -1) -> "AxesPoint":
+        if index < 0:
+            index += len(self.axes) + 1
+
+        return AxesPoint(self.axes[:index] + axis + self.axes[index:], np.insert(self._values, index, value))
+
+    def _other_values(self, other) -> np.ndarray:
+        if isinstance(other, AxesPoint):
+            return other.transpose(self.axes)._values
+
+        return other
+
+    def __add__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._values + self._other_values(other))
+
+    def __sub__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._values - self._other_values(other))
+
+    def __rsub__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._other_values(other) - self._values)
+
+    def __mul__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._values * self._other_values(other))
+
+    def __floordiv__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._values // self._other_values(other))
+
+    def __mod__(self, other) -> "AxesPoint":
+        return AxesPoint(self.axes, self._values % self._other_values(other))
+
+    def __neg__(self) -> "AxesPoint":
+        return AxesPoint(self.axes, -self._values)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    # comparisons hold if they hold for every axis
+    def __lt__(self, other) -> bool:
+        return bool(np.all(self._values < self._other_values(other)))
+
+    def __le__(self, other) -> bool:
+        return bool(np.all(self._values <= self._other_values(other)))
+
+    def __gt__(self, other) -> bool:
+        return bool(np.all(self._values > self._other_values(other)))
+
+    def __ge__(self, other) -> bool:
+        return bool(np.all(self._values >= self._other_values(other)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AxesPoint):
+            return sorted(self.axes) == sorted(other.axes) and bool(np.all(self._values == self._other_values(other)))
+
+        return NotImplemented
+
+    def __hash__(self):
+        # points equal up to axis order hash equally
+        return hash(tuple(sorted(zip(self.axes, self._values.tolist()))))
+
+    def __getitem__(self, key: Union[int, str]) -> int:
+        if isinstance(key, str):
+            key = self.axes.index(key)
+
+        return int(self._values[key])
+
+    def __len__(self) -> int:
+        return len(self.axes)
+
+    def __iter__(self):
+        return iter(self._values.tolist())
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join(f'{a}:{v}' for a, v in zip(self.axes, self._values))})"
+
+
+class ROI:
+    """
+    Region of interest [start, stop) with fixed axis order
+    """
+
+    __slots__ = ("start", "stop")
+
+    def __init__(self, start: AxesPoint, stop: AxesPoint) -> None:
+        self.start = start
+        self.stop = stop.transpose(start.axes)
+
+    @classmethod
+    def from_shape(cls, shape: AxesPoint, start: Optional[AxesPoint] = None) -> "ROI":
+        if start is None:
+            start = AxesPoint(shape.axes, np.zeros(len(shape), dtype=np.int64))
+
+        return cls(start, start + shape)
+
+    @property
+    def axes(self) -> str:
+        return self.start.axes
+
+    @property
+    def shape(self) -> AxesPoint:
+        return self.stop - self.start
+
+    @property
+    def is_empty(self) -> bool:
+        return bool(np.any(self.stop.values <= self.start.values))
+
+    def contains(self, other: Union[AxesPoint, "ROI"]) -> bool:
+        if isinstance(other, ROI):
+            return other.is_empty or (self.start <= other.start and other.stop <= self.stop)
+
+        return self.start <= other < self.stop
+
+    __contains__ = contains
+
+    def intersection(self, other: "ROI") -> Optional["ROI"]:
+        other_start = other.start.transpose(self.axes).values
+        other_stop = other.stop.transpose(self.axes).values
+        result = ROI(
+            AxesPoint(self.axes, np.maximum(self.start.values, other_start)),
+            AxesPoint(self.axes, np.minimum(self.stop.values, other_stop)),
+        )
+        return None if result.is_empty else result
+
+    def pad(self, halo: AxesPoint) -> "ROI":
+        return ROI(self.start - halo, self.stop + halo)
+
+    def translate(self, offset: AxesPoint) -> "ROI":
+        return ROI(self.start + offset, self.stop + offset)
+
+    def as_slices(self) -> Tuple[slice, ...]:
+        return tuple(slice(a, b) for a, b in zip(self.start, self.stop))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ROI):
+            return self.start == other.start and self.stop == other.stop
+
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.start, self.stop))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.start!r}, {self.stop!r})"
+
+
+class TileGrid:
+    """
+    Tiles covering a volume, stored as (num_tiles, num_axes) arrays in axis order of the grid
+    inner: part of the volume each tile is responsible for
+    outer: inner region extended by halo, may reach outside of the volume
+    read: outer region clipped to the volume, pad_before and pad_after give the missing amounts
+    """
+
+    __slots__ = ("axes", "inner_start", "inner_stop", "outer_start", "outer_stop", "read_start", "read_stop")
+
+    def __init__(self, axes: str, inner_start: np.ndarray, inner_stop: np.ndarray, halo: np.ndarray, shape: np.ndarray):
+        self.axes = axes
+        self.inner_start = inner_start
+        self.inner_stop = inner_stop
+        self.outer_start = inner_start - halo
+        self.outer_stop = inner_stop + halo
+        self.read_start = np.maximum(self.outer_start, 0)
+        self.read_stop = np.minimum(self.outer_stop, shape)
+
+    @property
+    def pad_before(self) -> np.ndarray:
+        return self.read_start - self.outer_start
+
+    @property
+    def pad_after(self) -> np.ndarray:
+        return self.outer_stop - self.read_stop
+
+    def __len__(self) -> int:
+        return len(self.inner_start)
+
+    def inner_roi(self, idx: int) -> ROI:
+        return ROI(AxesPoint(self.axes, self.inner_start[idx]), AxesPoint(self.axes, self.inner_stop[idx]))
+
+    def outer_roi(self, idx: int) -> ROI:
+        return ROI(AxesPoint(self.axes, self.outer_start[idx]), AxesPoint(self.axes, self.outer_stop[idx]))
+
+
+def tile_grid(
+    shape: AxesPoint, tile_shape: AxesPoint, halo: Optional[AxesPoint] = None, keep_tile_shape: bool = False
+) -> TileGrid:
+    """
+    Splits volume of given shape into tiles of tile_shape (inner size, without halo)
+    If keep_tile_shape is set, tiles at the upper border are moved back into the volume,
+    so that every tile has tile_shape (they overlap with their neighbours), otherwise they are cut off
+    """
+    axes = shape.axes
+    shape_arr = shape.values
+    tile = tile_shape.transpose(axes).values
+    halo_arr = np.zeros_like(shape_arr) if halo is None else halo.transpose(axes).values
+
+    if np.any(tile <= 0):
+        raise ValueError(f"Tile shape should be positive, got {tile_shape}")
+    if keep_tile_shape and np.any(tile > shape_arr):
+        raise ValueError(f"Tile shape {tile_shape} doesn't fit into {shape}")
+
+    counts = -(-shape_arr // tile)
+    grid = np.indices(counts, dtype=np.int64).reshape(len(axes), -1).T
+    inner_start = grid * tile
+    if keep_tile_shape:
+        inner_start = np.minimum(inner_start, shape_arr - tile)
+    inner_stop = np.minimum(inner_start + tile, shape_arr)
+
+    return TileGrid(axes, inner_start, inner_stop, halo_arr, shape_arr)
+
+
+def read_roi(array: np.ndarray, start: Sequence[int], stop: Sequence[int]) -> np.ndarray:
+    """
+    Reads region [start, stop) of array, parts reaching outside of it are filled by reflection
+    (by repeating the edge along axes of size 1)
+    """
+    start, stop = np.asarray(start, dtype=np.int64), np.asarray(stop, dtype=np.int64)
+    shape = np.asarray(array.shape, dtype=np.int64)
+    if len(start) != array.ndim or len(stop) != array.ndim:
+        raise ValueError(f"Region [{start.tolist()}, {stop.tolist()}) doesn't match array of shape {array.shape}")
+
+    read_start, read_stop = np.maximum(start, 0), np.minimum(stop, shape)
+    if np.any(read_stop <= read_start):
+        raise ValueError(f"Region [{start.tolist()}, {stop.tolist()}) is outside of array of shape {array.shape}")
+
+    data = array[tuple(slice(a, b) for a, b in zip(read_start.tolist(), read_stop.tolist()))]
+    for axis, (before, after) in enumerate(zip((read_start - start).tolist(), (stop - read_stop).tolist())):
+        if before or after:
+            pad_width = [(0, 0)] * data.ndim
+            pad_width[axis] = (before, after)
+            data = np.pad(data, pad_width, mode="reflect" if data.shape[axis] > 1 else "edge")
+
+    return data
+
+
+def choose_tile_shape(shape: AxesPoint, valid_shapes: Sequence[AxesPoint]) -> AxesPoint:
+    """
+    Picks smallest valid shape covering whole array, or the largest one if none does
+    """
+    if not valid_shapes:
+        raise ValueError("No valid shapes to choose from")
+
+    valid_shapes = [s.transpose(shape.axes) for s in valid_shapes]
+    covering = [s for s in valid_shapes if s >= shape]
+    if covering:
+        return min(covering, key=lambda s: int(np.prod(s.values)))
+
+    return max(valid_shapes, key=lambda s: int(np.prod(s.values)))
+
+
+class Tiling:
+    """
+    Covers array of given shape with tiles of tile_shape, each tile including halo on both sides
+
+    Every tile has exactly tile_shape, parts of it reaching outside of the array are filled by reflection
+    """
+
+    def __init__(self, shape: AxesPoint, tile_shape: AxesPoint, halo: Optional[AxesPoint] = None) -> None:
+        """
+        halo: may omit axes without halo
+        """
+        axes = shape.axes
+        self.shape = shape
+        self.tile_shape = tile_shape.transpose(axes)
+        # axes missing in halo get none
+        self.halo = AxesPoint.from_dict(axes, {} if halo is None else halo.as_dict(), missing=0)
+
+        inner = self.tile_shape - self.halo * 2
+        if np.any(inner.values <= 0):
+            raise ValueError(f"Halo {self.halo} leaves nothing of tile {self.tile_shape}")
+
+        # arrays smaller than tile are covered by single padded tile along that axis
+        inner = AxesPoint(axes, np.minimum(inner.values, shape.values))
+        self.grid: TileGrid = tile_grid(shape, inner, self.halo, keep_tile_shape=True)
+
+    @property
+    def axes(self) -> str:
+        return self.shape.axes
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def region(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start and stop of tile without halo, stop may reach past the array so that tile with halo has tile_shape
+        """
+        start = self.grid.inner_start[idx]
+        return start, start + self.tile_shape.values - 2 * self.halo.values
+
+    def read(self, array: np.ndarray, idx: int) -> np.ndarray:
+        start, stop = self.region(idx)
+        return read_roi(array, start - self.halo.values, stop + self.halo.values)
+
+
+class Stitcher:
+    """
+    Assembles predictions of tiles into one array
+
+    Along input axes, output tile should either keep the size of input tile (halo is cropped off)
+    or already be reduced by halo. Other axes (e.g. channels changed by model) are copied as they are,
+    which is only possible if array was not split along them.
+    """
+
+    def __init__(self, tiling: Tiling, output_axes: str) -> None:
+        self.__tiling = tiling
+        self.__output_axes = output_axes
+        self.__result: Optional[np.ndarray] = None
+
+    @property
+    def result(self) -> np.ndarray:
+        if self.__result is None:
+            raise RuntimeError("No tiles were stitched")
+
+        return self.__result
+
+    def put(self, idx: int, output: np.ndarray) -> None:
+        if output.ndim != len(self.__output_axes):
+            raise ValueError(f"Expected output with axes {self.__output_axes!r}, got shape {output.shape}")
+
+        src, dst, result_shape = [], [], []
+        for axis, size in zip(self.__output_axes, output.shape):
+            src_slice, dst_slice, full_size = self.__place_axis(idx, axis, size)
+            src.append(src_slice)
+            dst.append(dst_slice)
+            result_shape.append(full_size)
+
+        if self.__result is None:
+            self.__result = np.empty(result_shape, dtype=output.dtype)
+
+        self.__result[tuple(dst)] = output[tuple(src)]
+
+    def __place_axis(self, idx: int, axis: str, size: int):
+        tiling = self.__tiling
+        if axis in tiling.axes:
+            pos = tiling.axes.index(axis)
+            grid = tiling.grid
+            start, stop = int(grid.inner_start[idx, pos]), int(grid.inner_stop[idx, pos])
+            full_size = int(tiling.shape.values[pos])
+            halo = int(tiling.halo.values[pos])
+            tile_size = int(tiling.tile_shape.values[pos])
+
+            if size == tile_size:
+                return slice(halo, halo + stop - start), slice(start, stop), full_size
+            if size == tile_size - 2 * halo:
+                return slice(0, stop - start), slice(start, stop), full_size
+
+            is_split = halo or np.any(grid.inner_start[:, pos] != 0) or np.any(grid.inner_stop[:, pos] != full_size)
+            if is_split:
+                raise ValueError(f"Output size {size} along tiled axis {axis!r} doesn't match tile size {tile_size}")
+
+        return slice(None), slice(None), size
+
+
 class SetDeviceReturnType(NamedTuple):
     training_shape: Tuple[int, ...]
     valid_shapes: List[Tuple[int, ...]]